@@ -329,6 +329,64 @@ class OVSBridge(BaseOVS):
                         vxlan_udp_port=p_const.VXLAN_UDP_PORT,
                         dont_fragment=True,
                         tunnel_csum=False):
+        attrs = self._get_tunnel_port_attrs(remote_ip, local_ip, tunnel_type,
+                                            vxlan_udp_port, dont_fragment,
+                                            tunnel_csum)
+        return self.add_port(port_name, *attrs)
+
+    def add_tunnel_ports(self, tunnels, local_ip,
+                         vxlan_udp_port=p_const.VXLAN_UDP_PORT,
+                         dont_fragment=True,
+                         tunnel_csum=False):
+        """Add several tunnel ports in a single OVSDB transaction.
+
+        :param tunnels: a dict of (remote_ip, tunnel_type) tuples by port name.
+        :returns: a dict of the ofports of the ports by port name, with
+                  INVALID_OFPORT for the ports OVS did not assign one to.
+        """
+        if not tunnels:
+            return {}
+        with self.ovsdb.transaction() as txn:
+            for port_name, (remote_ip, tunnel_type) in tunnels.items():
+                attrs = self._get_tunnel_port_attrs(
+                    remote_ip, local_ip, tunnel_type, vxlan_udp_port,
+                    dont_fragment, tunnel_csum)
+                txn.add(self.ovsdb.add_port(self.br_name, port_name))
+                txn.add(self.ovsdb.db_set('Interface', port_name, *attrs))
+        return self.get_ports_ofports(list(tunnels))
+
+    def _get_ports_ofports(self, port_names):
+        port_info = self.get_ports_attributes(
+            'Interface', columns=['name', 'ofport'], ports=port_names,
+            if_exists=True)
+        return {port['name']: port['ofport'] for port in port_info}
+
+    def get_ports_ofports(self, port_names):
+        """Get the ports' assigned ofports, retrying if not yet assigned."""
+        def pending(ofports):
+            return any(_ofport_result_pending(ofports.get(port_name))
+                       for port_name in port_names)
+
+        get_ofports = tenacity.retry(
+            retry=tenacity.retry_if_result(pending),
+            wait=tenacity.wait_exponential(multiplier=0.01, max=1),
+            stop=tenacity.stop_after_delay(
+                self.vsctl_timeout))(self._get_ports_ofports)
+        try:
+            ofports = get_ofports(port_names)
+        except tenacity.RetryError as e:
+            ofports = e.last_attempt.result()
+            LOG.error(_LE("Timed out retrieving ofport on ports %s."),
+                      [port_name for port_name in port_names
+                       if _ofport_result_pending(ofports.get(port_name))])
+        return {port_name: (INVALID_OFPORT
+                            if _ofport_result_pending(ofports.get(port_name))
+                            else ofports[port_name])
+                for port_name in port_names}
+
+    @staticmethod
+    def _get_tunnel_port_attrs(remote_ip, local_ip, tunnel_type,
+                               vxlan_udp_port, dont_fragment, tunnel_csum):
         attrs = [('type', tunnel_type)]
         # TODO(twilson) This is an OrderedDict solely to make a test happy
         options = collections.OrderedDict()
@@ -346,8 +404,7 @@ class OVSBridge(BaseOVS):
         if tunnel_csum:
             options['csum'] = str(tunnel_csum).lower()
         attrs.append(('options', options))
-
-        return self.add_port(port_name, *attrs)
+        return attrs
 
     def add_patch_port(self, local_name, remote_name):
         attrs = [('type', 'patch'),
@@ -600,7 +657,8 @@ class DeferredOVSBridge(object):
     This class is not thread-safe, that's why for every use a new instance
     must be implemented.
     '''
-    ALLOWED_PASSTHROUGHS = 'add_port', 'add_tunnel_port', 'delete_port'
+    ALLOWED_PASSTHROUGHS = ('add_port', 'add_tunnel_port', 'add_tunnel_ports',
+                            'delete_port')
 
     def __init__(self, br, full_ordered=False,
                  order=('add', 'mod', 'del')):
@@ -14,17 +14,22 @@
 #    under the License.
 
 import collections
+import contextlib
+import operator
 import os
 
 import eventlet
 from neutron_lib import constants
 from neutron_lib import exceptions
+from oslo_concurrency import lockutils
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
 from oslo_service import loopingcall
 from oslo_utils import fileutils
 from oslo_utils import importutils
+from oslo_utils import timeutils
+import six
 
 from neutron._i18n import _, _LE, _LI, _LW
 from neutron.agent.linux import dhcp
@@ -39,6 +44,46 @@ from neutron import context
 from neutron import manager
 
 LOG = logging.getLogger(__name__)
+_SYNC_STATE_LOCK = lockutils.ReaderWriterLock()
+# Waits for a state sync shorter than this are not worth reporting
+_SYNC_WAIT_REPORT_THRESHOLD = 0.01
+
+
+def _sync_lock(f):
+    """Decorator to block all operations for a global sync call."""
+    @six.wraps(f)
+    def wrapped(*args, **kwargs):
+        with _SYNC_STATE_LOCK.write_lock():
+            return f(*args, **kwargs)
+    return wrapped
+
+
+def _wait_if_syncing(f):
+    """Decorator to wait if any sync operations are in progress."""
+    @six.wraps(f)
+    def wrapped(*args, **kwargs):
+        start = timeutils.now()
+        with _SYNC_STATE_LOCK.read_lock():
+            waited = timeutils.now() - start
+            if waited > _SYNC_WAIT_REPORT_THRESHOLD:
+                LOG.debug("%(handler)s waited %(waited).3f seconds for state "
+                          "sync to complete",
+                          {'handler': f.__name__, 'waited': waited})
+            return f(*args, **kwargs)
+    return wrapped
+
+
+@contextlib.contextmanager
+def _net_lock(network_id):
+    """Serialize the operations on a network, reporting the time waited."""
+    start = timeutils.now()
+    with lockutils.lock('dhcp-agent-network-lock-%s' % network_id,
+                        utils.SYNCHRONIZED_PREFIX):
+        LOG.debug("Waited %(waited).3f seconds for the lock of network "
+                  "%(network)s",
+                  {'waited': timeutils.now() - start,
+                   'network': network_id})
+        yield
 
 
 class DhcpAgent(manager.Manager):
@@ -146,7 +191,7 @@ class DhcpAgent(manager.Manager):
         """
         self.needs_resync_reasons[network_id].append(reason)
 
-    @utils.synchronized('dhcp-agent')
+    @_sync_lock
     def sync_state(self, networks=None):
         """Sync the local DHCP state with Neutron. If no networks are passed,
         or 'None' is one of the networks, sync all of the networks.
@@ -157,9 +202,18 @@ class DhcpAgent(manager.Manager):
         known_network_ids = set(self.cache.get_network_ids())
 
         try:
-            active_networks = self.plugin_rpc.get_active_networks_info()
+            # NOTE: networks may be fetched in several chunks, the ones of a
+            # chunk are configured by the pool while the next one is fetched.
+            active_networks = self.plugin_rpc.get_active_networks_info(
+                chunk_size=self.conf.sync_networks_chunk_size)
+            active_network_ids = set()
+            for network in active_networks:
+                active_network_ids.add(network.id)
+                if (not only_nets or  # specifically resync all
+                        network.id not in known_network_ids or  # missing net
+                        network.id in only_nets):  # specific network to sync
+                    pool.spawn(self.safe_configure_dhcp_for_network, network)
             LOG.info(_LI('All active networks have been fetched through RPC.'))
-            active_network_ids = set(network.id for network in active_networks)
             for deleted_id in known_network_ids - active_network_ids:
                 try:
                     self.disable_dhcp_helper(deleted_id)
@@ -167,12 +221,6 @@ class DhcpAgent(manager.Manager):
                     self.schedule_resync(e, deleted_id)
                     LOG.exception(_LE('Unable to sync network state on '
                                       'deleted network %s'), deleted_id)
-
-            for network in active_networks:
-                if (not only_nets or  # specifically resync all
-                        network.id not in known_network_ids or  # missing net
-                        network.id in only_nets):  # specific network to sync
-                    pool.spawn(self.safe_configure_dhcp_for_network, network)
             pool.waitall()
             # we notify all ports in case some were created while the agent
             # was down
@@ -180,6 +228,9 @@ class DhcpAgent(manager.Manager):
             LOG.info(_LI('Synchronizing state complete'))
 
         except Exception as e:
+            # The networks of the chunks fetched before the failure must not
+            # be configured once the lock is released
+            pool.waitall()
             if only_nets:
                 for network_id in only_nets:
                     self.schedule_resync(e, network_id)
@@ -239,9 +290,10 @@ class DhcpAgent(manager.Manager):
         """Spawn a thread to periodically resync the dhcp state."""
         eventlet.spawn(self._periodic_resync_helper)
 
-    def safe_get_network_info(self, network_id):
+    def safe_get_network_info(self, network_id, cached_network=None):
         try:
-            network = self.plugin_rpc.get_network_info(network_id)
+            network = self.plugin_rpc.get_network_info(
+                network_id, cached_network=cached_network)
             if not network:
                 LOG.debug('Network %s has been deleted.', network_id)
             return network
@@ -304,7 +356,8 @@ class DhcpAgent(manager.Manager):
             # DHCP current not running for network.
             return self.enable_dhcp_helper(network_id)
 
-        network = self.safe_get_network_info(network_id)
+        network = self.safe_get_network_info(network_id,
+                                             cached_network=old_network)
         if not network:
             return
 
@@ -327,48 +380,59 @@ class DhcpAgent(manager.Manager):
         # Update the metadata proxy after the dhcp driver has been updated
         self.update_isolated_metadata_proxy(network)
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def network_create_end(self, context, payload):
         """Handle the network.create.end notification event."""
         network_id = payload['network']['id']
-        self.enable_dhcp_helper(network_id)
+        with _net_lock(network_id):
+            self.enable_dhcp_helper(network_id)
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def network_update_end(self, context, payload):
         """Handle the network.update.end notification event."""
         network_id = payload['network']['id']
-        if payload['network']['admin_state_up']:
-            self.enable_dhcp_helper(network_id)
-        else:
-            self.disable_dhcp_helper(network_id)
+        with _net_lock(network_id):
+            if payload['network']['admin_state_up']:
+                self.enable_dhcp_helper(network_id)
+            else:
+                self.disable_dhcp_helper(network_id)
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def network_delete_end(self, context, payload):
         """Handle the network.delete.end notification event."""
-        self.disable_dhcp_helper(payload['network_id'])
+        network_id = payload['network_id']
+        with _net_lock(network_id):
+            self.disable_dhcp_helper(network_id)
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def subnet_update_end(self, context, payload):
         """Handle the subnet.update.end notification event."""
         network_id = payload['subnet']['network_id']
-        self.refresh_dhcp_helper(network_id)
+        with _net_lock(network_id):
+            self.refresh_dhcp_helper(network_id)
 
     # Use the update handler for the subnet create event.
     subnet_create_end = subnet_update_end
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def subnet_delete_end(self, context, payload):
         """Handle the subnet.delete.end notification event."""
         subnet_id = payload['subnet_id']
         network = self.cache.get_network_by_subnet_id(subnet_id)
-        if network:
+        if not network:
+            return
+        with _net_lock(network.id):
             self.refresh_dhcp_helper(network.id)
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def port_update_end(self, context, payload):
         """Handle the port.update.end notification event."""
         updated_port = dhcp.DictModel(payload['port'])
-        if self.cache.is_port_message_stale(payload['port']):
+        with _net_lock(updated_port.network_id):
+            self._port_update(updated_port)
+
+    def _port_update(self, updated_port):
+        if self.cache.is_port_message_stale(updated_port):
             LOG.debug("Discarding stale port update: %s", updated_port)
             return
         network = self.cache.get_network_by_id(updated_port.network_id)
@@ -409,12 +473,14 @@ class DhcpAgent(manager.Manager):
     # Use the update handler for the port create event.
     port_create_end = port_update_end
 
-    @utils.synchronized('dhcp-agent')
+    @_wait_if_syncing
     def port_delete_end(self, context, payload):
         """Handle the port.delete.end notification event."""
         port = self.cache.get_port_by_id(payload['port_id'])
         self.cache.deleted_ports.add(payload['port_id'])
-        if port:
+        if not port:
+            return
+        with _net_lock(port.network_id):
             network = self.cache.get_network_by_id(port.network_id)
             self.cache.remove_port(port)
             if self._is_port_on_this_agent(port):
@@ -496,6 +562,8 @@ class DhcpPluginApi(object):
         1.1 - Added get_active_networks_info, create_dhcp_port,
               and update_dhcp_port methods.
         1.5 - Added dhcp_ready_on_ports
+        1.7 - Added revisions to get_network_info
+        1.8 - Added marker and limit to get_active_networks_info
 
     """
 
@@ -506,6 +574,9 @@ class DhcpPluginApi(object):
                 namespace=n_const.RPC_NAMESPACE_DHCP_PLUGIN,
                 version='1.0')
         self.client = n_rpc.get_client(target)
+        # The client has no version cap, the versions that the server
+        # rejected are recorded here to not request them again.
+        self._unsupported_versions = set()
 
     @property
     def context(self):
@@ -516,21 +587,127 @@ class DhcpPluginApi(object):
         # can be independently tracked server side.
         return context.get_admin_context_without_session()
 
-    def get_active_networks_info(self):
-        """Make a remote process call to retrieve all network info."""
+    def get_active_networks_info(self, chunk_size=None):
+        """Make a remote process call to retrieve all network info.
+
+        If chunk_size is set and the server supports it, the networks are
+        fetched chunk_size at a time and returned by a generator, so that the
+        caller can handle the first ones while the next ones are fetched.
+        """
+        if chunk_size and '1.8' not in self._unsupported_versions:
+            return self._iter_active_networks_info(chunk_size)
+        return self._get_all_active_networks_info()
+
+    def _get_all_active_networks_info(self):
         cctxt = self.client.prepare(version='1.1')
         networks = cctxt.call(self.context, 'get_active_networks_info',
                               host=self.host)
         return [dhcp.NetModel(n) for n in networks]
 
-    def get_network_info(self, network_id):
-        """Make a remote process call to retrieve network info."""
+    def _iter_active_networks_info(self, chunk_size):
+        cctxt = self.client.prepare(version='1.8')
+        marker = None
+        while True:
+            try:
+                networks = cctxt.call(self.context,
+                                      'get_active_networks_info',
+                                      host=self.host, marker=marker,
+                                      limit=chunk_size)
+            except Exception as e:
+                # Only the first chunk can be refused by an old server
+                if marker is not None or not self._is_unsupported_version(
+                        e, '1.8'):
+                    raise
+                for network in self._get_all_active_networks_info():
+                    yield network
+                return
+            LOG.debug('Fetched %(count)d active networks after %(marker)s',
+                      {'count': len(networks), 'marker': marker})
+            # A chunk can be shorter than chunk_size while more networks
+            # follow, when networks are deleted or disabled between the
+            # queries of the server, so only an empty one is the last.
+            if not networks:
+                return
+            for network in networks:
+                yield dhcp.NetModel(network)
+            marker = networks[-1]['id']
+
+    def _is_unsupported_version(self, exc, version):
+        """Return whether exc is the refusal of version by the server.
+
+        The refused version is recorded so that it is not requested again.
+        """
+        if not (isinstance(exc, oslo_messaging.UnsupportedVersion) or
+                (isinstance(exc, oslo_messaging.RemoteError) and
+                 exc.exc_type == 'UnsupportedVersion')):
+            return False
+        LOG.info(_LI("The server does not support the version %s of the "
+                     "DHCP RPC API, falling back to an older version."),
+                 version)
+        self._unsupported_versions.add(version)
+        return True
+
+    def get_network_info(self, network_id, cached_network=None):
+        """Make a remote process call to retrieve network info.
+
+        When the agent already has a copy of the network, only the subnets
+        and ports whose revision changed are fetched and merged into it.
+        """
+        revisions = None
+        if (cached_network is not None and
+                '1.7' not in self._unsupported_versions):
+            revisions = self._get_revisions(cached_network)
+        if revisions is not None:
+            cctxt = self.client.prepare(version='1.7')
+            try:
+                network = cctxt.call(self.context, 'get_network_info',
+                                     network_id=network_id, host=self.host,
+                                     revisions=revisions)
+            except Exception as e:
+                if not self._is_unsupported_version(e, '1.7'):
+                    raise
+            else:
+                if network:
+                    return self._apply_network_delta(cached_network, network)
+                return
+
         cctxt = self.client.prepare()
         network = cctxt.call(self.context, 'get_network_info',
                              network_id=network_id, host=self.host)
         if network:
             return dhcp.NetModel(network)
 
+    @staticmethod
+    def _get_revisions(network):
+        """Return the revision numbers of the subnets and ports of network.
+
+        None is returned if any of them has no revision number, in which
+        case the whole network has to be fetched.
+        """
+        revisions = {}
+        for kind in ('subnets', 'ports'):
+            resources = network.get(kind, [])
+            if any(r.get('revision_number') is None for r in resources):
+                return
+            revisions[kind] = {r['id']: r['revision_number']
+                               for r in resources}
+        return revisions
+
+    @staticmethod
+    def _apply_network_delta(cached_network, delta):
+        """Build a new network from the cached one and a delta payload."""
+        for kind in ('subnets', 'ports'):
+            deleted_ids = set(delta.pop('deleted_%s' % kind, []))
+            merged = collections.OrderedDict(
+                (r['id'], r) for r in cached_network.get(kind, [])
+                if r['id'] not in deleted_ids)
+            merged.update((r['id'], r) for r in delta[kind])
+            delta[kind] = list(merged.values())
+        # The subnets must stay sorted by ID, the tags used by dnsmasq depend
+        # on their position.
+        delta['subnets'].sort(key=operator.itemgetter('id'))
+        return dhcp.NetModel(delta)
+
     def create_dhcp_port(self, port):
         """Make a remote process call to create the dhcp port."""
         cctxt = self.client.prepare(version='1.1')
@@ -198,6 +198,10 @@ class QosAgentExtension(l2_agent_extension.L2AgentExtension):
         self.qos_driver.initialize()
 
         self.policy_map = PortPolicyMap()
+        # Policies of a batch of ports fetched in bulk by prepare_ports, so
+        # that an agent (re)starting with many ports does not pull them one
+        # by one. Each one is used by the first port handled with it.
+        self._prefetched_policies = {}
 
         self._register_rpc_consumers(connection)
 
@@ -247,8 +251,7 @@ class QosAgentExtension(l2_agent_extension.L2AgentExtension):
         if not self.policy_map.has_policy_changed(port, qos_policy_id):
             return
 
-        qos_policy = self.resource_rpc.pull(
-            context, resources.QOS_POLICY, qos_policy_id)
+        qos_policy = self._get_policy(context, qos_policy_id)
         if qos_policy is None:
             LOG.info(_LI("QoS policy %(qos_policy_id)s applied to port "
                          "%(port_id)s is not available on server, "
@@ -263,6 +266,48 @@ class QosAgentExtension(l2_agent_extension.L2AgentExtension):
             else:
                 self.qos_driver.create(port, qos_policy)
 
+    @lockutils.synchronized('qos-port')
+    def prepare_ports(self, context, ports):
+        """Fetch at once the unknown QoS policies of a batch of ports."""
+        policy_ids = set()
+        for port in ports:
+            qos_policy_id = (port.get('qos_policy_id') or
+                             port.get('network_qos_policy_id'))
+            if (qos_policy_id and 'port_id' in port and
+                    not self.policy_map.get_policy(qos_policy_id) and
+                    self.policy_map.has_policy_changed(port, qos_policy_id)):
+                policy_ids.add(qos_policy_id)
+        self._prefetched_policies = {}
+        # A single policy is pulled as well by handle_port
+        if len(policy_ids) < 2:
+            return
+        try:
+            policies = self.resource_rpc.bulk_pull(
+                context, resources.QOS_POLICY,
+                filter_kwargs={'id': list(policy_ids)})
+        except resources_rpc.BulkPullNotSupported:
+            return
+        except Exception as e:
+            LOG.warning(_LW("Unable to fetch the QoS policies of the ports "
+                            "at once, they will be fetched one by one: %s"),
+                        e)
+            return
+        self._prefetched_policies = {policy.id: policy
+                                     for policy in policies}
+
+    def _get_policy(self, context, qos_policy_id):
+        """Return a QoS policy, pulling it only if it is not known yet.
+
+        Known policies are kept up to date by the notifications of the
+        server.
+        """
+        qos_policy = (self.policy_map.get_policy(qos_policy_id) or
+                      self._prefetched_policies.pop(qos_policy_id, None))
+        if qos_policy is None:
+            qos_policy = self.resource_rpc.pull(
+                context, resources.QOS_POLICY, qos_policy_id)
+        return qos_policy
+
     def delete_port(self, context, port):
         self._process_reset_port(port)
 
@@ -271,6 +316,8 @@ class QosAgentExtension(l2_agent_extension.L2AgentExtension):
                     all(i in old_policy.rules for i in policy.rules))
 
     def _process_update_policy(self, qos_policy):
+        if qos_policy.id in self._prefetched_policies:
+            self._prefetched_policies[qos_policy.id] = qos_policy
         old_qos_policy = self.policy_map.get_policy(qos_policy.id)
         if old_qos_policy:
             if self._policy_rules_modified(old_qos_policy, qos_policy):
@@ -27,6 +27,17 @@ class L2AgentExtension(agent_extension.AgentExtension):
     def initialize(self, connection, driver_type):
         """Initialize agent extension."""
 
+    def prepare_ports(self, context, ports):
+        """Prepare the handling of a batch of ports.
+
+        Called with the data of all the ports an agent is about to handle,
+        before handle_port is called for each of them, e.g. to fetch what
+        they need at once.
+
+        :param context: rpc context
+        :param ports: list of port data
+        """
+
     @abc.abstractmethod
     def handle_port(self, context, data):
         """Handle agent extension for port.
@@ -35,6 +35,12 @@ class L2AgentExtensionsManager(agent_ext_manager.AgentExtensionsManager):
         super(L2AgentExtensionsManager, self).__init__(conf,
                 L2_AGENT_EXT_MANAGER_NAMESPACE)
 
+    def prepare_ports(self, context, data):
+        """Notify all agent extensions of a batch of ports to handle."""
+        for extension in self:
+            if hasattr(extension.obj, 'prepare_ports'):
+                extension.obj.prepare_ports(context, data)
+
     def handle_port(self, context, data):
         """Notify all agent extensions to handle port."""
         for extension in self:
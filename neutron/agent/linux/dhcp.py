@@ -15,11 +15,13 @@
 
 import abc
 import collections
+import copy
 import os
 import re
 import shutil
 import time
 
+import eventlet
 import netaddr
 from neutron_lib import constants
 from neutron_lib import exceptions
@@ -29,6 +31,7 @@ from oslo_log import log as logging
 import oslo_messaging
 from oslo_utils import excutils
 from oslo_utils import fileutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import six
 
@@ -179,12 +182,21 @@ class DhcpBase(object):
 class DhcpLocalProcess(DhcpBase):
     PORTS = []
 
+    # Driver instances only live for a single operation, so the state which
+    # must survive between operations on a network is kept at class level,
+    # keyed by network id: the contents of the last written config files,
+    # the pending delayed reloads and the reload counters.
+    _config_files = collections.defaultdict(dict)
+    _pending_reloads = {}
+    _reload_stats = collections.defaultdict(collections.Counter)
+
     def __init__(self, conf, network, process_monitor, version=None,
                  plugin=None):
         super(DhcpLocalProcess, self).__init__(conf, network, process_monitor,
                                                version, plugin)
         self.confs_dir = self.get_confs_dir(conf)
         self.network_conf_dir = os.path.join(self.confs_dir, network.id)
+        self._changed_config_files = set()
         fileutils.ensure_tree(self.network_conf_dir, mode=0o755)
 
     @staticmethod
@@ -197,6 +209,51 @@ class DhcpLocalProcess(DhcpBase):
 
     def _remove_config_files(self):
         shutil.rmtree(self.network_conf_dir, ignore_errors=True)
+        self._config_files.pop(self.network.id, None)
+
+    def _replace_config_file(self, kind, contents):
+        """Write a config file unless it already holds these contents."""
+        file_name = self.get_conf_file_name(kind)
+        written = self._config_files[self.network.id]
+        if written.get(kind) != contents or not os.path.exists(file_name):
+            file_utils.replace_file(file_name, contents)
+            written[kind] = contents
+            self._changed_config_files.add(kind)
+        return file_name
+
+    def _reload_process(self, pm):
+        """Reload the process, coalescing reloads within dhcp_reload_delay.
+        """
+        if not self.conf.dhcp_reload_delay:
+            self._do_reload(pm)
+        elif self.network.id in self._pending_reloads:
+            self._reload_stats[self.network.id]['coalesced'] += 1
+        else:
+            self._pending_reloads[self.network.id] = eventlet.spawn_after(
+                self.conf.dhcp_reload_delay, self._delayed_reload, pm)
+
+    def _delayed_reload(self, pm):
+        self._pending_reloads.pop(self.network.id, None)
+        self._do_reload(pm)
+
+    def _do_reload(self, pm):
+        start = timeutils.now()
+        pm.enable(reload_cfg=True)
+        stats = self._reload_stats[self.network.id]
+        stats['reloads'] += 1
+        LOG.debug('Reloaded DHCP server for network %(net)s in %(time).3f '
+                  'seconds (%(reloads)d reloads, %(skipped)d skipped and '
+                  '%(coalesced)d coalesced so far)',
+                  {'net': self.network.id,
+                   'time': timeutils.now() - start,
+                   'reloads': stats['reloads'],
+                   'skipped': stats['skipped'],
+                   'coalesced': stats['coalesced']})
+
+    def _cancel_pending_reload(self):
+        pending = self._pending_reloads.pop(self.network.id, None)
+        if pending:
+            pending.cancel()
 
     def _enable_dhcp(self):
         """check if there is a subnet within the network with dhcp enabled."""
@@ -227,10 +284,12 @@ class DhcpLocalProcess(DhcpBase):
     def disable(self, retain_port=False):
         """Disable DHCP for this network by killing the local process."""
         self.process_monitor.unregister(self.network.id, DNSMASQ_SERVICE_NAME)
+        self._cancel_pending_reload()
         self._get_process_manager().disable()
         if not retain_port:
             self._destroy_namespace_and_port()
         self._remove_config_files()
+        self._reload_stats.pop(self.network.id, None)
 
     def _destroy_namespace_and_port(self):
         try:
@@ -284,6 +343,12 @@ class DhcpLocalProcess(DhcpBase):
         pass
 
 
+_HostEntry = collections.namedtuple(
+    '_HostEntry', ['port', 'hosts', 'addn_hosts', 'opts', 'dhcp_ips',
+                   'leases'])
+_HostTable = collections.namedtuple('_HostTable', ['subnets', 'entries'])
+
+
 class Dnsmasq(DhcpLocalProcess):
     # The ports that need to be opened when security policies are active
     # on the Neutron port used for DHCP.  These are provided as a convenience
@@ -300,6 +365,19 @@ class Dnsmasq(DhcpLocalProcess):
 
     _IS_DHCP_RELEASE6_SUPPORTED = None
 
+    # The host table of each network holds the hosts, addn_hosts and opts
+    # entries of its ports, so that only the ports which changed since the
+    # last operation are formatted again. The leases of the hosts which were
+    # removed are released on the next reload of dnsmasq.
+    _host_tables = {}
+    _unused_leases = collections.defaultdict(set)
+
+    def __init__(self, conf, network, process_monitor, version=None,
+                 plugin=None):
+        super(Dnsmasq, self).__init__(conf, network, process_monitor,
+                                      version, plugin)
+        self._host_entries = None
+
     @classmethod
     def check_version(cls):
         pass
@@ -431,6 +509,8 @@ class Dnsmasq(DhcpLocalProcess):
         # rather than on every reload since dnsmasq will keep the file current
         self._output_init_lease_file()
         self._spawn_or_reload_process(reload_with_HUP=False)
+        # A new dnsmasq only knows the leases of the initial lease file
+        self._unused_leases.pop(self.network.id, None)
 
     def _spawn_or_reload_process(self, reload_with_HUP):
         """Spawns or reloads a Dnsmasq process for the network.
@@ -439,12 +519,20 @@ class Dnsmasq(DhcpLocalProcess):
         or it's reloaded if the process is not running.
         """
 
-        self._output_config_files()
+        config_changed = self._output_config_files()
 
         pm = self._get_process_manager(
             cmd_callback=self._build_cmdline_callback)
 
-        pm.enable(reload_cfg=reload_with_HUP)
+        if reload_with_HUP and pm.active:
+            if config_changed:
+                self._reload_process(pm)
+            else:
+                self._reload_stats[self.network.id]['skipped'] += 1
+                LOG.debug('Configuration of network %s is unchanged, '
+                          'skipping dnsmasq reload', self.network.id)
+        else:
+            pm.enable(reload_cfg=reload_with_HUP)
 
         self.process_monitor.register(uuid=self.network.id,
                                       service_name=DNSMASQ_SERVICE_NAME,
@@ -480,10 +568,25 @@ class Dnsmasq(DhcpLocalProcess):
             LOG.warning(_LW('DHCP release failed for %(cmd)s. '
                             'Reason: %(e)s'), {'cmd': cmd, 'e': e})
 
+    def _remove_config_files(self):
+        super(Dnsmasq, self)._remove_config_files()
+        self._host_tables.pop(self.network.id, None)
+        self._unused_leases.pop(self.network.id, None)
+
+    def _do_reload(self, pm):
+        # The leases are released once per reload, however many port
+        # events were coalesced into it.
+        self._release_unused_leases()
+        super(Dnsmasq, self)._do_reload(pm)
+
     def _output_config_files(self):
+        """Write the config files, return whether any of them changed."""
+        self._changed_config_files.clear()
+        self._host_entries = None
         self._output_hosts_file()
         self._output_addn_hosts_file()
         self._output_opts_file()
+        return bool(self._changed_config_files)
 
     def reload_allocations(self):
         """Rebuild the dnsmasq config and signal the dnsmasq to reload."""
@@ -501,9 +604,11 @@ class Dnsmasq(DhcpLocalProcess):
                       'anymore, skipping reload: %s', self.network.id)
             return
 
-        self._release_unused_leases()
+        start = timeutils.now()
         self._spawn_or_reload_process(reload_with_HUP=True)
-        LOG.debug('Reloading allocations for network: %s', self.network.id)
+        LOG.debug('Reloaded allocations for network %(net)s in %(time).3f '
+                  'seconds', {'net': self.network.id,
+                              'time': timeutils.now() - start})
         self.device_manager.update(self.network, self.interface_name)
 
     def _sort_fixed_ips_for_dnsmasq(self, fixed_ips, v6_nets):
@@ -560,41 +665,156 @@ class Dnsmasq(DhcpLocalProcess):
             no_opts,  # A flag indication that options shouldn't be written
         )
         """
-        v6_nets = dict((subnet.id, subnet) for subnet in
-                       self.network.subnets if subnet.ip_version == 6)
-
+        v6_nets = self._get_v6_nets()
         for port in self.network.ports:
-            fixed_ips = self._sort_fixed_ips_for_dnsmasq(port.fixed_ips,
-                                                         v6_nets)
-            # Confirm whether Neutron server supports dns_name attribute in the
-            # ports API
-            dns_assignment = getattr(port, 'dns_assignment', None)
+            for host_tuple in self._iter_port_hosts(port, v6_nets):
+                yield host_tuple
+
+    def _get_v6_nets(self):
+        return dict((subnet.id, subnet) for subnet in
+                    self.network.subnets if subnet.ip_version == 6)
+
+    def _iter_port_hosts(self, port, v6_nets):
+        """Iterate over the hosts of a port, see _iter_hosts."""
+        fixed_ips = self._sort_fixed_ips_for_dnsmasq(port.fixed_ips, v6_nets)
+        # Confirm whether Neutron server supports dns_name attribute in the
+        # ports API
+        dns_assignment = getattr(port, 'dns_assignment', None)
+        if dns_assignment:
+            dns_ip_map = {d.ip_address: d for d in dns_assignment}
+        for alloc in fixed_ips:
+            no_dhcp = False
+            no_opts = False
+            if alloc.subnet_id in v6_nets:
+                addr_mode = v6_nets[alloc.subnet_id].ipv6_address_mode
+                no_dhcp = addr_mode in (constants.IPV6_SLAAC,
+                                        constants.DHCPV6_STATELESS)
+                # we don't setup anything for SLAAC. It doesn't make sense
+                # to provide options for a client that won't use DHCP
+                no_opts = addr_mode == constants.IPV6_SLAAC
+
+            # If dns_name attribute is supported by ports API, return the
+            # dns_assignment generated by the Neutron server. Otherwise,
+            # generate hostname and fqdn locally (previous behaviour)
             if dns_assignment:
-                dns_ip_map = {d.ip_address: d for d in dns_assignment}
-            for alloc in fixed_ips:
-                no_dhcp = False
-                no_opts = False
-                if alloc.subnet_id in v6_nets:
-                    addr_mode = v6_nets[alloc.subnet_id].ipv6_address_mode
-                    no_dhcp = addr_mode in (constants.IPV6_SLAAC,
-                                            constants.DHCPV6_STATELESS)
-                    # we don't setup anything for SLAAC. It doesn't make sense
-                    # to provide options for a client that won't use DHCP
-                    no_opts = addr_mode == constants.IPV6_SLAAC
-
-                # If dns_name attribute is supported by ports API, return the
-                # dns_assignment generated by the Neutron server. Otherwise,
-                # generate hostname and fqdn locally (previous behaviour)
-                if dns_assignment:
-                    hostname = dns_ip_map[alloc.ip_address].hostname
-                    fqdn = dns_ip_map[alloc.ip_address].fqdn
+                hostname = dns_ip_map[alloc.ip_address].hostname
+                fqdn = dns_ip_map[alloc.ip_address].fqdn
+            else:
+                hostname = 'host-%s' % alloc.ip_address.replace(
+                    '.', '-').replace(':', '-')
+                fqdn = hostname
+                if self.conf.dhcp_domain:
+                    fqdn = '%s.%s' % (fqdn, self.conf.dhcp_domain)
+            yield (port, alloc, hostname, fqdn, no_dhcp, no_opts)
+
+    def _get_host_entries(self):
+        """Return the host entries of the network ports, in port order."""
+        if self._host_entries is None:
+            self._host_entries = self._update_host_table()
+        return self._host_entries
+
+    def _update_host_table(self):
+        """Update the host table of the network with its current ports.
+
+        Only the entries of the ports which were added or changed since the
+        last update are built, and the leases of the ports which were removed
+        or changed are recorded to be released on the next reload.
+        """
+        v6_nets = self._get_v6_nets()
+        dhcp_enabled_subnet_ids = set(s.id for s in self.network.subnets
+                                      if s.enable_dhcp)
+        # The entries depend on the subnets, they are all built again when
+        # the subnets change
+        subnets = [(s.id, s.enable_dhcp, s.ip_version,
+                    getattr(s, 'ipv6_address_mode', None))
+                   for s in self.network.subnets]
+        table = self._host_tables.get(self.network.id)
+        if table is None:
+            # First update since the agent started: the leases to release
+            # are the ones of the hosts file left by the previous run
+            old_entries = {}
+            stale_leases = self._read_hosts_file_leases(
+                self.get_conf_file_name('host'))
+        else:
+            old_entries = dict(table.entries)
+            stale_leases = set()
+            if table.subnets != subnets:
+                for entry in old_entries.values():
+                    stale_leases |= entry.leases
+                old_entries = {}
+
+        entries = collections.OrderedDict()
+        new_leases = set()
+        # NOTE(ihrachyshka): the loop should not log anything inside it, to
+        # avoid potential performance drop when lots of hosts are dumped
+        for port in self.network.ports:
+            entry = old_entries.pop(port.id, None)
+            if entry is None or entry.port != port:
+                if entry is not None:
+                    stale_leases |= entry.leases
+                entry = self._build_host_entry(port, v6_nets,
+                                               dhcp_enabled_subnet_ids)
+                new_leases |= entry.leases
+            entries[port.id] = entry
+        # The remaining entries are the ones of the removed ports
+        for entry in old_entries.values():
+            stale_leases |= entry.leases
+
+        unused_leases = self._unused_leases[self.network.id]
+        unused_leases |= stale_leases - new_leases
+        unused_leases -= new_leases
+        self._host_tables[self.network.id] = _HostTable(subnets, entries)
+        return list(entries.values())
+
+    def _build_host_entry(self, port, v6_nets, dhcp_enabled_subnet_ids):
+        """Build the host entry of a port.
+
+        The entry holds the lines of the port in the hosts, addn_hosts and
+        opts files, the DHCP server addresses of the port if it is a DHCP
+        port and the leases matching its fixed IPs.
+        """
+        hosts = six.StringIO()
+        addn_hosts = six.StringIO()
+        for host_tuple in self._iter_port_hosts(port, v6_nets):
+            __, alloc, hostname, fqdn, no_dhcp, no_opts = host_tuple
+            # It is compulsory to write the `fqdn` before the `hostname` in
+            # order to obtain it in PTR responses.
+            if alloc:
+                addn_hosts.write('%s\t%s %s\n' %
+                                 (alloc.ip_address, fqdn, hostname))
+            self._write_host(hosts, port, alloc, fqdn, no_dhcp, no_opts,
+                             dhcp_enabled_subnet_ids)
+
+        opts = []
+        if self._get_port_extra_dhcp_opts(port):
+            port_ip_versions = set(
+                [netaddr.IPAddress(ip.ip_address).version
+                 for ip in port.fixed_ips])
+            for opt in port.extra_dhcp_opts:
+                if opt.opt_name == edo_ext.CLIENT_ID:
+                    continue
+                opt_ip_version = opt.ip_version
+                if opt_ip_version in port_ip_versions:
+                    opts.append(
+                        self._format_option(opt_ip_version, port.id,
+                                            opt.opt_name, opt.opt_value))
                 else:
-                    hostname = 'host-%s' % alloc.ip_address.replace(
-                        '.', '-').replace(':', '-')
-                    fqdn = hostname
-                    if self.conf.dhcp_domain:
-                        fqdn = '%s.%s' % (fqdn, self.conf.dhcp_domain)
-                yield (port, alloc, hostname, fqdn, no_dhcp, no_opts)
+                    LOG.info(_LI("Cannot apply dhcp option %(opt)s "
+                                 "because it's ip_version %(version)d "
+                                 "is not in port's address IP versions"),
+                             {'opt': opt.opt_name,
+                              'version': opt_ip_version})
+
+        dhcp_ips = []
+        if port.device_owner == constants.DEVICE_OWNER_DHCP:
+            dhcp_ips = [(ip.subnet_id, ip.ip_address)
+                        for ip in port.fixed_ips]
+
+        client_id = self._get_client_id(port)
+        leases = frozenset((alloc.ip_address, port.mac_address, client_id)
+                           for alloc in port.fixed_ips)
+        return _HostEntry(copy.deepcopy(port), hosts.getvalue(),
+                          addn_hosts.getvalue(), opts, dhcp_ips, leases)
 
     def _get_port_extra_dhcp_opts(self, port):
         return getattr(port, edo_ext.EXTRADHCPOPTS, False)
@@ -669,49 +889,46 @@ class Dnsmasq(DhcpLocalProcess):
         should receive a dhcp lease, the hosts resolution in itself is
         defined by the `_output_addn_hosts_file` method.
         """
-        buf = six.StringIO()
         filename = self.get_conf_file_name('host')
 
         LOG.debug('Building host file: %s', filename)
-        dhcp_enabled_subnet_ids = [s.id for s in self.network.subnets
-                                   if s.enable_dhcp]
-        # NOTE(ihrachyshka): the loop should not log anything inside it, to
-        # avoid potential performance drop when lots of hosts are dumped
-        for host_tuple in self._iter_hosts():
-            port, alloc, hostname, name, no_dhcp, no_opts = host_tuple
-            if no_dhcp:
-                if not no_opts and self._get_port_extra_dhcp_opts(port):
-                    buf.write('%s,%s%s\n' %
-                              (port.mac_address, 'set:', port.id))
-                continue
+        contents = ''.join(entry.hosts for entry in self._get_host_entries())
+        self._replace_config_file('host', contents)
+        LOG.debug('Done building host file %s', filename)
+        return filename
 
-            # don't write ip address which belongs to a dhcp disabled subnet.
-            if alloc.subnet_id not in dhcp_enabled_subnet_ids:
-                continue
+    def _write_host(self, buf, port, alloc, name, no_dhcp, no_opts,
+                    dhcp_enabled_subnet_ids):
+        """Write the hosts file line of a port fixed IP, if any."""
+        if no_dhcp:
+            if not no_opts and self._get_port_extra_dhcp_opts(port):
+                buf.write('%s,%s%s\n' %
+                          (port.mac_address, 'set:', port.id))
+            return
 
-            ip_address = self._format_address_for_dnsmasq(alloc.ip_address)
+        # don't write ip address which belongs to a dhcp disabled subnet.
+        if alloc.subnet_id not in dhcp_enabled_subnet_ids:
+            return
+
+        ip_address = self._format_address_for_dnsmasq(alloc.ip_address)
 
-            if self._get_port_extra_dhcp_opts(port):
-                client_id = self._get_client_id(port)
-                if client_id and len(port.extra_dhcp_opts) > 1:
-                    buf.write('%s,%s%s,%s,%s,%s%s\n' %
-                              (port.mac_address, self._ID, client_id, name,
-                               ip_address, 'set:', port.id))
-                elif client_id and len(port.extra_dhcp_opts) == 1:
-                    buf.write('%s,%s%s,%s,%s\n' %
+        if self._get_port_extra_dhcp_opts(port):
+            client_id = self._get_client_id(port)
+            if client_id and len(port.extra_dhcp_opts) > 1:
+                buf.write('%s,%s%s,%s,%s,%s%s\n' %
                           (port.mac_address, self._ID, client_id, name,
-                           ip_address))
-                else:
-                    buf.write('%s,%s,%s,%s%s\n' %
-                              (port.mac_address, name, ip_address,
-                               'set:', port.id))
+                           ip_address, 'set:', port.id))
+            elif client_id and len(port.extra_dhcp_opts) == 1:
+                buf.write('%s,%s%s,%s,%s\n' %
+                      (port.mac_address, self._ID, client_id, name,
+                       ip_address))
             else:
-                buf.write('%s,%s,%s\n' %
-                          (port.mac_address, name, ip_address))
-
-        file_utils.replace_file(filename, buf.getvalue())
-        LOG.debug('Done building host file %s', filename)
-        return filename
+                buf.write('%s,%s,%s,%s%s\n' %
+                          (port.mac_address, name, ip_address,
+                           'set:', port.id))
+        else:
+            buf.write('%s,%s,%s\n' %
+                      (port.mac_address, name, ip_address))
 
     def _get_client_id(self, port):
         if self._get_port_extra_dhcp_opts(port):
@@ -806,18 +1023,14 @@ class Dnsmasq(DhcpLocalProcess):
         return leases
 
     def _release_unused_leases(self):
-        filename = self.get_conf_file_name('host')
-        old_leases = self._read_hosts_file_leases(filename)
+        """Release the leases recorded by the host table updates."""
+        unused_leases = self._unused_leases.pop(self.network.id, None)
+        if not unused_leases:
+            return
         leases_filename = self.get_conf_file_name('leases')
         # here is dhcpv6 stuff needed to craft dhcpv6 packet
         v6_leases = self._read_v6_leases_file_leases(leases_filename)
-        new_leases = set()
-        for port in self.network.ports:
-            client_id = self._get_client_id(port)
-            for alloc in port.fixed_ips:
-                new_leases.add((alloc.ip_address, port.mac_address, client_id))
-
-        for ip, mac, client_id in old_leases - new_leases:
+        for ip, mac, client_id in unused_leases:
             entry = v6_leases.get(ip, None)
             version = netaddr.IPAddress(ip).version
             if entry:
@@ -840,25 +1053,16 @@ class Dnsmasq(DhcpLocalProcess):
         Each line in this file is in the same form as a standard /etc/hosts
         file.
         """
-        buf = six.StringIO()
-        for host_tuple in self._iter_hosts():
-            port, alloc, hostname, fqdn, no_dhcp, no_opts = host_tuple
-            # It is compulsory to write the `fqdn` before the `hostname` in
-            # order to obtain it in PTR responses.
-            if alloc:
-                buf.write('%s\t%s %s\n' % (alloc.ip_address, fqdn, hostname))
-        addn_hosts = self.get_conf_file_name('addn_hosts')
-        file_utils.replace_file(addn_hosts, buf.getvalue())
-        return addn_hosts
+        contents = ''.join(entry.addn_hosts
+                           for entry in self._get_host_entries())
+        return self._replace_config_file('addn_hosts', contents)
 
     def _output_opts_file(self):
         """Write a dnsmasq compatible options file."""
         options, subnet_index_map = self._generate_opts_per_subnet()
         options += self._generate_opts_per_port(subnet_index_map)
 
-        name = self.get_conf_file_name('opts')
-        file_utils.replace_file(name, '\n'.join(options))
-        return name
+        return self._replace_config_file('opts', '\n'.join(options))
 
     def _generate_opts_per_subnet(self):
         options = []
@@ -943,35 +1147,17 @@ class Dnsmasq(DhcpLocalProcess):
     def _generate_opts_per_port(self, subnet_index_map):
         options = []
         dhcp_ips = collections.defaultdict(list)
-        for port in self.network.ports:
-            if self._get_port_extra_dhcp_opts(port):
-                port_ip_versions = set(
-                    [netaddr.IPAddress(ip.ip_address).version
-                     for ip in port.fixed_ips])
-                for opt in port.extra_dhcp_opts:
-                    if opt.opt_name == edo_ext.CLIENT_ID:
-                        continue
-                    opt_ip_version = opt.ip_version
-                    if opt_ip_version in port_ip_versions:
-                        options.append(
-                            self._format_option(opt_ip_version, port.id,
-                                                opt.opt_name, opt.opt_value))
-                    else:
-                        LOG.info(_LI("Cannot apply dhcp option %(opt)s "
-                                     "because it's ip_version %(version)d "
-                                     "is not in port's address IP versions"),
-                                 {'opt': opt.opt_name,
-                                  'version': opt_ip_version})
+        for entry in self._get_host_entries():
+            options.extend(entry.opts)
 
             # provides all dnsmasq ip as dns-server if there is more than
             # one dnsmasq for a subnet and there is no dns-server submitted
             # by the server
-            if port.device_owner == constants.DEVICE_OWNER_DHCP:
-                for ip in port.fixed_ips:
-                    i = subnet_index_map.get(ip.subnet_id)
-                    if i is None:
-                        continue
-                    dhcp_ips[i].append(ip.ip_address)
+            for subnet_id, ip_address in entry.dhcp_ips:
+                i = subnet_index_map.get(subnet_id)
+                if i is None:
+                    continue
+                dhcp_ips[i].append(ip_address)
 
         for i, ips in dhcp_ips.items():
             for ip_version in (4, 6):
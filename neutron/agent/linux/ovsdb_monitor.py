@@ -12,13 +12,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import eventlet
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
+from ovs.db import idl
 
 from neutron._i18n import _LE
 from neutron.agent.linux import async_process
 from neutron.agent.ovsdb import api as ovsdb
+from neutron.agent.ovsdb import impl_idl
 
 
 LOG = logging.getLogger(__name__)
@@ -54,7 +58,12 @@ class SimpleInterfaceMonitor(OvsdbMonitor):
     since the previous access.
     """
 
-    def __init__(self, respawn_interval=None):
+    def __init__(self, respawn_interval=None, event_callback=None):
+        """
+        :param event_callback: an optional callable, called without
+                               arguments each time the monitor receives a
+                               change, e.g. to wake up a polling loop.
+        """
         super(SimpleInterfaceMonitor, self).__init__(
             'Interface',
             columns=['name', 'ofport', 'external_ids'],
@@ -62,6 +71,13 @@ class SimpleInterfaceMonitor(OvsdbMonitor):
             respawn_interval=respawn_interval,
         )
         self.new_events = {'added': [], 'removed': []}
+        self._event_callback = event_callback
+
+    def _read_stdout(self):
+        data = super(SimpleInterfaceMonitor, self)._read_stdout()
+        if data and self._event_callback:
+            self._event_callback()
+        return data
 
     @property
     def has_updates(self):
@@ -116,3 +132,91 @@ class SimpleInterfaceMonitor(OvsdbMonitor):
             with eventlet.timeout.Timeout(timeout):
                 while not self.is_active():
                     eventlet.sleep()
+
+
+class NativeInterfaceMonitor(object):
+    """Monitors the Interface table through the native OVSDB connection.
+
+    It offers the same interface as SimpleInterfaceMonitor, but the changes
+    are received as row events of the IDL already kept in sync by the
+    native OVSDB connection of the agent, instead of being parsed from the
+    output of an 'ovsdb-client monitor' process.
+    """
+
+    def __init__(self, event_callback=None):
+        """
+        :param event_callback: an optional callable, called without
+                               arguments each time the monitor receives a
+                               change, e.g. to wake up a polling loop.
+        """
+        self.new_events = {'added': [], 'removed': []}
+        self._event_callback = event_callback
+        self._lock = threading.Lock()
+        self._idl = None
+
+    def is_active(self):
+        return self._idl is not None
+
+    def start(self, block=False, timeout=5):
+        # The connection is started synchronously, block and timeout are
+        # accepted for compatibility with SimpleInterfaceMonitor.
+        ovsdb_connection = impl_idl.OvsdbIdl.ovsdb_connection
+        ovsdb_connection.start()
+        self._idl = ovsdb_connection.idl
+        # Report the existing interfaces as added, as 'ovsdb-client monitor'
+        # does with its initial rows.
+        with self._lock:
+            for row in self._idl.tables['Interface'].rows.values():
+                self.new_events['added'].append(self._get_device(row))
+        self._idl.register_row_event_handler(self._handle_row_event)
+
+    def stop(self, block=False):
+        if self._idl is not None:
+            self._idl.unregister_row_event_handler(self._handle_row_event)
+            self._idl = None
+
+    @staticmethod
+    def _get_device(row):
+        ofport = row.ofport[0] if row.ofport else []
+        return {'name': row.name,
+                'ofport': ofport,
+                'external_ids': dict(row.external_ids)}
+
+    def _handle_row_event(self, event, row, updates=None):
+        if row._table.name != 'Interface':
+            return
+        device = self._get_device(row)
+        # Most updates are the statistics and link state refreshes of the
+        # interfaces, only the ones changing a reported device are notified
+        notify = False
+        with self._lock:
+            if event == idl.ROW_CREATE:
+                self.new_events['added'].append(device)
+                notify = True
+            elif event == idl.ROW_DELETE:
+                self.new_events['removed'].append(device)
+                notify = True
+            elif event == idl.ROW_UPDATE:
+                # update any pending event with the ofport assigned since
+                for added in self.new_events['added']:
+                    if (added['name'] == device['name'] and
+                            added['ofport'] != device['ofport']):
+                        added['ofport'] = device['ofport']
+                        notify = True
+        if notify and self._event_callback:
+            self._event_callback()
+
+    @property
+    def has_updates(self):
+        """Indicate whether the ovsdb Interface table has been updated."""
+        if not self.is_active():
+            LOG.error(_LE("Interface monitor is not active"))
+        with self._lock:
+            return bool(self.new_events['added'] or
+                        self.new_events['removed'])
+
+    def get_events(self):
+        with self._lock:
+            events, self.new_events = (self.new_events,
+                                       {'added': [], 'removed': []})
+        return events
@@ -15,6 +15,7 @@
 import contextlib
 
 import eventlet
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from neutron.agent.common import base_polling
@@ -28,10 +29,12 @@ LOG = logging.getLogger(__name__)
 @contextlib.contextmanager
 def get_polling_manager(minimize_polling=False,
                         ovsdb_monitor_respawn_interval=(
-                            constants.DEFAULT_OVSDBMON_RESPAWN)):
+                            constants.DEFAULT_OVSDBMON_RESPAWN),
+                        event_callback=None):
     if minimize_polling:
         pm = InterfacePollingMinimizer(
-            ovsdb_monitor_respawn_interval=ovsdb_monitor_respawn_interval)
+            ovsdb_monitor_respawn_interval=ovsdb_monitor_respawn_interval,
+            event_callback=event_callback)
         pm.start()
     else:
         pm = base_polling.AlwaysPoll()
@@ -47,11 +50,17 @@ class InterfacePollingMinimizer(base_polling.BasePollingManager):
 
     def __init__(
             self,
-            ovsdb_monitor_respawn_interval=constants.DEFAULT_OVSDBMON_RESPAWN):
+            ovsdb_monitor_respawn_interval=constants.DEFAULT_OVSDBMON_RESPAWN,
+            event_callback=None):
 
         super(InterfacePollingMinimizer, self).__init__()
-        self._monitor = ovsdb_monitor.SimpleInterfaceMonitor(
-            respawn_interval=ovsdb_monitor_respawn_interval)
+        if cfg.CONF.OVS.ovsdb_interface == 'native':
+            self._monitor = ovsdb_monitor.NativeInterfaceMonitor(
+                event_callback=event_callback)
+        else:
+            self._monitor = ovsdb_monitor.SimpleInterfaceMonitor(
+                respawn_interval=ovsdb_monitor_respawn_interval,
+                event_callback=event_callback)
 
     def start(self):
         self._monitor.start(block=True)
@@ -35,6 +35,11 @@ SHARED_OPTS = [
 ]
 
 
+PER_NAMESPACE_PROXY_MODE = 'per-namespace'
+SHARED_PROXY_MODE = 'shared'
+PROXY_MODES = (PER_NAMESPACE_PROXY_MODE, SHARED_PROXY_MODE)
+
+
 DRIVER_OPTS = [
     cfg.BoolOpt('metadata_proxy_watch_log',
                 help=_("Enable/Disable log watch by metadata proxy. It "
@@ -46,6 +51,17 @@ DRIVER_OPTS = [
                        "metadata_proxy_user: watch log is enabled if "
                        "metadata_proxy_user is agent effective user "
                        "id/name.")),
+    cfg.StrOpt('metadata_proxy_mode',
+               default=PER_NAMESPACE_PROXY_MODE,
+               choices=PROXY_MODES,
+               help=_("How metadata proxies are run, 2 values allowed: "
+                      "'per-namespace': spawn one metadata proxy process "
+                      "in each router or network namespace, "
+                      "'shared': spawn a single metadata proxy process per "
+                      "agent which listens inside every namespace. The "
+                      "shared process runs as root since it needs to enter "
+                      "namespaces, metadata_proxy_user/group are not used "
+                      "in this mode.")),
 ]
 
 
@@ -20,6 +20,8 @@ from neutron.agent.l3 import ha_router
 from neutron.agent.l3 import namespaces
 from neutron.agent.linux import external_process
 from neutron.agent.linux import utils
+from neutron.agent.metadata import config as metadata_config
+from neutron.agent.metadata import proxy_registry
 from neutron.callbacks import events
 from neutron.callbacks import registry
 from neutron.callbacks import resources
@@ -29,6 +31,7 @@ from neutron.common import exceptions
 
 # Access with redirection to metadata proxy iptables mark mask
 METADATA_SERVICE_NAME = 'metadata-proxy'
+SHARED_PROXY_UUID_PREFIX = 'shared-metadata-proxy-'
 
 
 class MetadataDriver(object):
@@ -115,25 +118,75 @@ class MetadataDriver(object):
 
         return callback
 
+    @classmethod
+    def _get_shared_metadata_proxy_callback(cls, uuid, registry_dir, conf):
+
+        def callback(pid_file):
+            proxy_cmd = ['neutron-ns-metadata-proxy',
+                         '--pid_file=%s' % pid_file,
+                         '--metadata_proxy_socket=%s' %
+                         conf.metadata_proxy_socket,
+                         '--registry_dir=%s' % registry_dir,
+                         '--state_path=%s' % conf.state_path]
+            proxy_cmd.extend(config.get_log_args(
+                conf, 'neutron-ns-metadata-proxy-%s.log' % uuid))
+            return proxy_cmd
+
+        return callback
+
+    @classmethod
+    def _get_shared_metadata_proxy_process_manager(cls, monitor, conf):
+        uuid = SHARED_PROXY_UUID_PREFIX + monitor.resource_type
+        registry_dir = proxy_registry.get_registry_dir(
+            conf.state_path, monitor.resource_type)
+        callback = cls._get_shared_metadata_proxy_callback(
+            uuid, registry_dir, conf)
+        pm = external_process.ProcessManager(
+            conf=conf,
+            uuid=uuid,
+            default_cmd_callback=callback,
+            run_as_root=True)
+        return uuid, registry_dir, pm
+
     @classmethod
     def spawn_monitored_metadata_proxy(cls, monitor, ns_name, port, conf,
                                        network_id=None, router_id=None):
         uuid = network_id or router_id
-        callback = cls._get_metadata_proxy_callback(
-            port, conf, network_id=network_id, router_id=router_id)
-        pm = cls._get_metadata_proxy_process_manager(uuid, conf,
-                                                     ns_name=ns_name,
-                                                     callback=callback)
-        pm.enable()
-        monitor.register(uuid, METADATA_SERVICE_NAME, pm)
+        if conf.metadata_proxy_mode == metadata_config.SHARED_PROXY_MODE:
+            if uuid is None:
+                raise exceptions.NetworkIdOrRouterIdRequiredError()
+            shared_uuid, registry_dir, pm = (
+                cls._get_shared_metadata_proxy_process_manager(monitor, conf))
+            proxy_registry.register(registry_dir, uuid, ns_name, port,
+                                    network_id=network_id,
+                                    router_id=router_id)
+            # Spawn the shared proxy or make it load the new registration
+            pm.enable(reload_cfg=True)
+            monitor.register(shared_uuid, METADATA_SERVICE_NAME, pm)
+        else:
+            callback = cls._get_metadata_proxy_callback(
+                port, conf, network_id=network_id, router_id=router_id)
+            pm = cls._get_metadata_proxy_process_manager(uuid, conf,
+                                                         ns_name=ns_name,
+                                                         callback=callback)
+            pm.enable()
+            monitor.register(uuid, METADATA_SERVICE_NAME, pm)
         cls.monitors[router_id] = pm
 
     @classmethod
     def destroy_monitored_metadata_proxy(cls, monitor, uuid, conf):
         monitor.unregister(uuid, METADATA_SERVICE_NAME)
-        # No need to pass ns name as it's not needed for disable()
+        # No need to pass ns name as it's not needed for disable(). This is
+        # also done in shared mode to stop any proxy spawned before the mode
+        # was changed.
         pm = cls._get_metadata_proxy_process_manager(uuid, conf)
         pm.disable()
+        if conf.metadata_proxy_mode == metadata_config.SHARED_PROXY_MODE:
+            _shared_uuid, registry_dir, shared_pm = (
+                cls._get_shared_metadata_proxy_process_manager(monitor, conf))
+            proxy_registry.unregister(registry_dir, uuid)
+            if shared_pm.active:
+                shared_pm.reload_cfg()
         cls.monitors.pop(uuid, None)
 
     @classmethod
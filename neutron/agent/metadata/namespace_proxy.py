@@ -12,6 +12,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import contextlib
+import ctypes
+import ctypes.util
+import os
+import signal
+import time
+
+import eventlet
+import eventlet.wsgi
 import httplib2
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -21,9 +31,10 @@ import six
 import six.moves.urllib.parse as urlparse
 import webob
 
-from neutron._i18n import _, _LE
+from neutron._i18n import _, _LE, _LI, _LW
 from neutron.agent.linux import daemon
 from neutron.agent.linux import utils as agent_utils
+from neutron.agent.metadata import proxy_registry
 from neutron.common import config
 from neutron.common import exceptions
 from neutron.common import utils
@@ -31,6 +42,16 @@ from neutron import wsgi
 
 LOG = logging.getLogger(__name__)
 
+CLONE_NEWNET = 0x40000000
+NETNS_RUN_DIR = '/var/run/netns'
+# Interval at which the shared proxy checks whether it was asked to reload
+# its registrations.
+SHARED_PROXY_SYNC_INTERVAL = 1
+# Maximum delay between two attempts to serve a registration which failed.
+SHARED_PROXY_MAX_RETRY_INTERVAL = 60
+
+_libc = None
+
 
 class NetworkMetadataProxyHandler(object):
     """Proxy AF_INET metadata request through Unix Domain socket.
@@ -136,6 +157,145 @@ class ProxyDaemon(daemon.Daemon):
         proxy.wait()
 
 
+def _setns(fd):
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    if _libc.setns(fd, CLONE_NEWNET) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+@contextlib.contextmanager
+def _in_namespace(namespace):
+    """Move the process to a network namespace for the enclosed block.
+
+    The whole process is moved, not only the current greenthread, so the
+    enclosed block must not yield to other greenthreads.
+    """
+    own_ns = os.open('/proc/self/ns/net', os.O_RDONLY)
+    try:
+        target_ns = os.open(os.path.join(NETNS_RUN_DIR, namespace),
+                            os.O_RDONLY)
+        try:
+            _setns(target_ns)
+        finally:
+            os.close(target_ns)
+        try:
+            yield
+        finally:
+            _setns(own_ns)
+    finally:
+        os.close(own_ns)
+
+
+_NamespaceServer = collections.namedtuple(
+    '_NamespaceServer', ['registration', 'socket', 'thread'])
+_FailedRegistration = collections.namedtuple(
+    '_FailedRegistration', ['registration', 'failures', 'retry_at'])
+
+
+class SharedProxyDaemon(daemon.Daemon):
+    """Proxy metadata requests for all the registered namespaces.
+
+    A listening socket is opened inside every namespace described in the
+    registry directory and all of them are served by the greenthreads of this
+    single process. Registrations are reloaded on SIGHUP. The registrations
+    which cannot be served are retried with an exponential backoff.
+    """
+
+    def __init__(self, pidfile, registry_dir, watch_log=True):
+        super(SharedProxyDaemon, self).__init__(pidfile, watch_log=watch_log)
+        self.registry_dir = registry_dir
+        self._pool = eventlet.GreenPool()
+        self._servers = {}
+        self._failed = {}
+        self._sync_requested = True
+
+    def handle_sighup(self, signum, frame):
+        self._sync_requested = True
+
+    def sync(self):
+        registrations = proxy_registry.load(self.registry_dir)
+        for uuid in set(self._servers) - set(registrations):
+            self._stop_server(uuid)
+        for uuid in set(self._failed) - set(registrations):
+            del self._failed[uuid]
+
+        now = time.time()
+        for uuid, registration in registrations.items():
+            server = self._servers.get(uuid)
+            if server:
+                if server.registration == registration:
+                    continue
+                self._stop_server(uuid)
+            failed = self._failed.get(uuid)
+            if failed and failed.registration != registration:
+                # The registration changed, retry it right away
+                del self._failed[uuid]
+                failed = None
+            if failed and failed.retry_at > now:
+                self._sync_requested = True
+                continue
+            try:
+                self._start_server(uuid, registration)
+            except Exception as e:
+                self._handle_failure(uuid, registration, failed, now, e)
+            else:
+                self._failed.pop(uuid, None)
+
+    def _handle_failure(self, uuid, registration, failed, now, error):
+        failures = failed.failures + 1 if failed else 1
+        delay = min(SHARED_PROXY_SYNC_INTERVAL * 2 ** (failures - 1),
+                    SHARED_PROXY_MAX_RETRY_INTERVAL)
+        if failures == 1:
+            LOG.exception(_LE("Unable to start metadata proxy for %(uuid)s, "
+                              "will retry in %(delay)d seconds"),
+                          {'uuid': uuid, 'delay': delay})
+        else:
+            LOG.warning(_LW("Unable to start metadata proxy for %(uuid)s "
+                            "after %(failures)d attempts: %(error)s, will "
+                            "retry in %(delay)d seconds"),
+                        {'uuid': uuid, 'failures': failures, 'error': error,
+                         'delay': delay})
+        self._failed[uuid] = _FailedRegistration(registration, failures,
+                                                 now + delay)
+        self._sync_requested = True
+
+    def _start_server(self, uuid, registration):
+        handler = NetworkMetadataProxyHandler(
+            network_id=registration['network_id'],
+            router_id=registration['router_id'])
+        # eventlet.listen does not yield, so no other greenthread runs while
+        # the process is inside the namespace.
+        with _in_namespace(registration['namespace']):
+            sock = eventlet.listen(('0.0.0.0', registration['port']),
+                                   backlog=cfg.CONF.backlog)
+        thread = self._pool.spawn(eventlet.wsgi.server, sock, handler,
+                                  log=LOG,
+                                  keepalive=cfg.CONF.wsgi_keep_alive,
+                                  socket_timeout=(
+                                      cfg.CONF.client_socket_timeout or None))
+        self._servers[uuid] = _NamespaceServer(registration, sock, thread)
+        LOG.info(_LI("Serving metadata for %(uuid)s in namespace %(ns)s"),
+                 {'uuid': uuid, 'ns': registration['namespace']})
+
+    def _stop_server(self, uuid):
+        server = self._servers.pop(uuid)
+        server.thread.kill()
+        server.socket.close()
+        LOG.info(_LI("Stopped serving metadata for %s"), uuid)
+
+    def run(self):
+        super(SharedProxyDaemon, self).run()
+        signal.signal(signal.SIGHUP, self.handle_sighup)
+        while True:
+            if self._sync_requested:
+                self._sync_requested = False
+                self.sync()
+            eventlet.sleep(SHARED_PROXY_SYNC_INTERVAL)
+
+
 def main():
     opts = [
         cfg.StrOpt('network_id',
@@ -144,6 +304,11 @@ def main():
         cfg.StrOpt('router_id',
                    help=_('Router that will have connected instances\' '
                           'metadata proxied.')),
+        cfg.StrOpt('registry_dir',
+                   help=_('Directory of namespace registrations. When set, '
+                          'a single process proxies metadata for all the '
+                          'registered namespaces and network_id/router_id '
+                          'are ignored.')),
         cfg.StrOpt('pid_file',
                    help=_('Location of pid file of this process.')),
         cfg.BoolOpt('daemonize',
@@ -176,13 +341,19 @@ def main():
     config.setup_logging()
     utils.log_opt_values(LOG)
 
-    proxy = ProxyDaemon(cfg.CONF.pid_file,
-                        cfg.CONF.metadata_port,
-                        network_id=cfg.CONF.network_id,
-                        router_id=cfg.CONF.router_id,
-                        user=cfg.CONF.metadata_proxy_user,
-                        group=cfg.CONF.metadata_proxy_group,
-                        watch_log=cfg.CONF.metadata_proxy_watch_log)
+    if cfg.CONF.registry_dir:
+        proxy = SharedProxyDaemon(
+            cfg.CONF.pid_file,
+            cfg.CONF.registry_dir,
+            watch_log=cfg.CONF.metadata_proxy_watch_log)
+    else:
+        proxy = ProxyDaemon(cfg.CONF.pid_file,
+                            cfg.CONF.metadata_port,
+                            network_id=cfg.CONF.network_id,
+                            router_id=cfg.CONF.router_id,
+                            user=cfg.CONF.metadata_proxy_user,
+                            group=cfg.CONF.metadata_proxy_group,
+                            watch_log=cfg.CONF.metadata_proxy_watch_log)
 
     if cfg.CONF.daemonize:
         proxy.start()
@@ -0,0 +1,74 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Namespace registrations served by a shared metadata proxy.
+
+Agents running in 'shared' metadata proxy mode describe every namespace which
+needs a metadata proxy with one small JSON file in a registry directory. The
+shared proxy process reads the whole directory when it starts and again each
+time it receives SIGHUP, so registrations survive a respawn of the proxy.
+"""
+
+import os
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import fileutils
+from oslo_utils import uuidutils
+
+from neutron._i18n import _LW
+from neutron.common import utils as common_utils
+
+LOG = logging.getLogger(__name__)
+
+REGISTRY_DIR_NAME = 'metadata-proxy'
+
+
+def get_registry_dir(state_path, resource_type):
+    return os.path.join(state_path, REGISTRY_DIR_NAME, resource_type)
+
+
+def register(registry_dir, uuid, namespace, port, network_id=None,
+             router_id=None):
+    registration = {'namespace': namespace,
+                    'port': port,
+                    'network_id': network_id,
+                    'router_id': router_id}
+    common_utils.ensure_dir(registry_dir)
+    common_utils.replace_file(os.path.join(registry_dir, uuid),
+                              jsonutils.dumps(registration))
+
+
+def unregister(registry_dir, uuid):
+    fileutils.delete_if_exists(os.path.join(registry_dir, uuid))
+
+
+def load(registry_dir):
+    """Return a dict of registrations keyed by router or network id."""
+    registrations = {}
+    try:
+        uuids = os.listdir(registry_dir)
+    except OSError:
+        return registrations
+    for uuid in uuids:
+        if not uuidutils.is_uuid_like(uuid):
+            # Skip temporary files left by an in-progress replace_file
+            continue
+        try:
+            with open(os.path.join(registry_dir, uuid)) as f:
+                registrations[uuid] = jsonutils.loads(f.read())
+        except (IOError, ValueError):
+            # The file may be removed or replaced while we read it, the
+            # agent will signal us again in that case.
+            LOG.warning(_LW("Unable to read metadata proxy registration "
+                            "%s"), uuid)
+    return registrations
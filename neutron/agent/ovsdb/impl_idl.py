@@ -190,9 +190,9 @@ class NeutronOVSDBTransaction(Transaction):
 
 class OvsdbIdl(api.API):
 
-    ovsdb_connection = connection.Connection(cfg.CONF.OVS.ovsdb_connection,
-                                             cfg.CONF.ovs_vsctl_timeout,
-                                             'Open_vSwitch')
+    ovsdb_connection = connection.Connection(
+        cfg.CONF.OVS.ovsdb_connection, cfg.CONF.ovs_vsctl_timeout,
+        'Open_vSwitch', idl_class=connection.RowEventIdl)
 
     def __init__(self, context):
         super(OvsdbIdl, self).__init__(context)
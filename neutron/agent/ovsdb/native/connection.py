@@ -52,6 +52,29 @@ class TransactionQueue(Queue.Queue, object):
         return self.alertin.fileno()
 
 
+class RowEventIdl(idl.Idl):
+    """An Idl calling the registered handlers on each change of a row.
+
+    The handlers are called from the thread running the connection with the
+    event (idl.ROW_CREATE, idl.ROW_UPDATE or idl.ROW_DELETE), the row and,
+    on updates, a row holding the previous values of the changed columns.
+    """
+
+    def __init__(self, remote, schema_helper):
+        super(RowEventIdl, self).__init__(remote, schema_helper)
+        self._row_event_handlers = set()
+
+    def register_row_event_handler(self, handler):
+        self._row_event_handlers.add(handler)
+
+    def unregister_row_event_handler(self, handler):
+        self._row_event_handlers.discard(handler)
+
+    def notify(self, event, row, updates=None):
+        for handler in list(self._row_event_handlers):
+            handler(event, row, updates)
+
+
 class Connection(object):
     def __init__(self, connection, timeout, schema_name, idl_class=None):
         self.idl = None
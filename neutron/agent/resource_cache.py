@@ -0,0 +1,189 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+
+from oslo_log import log as logging
+
+from neutron.api.rpc.callbacks.consumer import registry as cons_registry
+from neutron.api.rpc.callbacks import events as rpc_events
+from neutron.api.rpc.callbacks import resources
+from neutron.api.rpc.handlers import resources_rpc
+from neutron.callbacks import events
+from neutron.callbacks import registry
+from neutron import context as n_ctx
+
+LOG = logging.getLogger(__name__)
+
+
+class RemoteResourceCache(object):
+    """Agent-side cache of the versioned objects of the server.
+
+    The cache is filled by the objects pushed by the server and by the
+    objects pulled from it when a lookup misses. Objects are stored by type
+    and ID, and can also be indexed by some of their fields, e.g. the ports
+    by network_id, so that the agents can answer their common questions
+    without a round-trip to the server.
+
+    Each change of a cached object is notified locally through the callbacks
+    registry, with the resource type as resource and AFTER_UPDATE or
+    AFTER_DELETE as event.
+    """
+
+    def __init__(self, resource_types, indexes=None):
+        """
+        :param resource_types: the versioned object types to cache.
+        :param indexes: a dict of the fields to index, by resource type.
+        """
+        indexes = indexes or {}
+        self.resource_types = resource_types
+        self._cache_by_type_and_id = {rtype: {} for rtype in resource_types}
+        self._index_by_type = {
+            rtype: {field: collections.defaultdict(set)
+                    for field in indexes.get(rtype, ())}
+            for rtype in resource_types}
+        self._deleted_ids_by_type = {rtype: set()
+                                     for rtype in resource_types}
+        self._puller = resources_rpc.ResourcesPullRpcApi()
+        self.stats = collections.Counter()
+
+    def start_watcher(self, connection):
+        """Subscribe the cache to the server pushes of its resource types."""
+        endpoints = [resources_rpc.ResourcesPushRpcCallback()]
+        for rtype in self.resource_types:
+            cons_registry.subscribe(self._handle_push, rtype)
+            topic = resources_rpc.resource_type_versioned_topic(rtype)
+            connection.create_consumer(topic, endpoints, fanout=True)
+
+    def _handle_push(self, resource_list, event_type):
+        context = n_ctx.get_admin_context_without_session()
+        for resource in resource_list:
+            rtype = resources.get_resource_type(resource)
+            if event_type == rpc_events.DELETED:
+                self.record_resource_delete(context, rtype, resource.id)
+            else:
+                self.record_resource_update(context, rtype, resource)
+
+    def get_resource_by_id(self, rtype, obj_id):
+        """Return the object, pulling it on a cache miss, or None."""
+        cached = self._cache_by_type_and_id[rtype].get(obj_id)
+        if cached is not None:
+            self.stats['hits'] += 1
+            return cached
+        if obj_id in self._deleted_ids_by_type[rtype]:
+            self.stats['hits'] += 1
+            return
+        self.stats['misses'] += 1
+        context = n_ctx.get_admin_context_without_session()
+        try:
+            resource = self._puller.pull(context, rtype, obj_id)
+        except resources_rpc.ResourceNotFound:
+            return
+        self.record_resource_update(context, rtype, resource)
+        return self._cache_by_type_and_id[rtype].get(obj_id)
+
+    def load_resources(self, rtype, filters=None):
+        """Fill the cache with the objects matching filters in one call.
+
+        Agents call it when they start, to warm the cache with the objects
+        they are about to look up.
+        """
+        context = n_ctx.get_admin_context_without_session()
+        resource_list = self._puller.bulk_pull(context, rtype,
+                                               filter_kwargs=filters)
+        for resource in resource_list:
+            self.record_resource_update(context, rtype, resource)
+        LOG.debug("Loaded %(count)d %(rtype)s objects matching %(filters)s",
+                  {'count': len(resource_list), 'rtype': rtype,
+                   'filters': filters})
+
+    def get_resources(self, rtype, filters):
+        """Return the cached objects matching all the filters.
+
+        :param filters: a dict of lists of accepted values, by field name.
+        """
+        self.stats['queries'] += 1
+        candidates = None
+        indexes = self._index_by_type[rtype]
+        for field, values in filters.items():
+            if field in indexes:
+                candidates = set()
+                for value in values:
+                    candidates |= indexes[field].get(value, set())
+                break
+        cache = self._cache_by_type_and_id[rtype]
+        objs = (cache.values() if candidates is None else
+                (cache[obj_id] for obj_id in candidates))
+        return [obj for obj in objs if self._matches(obj, filters)]
+
+    def match_resources_with_func(self, rtype, matcher):
+        """Return the cached objects for which matcher returns True."""
+        self.stats['queries'] += 1
+        return [obj for obj in self._cache_by_type_and_id[rtype].values()
+                if matcher(obj)]
+
+    @staticmethod
+    def _field_values(obj, field):
+        if not obj.obj_attr_is_set(field):
+            return ()
+        value = getattr(obj, field)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return value
+        return (value,)
+
+    def _matches(self, obj, filters):
+        return all(set(self._field_values(obj, field)) & set(values)
+                   for field, values in filters.items())
+
+    def _is_stale(self, rtype, resource):
+        existing = self._cache_by_type_and_id[rtype].get(resource.id)
+        if existing is None:
+            return False
+        if not (existing.obj_attr_is_set('revision_number') and
+                resource.obj_attr_is_set('revision_number')):
+            return False
+        return existing.revision_number > resource.revision_number
+
+    def _update_indexes(self, rtype, obj, add):
+        for field, index in self._index_by_type[rtype].items():
+            for value in self._field_values(obj, field):
+                if add:
+                    index[value].add(obj.id)
+                else:
+                    index[value].discard(obj.id)
+                    if not index[value]:
+                        del index[value]
+
+    def record_resource_update(self, context, rtype, resource):
+        """Store the object, unless a newer revision is already cached."""
+        if self._is_stale(rtype, resource):
+            LOG.debug("Ignoring stale update of %(rtype)s %(id)s",
+                      {'rtype': rtype, 'id': resource.id})
+            return
+        existing = self._cache_by_type_and_id[rtype].get(resource.id)
+        if existing is not None:
+            self._update_indexes(rtype, existing, add=False)
+        self._deleted_ids_by_type[rtype].discard(resource.id)
+        self._cache_by_type_and_id[rtype][resource.id] = resource
+        self._update_indexes(rtype, resource, add=True)
+        registry.notify(rtype, events.AFTER_UPDATE, self, context=context,
+                        resource_id=resource.id, existing=existing,
+                        updated=resource)
+
+    def record_resource_delete(self, context, rtype, resource_id):
+        """Drop the object and remember it is gone."""
+        existing = self._cache_by_type_and_id[rtype].pop(resource_id, None)
+        if existing is not None:
+            self._update_indexes(rtype, existing, add=False)
+        self._deleted_ids_by_type[rtype].add(resource_id)
+        registry.notify(rtype, events.AFTER_DELETE, self, context=context,
+                        resource_id=resource_id, existing=existing)
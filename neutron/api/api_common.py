@@ -27,6 +27,7 @@ from webob import exc
 
 from neutron._i18n import _, _LW
 from neutron.common import constants
+from neutron.db import _utils as ndb_utils
 from neutron import wsgi
 
 
@@ -64,21 +65,29 @@ def get_filters_from_dict(data, attr_info, skips=None):
     return res
 
 
-def get_previous_link(request, items, id_key):
+def _get_marker(item, id_key, sort_keys):
+    if sort_keys:
+        marker = ndb_utils.encode_keyset_marker(item, sort_keys)
+        if marker:
+            return marker
+    return item[id_key]
+
+
+def get_previous_link(request, items, id_key, sort_keys=None):
     params = request.GET.copy()
     params.pop('marker', None)
     if items:
-        marker = items[0][id_key]
+        marker = _get_marker(items[0], id_key, sort_keys)
         params['marker'] = marker
     params['page_reverse'] = True
     return "%s?%s" % (request.path_url, parse.urlencode(params))
 
 
-def get_next_link(request, items, id_key):
+def get_next_link(request, items, id_key, sort_keys=None):
     params = request.GET.copy()
     params.pop('marker', None)
     if items:
-        marker = items[-1][id_key]
+        marker = _get_marker(items[-1], id_key, sort_keys)
         params['marker'] = marker
     params.pop('page_reverse', None)
     return "%s?%s" % (request.path_url, parse.urlencode(params))
@@ -168,7 +177,12 @@ def get_page_reverse(request):
 
 
 def get_pagination_links(request, items, limit,
-                         marker, page_reverse, key="id"):
+                         marker, page_reverse, key="id", sort_keys=None):
+    """Return the links to the pages around items.
+
+    When sort_keys are given, the markers of the links carry the values of
+    the sort keys of the items, see neutron.db._utils.KeysetMarker.
+    """
     key = key if key else 'id'
     links = []
     if not limit:
@@ -176,11 +190,11 @@ def get_pagination_links(request, items, limit,
     if not (len(items) < limit and not page_reverse):
         links.append({"rel": "next",
                       "href": get_next_link(request, items,
-                                            key)})
+                                            key, sort_keys)})
     if not (len(items) < limit and page_reverse):
         links.append({"rel": "previous",
                       "href": get_previous_link(request, items,
-                                                key)})
+                                                key, sort_keys)})
     return links
 
 
@@ -266,15 +280,34 @@ class PaginationEmulatedHelper(PaginationHelper):
 
 class PaginationNativeHelper(PaginationEmulatedHelper):
 
+    def __init__(self, request, primary_key='id'):
+        super(PaginationNativeHelper, self).__init__(request, primary_key)
+        self.sort_keys = [primary_key]
+
     def update_args(self, args):
         if self.primary_key not in dict(args.get('sorts', [])).keys():
             args.setdefault('sorts', []).append((self.primary_key, True))
         args.update({'limit': self.limit, 'marker': self.marker,
                      'page_reverse': self.page_reverse})
+        self.sort_keys = [key for key, direction in args['sorts']]
+
+    def update_fields(self, original_fields, fields_to_add):
+        # The sort key values of the items make the markers of the links
+        if not original_fields:
+            return
+        for key in self.sort_keys:
+            if key not in original_fields:
+                original_fields.append(key)
+                fields_to_add.append(key)
 
     def paginate(self, items):
         return items
 
+    def get_links(self, items):
+        return get_pagination_links(
+            self.request, items, self.limit, self.marker,
+            self.page_reverse, self.primary_key, self.sort_keys)
+
 
 class NoPaginationHelper(PaginationHelper):
     pass
@@ -342,6 +375,32 @@ class NoSortingHelper(SortingHelper):
     pass
 
 
+def can_stream_collection(pagination_helper, sorting_helper):
+    """Whether the response listing a collection may be streamed.
+
+    The links of a page are built from all its items, and emulated sorting
+    needs all the items too.
+    """
+    return (cfg.CONF.stream_collection_responses and
+            not getattr(pagination_helper, 'limit', None) and
+            not isinstance(sorting_helper, SortingEmulatedHelper))
+
+
+class CollectionStream(object):
+    """The items of a collection, built as the response is serialized.
+
+    Controllers return it in place of the collection dict when the response
+    is streamed, see can_stream_collection.
+    """
+
+    def __init__(self, collection, items):
+        self.collection = collection
+        self.items = items
+
+    def to_dict(self):
+        return {self.collection: list(self.items)}
+
+
 def convert_exception_to_http_exc(e, faults, language):
     serializer = wsgi.JSONDictSerializer()
     if isinstance(e, exceptions.MultipleExceptions):
@@ -27,6 +27,7 @@ import webob.dec
 import webob.exc
 
 from neutron._i18n import _, _LE, _LI, _LW
+from neutron.api.v2 import attributes
 from neutron.common import exceptions
 import neutron.extensions
 from neutron import manager
@@ -531,6 +532,7 @@ class ExtensionManager(object):
         # Extending extensions' attributes map.
         for ext in processed_exts.values():
             ext.update_attributes_map(attr_map)
+        attributes.build_request_body_plans(attr_map)
 
     def _check_faulty_extensions(self, faulty_extensions):
         """Raise for non-default faulty extensions.
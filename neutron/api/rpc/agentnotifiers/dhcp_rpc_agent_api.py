@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
 from neutron_lib import constants
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -149,6 +151,14 @@ class DhcpAgentNotifyAPI(object):
 
     def _notify_agents(self, context, method, payload, network_id):
         """Notify all the agents that are hosting the network."""
+        self._notify_agents_bulk(context, method, [payload], network_id)
+
+    def _notify_agents_bulk(self, context, method, payloads, network_id):
+        """Send each payload to all the agents that are hosting the network.
+
+        The agents are looked up, and the network scheduled, once for all
+        the payloads, which are only grouped for ports.
+        """
         # fanout is required as we do not know who is "listening"
         no_agents = not utils.is_extension_supported(
             self.plugin, constants.DHCP_AGENT_SCHEDULER_EXT_ALIAS)
@@ -159,10 +169,12 @@ class DhcpAgentNotifyAPI(object):
         cast_required = method != 'network_create_end'
 
         if fanout_required:
-            self._fanout_message(context, method, payload)
+            for payload in payloads:
+                self._fanout_message(context, method, payload)
         elif cast_required:
             admin_ctx = (context if context.is_admin else context.elevated())
             network = self.plugin.get_network(admin_ctx, network_id)
+            payload = payloads[0]
             if 'subnet' in payload and payload['subnet'].get('segment_id'):
                 # if segment_id exists then the segment service plugin
                 # must be loaded
@@ -178,7 +190,8 @@ class DhcpAgentNotifyAPI(object):
             schedule_required = (
                 method == 'subnet_create_end' or
                 method == 'port_create_end' and
-                not self._is_reserved_dhcp_port(payload['port']))
+                not all(self._is_reserved_dhcp_port(payload['port'])
+                        for payload in payloads))
             if schedule_required:
                 agents = self._schedule_network(admin_ctx, network, agents)
             if not agents:
@@ -186,10 +199,12 @@ class DhcpAgentNotifyAPI(object):
                           network_id)
                 return
             enabled_agents = self._get_enabled_agents(
-                context, network, agents, method, payload)
+                context, network, agents, method,
+                payload if len(payloads) == 1 else payloads)
             for agent in enabled_agents:
-                self._cast_message(
-                    context, method, payload, agent.host, agent.topic)
+                for payload in payloads:
+                    self._cast_message(
+                        context, method, payload, agent.host, agent.topic)
 
     def _cast_message(self, context, method, payload, host,
                       topic=topics.DHCP_AGENT):
@@ -226,6 +241,28 @@ class DhcpAgentNotifyAPI(object):
                             {'port_id': kwargs['port']['id']},
                             kwargs['port']['network_id'])
 
+    def notify_bulk(self, context, resource, bodies, method_name):
+        """Notify the agents of the changes of several items at once.
+
+        The bodies of ports are grouped by network, so that the agents of
+        each network are looked up once. The agents are still sent one
+        message per port.
+        """
+        if (resource != 'port' or method_name.endswith('.delete.end') or
+                method_name not in self.VALID_METHOD_NAMES):
+            for body in bodies:
+                self.notify(context, {resource: body}, method_name)
+            return
+        payloads_by_network = collections.OrderedDict()
+        for body in bodies:
+            if body.get('network_id'):
+                payloads_by_network.setdefault(body['network_id'], []).append(
+                    {resource: body})
+        method_name = method_name.replace(".", "_")
+        for network_id, payloads in payloads_by_network.items():
+            self._notify_agents_bulk(context, method_name, payloads,
+                                     network_id)
+
     def _native_event_send_dhcp_notification(self, resource, event, trigger,
                                              context, **kwargs):
         action = event.replace('after_', '')
@@ -252,9 +289,7 @@ class DhcpAgentNotifyAPI(object):
                 self.uses_native_notifications[resource][action]):
             return
         if collection and collection in data:
-            for body in data[collection]:
-                item = {resource: body}
-                self.notify(context, item, method_name)
+            self.notify_bulk(context, resource, data[collection], method_name)
         else:
             self.notify(context, data, method_name)
 
@@ -35,11 +35,32 @@ def unprovide(callback, resource_type):
     _get_manager().unregister(callback, resource_type)
 
 
+def provide_bulk(callback, resource_type):
+    """Register a callback as a bulk producer for the resource type.
+
+    This callback will be used to produce all the resources of corresponding
+    type matching some filters.
+    """
+    _get_manager().register_bulk(callback, resource_type)
+
+
+def unprovide_bulk(callback, resource_type):
+    """Unregister a bulk callback for corresponding resource type."""
+    _get_manager().unregister_bulk(callback, resource_type)
+
+
 def clear():
     """Clear all callbacks."""
     _get_manager().clear()
 
 
+def _validate_object(resource_type, obj):
+    if (not isinstance(obj, base.NeutronObject) or
+        resource_type != obj.obj_name()):
+        raise exceptions.CallbackWrongResourceType(
+            resource_type=resource_type)
+
+
 def pull(resource_type, resource_id, **kwargs):
     """Get resource object that corresponds to resource id.
 
@@ -50,8 +71,20 @@ def pull(resource_type, resource_id, **kwargs):
     callback = _get_manager().get_callback(resource_type)
     obj = callback(resource_type, resource_id, **kwargs)
     if obj:
-        if (not isinstance(obj, base.NeutronObject) or
-            resource_type != obj.obj_name()):
-            raise exceptions.CallbackWrongResourceType(
-                resource_type=resource_type)
+        _validate_object(resource_type, obj)
     return obj
+
+
+def bulk_pull(resource_type, filters, **kwargs):
+    """Get the resource objects matching filters.
+
+    The function will return the objects provided by the bulk producer of
+    the resource type.
+
+    :returns: a list of NeutronObject
+    """
+    callback = _get_manager().get_bulk_callback(resource_type)
+    objs = callback(resource_type, filters, **kwargs)
+    for obj in objs:
+        _validate_object(resource_type, obj)
+    return objs
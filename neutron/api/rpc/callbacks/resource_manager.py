@@ -86,6 +86,7 @@ class ResourceCallbacksManager(object):
 class ProducerResourceCallbacksManager(ResourceCallbacksManager):
 
     _callbacks = dict()
+    _bulk_callbacks = dict()
 
     def _add_callback(self, callback, resource_type):
         if resource_type in self._callbacks:
@@ -98,8 +99,30 @@ class ProducerResourceCallbacksManager(ResourceCallbacksManager):
         except KeyError:
             raise rpc_exc.CallbackNotFound(resource_type=resource_type)
 
+    def register_bulk(self, callback, resource_type):
+        """Register a callback producing the resources matching filters.
+
+        :param callback: the callback. It must raise or return a list of
+                         NeutronObject.
+        :param resource_type: must be a valid resource type.
+        """
+        LOG.debug("Registering bulk callback for %s", resource_type)
+        _validate_resource_type(resource_type)
+        if resource_type in self._bulk_callbacks:
+            raise rpc_exc.CallbacksMaxLimitReached(resource_type=resource_type)
+        self._bulk_callbacks[resource_type] = callback
+
+    def unregister_bulk(self, callback, resource_type):
+        LOG.debug("Unregistering bulk callback for %s", resource_type)
+        _validate_resource_type(resource_type)
+        try:
+            del self._bulk_callbacks[resource_type]
+        except KeyError:
+            raise rpc_exc.CallbackNotFound(resource_type=resource_type)
+
     def clear(self):
         self._callbacks = dict()
+        self._bulk_callbacks = dict()
 
     def get_callback(self, resource_type):
         _validate_resource_type(resource_type)
@@ -108,6 +131,13 @@ class ProducerResourceCallbacksManager(ResourceCallbacksManager):
         except KeyError:
             raise rpc_exc.CallbackNotFound(resource_type=resource_type)
 
+    def get_bulk_callback(self, resource_type):
+        _validate_resource_type(resource_type)
+        try:
+            return self._bulk_callbacks[resource_type]
+        except KeyError:
+            raise rpc_exc.CallbackNotFound(resource_type=resource_type)
+
 
 class ConsumerResourceCallbacksManager(ResourceCallbacksManager):
 
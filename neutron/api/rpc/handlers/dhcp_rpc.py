@@ -30,6 +30,7 @@ from neutron.callbacks import resources
 from neutron.common import constants as n_const
 from neutron.common import exceptions as n_exc
 from neutron.common import utils
+from neutron.db import _utils as ndb_utils
 from neutron.db import api as db_api
 from neutron.db import provisioning_blocks
 from neutron.extensions import portbindings
@@ -71,10 +72,12 @@ class DhcpRpcCallback(object):
     #     1.6 - Removed get_active_networks. It's not used by reference
     #           DHCP agent since Havana, so similar rationale for not bumping
     #           the major version as above applies here too.
+    #     1.7 - Added revisions to get_network_info.
+    #     1.8 - Added marker and limit to get_active_networks_info.
 
     target = oslo_messaging.Target(
         namespace=n_const.RPC_NAMESPACE_DHCP_PLUGIN,
-        version='1.6')
+        version='1.8')
 
     def _get_active_networks(self, context, **kwargs):
         """Retrieve and return a list of the active networks."""
@@ -82,13 +85,28 @@ class DhcpRpcCallback(object):
         plugin = manager.NeutronManager.get_plugin()
         if utils.is_extension_supported(
             plugin, constants.DHCP_AGENT_SCHEDULER_EXT_ALIAS):
-            if cfg.CONF.network_auto_schedule:
+            # Networks are only scheduled once when they are fetched in
+            # several chunks, at the first one.
+            if (cfg.CONF.network_auto_schedule and
+                    kwargs.get('marker') is None):
                 plugin.auto_schedule_networks(context, host)
             nets = plugin.list_active_networks_on_active_dhcp_agent(
-                context, host)
+                context, host, marker=kwargs.get('marker'),
+                limit=kwargs.get('limit'))
         else:
             filters = dict(admin_state_up=[True])
-            nets = plugin.get_networks(context, filters=filters)
+            limit = kwargs.get('limit')
+            if limit:
+                marker = kwargs.get('marker')
+                # A keyset marker does not require the marker network to
+                # still exist
+                nets = plugin.get_networks(
+                    context, filters=filters, sorts=[('id', True)],
+                    limit=limit,
+                    marker=marker and ndb_utils.encode_keyset_marker(
+                        {'id': marker}, ['id']))
+            else:
+                nets = plugin.get_networks(context, filters=filters)
         return nets
 
     def _port_action(self, plugin, context, port, action):
@@ -136,10 +154,20 @@ class DhcpRpcCallback(object):
         return grouped
 
     def get_active_networks_info(self, context, **kwargs):
-        """Returns all the networks/subnets/ports in system."""
+        """Returns all the networks/subnets/ports in system.
+
+        If 'limit' is passed, at most that many networks sorted by ID are
+        returned, starting after the network ID passed in 'marker'.
+        """
         host = kwargs.get('host')
-        LOG.debug('get_active_networks_info from %s', host)
+        marker = kwargs.get('marker')
+        limit = kwargs.get('limit')
+        LOG.debug('get_active_networks_info from %(host)s, marker: '
+                  '%(marker)s, limit: %(limit)s',
+                  {'host': host, 'marker': marker, 'limit': limit})
         networks = self._get_active_networks(context, **kwargs)
+        if not networks:
+            return []
         plugin = manager.NeutronManager.get_plugin()
         filters = {'network_id': [network['id'] for network in networks]}
         ports = plugin.get_ports(context, filters=filters)
@@ -182,10 +210,34 @@ class DhcpRpcCallback(object):
 
         return networks
 
+    @staticmethod
+    def _get_revision_delta(resources, known_revisions):
+        """Compare resources with the revision numbers known to the agent.
+
+        Return the IDs of the resources the agent does not know about or has
+        a different revision of, and the IDs of the resources known to the
+        agent which no longer exist. Resources without a revision number are
+        always considered changed.
+        """
+        changed_ids = [r['id'] for r in resources
+                       if r.get('revision_number') is None or
+                       known_revisions.get(r['id']) != r['revision_number']]
+        current_ids = {r['id'] for r in resources}
+        deleted_ids = [r_id for r_id in known_revisions
+                       if r_id not in current_ids]
+        return changed_ids, deleted_ids
+
     def get_network_info(self, context, **kwargs):
-        """Retrieve and return extended information about a network."""
+        """Retrieve and return extended information about a network.
+
+        If the agent passes the revision numbers of the subnets and ports it
+        already has in 'revisions', only the subnets and ports which changed
+        are returned, together with the IDs of the deleted ones in
+        'deleted_subnets' and 'deleted_ports'.
+        """
         network_id = kwargs.get('network_id')
         host = kwargs.get('host')
+        revisions = kwargs.get('revisions')
         LOG.debug('Network %(network_id)s requested from '
                   '%(host)s', {'network_id': network_id,
                                'host': host})
@@ -217,8 +269,29 @@ class DhcpRpcCallback(object):
         # NOTE(kevinbenton): we sort these because the agent builds tags
         # based on position in the list and has to restart the process if
         # the order changes.
-        network['subnets'] = sorted(subnets, key=operator.itemgetter('id'))
-        network['ports'] = plugin.get_ports(context, filters=filters)
+        subnets = sorted(subnets, key=operator.itemgetter('id'))
+        if revisions is None:
+            network['subnets'] = subnets
+            network['ports'] = plugin.get_ports(context, filters=filters)
+            return network
+
+        changed_ids, network['deleted_subnets'] = self._get_revision_delta(
+            subnets, revisions.get('subnets', {}))
+        network['subnets'] = [s for s in subnets if s['id'] in changed_ids]
+        # Only load the revision numbers of all the ports of the network, the
+        # full port dicts are built just for the ports which changed.
+        port_revisions = plugin.get_ports(
+            context, filters=filters, fields=['id', 'revision_number'])
+        changed_ids, network['deleted_ports'] = self._get_revision_delta(
+            port_revisions, revisions.get('ports', {}))
+        network['ports'] = (
+            plugin.get_ports(context, filters={'id': changed_ids})
+            if changed_ids else [])
+        LOG.debug('Returning %(subnets)d changed subnets and %(ports)d '
+                  'changed ports of network %(network_id)s to %(host)s',
+                  {'subnets': len(network['subnets']),
+                   'ports': len(network['ports']),
+                   'network_id': network_id, 'host': host})
         return network
 
     @db_api.retry_db_errors
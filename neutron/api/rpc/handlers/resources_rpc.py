@@ -15,12 +15,16 @@
 
 import collections
 
+import eventlet
 from neutron_lib import exceptions
+from oslo_config import cfg
 from oslo_log import helpers as log_helpers
+from oslo_log import log as logging
 import oslo_messaging
 
-from neutron._i18n import _
+from neutron._i18n import _, _LE, _LI
 from neutron.api.rpc.callbacks.consumer import registry as cons_registry
+from neutron.api.rpc.callbacks import events as rpc_events
 from neutron.api.rpc.callbacks import exceptions as rpc_exc
 from neutron.api.rpc.callbacks.producer import registry as prod_registry
 from neutron.api.rpc.callbacks import resources
@@ -30,6 +34,8 @@ from neutron.common import rpc as n_rpc
 from neutron.common import topics
 from neutron.objects import base as obj_base
 
+LOG = logging.getLogger(__name__)
+
 
 class ResourcesRpcError(exceptions.NeutronException):
     pass
@@ -44,6 +50,11 @@ class ResourceNotFound(ResourcesRpcError):
                 "not found")
 
 
+class BulkPullNotSupported(ResourcesRpcError):
+    message = _("The server does not support pulling the %(resource_type)s "
+                "resources in bulk")
+
+
 def _validate_resource_type(resource_type):
     if not resources.is_valid_resource_type(resource_type):
         raise InvalidResourceTypeClass(resource_type=resource_type)
@@ -77,6 +88,9 @@ class ResourcesPullRpcApi(object):
                 topic=topics.PLUGIN, version='1.0',
                 namespace=constants.RPC_NAMESPACE_RESOURCES)
             cls._instance.client = n_rpc.get_client(target)
+            # Set once the server rejected a bulk_pull, the client has no
+            # version cap to tell it in advance
+            cls._instance._bulk_pull_unsupported = False
         return cls._instance
 
     @log_helpers.log_method_call
@@ -98,6 +112,40 @@ class ResourcesPullRpcApi(object):
 
         return resource_type_cls.clean_obj_from_primitive(primitive)
 
+    @log_helpers.log_method_call
+    def bulk_pull(self, context, resource_type, filter_kwargs=None):
+        """Pull all the resources of a type matching the filters.
+
+        The objects are returned in the version known to the agent, like for
+        pull. BulkPullNotSupported is raised if the server does not support
+        bulk_pull, callers may then fall back to pull. Once the server
+        rejected a bulk_pull, it is not sent again.
+        """
+        _validate_resource_type(resource_type)
+        if self._bulk_pull_unsupported:
+            raise BulkPullNotSupported(resource_type=resource_type)
+
+        resource_type_cls = resources.get_resource_cls(resource_type)
+
+        cctxt = self.client.prepare(version='1.1')
+        try:
+            primitives = cctxt.call(context, 'bulk_pull',
+                resource_type=resource_type,
+                version=resource_type_cls.VERSION,
+                filter_kwargs=filter_kwargs or {})
+        except (oslo_messaging.UnsupportedVersion,
+                oslo_messaging.RemoteError) as e:
+            if (isinstance(e, oslo_messaging.RemoteError) and
+                    e.exc_type != 'UnsupportedVersion'):
+                raise
+            LOG.info(_LI("The server does not support bulk_pull, the "
+                         "resources will be pulled one by one."))
+            self._bulk_pull_unsupported = True
+            raise BulkPullNotSupported(resource_type=resource_type)
+
+        return [resource_type_cls.clean_obj_from_primitive(primitive)
+                for primitive in primitives]
+
 
 class ResourcesPullRpcCallback(object):
     """Plugin-side RPC (implementation) for agent-to-plugin interaction.
@@ -109,9 +157,10 @@ class ResourcesPullRpcCallback(object):
 
     # History
     #   1.0 Initial version
+    #   1.1 Added bulk_pull
 
     target = oslo_messaging.Target(
-        version='1.0', namespace=constants.RPC_NAMESPACE_RESOURCES)
+        version='1.1', namespace=constants.RPC_NAMESPACE_RESOURCES)
 
     @oslo_messaging.expected_exceptions(rpc_exc.CallbackNotFound)
     def pull(self, context, resource_type, version, resource_id):
@@ -119,6 +168,12 @@ class ResourcesPullRpcCallback(object):
         if obj:
             return obj.obj_to_primitive(target_version=version)
 
+    @oslo_messaging.expected_exceptions(rpc_exc.CallbackNotFound)
+    def bulk_pull(self, context, resource_type, version, filter_kwargs=None):
+        objs = prod_registry.bulk_pull(resource_type, filter_kwargs or {},
+                                       context=context)
+        return [obj.obj_to_primitive(target_version=version) for obj in objs]
+
 
 class ResourcesPushToServersRpcApi(object):
     """Publisher-side RPC (stub) for plugin-to-plugin fanout interaction.
@@ -175,12 +230,35 @@ class ResourcesPushRpcApi(object):
 
     This class implements the caller side of an rpc interface.  The receiver
     side can be found below: ResourcesPushRpcCallback.
+
+    The updates of the same object pushed within
+    resource_push_coalesce_interval are coalesced, so that only its latest
+    revision is fanned out. The primitives of the object types listed in
+    PRIMITIVE_CACHE_TYPES are kept in an LRU cache, so that the same revision
+    is only dehydrated once per target version however many times it is
+    pushed.
     """
 
+    # The object types whose revision is bumped on every change of the
+    # fields they carry, and which are pushed as loaded once the change is
+    # committed: the rules of a security group bump its revision, and rules
+    # can't be updated. The revision of the other types is not bumped by the
+    # changes of their bindings, segments, subports or RBAC entries, and QoS
+    # policies are pushed from within the transaction changing their rules.
+    PRIMITIVE_CACHE_TYPES = frozenset([resources.SECURITYGROUP,
+                                       resources.SECURITYGROUPRULE])
+
+    # Number of primitives kept in the cache, by (object type, id, revision,
+    # target version)
+    PRIMITIVE_CACHE_SIZE = 1024
+
     def __init__(self):
         target = oslo_messaging.Target(
             namespace=constants.RPC_NAMESPACE_RESOURCES)
         self.client = n_rpc.get_client(target)
+        self._primitive_cache = collections.OrderedDict()
+        self._pending_updates = collections.OrderedDict()
+        self._flush_thread = None
 
     def _prepare_object_fanout_context(self, obj, resource_version,
                                        rpc_version):
@@ -206,10 +284,75 @@ class ResourcesPushRpcApi(object):
         resource type.
         """
 
+        coalesce = (event_type == rpc_events.UPDATED and
+                    cfg.CONF.resource_push_coalesce_interval > 0)
         resources_by_type = self._classify_resources_by_type(resource_list)
         for resource_type, type_resources in resources_by_type.items():
+            if coalesce:
+                self._queue_updates(context, resource_type, type_resources)
+                continue
+            # The event supersedes the pending updates of the same objects
+            for resource in type_resources:
+                self._pending_updates.pop((resource_type, resource.id), None)
             self._push(context, resource_type, type_resources, event_type)
 
+    @staticmethod
+    def _get_revision(resource):
+        if ('revision_number' in resource.fields and
+                resource.obj_attr_is_set('revision_number')):
+            return resource.revision_number
+
+    def _queue_updates(self, context, resource_type, resource_list):
+        for resource in resource_list:
+            key = (resource_type, resource.id)
+            pending = self._pending_updates.get(key)
+            if pending is not None:
+                pending_revision = self._get_revision(pending[1])
+                revision = self._get_revision(resource)
+                if (pending_revision is not None and revision is not None and
+                        pending_revision > revision):
+                    continue
+            self._pending_updates[key] = (context, resource)
+        if self._flush_thread is None:
+            self._flush_thread = eventlet.spawn_after(
+                cfg.CONF.resource_push_coalesce_interval,
+                self.flush_pending_updates)
+
+    def flush_pending_updates(self):
+        """Push the pending updates now, batched per type."""
+        if self._flush_thread is not None:
+            self._flush_thread.cancel()
+            self._flush_thread = None
+        pending, self._pending_updates = (self._pending_updates,
+                                          collections.OrderedDict())
+        updates_by_type = collections.OrderedDict()
+        for (resource_type, _id), (context, resource) in pending.items():
+            updates_by_type.setdefault(resource_type, (context, []))
+            updates_by_type[resource_type][1].append(resource)
+        for resource_type, (context, resource_list) in (
+                updates_by_type.items()):
+            try:
+                self._push(context, resource_type, resource_list,
+                           rpc_events.UPDATED)
+            except Exception:
+                LOG.exception(_LE("Failed to push the updates of %d "
+                                  "%s objects."),
+                              len(resource_list), resource_type)
+
+    def _get_primitive(self, resource_type, resource, version):
+        revision = self._get_revision(resource)
+        if (resource_type not in self.PRIMITIVE_CACHE_TYPES or
+                revision is None or resource.obj_what_changed()):
+            return resource.obj_to_primitive(target_version=version)
+        key = (resource_type, resource.id, revision, version)
+        primitive = self._primitive_cache.pop(key, None)
+        if primitive is None:
+            primitive = resource.obj_to_primitive(target_version=version)
+            if len(self._primitive_cache) >= self.PRIMITIVE_CACHE_SIZE:
+                self._primitive_cache.popitem(last=False)
+        self._primitive_cache[key] = primitive
+        return primitive
+
     def _push(self, context, resource_type, resource_list, event_type):
         """Push an event and list of resources of the same type to agents."""
         _validate_resource_type(resource_type)
@@ -221,7 +364,7 @@ class ResourcesPushRpcApi(object):
                 rpc_version='1.0' if compat_call else '1.1')
 
             dehydrated_resources = [
-                resource.obj_to_primitive(target_version=version)
+                self._get_primitive(resource_type, resource, version)
                 for resource in resource_list]
 
             if compat_call:
@@ -0,0 +1,98 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_middleware import base
+from oslo_serialization import jsonutils
+import webob.dec
+import webob.exc
+
+from neutron._i18n import _, _LI
+from neutron.common import request_stats
+from neutron import context
+from neutron.db import api as db_api
+from neutron.quota import resource_registry
+
+LOG = logging.getLogger(__name__)
+
+STATS_OPERATION = '_stats'
+API_VERSION_PREFIX = 'v2.0'
+
+
+def get_operation(path):
+    """Return the operation of a request path, without its IDs.
+
+    The API paths alternate collections or actions and IDs, e.g.
+    /v2.0/routers/<id>/add_router_interface.json is turned into
+    routers/{id}/add_router_interface, so that the IDs which are not UUIDs,
+    like the tags or the project IDs of the quotas, are replaced as well.
+    """
+    segments = [segment for segment in path.split('/') if segment]
+    if segments and segments[0] == API_VERSION_PREFIX:
+        segments = segments[1:]
+    if segments:
+        segments[-1] = segments[-1].rsplit('.', 1)[0]
+    return '/'.join('{id}' if index % 2 else segment
+                    for index, segment in enumerate(segments))
+
+
+class RequestStatsMiddleware(base.ConfigurableMiddleware):
+    """Record the statistics of the API requests.
+
+    The summary of each request is logged, and the histograms of the API
+    worker serving the request are returned to the admins on GET _stats.
+    """
+
+    @webob.dec.wsgify
+    def __call__(self, req):
+        if not cfg.CONF.enable_request_stats:
+            return self.application
+        operation = get_operation(req.path_info)
+        if operation == STATS_OPERATION:
+            return self._show_stats(req)
+        request_stats.start_request(req.method, operation)
+        status = None
+        try:
+            response = req.get_response(self.application)
+            status = response.status_int
+            return response
+        finally:
+            stats = request_stats.finish_request()
+            LOG.info(_LI("%(method)s %(operation)s status: %(status)s "
+                         "time: %(elapsed).3f sql_count: %(sql_count)d "
+                         "sql_time: %(sql_time).3f plugin_time: "
+                         "%(plugin_time).3f driver_time: %(driver_time).3f "
+                         "callback_time: %(callback_time).3f"),
+                     {'method': req.method, 'operation': operation,
+                      'status': status, 'elapsed': stats.elapsed,
+                      'sql_count': stats.sql_count,
+                      'sql_time': stats.sql_time,
+                      'plugin_time': stats.get_category_time('plugin'),
+                      'driver_time': stats.get_category_time('driver'),
+                      'callback_time': stats.get_category_time('callback')})
+
+    def _show_stats(self, req):
+        if req.method != 'GET':
+            return webob.exc.HTTPMethodNotAllowed()
+        ctx = (req.environ.get('neutron.context') or
+               context.Context.from_environ(req.environ))
+        if not ctx.is_admin:
+            return webob.exc.HTTPForbidden(
+                _("Only admins can show the request statistics"))
+        return webob.Response(
+            body=jsonutils.dump_as_bytes(
+                {'stats': request_stats.get_histograms(),
+                 'db_pool': db_api.get_pool_stats(),
+                 'quota_usage_resyncs':
+                     resource_registry.get_resync_counts()}),
+            content_type='application/json')
@@ -425,3 +425,111 @@ def verify_attributes(res_dict, attr_info):
     if extra_keys:
         msg = _("Unrecognized attribute(s) '%s'") % ', '.join(extra_keys)
         raise webob.exc.HTTPBadRequest(msg)
+
+
+class RequestBodyPlan(object):
+    """Precompiled checks of the request bodies of a resource action.
+
+    The plan sorts out once which attributes need a default value, which
+    ones are read-only and which ones need a conversion or a validation, and
+    looks up their validators, so that preparing each body of a request
+    only loops over the relevant attributes. The result is the same as the
+    one of verify_attributes, fill_default_value and convert_value.
+    """
+
+    def __init__(self, attr_info, is_create):
+        populate_project_info(attr_info)
+        self.attr_info = attr_info
+        self.attr_count = len(attr_info)
+        self.is_create = is_create
+        self._allowed = frozenset(attr_info)
+        # The checks are kept in the order of attr_info, so that the first
+        # invalid attribute of a body is the one reported
+        if is_create:
+            self._post_steps = [
+                (attr, attr_vals['allow_post'], 'default' in attr_vals,
+                 attr_vals.get('default'))
+                for attr, attr_vals in six.iteritems(attr_info)]
+        else:
+            self._read_only = [attr for attr, attr_vals
+                               in six.iteritems(attr_info)
+                               if not attr_vals['allow_put']]
+        self._conversions = [
+            (attr, attr_vals.get('convert_to'),
+             [(rule, lib_validators.get_validator(rule), rule_data)
+              for rule, rule_data in six.iteritems(
+                  attr_vals.get('validate', {}))])
+            for attr, attr_vals in six.iteritems(attr_info)
+            if 'convert_to' in attr_vals or 'validate' in attr_vals]
+
+    def is_current(self, attr_info):
+        """Whether the plan was built from attr_info, as it is now."""
+        return (self.attr_info is attr_info and
+                self.attr_count == len(attr_info))
+
+    def prepare(self, res_dict, exc_cls=ValueError):
+        """Verify, fill and convert the attributes of res_dict."""
+        extra_keys = set(res_dict) - self._allowed
+        if extra_keys:
+            msg = _("Unrecognized attribute(s) '%s'") % ', '.join(extra_keys)
+            raise webob.exc.HTTPBadRequest(msg)
+        if self.is_create:
+            for attr, allow_post, has_default, default in self._post_steps:
+                if allow_post:
+                    if attr not in res_dict:
+                        if not has_default:
+                            msg = _("Failed to parse request. Required "
+                                    "attribute '%s' not specified") % attr
+                            raise exc_cls(msg)
+                        res_dict[attr] = default
+                elif attr in res_dict:
+                    msg = _("Attribute '%s' not allowed in POST") % attr
+                    raise exc_cls(msg)
+        else:
+            for attr in self._read_only:
+                if attr in res_dict:
+                    msg = _("Cannot update read-only attribute %s") % attr
+                    raise exc_cls(msg)
+        for attr, converter, validators in self._conversions:
+            value = res_dict.get(attr, constants.ATTR_NOT_SPECIFIED)
+            if value is constants.ATTR_NOT_SPECIFIED:
+                continue
+            if converter:
+                value = res_dict[attr] = converter(value)
+            for rule, validator, rule_data in validators:
+                # Validators registered after the plan was built
+                validator = validator or lib_validators.get_validator(rule)
+                res = validator(value, rule_data)
+                if res:
+                    msg_dict = dict(attr=attr, reason=res)
+                    msg = _("Invalid input for %(attr)s. "
+                            "Reason: %(reason)s.") % msg_dict
+                    raise exc_cls(msg)
+
+
+# Request body plans, by id of the attribute info and create flag
+_REQUEST_BODY_PLANS = {}
+
+
+def build_request_body_plans(attr_map):
+    """Build the request body plans of the resources of attr_map.
+
+    The plans have to be built again when the attributes of a resource
+    change, the ones of resources with a different number of attributes are
+    ignored.
+    """
+    for attr_info in attr_map.values():
+        for is_create in (True, False):
+            try:
+                plan = RequestBodyPlan(attr_info, is_create)
+            except (KeyError, webob.exc.HTTPBadRequest):
+                # Invalid definitions are reported on each request instead
+                continue
+            _REQUEST_BODY_PLANS[id(attr_info), is_create] = plan
+
+
+def get_request_body_plan(attr_info, is_create):
+    """Return the current request body plan of attr_info, or None."""
+    plan = _REQUEST_BODY_PLANS.get((id(attr_info), is_create))
+    if plan is not None and plan.is_current(attr_info):
+        return plan
@@ -32,6 +32,7 @@ from neutron.callbacks import events
 from neutron.callbacks import registry
 from neutron.common import constants as n_const
 from neutron.common import exceptions as n_exc
+from neutron.common import request_stats
 from neutron.common import rpc as n_rpc
 from neutron.db import api as db_api
 from neutron import policy
@@ -142,6 +143,10 @@ class Controller(object):
                 return key
         return default_primary_key
 
+    def _get_plugin_method(self, name):
+        return request_stats.timed_callable(
+            'plugin', name, getattr(self._plugin, name))
+
     def _is_native_bulk_supported(self):
         native_bulk_attr_name = ("_%s__native_bulk_support"
                                  % self._plugin.__class__.__name__)
@@ -247,7 +252,8 @@ class Controller(object):
                                name,
                                resource,
                                pluralized=self._collection)
-                ret_value = getattr(self._plugin, name)(*arg_list, **kwargs)
+                ret_value = self._get_plugin_method(name)(
+                    *arg_list, **kwargs)
                 # It is simply impossible to predict whether one of this
                 # actions alters resource usage. For instance a tenant port
                 # is created when a router interface is added. Therefore it is
@@ -276,8 +282,40 @@ class Controller(object):
             return api_common.SortingEmulatedHelper(request, self._attr_info)
         return api_common.NoSortingHelper(request, self._attr_info)
 
-    def _items(self, request, do_authz=False, parent_id=None):
-        """Retrieves and formats a list of elements of the requested entity."""
+    def _iter_authorized(self, context, obj_list):
+        # FIXME(salvatore-orlando): obj_getter might return references to
+        # other resources. Must check authZ on them too.
+        # Omit items from list that should not be visible
+        for obj in obj_list:
+            if policy.check(context,
+                            self._plugin_handlers[self.SHOW],
+                            obj,
+                            plugin=self._plugin,
+                            pluralized=self._collection):
+                yield obj
+
+    def _iter_views(self, context, obj_list, fields_to_add):
+        fields_to_strip = None
+        for obj in obj_list:
+            if fields_to_strip is None:
+                # Use the first element in the list for discriminating which
+                # attributes should be filtered out because of authZ policies
+                # fields_to_add contains a list of attributes added for
+                # request policy checks but that were not required by the
+                # user. They should be therefore stripped
+                fields_to_strip = ((fields_to_add or []) +
+                                   self._exclude_attributes_by_policy(
+                                       context, obj))
+            yield self._filter_attributes(context, obj,
+                                          fields_to_strip=fields_to_strip)
+
+    def _items(self, request, do_authz=False, parent_id=None, stream=False):
+        """Retrieves and formats a list of elements of the requested entity.
+
+        When stream is True and the list is not paginated, the elements are
+        returned as a CollectionStream, only fetched from the plugin result,
+        authorized and formatted as the response is serialized.
+        """
         # NOTE(salvatore-orlando): The following ensures that fields which
         # are needed for authZ policy validation are not stripped away by the
         # plugin before returning.
@@ -296,41 +334,30 @@ class Controller(object):
         pagination_helper.update_fields(original_fields, fields_to_add)
         if parent_id:
             kwargs[self._parent_id_name] = parent_id
-        obj_getter = getattr(self._plugin, self._plugin_handlers[self.LIST])
+        obj_getter = self._get_plugin_method(
+            self._plugin_handlers[self.LIST])
         obj_list = obj_getter(request.context, **kwargs)
         obj_list = sorting_helper.sort(obj_list)
         obj_list = pagination_helper.paginate(obj_list)
+        # Synchronize usage trackers, if needed
+        resource_registry.resync_resource(
+            request.context, self._resource, request.context.tenant_id)
+        if stream and api_common.can_stream_collection(pagination_helper,
+                                                       sorting_helper):
+            if do_authz:
+                obj_list = self._iter_authorized(request.context, obj_list)
+            return api_common.CollectionStream(
+                self._collection,
+                self._iter_views(request.context, obj_list, fields_to_add))
         # Check authz
         if do_authz:
-            # FIXME(salvatore-orlando): obj_getter might return references to
-            # other resources. Must check authZ on them too.
-            # Omit items from list that should not be visible
-            obj_list = [obj for obj in obj_list
-                        if policy.check(request.context,
-                                        self._plugin_handlers[self.SHOW],
-                                        obj,
-                                        plugin=self._plugin,
-                                        pluralized=self._collection)]
-        # Use the first element in the list for discriminating which attributes
-        # should be filtered out because of authZ policies
-        # fields_to_add contains a list of attributes added for request policy
-        # checks but that were not required by the user. They should be
-        # therefore stripped
-        fields_to_strip = fields_to_add or []
-        if obj_list:
-            fields_to_strip += self._exclude_attributes_by_policy(
-                request.context, obj_list[0])
+            obj_list = list(self._iter_authorized(request.context, obj_list))
         collection = {self._collection:
-                      [self._filter_attributes(
-                          request.context, obj,
-                          fields_to_strip=fields_to_strip)
-                       for obj in obj_list]}
+                      list(self._iter_views(request.context, obj_list,
+                                            fields_to_add))}
         pagination_links = pagination_helper.get_links(obj_list)
         if pagination_links:
             collection[self._collection + "_links"] = pagination_links
-        # Synchronize usage trackers, if needed
-        resource_registry.resync_resource(
-            request.context, self._resource, request.context.tenant_id)
         return collection
 
     def _item(self, request, id, do_authz=False, field_list=None,
@@ -340,7 +367,7 @@ class Controller(object):
         action = self._plugin_handlers[self.SHOW]
         if parent_id:
             kwargs[self._parent_id_name] = parent_id
-        obj_getter = getattr(self._plugin, action)
+        obj_getter = self._get_plugin_method(action)
         obj = obj_getter(request.context, id, **kwargs)
         # Check authz
         # FIXME(salvatore-orlando): obj_getter might return references to
@@ -358,7 +385,7 @@ class Controller(object):
         parent_id = kwargs.get(self._parent_id_name)
         # Ensure policy engine is initialized
         policy.init()
-        return self._items(request, True, parent_id)
+        return self._items(request, True, parent_id, stream=True)
 
     @db_api.retry_db_errors
     def show(self, request, id, **kwargs):
@@ -405,8 +432,8 @@ class Controller(object):
         except Exception:
             with excutils.save_and_reraise_exception():
                 for obj in objs:
-                    obj_deleter = getattr(self._plugin,
-                                          self._plugin_handlers[self.DELETE])
+                    obj_deleter = self._get_plugin_method(
+                        self._plugin_handlers[self.DELETE])
                     try:
                         kwargs = ({self._parent_id_name: parent_id}
                                   if parent_id else {})
@@ -501,9 +528,9 @@ class Controller(object):
         def do_create(body, bulk=False, emulated=False):
             kwargs = {self._parent_id_name: parent_id} if parent_id else {}
             if bulk and not emulated:
-                obj_creator = getattr(self._plugin, "%s_bulk" % action)
+                obj_creator = self._get_plugin_method("%s_bulk" % action)
             else:
-                obj_creator = getattr(self._plugin, action)
+                obj_creator = self._get_plugin_method(action)
             try:
                 if emulated:
                     return self._emulate_bulk_create(obj_creator, request,
@@ -573,7 +600,7 @@ class Controller(object):
             msg = _('The resource could not be found.')
             raise webob.exc.HTTPNotFound(msg)
 
-        obj_deleter = getattr(self._plugin, action)
+        obj_deleter = self._get_plugin_method(action)
         obj_deleter(request.context, id, **kwargs)
         # A delete operation usually alters resource usage, so mark affected
         # usage trackers as dirty
@@ -645,7 +672,7 @@ class Controller(object):
             msg = _('The resource could not be found.')
             raise webob.exc.HTTPNotFound(msg)
 
-        obj_updater = getattr(self._plugin, action)
+        obj_updater = self._get_plugin_method(action)
         kwargs = {self._resource: body}
         if parent_id:
             kwargs[self._parent_id_name] = parent_id
@@ -705,6 +732,10 @@ class Controller(object):
             raise webob.exc.HTTPBadRequest(msg)
 
         attributes.populate_tenant_id(context, res_dict, attr_info, is_create)
+        plan = attributes.get_request_body_plan(attr_info, is_create)
+        if plan:
+            plan.prepare(res_dict, webob.exc.HTTPBadRequest)
+            return body
         attributes.verify_attributes(res_dict, attr_info)
 
         if is_create:  # POST
@@ -94,6 +94,16 @@ def Resource(controller, faults=None, deserializers=None, serializers=None,
             raise mapped_exc
 
         status = action_status.get(action, 200)
+        if isinstance(result, api_common.CollectionStream):
+            if hasattr(serializer, 'serialize_collection'):
+                # NOTE: without a content length, the response is sent with
+                # a chunked transfer encoding.
+                return webob.Response(
+                    request=request, status=status,
+                    content_type=content_type,
+                    app_iter=serializer.serialize_collection(
+                        result.collection, result.items))
+            result = result.to_dict()
         body = serializer.serialize(result)
         # NOTE(jkoelker) Comply with RFC2616 section 9.7
         if status == 204:
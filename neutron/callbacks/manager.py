@@ -18,6 +18,7 @@ from oslo_utils import reflection
 from neutron._i18n import _LE
 from neutron.callbacks import events
 from neutron.callbacks import exceptions
+from neutron.common import request_stats
 from neutron.db import api as db_api
 
 LOG = logging.getLogger(__name__)
@@ -140,10 +141,15 @@ class CallbacksManager(object):
         callbacks = list(self._callbacks[resource].get(event, {}).items())
         LOG.debug("Notify callbacks %s for %s, %s",
                   callbacks, resource, event)
+        # The callbacks are only timed while a request is recorded
+        recording = request_stats.get_request_stats() is not None
         # TODO(armax): consider using a GreenPile
         for callback_id, callback in callbacks:
             try:
-                callback(resource, event, trigger, **kwargs)
+                name = (reflection.get_callable_name(callback) if recording
+                        else None)
+                with request_stats.timed('callback', name):
+                    callback(resource, event, trigger, **kwargs)
             except Exception as e:
                 abortable_event = (
                     event.startswith(events.BEFORE) or
@@ -0,0 +1,95 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the time neutron-server takes to build its API application.
+
+The phases are run in the order of a server start, with the configuration
+files of the server, and the time of each of them is printed. Nothing is
+served and no worker is forked, so the times are the ones spent by the
+parent process before the workers can be started.
+"""
+
+import sys
+import time
+
+from oslo_config import cfg
+from oslo_utils import importutils
+
+from neutron.common import config
+
+
+# The modules of the server are only imported by the first phase, so that
+# their import time is measured
+SERVER_MODULES = [
+    'neutron.api.extensions',
+    'neutron.manager',
+    'neutron.pecan_wsgi.app',
+    'neutron.policy',
+]
+
+
+def _load_modules():
+    for module in SERVER_MODULES:
+        importutils.import_module(module)
+
+
+def _load_plugins():
+    from neutron import manager
+    manager.NeutronManager.get_instance()
+
+
+def _load_extensions():
+    from neutron.api import extensions
+    extensions.PluginAwareExtensionManager.get_instance()
+
+
+def _load_api():
+    if cfg.CONF.web_framework == 'legacy':
+        config.load_paste_app('neutron')
+    else:
+        from neutron.pecan_wsgi import app as pecan_app
+        pecan_app.setup_app()
+
+
+def _load_policy():
+    from neutron import policy
+    policy.init()
+
+
+PHASES = [
+    ('modules', _load_modules),
+    ('plugins', _load_plugins),
+    ('extensions', _load_extensions),
+    ('api', _load_api),
+    ('policy', _load_policy),
+]
+
+
+def run_phases():
+    """Run the phases of the startup and return their times."""
+    timings = []
+    for name, phase in PHASES:
+        start = time.time()
+        phase()
+        timings.append((name, time.time() - start))
+    return timings
+
+
+def main():
+    config.init(sys.argv[1:])
+    config.setup_logging()
+    config.set_config_defaults()
+    timings = run_phases()
+    for name, elapsed in timings:
+        print('%-12s %8.3f' % (name, elapsed))
+    print('%-12s %8.3f' % ('total', sum(elapsed for _name, elapsed
+                                        in timings)))
@@ -0,0 +1,233 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process statistics of the API requests.
+
+While a request is processed, the SQL statements it runs and the time it
+spends in the plugins, the mechanism drivers and the callbacks are recorded
+in the stats of the request, which are kept in a (green) thread local. When
+the request ends, its summary is logged and added to histograms which are
+kept for the lifetime of the process.
+
+Recording is skipped as soon as no request stats are active, so the
+instrumented code paths only pay for a thread local lookup when the
+statistics are disabled.
+"""
+
+import collections
+import threading
+import time
+
+from sqlalchemy import event
+
+# Upper bounds of the buckets of the histograms
+TIME_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2,
+                5, 10, 30, 60)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_local = threading.local()
+
+
+class Histogram(object):
+    """Distribution of the values of a measure, in fixed buckets."""
+
+    def __init__(self, bounds=TIME_BUCKETS):
+        self.bounds = bounds
+        # The last bucket counts the values above the last bound
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        index = 0
+        for bound in self.bounds:
+            if value <= bound:
+                break
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        buckets = collections.OrderedDict(
+            ('le_%s' % bound, count)
+            for bound, count in zip(self.bounds, self.buckets))
+        buckets['inf'] = self.buckets[-1]
+        return {'count': self.count,
+                'total': self.total,
+                'max': self.max,
+                'buckets': buckets}
+
+
+# Histograms of the process, by category and name
+_HISTOGRAMS = collections.defaultdict(dict)
+# Maximum number of histograms of a category, the values of the names above
+# it are added to the OTHER_NAME histogram of the category, so that the
+# memory of the process is bounded whatever the requests it serves.
+MAX_HISTOGRAMS_PER_CATEGORY = 500
+OTHER_NAME = '{other}'
+
+
+def add_to_histogram(category, name, value, bounds=TIME_BUCKETS):
+    """Add a value to the histogram of the process of category and name."""
+    histograms = _HISTOGRAMS[category]
+    histogram = histograms.get(name)
+    if histogram is None:
+        if len(histograms) >= MAX_HISTOGRAMS_PER_CATEGORY:
+            name = OTHER_NAME
+            histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram(bounds)
+    histogram.add(value)
+
+
+def get_histograms():
+    """Return the histograms of the process, by category and name."""
+    return {category: {name: histogram.to_dict()
+                       for name, histogram in histograms.items()}
+            for category, histograms in _HISTOGRAMS.items()}
+
+
+def reset_histograms():
+    _HISTOGRAMS.clear()
+
+
+class RequestStats(object):
+    """Statistics of a single request."""
+
+    def __init__(self, method, operation):
+        self.method = method
+        self.operation = operation
+        self.start = time.time()
+        self.sql_count = 0
+        self.sql_time = 0
+        # [count, total time] of the timed calls, by category and name
+        self.timings = collections.defaultdict(
+            lambda: collections.defaultdict(lambda: [0, 0]))
+
+    def add_timing(self, category, name, elapsed):
+        timing = self.timings[category][name]
+        timing[0] += 1
+        timing[1] += elapsed
+
+    def get_category_time(self, category):
+        return sum(timing[1] for timing in self.timings[category].values())
+
+
+class _Timer(object):
+    __slots__ = ('_stats', '_category', '_name', '_start')
+
+    def __init__(self, stats, category, name):
+        self._stats = stats
+        self._category = category
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.time()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stats.add_timing(self._category, self._name,
+                               time.time() - self._start)
+
+
+class _NoTimer(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+def get_request_stats():
+    """Return the stats of the request of the current thread, or None."""
+    return getattr(_local, 'stats', None)
+
+
+def timed(category, name):
+    """Return a context manager timing its block in the current request."""
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        return _NO_TIMER
+    return _Timer(stats, category, name)
+
+
+def timed_callable(category, name, func):
+    """Return func, timed in the current request if there is one."""
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        return func
+
+    def _timed(*args, **kwargs):
+        with _Timer(stats, category, name):
+            return func(*args, **kwargs)
+    return _timed
+
+
+def start_request(method, operation):
+    """Start recording the stats of a request in the current thread.
+
+    :param method: the HTTP method of the request.
+    :param operation: the name of the operation, e.g. the collection.
+    """
+    _local.stats = RequestStats(method, operation)
+    return _local.stats
+
+
+def finish_request():
+    """Stop recording the stats of the current request and return them.
+
+    The stats are added to the histograms of the process.
+    """
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        return
+    del _local.stats
+    elapsed = time.time() - stats.start
+    request = '%s %s' % (stats.method, stats.operation)
+    add_to_histogram('request', request, elapsed)
+    add_to_histogram('request_sql_count', request, stats.sql_count,
+                     COUNT_BUCKETS)
+    add_to_histogram('request_sql_time', request, stats.sql_time)
+    for category, timings in stats.timings.items():
+        for name, (count, total) in timings.items():
+            add_to_histogram(category, name, total)
+    stats.elapsed = elapsed
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    if getattr(_local, 'stats', None) is not None:
+        conn.info['request_stats_start'] = time.time()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    start = conn.info.pop('request_stats_start', None)
+    stats = getattr(_local, 'stats', None)
+    if stats is None or start is None:
+        return
+    stats.sql_count += 1
+    stats.sql_time += time.time() - start
+
+
+def add_engine_hooks(engine):
+    """Count the SQL statements, and their time, of the requests."""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
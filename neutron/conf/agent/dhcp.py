@@ -58,7 +58,13 @@ DHCP_AGENT_OPTS = [
     cfg.IntOpt('num_sync_threads', default=4,
                help=_('Number of threads to use during sync process. '
                       'Should not exceed connection pool size configured on '
-                      'server.'))
+                      'server.')),
+    cfg.IntOpt('sync_networks_chunk_size', default=100, min=0,
+               help=_('Maximum number of networks fetched from the server '
+                      'by a single RPC call during the sync process. DHCP '
+                      'is configured for the networks of a chunk while the '
+                      'next one is being fetched. 0 fetches all the '
+                      'networks with a single call.'))
 ]
 
 DHCP_OPTS = [
@@ -72,6 +78,14 @@ DHCP_OPTS = [
                       'neutron.conf as dns_domain. It will be removed '
                       'in a future release.'),
                deprecated_for_removal=True),
+    cfg.FloatOpt('dhcp_reload_delay',
+                 default=0,
+                 min=0,
+                 help=_('Number of seconds to wait before signalling the DHCP '
+                        'server to reload its configuration after a change. '
+                        'Changes made to a network within this delay are '
+                        'applied with a single reload, 0 reloads the server '
+                        'immediately after each change.')),
 ]
 
 DNSMASQ_OPTS = [
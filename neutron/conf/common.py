@@ -60,6 +60,13 @@ core_opts = [
                help=_("The maximum number of items returned in a single "
                       "response, value was 'infinite' or negative integer "
                       "means no limit")),
+    cfg.BoolOpt('stream_collection_responses', default=False,
+                help=_("Stream the responses listing the resources of a "
+                       "collection when they are not paginated, encoding "
+                       "their items one at a time in a chunked response. "
+                       "As the response status is sent before the items "
+                       "are encoded, an error occurring afterwards aborts "
+                       "the response.")),
     cfg.ListOpt('default_availability_zones', default=[],
                 help=_("Default value of availability zone hints. The "
                        "availability zone aware schedulers use this when "
@@ -119,6 +126,12 @@ core_opts = [
     cfg.IntOpt('send_events_interval', default=2,
                help=_('Number of seconds between sending events to nova if '
                       'there are any events to send.')),
+    cfg.FloatOpt('resource_push_coalesce_interval', default=0,
+                 help=_('Number of seconds during which the updates of the '
+                        'same versioned object are coalesced before being '
+                        'pushed to the agents, so that only its latest '
+                        'revision is sent. By default, every update is '
+                        'pushed immediately.')),
     cfg.BoolOpt('advertise_mtu', default=True,
                 deprecated_for_removal=True,
                 help=_('If True, advertise network MTU values if core plugin '
@@ -136,6 +149,14 @@ core_opts = [
                help=_("This will choose the web framework in which to run "
                       "the Neutron API server. 'pecan' is a new experimental "
                       "rewrite of the API server.")),
+    cfg.BoolOpt('enable_request_stats', default=False,
+                help=_("Record the number of SQL statements of each API "
+                       "request and the time it spends in the database, the "
+                       "plugins, the mechanism drivers and the callbacks. "
+                       "A summary of each request is logged, and the "
+                       "histograms of the API worker are shown to admins "
+                       "on GET /v2.0/_stats. The request_stats filter must "
+                       "be in the API paste pipeline.")),
     cfg.IntOpt('global_physnet_mtu', default=constants.DEFAULT_NETWORK_MTU,
                deprecated_name='segment_mtu', deprecated_group='ml2',
                help=_('MTU of the underlying physical network. Neutron uses '
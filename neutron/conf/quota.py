@@ -51,6 +51,17 @@ core_quota_opts = [
                 help=_('Keep in track in the database of current resource '
                        'quota usage. Plugins which do not leverage the '
                        'neutron database should set this flag to False.')),
+    cfg.FloatOpt('usage_resync_interval',
+                 default=5.0,
+                 help=_('Seconds between two batches of quota usage '
+                        'resynchronizations. Listing a tracked resource '
+                        'schedules the resynchronization of its usage for '
+                        'the tenant of the request instead of running it.')),
+    cfg.IntOpt('usage_resync_batch_size',
+               default=100,
+               help=_('Maximum number of quota usage resynchronizations, '
+                      'of one resource for one tenant each, run every '
+                      'usage_resync_interval seconds.')),
 ]
 
 # security_group_quota_opts from neutron/extensions/securitygroup.py
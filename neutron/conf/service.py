@@ -39,6 +39,63 @@ service_opts = [
                help=_('Range of seconds to randomly delay when starting the '
                       'periodic task scheduler to reduce stampeding. '
                       '(Disable by setting to 0)')),
+    cfg.IntOpt('api_workers_db_pool_size',
+               min=1,
+               help=_('Size of the pool of database connections of each API '
+                      'worker process. If not specified, the [database] '
+                      'max_pool_size option is used.')),
+    cfg.IntOpt('api_workers_db_max_overflow',
+               min=0,
+               help=_('Maximum number of connections each API worker '
+                      'process can open above its pool size. If not '
+                      'specified, the [database] max_overflow option is '
+                      'used.')),
+    cfg.IntOpt('rpc_workers_db_pool_size',
+               min=1,
+               help=_('Size of the pool of database connections of each RPC '
+                      'worker process. If not specified, the [database] '
+                      'max_pool_size option is used.')),
+    cfg.IntOpt('rpc_workers_db_max_overflow',
+               min=0,
+               help=_('Maximum number of connections each RPC worker '
+                      'process can open above its pool size. If not '
+                      'specified, the [database] max_overflow option is '
+                      'used.')),
+    cfg.IntOpt('periodic_workers_db_pool_size',
+               min=1,
+               help=_('Size of the pool of database connections of each '
+                      'process running the periodic and other plugin '
+                      'workers. If not specified, the [database] '
+                      'max_pool_size option is used.')),
+    cfg.IntOpt('periodic_workers_db_max_overflow',
+               min=0,
+               help=_('Maximum number of connections each process running '
+                      'the periodic and other plugin workers can open above '
+                      'its pool size. If not specified, the [database] '
+                      'max_overflow option is used.')),
+    cfg.BoolOpt('db_pool_queue_on_exhaustion',
+                default=False,
+                help=_('Never open connections above the pool size of the '
+                       'worker processes. The green threads of a worker '
+                       'wait for a connection of its pool to be released '
+                       'instead, for up to the [database] pool_timeout '
+                       'option, which bounds the number of connections of '
+                       'the server to the sum of the pool sizes of its '
+                       'workers.')),
+    cfg.IntOpt('db_pool_stats_log_interval',
+               default=600,
+               min=0,
+               help=_('Seconds between two logs of the database connection '
+                      'pool counters of each RPC and periodic worker '
+                      'process. API workers expose them through the _stats '
+                      'endpoint instead. (Disable by setting to 0)')),
+    cfg.BoolOpt('preload_workers_state',
+                default=False,
+                help=_('Build the state which the API and RPC worker '
+                       'processes otherwise build on their own, such as the '
+                       'policy rules, before forking them, so that they '
+                       'share it copy-on-write and serve their first '
+                       'requests sooner.')),
 ]
 
 
@@ -15,18 +15,31 @@ NOTE: This module shall not be used by external projects. It will be moved
       to neutron-lib in due course, and then it can be used from there.
 """
 
+import base64
 import contextlib
 
+from neutron_lib import exceptions as n_exc
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import encodeutils
 from oslo_utils import excutils
 import six
+import sqlalchemy as sa
 from sqlalchemy.ext import associationproxy
 
-from neutron._i18n import _LE
+from neutron._i18n import _, _LE
 from neutron.api.v2 import attributes
 
 LOG = logging.getLogger(__name__)
 
+# Prefix of the pagination markers carrying the sort key values of an item,
+# as opposed to the markers made of the ID of an item.
+KEYSET_MARKER_PREFIX = 'keyset-'
+
+# Column types whose values are returned unchanged by the API, and may
+# therefore be compared to the values carried by a marker.
+_KEYSET_COLUMN_TYPES = (sa.Boolean, sa.Integer, sa.String)
+
 
 @contextlib.contextmanager
 def _noop_context_manager():
@@ -121,3 +134,59 @@ def filter_non_model_columns(data, model):
                 six.iteritems(data) if k in columns or
                 isinstance(getattr(model, k, None),
                            associationproxy.AssociationProxy))
+
+
+class KeysetMarker(object):
+    """A pagination marker made of the sort key values of an item.
+
+    paginate_query only reads the sort key attributes of the marker object,
+    so a keyset marker seeks to the next page without loading the item from
+    the database, and whatever the depth of the page.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['values'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def covers(self, model, sort_keys):
+        """Whether the marker values may be compared to the model columns."""
+        for key in sort_keys:
+            column_type = getattr(getattr(model, key, None), 'type', None)
+            if (key not in self.values or
+                    not isinstance(column_type, _KEYSET_COLUMN_TYPES)):
+                return False
+        return True
+
+
+def encode_keyset_marker(item, sort_keys):
+    """Return the keyset pagination marker of a resource dictionary.
+
+    Return None if the item lacks one of the sort keys.
+    """
+    try:
+        values = {key: item[key] for key in sort_keys}
+    except KeyError:
+        return None
+    encoded = base64.urlsafe_b64encode(
+        encodeutils.to_utf8(jsonutils.dumps(values)))
+    return KEYSET_MARKER_PREFIX + encodeutils.safe_decode(encoded)
+
+
+def decode_keyset_marker(marker):
+    """Return the KeysetMarker of a marker, or None for an ID marker."""
+    if not marker.startswith(KEYSET_MARKER_PREFIX):
+        return None
+    try:
+        values = jsonutils.loads(base64.urlsafe_b64decode(
+            encodeutils.to_utf8(marker[len(KEYSET_MARKER_PREFIX):])))
+    except (TypeError, ValueError):
+        values = None
+    if not isinstance(values, dict) or 'id' not in values:
+        msg = _("Invalid pagination marker %s") % marker
+        raise n_exc.BadRequest(resource='marker', msg=msg)
+    return KeysetMarker(values)
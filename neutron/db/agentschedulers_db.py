@@ -33,6 +33,7 @@ from neutron import context as ncontext
 from neutron.db import agents_db
 from neutron.db.availability_zone import network as network_az
 from neutron.db.models import agent as agent_model
+from neutron.db import models_v2
 from neutron.db.network_dhcp_agent_binding import models as ndab_model
 from neutron.extensions import agent as ext_agent
 from neutron.extensions import dhcpagentscheduler
@@ -469,7 +470,13 @@ class DhcpAgentSchedulerDbMixin(dhcpagentscheduler
             self._get_agent(context, id)
             return {'networks': []}
 
-    def list_active_networks_on_active_dhcp_agent(self, context, host):
+    def list_active_networks_on_active_dhcp_agent(self, context, host,
+                                                  marker=None, limit=None):
+        """Return the active networks hosted by the DHCP agent of host.
+
+        If limit is set, at most limit networks sorted by ID are returned,
+        starting after the network ID marker.
+        """
         try:
             agent = self._get_agent_by_type_and_host(
                 context, constants.AGENT_TYPE_DHCP, host)
@@ -483,12 +490,21 @@ class DhcpAgentSchedulerDbMixin(dhcpagentscheduler
             ndab_model.NetworkDhcpAgentBinding.network_id)
         query = query.filter(
             ndab_model.NetworkDhcpAgentBinding.dhcp_agent_id == agent.id)
+        if limit:
+            network_id = ndab_model.NetworkDhcpAgentBinding.network_id
+            query = query.join(
+                models_v2.Network, models_v2.Network.id == network_id)
+            query = query.filter(models_v2.Network.admin_state_up == True)  # noqa
+            if marker:
+                query = query.filter(network_id > marker)
+            query = query.order_by(network_id).limit(limit)
 
         net_ids = [item[0] for item in query]
         if net_ids:
             return self.get_networks(
                 context,
-                filters={'id': net_ids, 'admin_state_up': [True]}
+                filters={'id': net_ids, 'admin_state_up': [True]},
+                sorts=[('id', True)] if limit else None
             )
         else:
             return []
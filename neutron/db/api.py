@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import contextlib
 import copy
+import time
 
 from neutron_lib import exceptions
 from oslo_config import cfg
@@ -22,20 +24,28 @@ from oslo_db import api as oslo_db_api
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import enginefacade
 from oslo_log import log as logging
+from oslo_service import loopingcall
 from oslo_utils import excutils
 from osprofiler import opts as profiler_opts
 import osprofiler.sqlalchemy
 from pecan import util as p_util
 import six
 import sqlalchemy
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import pool as sa_pool
 from sqlalchemy.orm import exc
 import traceback
 
-from neutron._i18n import _LE
+from neutron._i18n import _LE, _LI
+from neutron.common import request_stats
+from neutron.conf import service as service_conf
 from neutron.objects import exceptions as obj_exc
 
+service_conf.register_service_opts(service_conf.service_opts)
+
 
 def set_hook(engine):
+    request_stats.add_engine_hooks(engine)
     if (profiler_opts.is_trace_enabled() and
             profiler_opts.is_db_trace_enabled()):
         osprofiler.sqlalchemy.add_tracing(sqlalchemy, engine, 'neutron.db')
@@ -56,6 +66,136 @@ context_manager.append_on_engine_create(set_hook)
 MAX_RETRIES = 10
 LOG = logging.getLogger(__name__)
 
+# Default of the SQLAlchemy QueuePool, used when [database] leaves it unset
+DEFAULT_POOL_TIMEOUT = 30
+
+# Connection pool counters of the process
+_POOL_STATS = collections.Counter()
+# Type and connection pools of the worker run by the process
+_worker = {'type': None, 'pools': [], 'stats_logger': None}
+
+
+class _WorkerQueuePool(sa_pool.QueuePool):
+    """Queue pool counting its checkouts and timing them."""
+
+    def _do_get(self):
+        # The pool is saturated when no connection is idle and no more can
+        # be opened, the checkout then waits for a connection to be released
+        saturated = (not self.checkedin() and
+                     0 <= self._max_overflow <= self.overflow())
+        start = time.time()
+        try:
+            return super(_WorkerQueuePool, self)._do_get()
+        except sa_exc.TimeoutError:
+            _POOL_STATS['timeouts'] += 1
+            raise
+        finally:
+            _POOL_STATS['checkouts'] += 1
+            if saturated:
+                _POOL_STATS['saturated_checkouts'] += 1
+            if cfg.CONF.enable_request_stats:
+                request_stats.add_to_histogram('db_pool', 'checkout',
+                                               time.time() - start)
+
+
+def _get_worker_pool_option(worker_type, name, default):
+    value = getattr(cfg.CONF, '%s_workers_db_%s' % (worker_type, name))
+    return default if value is None else value
+
+
+def _get_engines():
+    # The reader engine is the writer one unless a slave_connection is set
+    return {context_manager.writer.get_engine(),
+            context_manager.reader.get_engine()}
+
+
+def _get_queue_pools():
+    return [engine.pool for engine in _get_engines()
+            if isinstance(engine.pool, sa_pool.QueuePool)]
+
+
+def configure_worker_pool(worker_type):
+    """Replace the connection pools of a forked worker process.
+
+    The size of the new pools depends on the type of the worker, 'api',
+    'rpc' or 'periodic', and their checkouts are counted by get_pool_stats.
+    The pools are kept when no option of the worker type nor
+    db_pool_queue_on_exhaustion is set, their checkouts are then not
+    counted. Pools which are not queue pools, e.g. the ones of sqlite, are
+    always kept.
+    """
+    pool_size = _get_worker_pool_option(worker_type, 'pool_size', None)
+    max_overflow = _get_worker_pool_option(worker_type, 'max_overflow', None)
+    if (pool_size is None and max_overflow is None and
+            not cfg.CONF.db_pool_queue_on_exhaustion):
+        pools = _get_queue_pools()
+    else:
+        pools = _replace_queue_pools(worker_type, pool_size, max_overflow)
+    _worker.update(type=worker_type, pools=pools)
+    # The API workers expose the counters through the _stats endpoint
+    interval = cfg.CONF.db_pool_stats_log_interval
+    if (worker_type != 'api' and interval and pools and
+            _worker['stats_logger'] is None):
+        _worker['stats_logger'] = loopingcall.FixedIntervalLoopingCall(
+            _log_pool_stats)
+        _worker['stats_logger'].start(interval=interval,
+                                      initial_delay=interval)
+
+
+def _replace_queue_pools(worker_type, pool_size, max_overflow):
+    if pool_size is None:
+        pool_size = cfg.CONF.database.max_pool_size
+    if max_overflow is None:
+        max_overflow = cfg.CONF.database.max_overflow
+    if cfg.CONF.db_pool_queue_on_exhaustion:
+        max_overflow = 0
+    timeout = cfg.CONF.database.pool_timeout or DEFAULT_POOL_TIMEOUT
+    pools = []
+    for engine in _get_engines():
+        pool = engine.pool
+        if not isinstance(pool, sa_pool.QueuePool):
+            continue
+        # NOTE: the pool is built like QueuePool.recreate() does, with the
+        # worker sizes, so that the listeners of the engine are kept. The
+        # private attributes it copies are checked by the unit tests.
+        pool.dispose()
+        engine.pool = _WorkerQueuePool(
+            pool._creator,
+            pool_size=pool_size or pool.size(),
+            max_overflow=(pool._max_overflow if max_overflow is None
+                          else max_overflow),
+            timeout=timeout,
+            recycle=pool._recycle,
+            echo=pool.echo,
+            logging_name=pool._orig_logging_name,
+            use_threadlocal=pool._use_threadlocal,
+            reset_on_return=pool._reset_on_return,
+            _dispatch=pool.dispatch,
+            _dialect=pool._dialect)
+        pools.append(engine.pool)
+        LOG.debug("Database pool of %(type)s worker: size %(size)d, "
+                  "max overflow %(overflow)d",
+                  {'type': worker_type, 'size': engine.pool.size(),
+                   'overflow': engine.pool._max_overflow})
+    return pools
+
+
+def _log_pool_stats():
+    LOG.info(_LI("Database pool stats of %(type)s worker: %(stats)s"),
+             {'type': _worker['type'], 'stats': get_pool_stats()})
+
+
+def get_pool_stats():
+    """Return the connection pool counters of the process."""
+    stats = {key: _POOL_STATS[key]
+             for key in ('checkouts', 'saturated_checkouts', 'timeouts')}
+    stats['worker_type'] = _worker['type']
+    stats['pools'] = [{'size': pool.size(),
+                       'checked_out': pool.checkedout(),
+                       'overflow': pool.overflow()}
+                      for pool in _worker['pools']]
+    return stats
+
 
 def is_retriable(e):
     if getattr(e, '_RETRY_EXCEEDED', False):
@@ -16,6 +16,7 @@
 import weakref
 
 from neutron_lib.db import utils as db_utils
+from neutron_lib import exceptions as n_exc
 from oslo_db.sqlalchemy import utils as sa_utils
 from oslo_log import log as logging
 import six
@@ -24,6 +25,7 @@ from sqlalchemy.ext import associationproxy
 from sqlalchemy import or_
 from sqlalchemy import sql
 
+from neutron._i18n import _
 from neutron.api.v2 import attributes
 from neutron.db import _utils as ndb_utils
 
@@ -225,6 +227,9 @@ class CommonDbMixin(object):
         if sorts:
             sort_keys = db_utils.get_and_validate_sort_keys(sorts, model)
             sort_dirs = db_utils.get_sort_dirs(sorts, page_reverse)
+            if isinstance(marker_obj, ndb_utils.KeysetMarker):
+                marker_obj = self._get_keyset_marker_obj(
+                    context, model, marker_obj, sort_keys)
             collection = sa_utils.paginate_query(collection, model, limit,
                                                  marker=marker_obj,
                                                  sort_keys=sort_keys,
@@ -250,9 +255,28 @@ class CommonDbMixin(object):
 
     def _get_marker_obj(self, context, resource, limit, marker):
         if limit and marker:
-            return getattr(self, '_get_%s' % resource)(context, marker)
+            keyset_marker = ndb_utils.decode_keyset_marker(marker)
+            if keyset_marker is not None:
+                return keyset_marker
+            getter = getattr(self, '_get_%s' % resource, None)
+            if getter is None:
+                # The marker item is loaded with the collection model
+                return ndb_utils.KeysetMarker({'id': marker})
+            return getter(context, marker)
         return None
 
+    def _get_keyset_marker_obj(self, context, model, marker, sort_keys):
+        if marker.covers(model, sort_keys):
+            return marker
+        # NOTE: the marker was built with other sort keys, or its values
+        # are formatted by the API, e.g. timestamps, load the item instead.
+        marker_obj = self._model_query(context, model).filter(
+            model.id == marker.id).first()
+        if marker_obj is None:
+            msg = _("Marker %s not found") % marker.id
+            raise n_exc.BadRequest(resource=model.__tablename__, msg=msg)
+        return marker_obj
+
     # TODO(HenryG): Remove this when available in neutron-lib
     def _filter_non_model_columns(self, data, model):
         return ndb_utils.filter_non_model_columns(data, model)
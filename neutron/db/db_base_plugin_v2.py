@@ -1299,6 +1299,9 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
         if sorts:
             sort_keys = db_utils.get_and_validate_sort_keys(sorts, Port)
             sort_dirs = db_utils.get_sort_dirs(sorts, page_reverse)
+            if isinstance(marker_obj, ndb_utils.KeysetMarker):
+                marker_obj = self._get_keyset_marker_obj(
+                    context, Port, marker_obj, sort_keys)
             query = sa_utils.paginate_query(query, Port, limit,
                                             marker=marker_obj,
                                             sort_keys=sort_keys,
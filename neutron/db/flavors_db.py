@@ -142,11 +142,12 @@ class FlavorsDbMixin(common_db_mixin.CommonDbMixin):
 
     def get_flavors(self, context, filters=None, fields=None,
                     sorts=None, limit=None, marker=None, page_reverse=False):
+        marker_obj = self._get_marker_obj(context, 'flavor', limit, marker)
         return self._get_collection(context, flavor_models.Flavor,
                                     self._make_flavor_dict,
                                     filters=filters, fields=fields,
                                     sorts=sorts, limit=limit,
-                                    marker_obj=marker,
+                                    marker_obj=marker_obj,
                                     page_reverse=page_reverse)
 
     def create_flavor_service_profile(self, context,
@@ -243,11 +244,13 @@ class FlavorsDbMixin(common_db_mixin.CommonDbMixin):
     def get_service_profiles(self, context, filters=None, fields=None,
                              sorts=None, limit=None, marker=None,
                              page_reverse=False):
+        marker_obj = self._get_marker_obj(context, 'service_profile', limit,
+                                          marker)
         return self._get_collection(context, flavor_models.ServiceProfile,
                                     self._make_service_profile_dict,
                                     filters=filters, fields=fields,
                                     sorts=sorts, limit=limit,
-                                    marker_obj=marker,
+                                    marker_obj=marker_obj,
                                     page_reverse=page_reverse)
 
     def get_flavor_next_provider(self, context, flavor_id,
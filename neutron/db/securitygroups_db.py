@@ -650,10 +650,34 @@ class SecurityGroupDbMixin(ext_sg.SecurityGroupPluginBase):
     db_base_plugin_v2.NeutronDbPluginV2.register_dict_extend_funcs(
         attributes.PORTS, ['_extend_port_dict_security_group'])
 
+    def _create_port_security_group_bindings(self, context, bindings):
+        """Create the security group bindings of several ports at once.
+
+        :param bindings: list of (port_id, security_group_id) tuples.
+        """
+        if not bindings:
+            return
+        with context.session.begin(subtransactions=True):
+            context.session.add_all(
+                [sg_models.SecurityGroupPortBinding(
+                    port_id=port_id, security_group_id=security_group_id)
+                 for port_id, security_group_id in bindings])
+            # The bindings are inserted together by a single flush
+            context.session.flush()
+
     def _process_port_create_security_group(self, context, port,
-                                            security_group_ids):
+                                            security_group_ids,
+                                            bindings=None):
+        """Bind the port to its security groups.
+
+        If bindings is a list, the bindings are appended to it instead of
+        being created, see _create_port_security_group_bindings.
+        """
         if validators.is_attr_set(security_group_ids):
             for security_group_id in security_group_ids:
+                if bindings is not None:
+                    bindings.append((port['id'], security_group_id))
+                    continue
                 self._create_port_security_group_binding(context, port['id'],
                                                          security_group_id)
         # Convert to list as a set might be passed here and
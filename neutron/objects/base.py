@@ -25,6 +25,7 @@ import six
 
 from neutron._i18n import _
 from neutron.api.v2 import attributes
+from neutron.db import _utils as ndb_utils
 from neutron.db import api as db_api
 from neutron.db import model_base
 from neutron.db import standard_attr
@@ -74,8 +75,9 @@ class Pager(object):
             if getattr(self, attr) is not None
         }
         if self.marker and self.limit:
-            res['marker_obj'] = obj_db_api.get_object(
-                context, model, id=self.marker)
+            res['marker_obj'] = (
+                ndb_utils.decode_keyset_marker(self.marker) or
+                obj_db_api.get_object(context, model, id=self.marker))
         return res
 
     def __str__(self):
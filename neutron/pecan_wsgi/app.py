@@ -21,6 +21,7 @@ from oslo_middleware import http_proxy_to_wsgi
 from oslo_middleware import request_id
 import pecan
 
+from neutron.api import stats
 from neutron.api import versions
 from neutron.pecan_wsgi import hooks
 from neutron.pecan_wsgi import startup
@@ -69,6 +70,7 @@ def setup_app(*args, **kwargs):
 
 
 def _wrap_app(app):
+    app = stats.RequestStatsMiddleware(app)
     app = request_id.RequestId(app)
     if cfg.CONF.auth_strategy == 'noauth':
         pass
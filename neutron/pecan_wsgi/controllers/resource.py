@@ -17,6 +17,7 @@ import pecan
 from pecan import request
 
 from neutron._i18n import _LW
+from neutron.api import api_common
 from neutron import manager
 from neutron.pecan_wsgi.controllers import utils
 
@@ -135,8 +136,16 @@ class CollectionsController(utils.NeutronPecanController):
         lister_args = [neutron_context]
         if 'parent_id' in request.context:
             lister_args.append(request.context['parent_id'])
-        return {self.collection: self.plugin_lister(*lister_args,
-                **query_params)}
+        items = self.plugin_lister(*lister_args, **query_params)
+        if api_common.can_stream_collection(
+                request.context.get('pagination_helper'),
+                request.context.get('sorting_helper')):
+            # NOTE: the items are neither rendered nor parsed by the hooks,
+            # the PolicyHook streams the ones the user may see.
+            request.context['streamed_items'] = items
+            pecan.response.content_type = 'application/json'
+            return pecan.response
+        return {self.collection: items}
 
     @utils.when(index, method='HEAD')
     @utils.when(index, method='PATCH')
@@ -180,12 +189,12 @@ class MemberActionController(ItemController):
         # If _show_action is None, getattr throws an exception and fails a
         # request.
         if self._show_action:
-            return getattr(self.plugin, self._show_action)
+            return self._get_plugin_method(self._show_action)
 
     @property
     def plugin_updater(self):
         if self._update_action:
-            return getattr(self.plugin, self._update_action)
+            return self._get_plugin_method(self._update_action)
 
     def __init__(self, resource, item, parent_controller, plugin=None,
                  resource_info=None, show_action=None, update_action=None):
@@ -24,6 +24,7 @@ import six
 
 from neutron.api import api_common
 from neutron.api.v2 import attributes as api_attributes
+from neutron.common import request_stats
 from neutron.db import api as db_api
 from neutron import manager
 
@@ -172,30 +173,34 @@ class NeutronPecanController(object):
     def plugin_handlers(self):
         return self._plugin_handlers
 
+    def _get_plugin_method(self, name):
+        return request_stats.timed_callable(
+            'plugin', name, getattr(self.plugin, name))
+
     @property
     def plugin_lister(self):
-        return getattr(self.plugin, self._plugin_handlers[self.LIST])
+        return self._get_plugin_method(self._plugin_handlers[self.LIST])
 
     @property
     def plugin_shower(self):
-        return getattr(self.plugin, self._plugin_handlers[self.SHOW])
+        return self._get_plugin_method(self._plugin_handlers[self.SHOW])
 
     @property
     def plugin_creator(self):
-        return getattr(self.plugin, self._plugin_handlers[self.CREATE])
+        return self._get_plugin_method(self._plugin_handlers[self.CREATE])
 
     @property
     def plugin_bulk_creator(self):
-        return getattr(self.plugin,
-                       '%s_bulk' % self._plugin_handlers[self.CREATE])
+        return self._get_plugin_method(
+            '%s_bulk' % self._plugin_handlers[self.CREATE])
 
     @property
     def plugin_deleter(self):
-        return getattr(self.plugin, self._plugin_handlers[self.DELETE])
+        return self._get_plugin_method(self._plugin_handlers[self.DELETE])
 
     @property
     def plugin_updater(self):
-        return getattr(self.plugin, self._plugin_handlers[self.UPDATE])
+        return self._get_plugin_method(self._plugin_handlers[self.UPDATE])
 
 
 class ShimRequest(object):
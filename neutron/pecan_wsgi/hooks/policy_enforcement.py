@@ -14,6 +14,7 @@
 #    under the License.
 
 import copy
+import functools
 
 from oslo_policy import policy as oslo_policy
 from oslo_utils import excutils
@@ -28,6 +29,7 @@ from neutron.pecan_wsgi import constants as pecan_constants
 from neutron.pecan_wsgi.controllers import quota
 from neutron.pecan_wsgi.hooks import utils
 from neutron import policy
+from neutron import wsgi
 
 
 def _custom_getter(resource, resource_id):
@@ -153,6 +155,10 @@ class PolicyHook(hooks.PecanHook):
         # NOTE(kevinbenton): extension listing isn't controlled by policy
         if resource == 'extension':
             return
+        if 'streamed_items' in state.request.context:
+            self._stream_visible_items(state, controller, resource,
+                                       collection)
+            return
         try:
             data = state.response.json
         except ValueError:
@@ -166,18 +172,23 @@ class PolicyHook(hooks.PecanHook):
         is_single = resource in data
         key = resource if is_single else collection
         to_process = [data[resource]] if is_single else data[collection]
+        plugin = manager.NeutronManager.get_plugin_for_resource(resource)
+        checker = policy.CollectionPolicyChecker(neutron_context,
+                                                 pluralized=collection)
         # in the single case, we enforce which raises on violation
         # in the plural case, we just check so violating items are hidden
-        policy_method = policy.enforce if is_single else policy.check
-        plugin = manager.NeutronManager.get_plugin_for_resource(resource)
+        if is_single:
+            policy_method = functools.partial(
+                policy.enforce, neutron_context, plugin=plugin,
+                pluralized=collection)
+        else:
+            policy_method = checker.check
         try:
             resp = [self._get_filtered_item(state.request, controller,
-                                            resource, collection, item)
+                                            resource, checker, item)
                     for item in to_process
                     if (state.request.method != 'GET' or
-                        policy_method(neutron_context, action, item,
-                                      plugin=plugin,
-                                      pluralized=collection))]
+                        policy_method(action, item))]
         except oslo_policy.PolicyNotAuthorized as e:
             # This exception must be explicitly caught as the exception
             # translation hook won't be called if an error occurs in the
@@ -188,11 +199,25 @@ class PolicyHook(hooks.PecanHook):
             resp = resp[0]
         state.response.json = {key: resp}
 
-    def _get_filtered_item(self, request, controller, resource, collection,
+    def _stream_visible_items(self, state, controller, resource, collection):
+        neutron_context = state.request.context.get('neutron_context')
+        action = 'get_%s' % resource
+        checker = policy.CollectionPolicyChecker(neutron_context,
+                                                 pluralized=collection)
+        items = state.request.context['streamed_items']
+        visible_items = (
+            self._get_filtered_item(state.request, controller, resource,
+                                    checker, item)
+            for item in items
+            if checker.check(action, item))
+        serializer = wsgi.JSONDictSerializer()
+        state.response.app_iter = serializer.serialize_collection(
+            collection, visible_items)
+
+    def _get_filtered_item(self, request, controller, resource, checker,
                            data):
-        neutron_context = request.context.get('neutron_context')
         to_exclude = self._exclude_attributes_by_policy(
-            neutron_context, controller, resource, collection, data)
+            checker, controller, resource, data)
         return self._filter_attributes(request, data, to_exclude)
 
     def _filter_attributes(self, request, data, fields_to_strip):
@@ -204,8 +229,8 @@ class PolicyHook(hooks.PecanHook):
                     if (item[0] not in fields_to_strip and
                         (not user_fields or item[0] in user_fields)))
 
-    def _exclude_attributes_by_policy(self, context, controller, resource,
-                                      collection, data):
+    def _exclude_attributes_by_policy(self, checker, controller, resource,
+                                      data):
         """Identifies attributes to exclude according to authZ policies.
 
         Return a list of attribute names which should be stripped from the
@@ -216,14 +241,12 @@ class PolicyHook(hooks.PecanHook):
         for attr_name in data.keys():
             attr_data = controller.resource_info.get(attr_name)
             if attr_data and attr_data['is_visible']:
-                if policy.check(
-                    context,
+                if checker.check(
                     # NOTE(kevinbenton): this used to reference a
                     # _plugin_handlers dict, why?
                     'get_%s:%s' % (resource, attr_name),
                     data,
-                    might_not_exist=True,
-                    pluralized=collection):
+                    might_not_exist=True):
                     # this attribute is visible, check next one
                     continue
             # if the code reaches this point then either the policy check
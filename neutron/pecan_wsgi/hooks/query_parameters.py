@@ -115,6 +115,9 @@ class QueryParametersHook(hooks.PecanHook):
         if (not resource or resource == 'extension' or
                 state.request.method != 'GET'):
             return
+        # Streamed collections are neither sorted nor paginated here
+        if 'streamed_items' in state.request.context:
+            return
         try:
             data = state.response.json
         except ValueError:
@@ -65,7 +65,29 @@ ml2_opts = [
     cfg.IntOpt('overlay_ip_version',
                default=4,
                help=_("IP version of all overlay (tunnel) network endpoints. "
-                      "Use a value of 4 for IPv4 or 6 for IPv6."))
+                      "Use a value of 4 for IPv4 or 6 for IPv6.")),
+    cfg.FloatOpt('slow_driver_call_threshold',
+                 default=0,
+                 min=0,
+                 help=_("Time, in seconds, above which a call of a mechanism "
+                        "driver is logged as slow, with the driver, the "
+                        "method and the resource it was called for. 0 "
+                        "disables the logging of the slow calls.")),
+    cfg.BoolOpt('concurrent_postcommit',
+                default=False,
+                help=_("Call the postcommit methods of the mechanism "
+                       "drivers declaring their postcommit methods as "
+                       "thread safe concurrently, in green threads. The "
+                       "other drivers are still called one after the other, "
+                       "in the order of mechanism_drivers.")),
+    cfg.BoolOpt('push_resource_objects',
+                default=False,
+                help=_("Push the ports, networks, security groups and "
+                       "security group rules to the agents as versioned "
+                       "objects each time they change, and let the agents "
+                       "pull them. Only enable it for agents keeping these "
+                       "objects in a resource cache, the pushes are sent "
+                       "for nothing otherwise."))
 ]
 
 
@@ -781,6 +781,22 @@ class MechanismDriver(object):
         """
         pass
 
+    def create_port_postcommit_bulk(self, contexts):
+        """Create the ports of a bulk request.
+
+        :param contexts: list of PortContext instances describing the
+        ports.
+
+        Called once after the transaction of a bulk port creation
+        completes, instead of create_port_postcommit for each port. The
+        default implementation calls create_port_postcommit for each
+        port, drivers which can process the ports together should
+        override it. Raising an exception will result in the deletion of
+        all the ports of the request.
+        """
+        for context in contexts:
+            self.create_port_postcommit(context)
+
     def update_port_precommit(self, context):
         """Update resources of a port.
 
@@ -889,6 +905,18 @@ class MechanismDriver(object):
     def _supports_port_binding(self):
         return self.__class__.bind_port != MechanismDriver.bind_port
 
+    @property
+    def is_postcommit_thread_safe(self):
+        """Whether the postcommit methods can run concurrently.
+
+        When the concurrent_postcommit option is enabled, the postcommit
+        methods of the drivers returning True are called in green threads,
+        concurrently with the ones of the other drivers. Such methods must
+        not rely on the order of the drivers, nor use the session of the
+        plugin context, which is shared by the green threads.
+        """
+        return False
+
     def check_vlan_transparency(self, context):
         """Check if the network supports vlan transparency.
 
@@ -223,6 +223,7 @@ class CommonAgentLoop(service.Service):
             # resync is needed
             return True
 
+        self.ext_manager.prepare_ports(self.context, devices_details_list)
         for device_details in devices_details_list:
             self._process_device_if_exists(device_details)
         # no resync is needed
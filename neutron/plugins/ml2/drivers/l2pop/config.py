@@ -22,6 +22,22 @@ l2_population_options = [
     cfg.IntOpt('agent_boot_time', default=180,
                help=_('Delay within which agent is expected to update '
                       'existing ports whent it restarts')),
+    cfg.FloatOpt('fdb_aggregation_interval', default=0,
+                 help=_('Number of seconds during which the fdb entries of '
+                        'the ports going up or down are aggregated before '
+                        'being sent to the agents in a single fanout '
+                        'notification. Set to 0 to notify each port '
+                        'immediately.')),
+    cfg.IntOpt('fdb_cache_timeout', default=0,
+               help=_('Number of seconds during which the tunnel endpoints '
+                      'and fdb entries of a network are cached by the RPC '
+                      'workers, to build the fdb sent to an agent when its '
+                      'first port of the network comes up. The cache '
+                      'follows the l2pop fanout notifications sent by all '
+                      'the server processes. The timeout bounds how long a '
+                      'notification missed while a worker was disconnected '
+                      'from the message bus affects the cache. '
+                      'Set to 0 to disable the cache.')),
 ]
 
 cfg.CONF.register_opts(l2_population_options, "l2pop")
@@ -13,12 +13,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 from neutron_lib import constants as const
 from neutron_lib import exceptions
 from oslo_config import cfg
 from oslo_log import log as logging
+import oslo_messaging
 
 from neutron._i18n import _, _LW
+from neutron.callbacks import events
+from neutron.callbacks import registry
+from neutron.callbacks import resources
+from neutron.common import rpc as n_rpc
+from neutron.common import topics
 from neutron import context as n_context
 from neutron.db import api as db_api
 from neutron.db import l3_hamode_db
@@ -32,15 +40,124 @@ from neutron.plugins.ml2.drivers.l2pop import rpc as l2pop_rpc
 LOG = logging.getLogger(__name__)
 
 
+class NetworkEndpointIndex(object):
+    """Cache of the tunnel endpoints and fdb entries of the networks.
+
+    An entry holds the fdb entries of the nondistributed ports of each
+    tunnel IP with active ports on the network. The entries are only kept
+    once enabled, by the RPC workers following the l2pop fanout
+    notifications of all the server processes: the notifications are
+    applied to the entries the way the agents apply them to their fdb. The
+    changes which can't be applied drop the entry, and entries expire after
+    timeout seconds, which bounds how long a notification missed while the
+    worker was disconnected from the message bus affects them.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.enabled = False
+        self._networks = {}
+
+    def get(self, network_id):
+        """Return the fdb entries of the network by tunnel IP, or None."""
+        cached = self._networks.get(network_id)
+        if cached is None:
+            return
+        if time.time() - cached[0] > self.timeout:
+            del self._networks[network_id]
+            return
+        return cached[1]
+
+    def set(self, network_id, endpoints):
+        if self.enabled and self.timeout > 0:
+            self._networks[network_id] = (time.time(), endpoints)
+
+    def invalidate(self, network_id):
+        self._networks.pop(network_id, None)
+
+    def _iter_endpoint_entries(self, fdb_entries):
+        for network_id, network in fdb_entries.items():
+            cached = self._networks.get(network_id)
+            if cached is None:
+                continue
+            for ip, entries in network.get('ports', {}).items():
+                # The entries are lists once sent over RPC
+                yield cached[1], ip, [l2pop_rpc.PortInfo(*entry)
+                                      for entry in entries]
+
+    def add_fdb_entries(self, fdb_entries):
+        for endpoints, ip, entries in self._iter_endpoint_entries(
+                fdb_entries):
+            ip_fdbs = endpoints.setdefault(ip, [])
+            ip_fdbs.extend(entry for entry in entries
+                           if entry != const.FLOODING_ENTRY and
+                           entry not in ip_fdbs)
+
+    def remove_fdb_entries(self, fdb_entries):
+        for endpoints, ip, entries in self._iter_endpoint_entries(
+                fdb_entries):
+            if const.FLOODING_ENTRY in entries:
+                # The last port of the tunnel IP on the network went down
+                endpoints.pop(ip, None)
+            elif ip in endpoints:
+                endpoints[ip] = [fdb for fdb in endpoints[ip]
+                                 if fdb not in entries]
+
+    def update_fdb_entries(self, fdb_entries):
+        for network_id in fdb_entries.get('chg_ip', {}):
+            # The fixed IPs of ports which are not active change too
+            self.invalidate(network_id)
+        if set(fdb_entries) - set(['chg_ip']):
+            self._networks.clear()
+
+
+class NetworkEndpointIndexCallback(object):
+    """Apply the l2pop fanout notifications to a NetworkEndpointIndex."""
+
+    target = oslo_messaging.Target(version='1.0')
+
+    def __init__(self, index):
+        self.index = index
+
+    def add_fdb_entries(self, context, fdb_entries, host=None):
+        self.index.add_fdb_entries(fdb_entries)
+
+    def remove_fdb_entries(self, context, fdb_entries, host=None):
+        self.index.remove_fdb_entries(fdb_entries)
+
+    def update_fdb_entries(self, context, fdb_entries, host=None):
+        self.index.update_fdb_entries(fdb_entries)
+
+
 class L2populationMechanismDriver(api.MechanismDriver):
 
     def __init__(self):
         super(L2populationMechanismDriver, self).__init__()
         self.L2populationAgentNotify = l2pop_rpc.L2populationAgentNotifyAPI()
+        self.endpoint_index = NetworkEndpointIndex(
+            cfg.CONF.l2pop.fdb_cache_timeout)
 
     def initialize(self):
         LOG.debug("Experimental L2 population driver")
         self.rpc_ctx = n_context.get_admin_context_without_session()
+        if cfg.CONF.l2pop.fdb_cache_timeout > 0:
+            registry.subscribe(self._start_endpoint_index,
+                               resources.PROCESS, events.AFTER_INIT)
+
+    def _start_endpoint_index(self, resource, event, trigger, **kwargs):
+        # The trigger is the start method of the worker. The full fdb of the
+        # agents is built by the RPC workers, handling the ports going up.
+        worker = getattr(trigger, '__self__', None)
+        if getattr(worker, 'worker_type', None) != 'rpc':
+            return
+        self._index_conn = n_rpc.create_connection()
+        self._index_conn.create_consumer(
+            topics.get_topic_name(topics.AGENT, topics.L2POPULATION,
+                                  topics.UPDATE),
+            [NetworkEndpointIndexCallback(self.endpoint_index)],
+            fanout=True)
+        self._index_conn.consume_in_threads()
+        self.endpoint_index.enabled = True
 
     def _get_port_fdb_entries(self, port):
         # the port might be concurrently deleted
@@ -78,10 +195,14 @@ class L2populationMechanismDriver(api.MechanismDriver):
             other_fdb_ports = self._get_ha_port_agents_fdb(
                 session, network_id, port['device_id'])
             fdb_entries[network_id]['ports'] = other_fdb_ports
+            self.endpoint_index.invalidate(network_id)
 
         self.L2populationAgentNotify.remove_fdb_entries(self.rpc_ctx,
             fdb_entries)
 
+    def delete_network_postcommit(self, context):
+        self.endpoint_index.invalidate(context.current['id'])
+
     def filter_hosts_with_segment_access(
             self, context, segments, candidate_hosts, agent_getter):
         # NOTE(cbrandily): let other mechanisms (openvswitch, linuxbridge, ...)
@@ -120,6 +241,9 @@ class L2populationMechanismDriver(api.MechanismDriver):
                                           ip_address=ip)
                        for ip in port_ips]
 
+        # The previous fdb entries of the port can't be told apart from the
+        # ones of its other IPs in the index
+        self.endpoint_index.invalidate(port['network_id'])
         upd_fdb_entries = {port['network_id']: {agent_ip: {}}}
 
         ports = upd_fdb_entries[port['network_id']][agent_ip]
@@ -197,43 +321,49 @@ class L2populationMechanismDriver(api.MechanismDriver):
 
         return True
 
-    def _create_agent_fdb(self, session, agent, segment, network_id):
-        agent_fdb_entries = {network_id:
-                             {'segment_id': segment['segmentation_id'],
-                              'network_type': segment['network_type'],
-                              'ports': {}}}
+    def _get_network_endpoints(self, session, network_id):
+        """Return the fdb entries of the network, by tunnel IP.
+
+        They are served from the endpoint index when it has the network.
+        """
+        cached = self.endpoint_index.get(network_id)
+        if cached is not None:
+            return cached
         tunnel_network_ports = (
             l2pop_db.get_distributed_active_network_ports(session, network_id))
         fdb_network_ports = (
             l2pop_db.get_nondistributed_active_network_ports(session,
                                                              network_id))
-        ports = agent_fdb_entries[network_id]['ports']
-        ports.update(self._get_tunnels(
-            fdb_network_ports + tunnel_network_ports,
-            agent.host))
-        for agent_ip, fdbs in ports.items():
-            for binding, agent in fdb_network_ports:
-                if l2pop_db.get_agent_ip(agent) == agent_ip:
-                    fdbs.extend(self._get_port_fdb_entries(binding.port))
-
-        return agent_fdb_entries
-
-    def _get_tunnels(self, tunnel_network_ports, exclude_host):
-        agents = {}
-        for __, agent in tunnel_network_ports:
-            if agent.host == exclude_host:
-                continue
-
+        endpoints = {}
+        agent_ips = {}
+        for __, agent in fdb_network_ports + tunnel_network_ports:
             ip = l2pop_db.get_agent_ip(agent)
             if not ip:
                 LOG.debug("Unable to retrieve the agent ip, check "
                           "the agent %s configuration.", agent.host)
                 continue
+            agent_ips[agent.host] = ip
+            endpoints.setdefault(ip, [])
+        for binding, agent in fdb_network_ports:
+            ip = agent_ips.get(agent.host)
+            if ip:
+                endpoints[ip].extend(self._get_port_fdb_entries(binding.port))
+        self.endpoint_index.set(network_id, endpoints)
+        return endpoints
 
-            if ip not in agents:
-                agents[ip] = [const.FLOODING_ENTRY]
+    def _create_agent_fdb(self, session, agent, segment, network_id):
+        agent_fdb_entries = {network_id:
+                             {'segment_id': segment['segmentation_id'],
+                              'network_type': segment['network_type'],
+                              'ports': {}}}
+        endpoints = self._get_network_endpoints(session, network_id)
+        agent_ip = l2pop_db.get_agent_ip(agent)
+        ports = agent_fdb_entries[network_id]['ports']
+        for ip, ip_fdbs in endpoints.items():
+            if ip != agent_ip:
+                ports[ip] = [const.FLOODING_ENTRY] + ip_fdbs
 
-        return agents
+        return agent_fdb_entries
 
     def update_port_down(self, context):
         port = context.current
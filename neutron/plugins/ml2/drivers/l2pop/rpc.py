@@ -15,11 +15,15 @@
 
 import collections
 
+import eventlet
+from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
 
+from neutron._i18n import _LE
 from neutron.common import rpc as n_rpc
 from neutron.common import topics
+from neutron.plugins.ml2.drivers.l2pop import config  # noqa
 
 
 LOG = logging.getLogger(__name__)
@@ -27,6 +31,22 @@ LOG = logging.getLogger(__name__)
 
 PortInfo = collections.namedtuple("PortInfo", "mac_address ip_address")
 
+# The fanout notifications whose fdb entries can be merged together
+_AGGREGATED_METHODS = ('add_fdb_entries', 'remove_fdb_entries')
+
+
+def _merge_fdb_entries(merged, fdb_entries):
+    for network_id, values in fdb_entries.items():
+        merged_values = merged.setdefault(
+            network_id, {'segment_id': values['segment_id'],
+                         'network_type': values['network_type'],
+                         'ports': {}})
+        for agent_ip, entries in values['ports'].items():
+            merged_entries = merged_values['ports'].setdefault(agent_ip, [])
+            for entry in entries:
+                if entry not in merged_entries:
+                    merged_entries.append(entry)
+
 
 class L2populationAgentNotifyAPI(object):
 
@@ -37,8 +57,48 @@ class L2populationAgentNotifyAPI(object):
                                                         topics.UPDATE)
         target = oslo_messaging.Target(topic=topic, version='1.0')
         self.client = n_rpc.get_client(target)
+        self._pending_fanouts = []
+        self._flush_thread = None
 
     def _notification_fanout(self, context, method, fdb_entries):
+        if cfg.CONF.l2pop.fdb_aggregation_interval > 0:
+            self._queue_fanout(context, method, fdb_entries)
+        else:
+            self._cast_fanout(context, method, fdb_entries)
+
+    def _queue_fanout(self, context, method, fdb_entries):
+        # The notifications are sent in order, only the fdb entries of
+        # consecutive additions or removals are merged.
+        if method in _AGGREGATED_METHODS:
+            pending = self._pending_fanouts
+            if pending and pending[-1][1] == method:
+                merged = pending[-1][2]
+            else:
+                merged = {}
+                self._pending_fanouts.append((context, method, merged))
+            _merge_fdb_entries(merged, fdb_entries)
+        else:
+            self._pending_fanouts.append((context, method, fdb_entries))
+        if self._flush_thread is None:
+            self._flush_thread = eventlet.spawn_after(
+                cfg.CONF.l2pop.fdb_aggregation_interval,
+                self.flush_pending_fanouts)
+
+    def flush_pending_fanouts(self):
+        """Send the pending fanout notifications now."""
+        if self._flush_thread is not None:
+            self._flush_thread.cancel()
+            self._flush_thread = None
+        pending, self._pending_fanouts = self._pending_fanouts, []
+        for context, method, fdb_entries in pending:
+            try:
+                self._cast_fanout(context, method, fdb_entries)
+            except Exception:
+                LOG.exception(_LE("Failed to send the %(method)s fanout "
+                                  "notification of %(count)d networks."),
+                              {'method': method, 'count': len(fdb_entries)})
+
+    def _cast_fanout(self, context, method, fdb_entries):
         LOG.debug('Fanout notify l2population agents at %(topic)s '
                   'the message %(method)s with %(fdb_entries)s',
                   {'topic': self.topic,
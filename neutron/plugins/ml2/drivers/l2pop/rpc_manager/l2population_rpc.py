@@ -189,6 +189,23 @@ class L2populationRpcCallBackTunnelMixin(L2populationRpcCallBackMixin):
         '''
         pass
 
+    def setup_tunnel_ports(self, br, tunnels):
+        '''Setup several added tunnel ports.
+
+        This method is assumed to be used by method fdb_add_tun_entries.
+        It calls setup_tunnel_port for each tunnel, override it to add all
+        the ports to the bridge at once.
+
+        :param br: represent the bridge on which setup_tunnel_ports should be
+        applied.
+        :param tunnels: a set of (remote_ip, network_type) tuples.
+        :returns: a dict of ofport values by (remote_ip, network_type) tuple.
+            value 0 means the port is unavailable.
+        '''
+        return {(remote_ip, network_type):
+                self.setup_tunnel_port(br, remote_ip, network_type)
+                for remote_ip, network_type in tunnels}
+
     @abc.abstractmethod
     def cleanup_tunnel_port(self, br, tun_ofport, tunnel_type):
         '''Clean up a deleted tunnel port.
@@ -275,6 +292,31 @@ class L2populationRpcCallBackTunnelMixin(L2populationRpcCallBackMixin):
             for port in ports:
                 self.add_fdb_flow(br, port, remote_ip, lvm, ofport)
 
+    def fdb_add_tun_entries(self, context, br, entries, lookup_port):
+        '''Call fdb_add_tun for the ports of several networks.
+
+        The tunnel ports missing for any of the networks are set up first,
+        with a single setup_tunnel_ports call.
+
+        :param entries: a list of (lvm, agent_ports) pairs, as yielded by
+            get_agent_ports.
+        '''
+        missing_tunnels = set()
+        for lvm, agent_ports in entries:
+            for remote_ip in agent_ports:
+                if not lookup_port(lvm.network_type, remote_ip):
+                    missing_tunnels.add((remote_ip, lvm.network_type))
+        failed_tunnels = set()
+        if missing_tunnels:
+            ofports = self.setup_tunnel_ports(br, missing_tunnels)
+            failed_tunnels = {tunnel for tunnel in missing_tunnels
+                              if not ofports.get(tunnel)}
+        for lvm, agent_ports in entries:
+            agent_ports = {
+                remote_ip: ports for remote_ip, ports in agent_ports.items()
+                if (remote_ip, lvm.network_type) not in failed_tunnels}
+            self.fdb_add_tun(context, br, lvm, agent_ports, lookup_port)
+
     @log_helpers.log_method_call
     def fdb_remove_tun(self, context, br, lvm, agent_ports, lookup_port):
         for remote_ip, ports in agent_ports.items():
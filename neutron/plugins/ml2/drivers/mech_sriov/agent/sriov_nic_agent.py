@@ -297,6 +297,7 @@ class SriovNicSwitchAgent(object):
             # resync is needed
             return True
 
+        self.ext_manager.prepare_ports(self.context, devices_details_list)
         for device_details in devices_details_list:
             device = device_details['device']
             LOG.debug("Port with MAC address %s is added", device)
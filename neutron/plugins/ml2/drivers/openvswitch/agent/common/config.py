@@ -100,6 +100,12 @@ agent_opts = [
     cfg.IntOpt('polling_interval', default=2,
                help=_("The number of seconds the agent will wait between "
                       "polling for local device changes.")),
+    cfg.FloatOpt('min_polling_interval', default=0.5,
+                 help=_("The minimum number of seconds between the start of "
+                        "two polls for local device changes. The agent polls "
+                        "as soon as a device change or a port, network or "
+                        "security group notification is received, but no "
+                        "more often than this.")),
     cfg.BoolOpt('minimize_polling',
                 default=True,
                 help=_("Minimize polling by monitoring ovsdb for interface "
@@ -108,6 +114,15 @@ agent_opts = [
                default=constants.DEFAULT_OVSDBMON_RESPAWN,
                help=_("The number of seconds to wait before respawning the "
                       "ovsdb monitor after losing communication with it.")),
+    cfg.IntOpt('port_processing_workers', default=1, min=1,
+               help=_("The number of networks whose added or updated ports "
+                      "are processed concurrently. When greater than 1, "
+                      "the details of the ports are fetched in concurrent "
+                      "batches, and the ports of each network are wired, "
+                      "filtered and reported as soon as their details are "
+                      "received, while the ports of other networks are "
+                      "processed. The ports of a network are always "
+                      "processed in order.")),
     cfg.ListOpt('tunnel_types', default=DEFAULT_TUNNEL_TYPES,
                 help=_("Network types supported by the agent "
                        "(gre and/or vxlan).")),
@@ -151,6 +166,11 @@ agent_opts = [
     cfg.BoolOpt('drop_flows_on_start', default=False,
                 help=_("Reset flow table on start. Setting this to True will "
                        "cause brief traffic interruption.")),
+    cfg.IntOpt('flow_cleanup_tables_per_iteration', default=0, min=0,
+               help=_("The number of OpenFlow tables of a bridge whose stale "
+                      "flows are deleted in each iteration of the agent loop "
+                      "after a start. A value of 0 deletes the stale flows "
+                      "of all the tables at once.")),
     cfg.BoolOpt('tunnel_csum', default=False,
                 help=_("Set or un-set the tunnel header checksum  on "
                        "outgoing IP packet carrying GRE/VXLAN tunnel.")),
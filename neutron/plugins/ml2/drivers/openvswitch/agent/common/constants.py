@@ -95,6 +95,9 @@ DVR_NOT_LEARN_VLAN = 3
 # type for ARP reply in ARP header
 ARP_REPLY = '0x2'
 
+# Number of the OpenFlow tables of a bridge, the last one is 254
+NUM_OPENFLOW_TABLES = 255
+
 # Map tunnel types to tables number
 TUN_TABLE = {p_const.TYPE_GRE: GRE_TUN_TO_LV,
              p_const.TYPE_VXLAN: VXLAN_TUN_TO_LV,
@@ -133,6 +136,13 @@ VHOST_USER_SOCKET_DIR = '/var/run/openvswitch'
 
 MAX_DEVICE_RETRIES = 5
 
+# Number of devices whose details are fetched in one call when the ports are
+# processed concurrently
+PORT_DETAILS_BATCH_SIZE = 50
+
+# Number of the latest plug to ACTIVE latencies reported by the agent
+PORT_PLUG_LATENCY_SAMPLES = 100
+
 # OpenFlow version constants
 OPENFLOW10 = "OpenFlow10"
 OPENFLOW11 = "OpenFlow11"
@@ -13,8 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+
 from neutron.agent.common import ovs_lib
 
+# Key of the Bridge external_ids listing the cookies of the agent flows
+COOKIES_EXTERNAL_ID = 'neutron-flow-cookies'
+
 
 class OVSBridgeCookieMixin(object):
     '''Mixin to provide cookie retention functionality
@@ -24,6 +29,14 @@ class OVSBridgeCookieMixin(object):
     def __init__(self, *args, **kwargs):
         super(OVSBridgeCookieMixin, self).__init__(*args, **kwargs)
         self._reserved_cookies = set()
+        self._cookies_recorded = False
+        self._stale_cookies_forgotten = False
+        # The cookies recorded by a previous run of the agent, read once
+        self._previous_cookies = set()
+        # Whether released cookies are still recorded
+        self._cookies_dirty = False
+        # The cookies of the flows installed for an owner, e.g. a port
+        self._owner_cookies = {}
 
     @property
     def reserved_cookies(self):
@@ -31,7 +44,7 @@ class OVSBridgeCookieMixin(object):
             self._reserved_cookies.add(self._default_cookie)
         return set(self._reserved_cookies)
 
-    def request_cookie(self):
+    def request_cookie(self, record=True):
         if self._default_cookie not in self._reserved_cookies:
             self._reserved_cookies.add(self._default_cookie)
 
@@ -40,10 +53,124 @@ class OVSBridgeCookieMixin(object):
             uuid_stamp = ovs_lib.generate_random_cookie()
 
         self._reserved_cookies.add(uuid_stamp)
+        if record and self._cookies_recorded:
+            self._write_recorded_cookies()
         return uuid_stamp
 
+    def release_cookie(self, cookie):
+        """Stop reserving a cookie once its flows are deleted.
+
+        The record is only rewritten by the next flush_cookies or the next
+        cookie reservation, as keeping a released cookie recorded is
+        harmless.
+        """
+        self._reserved_cookies.discard(cookie)
+        if self._cookies_recorded:
+            self._cookies_dirty = True
+
+    def reserve_owner_cookies(self, owners):
+        """Request a cookie for each owner which does not have one yet."""
+        new_owners = set(owners) - set(self._owner_cookies)
+        for owner in new_owners:
+            self._owner_cookies[owner] = self.request_cookie(record=False)
+        if new_owners and self._cookies_recorded:
+            self._write_recorded_cookies()
+
+    def get_owner_bridge(self, owner):
+        """Return a copy of the bridge installing flows for owner.
+
+        The flows installed through the copy carry the cookie of the owner,
+        so that delete_owner_flows can delete them all with an exact cookie
+        match, which Open vSwitch resolves without scanning its tables.
+        """
+        self.reserve_owner_cookies([owner])
+        bridge = copy.copy(self)
+        bridge._default_cookie = self._owner_cookies[owner]
+        return bridge
+
+    def has_flow_owner(self, owner):
+        return owner in self._owner_cookies
+
+    def delete_owner_flows(self, owner, **match_kwargs):
+        """Delete the flows installed for owner and release its cookie.
+
+        When match_kwargs are given, the flows matching them which carry
+        another cookie of the agent, e.g. the cookie of an agent extension,
+        are deleted as well. One delete is sent per cookie, with an exact
+        cookie match, so that Open vSwitch finds the flows with its cookie
+        index instead of matching every flow of the bridge.
+        """
+        cookie = self._owner_cookies.pop(owner, None)
+        if cookie is not None:
+            self.delete_flows_by_cookies([cookie])
+            self.release_cookie(cookie)
+        if match_kwargs:
+            self.delete_flows_by_cookies(
+                (self.reserved_cookies | self._previous_cookies) -
+                set(self._owner_cookies.values()), **match_kwargs)
+
     def set_agent_uuid_stamp(self, val):
         self._reserved_cookies.add(val)
         if self._default_cookie in self._reserved_cookies:
             self._reserved_cookies.remove(self._default_cookie)
         super(OVSBridgeCookieMixin, self).set_agent_uuid_stamp(val)
+
+    def _get_recorded_cookies(self):
+        external_ids = self.db_get_val('Bridge', self.br_name,
+                                       'external_ids') or {}
+        cookies = external_ids.get(COOKIES_EXTERNAL_ID)
+        if cookies is None:
+            return None
+        return set(int(cookie, 16) for cookie in cookies.split(',') if cookie)
+
+    def _set_recorded_cookies(self, cookies):
+        self.set_db_attribute(
+            'Bridge', self.br_name, 'external_ids',
+            {COOKIES_EXTERNAL_ID: ','.join(
+                '%#x' % cookie for cookie in sorted(cookies))})
+
+    def _write_recorded_cookies(self):
+        self._set_recorded_cookies(
+            self._previous_cookies | self.reserved_cookies)
+        self._cookies_dirty = False
+
+    def record_cookies(self):
+        """Record the reserved cookies in the bridge external_ids.
+
+        The cookies recorded by a previous run of the agent are kept until
+        forget_stale_cookies is called, so that the flows they mark can
+        still be deleted by cookie after a restart. They are only read by
+        the first call, the cookies reserved afterwards are recorded without
+        reading the bridge again.
+        """
+        if not self._cookies_recorded and not self._stale_cookies_forgotten:
+            self._previous_cookies = self._get_recorded_cookies() or set()
+        self._write_recorded_cookies()
+        self._cookies_recorded = True
+
+    def flush_cookies(self):
+        """Record the reserved cookies if cookies were released since.
+
+        The agent calls it once per loop iteration, so that the cookies
+        released by an iteration are recorded with a single write.
+        """
+        if self._cookies_dirty:
+            self._write_recorded_cookies()
+
+    def get_stale_cookies(self):
+        """Return the recorded cookies which are not reserved anymore.
+
+        None is returned when no cookie was ever recorded on the bridge, the
+        stale flows then have to be found by dumping them.
+        """
+        recorded = self._get_recorded_cookies()
+        if recorded is None:
+            return None
+        return recorded - self.reserved_cookies
+
+    def forget_stale_cookies(self):
+        """Only keep the reserved cookies recorded, once flows are cleaned."""
+        self._previous_cookies = set()
+        self._write_recorded_cookies()
+        self._cookies_recorded = True
+        self._stale_cookies_forgotten = True
@@ -23,7 +23,8 @@ from oslo_utils import timeutils
 import ryu.app.ofctl.api as ofctl_api
 import ryu.exception as ryu_exc
 
-from neutron._i18n import _, _LW
+from neutron._i18n import _, _LI, _LW
+from neutron.agent.common import ovs_lib
 
 LOG = logging.getLogger(__name__)
 
@@ -134,13 +135,41 @@ class OpenFlowSwitchMixin(object):
             flows += rep.body
         return flows
 
-    def cleanup_flows(self):
-        cookies = set([f.cookie for f in self.dump_flows()]) - \
-                  self.reserved_cookies
-        for c in cookies:
-            LOG.warning(_LW("Deleting flow with cookie 0x%(cookie)x"),
-                        {'cookie': c})
-            self.delete_flows(cookie=c, cookie_mask=((1 << 64) - 1))
+    def delete_flows_by_cookies(self, cookies, table_ids=None,
+                                **match_kwargs):
+        for cookie in cookies:
+            for table_id in (table_ids or [None]):
+                self.delete_flows(table_id=table_id, cookie=cookie,
+                                  cookie_mask=ovs_lib.UINT64_BITMASK,
+                                  **match_kwargs)
+
+    def cleanup_flows(self, table_ids=None):
+        """Delete the flows whose cookie is not reserved by the agent.
+
+        The flows of the cookies recorded by a previous run of the agent are
+        deleted by cookie inside Open vSwitch. The flows are only dumped
+        when no cookie was ever recorded on the bridge.
+
+        :param table_ids: the tables to clean, all of them by default.
+        """
+        stale_cookies = self.get_stale_cookies()
+        if stale_cookies is not None:
+            for cookie in stale_cookies:
+                LOG.info(_LI("Deleting flows with cookie %#x"), cookie)
+        else:
+            flows = []
+            for table_id in (table_ids or [None]):
+                flows += self.dump_flows(table_id)
+            stale_cookies = set(f.cookie for f in flows) - \
+                self.reserved_cookies
+            for c in stale_cookies:
+                # deleting a stale flow should be rare.
+                # it might deserve some attention
+                LOG.warning(_LW("Deleting flow with cookie 0x%(cookie)x"),
+                            {'cookie': c})
+        self.delete_flows_by_cookies(stale_cookies, table_ids)
+        if table_ids is None:
+            self.forget_stale_cookies()
 
     def install_goto_next(self, table_id):
         self.install_goto(table_id=table_id, dest_table_id=table_id + 1)
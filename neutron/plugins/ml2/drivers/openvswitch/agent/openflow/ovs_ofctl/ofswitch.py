@@ -18,7 +18,7 @@ import re
 
 from oslo_log import log as logging
 
-from neutron._i18n import _LW
+from neutron._i18n import _LI, _LW
 
 LOG = logging.getLogger(__name__)
 
@@ -102,10 +102,45 @@ class OpenFlowSwitchMixin(object):
                 fl_table = fl_table.group(1)
                 yield flow, fl_cookie, fl_table
 
-    def cleanup_flows(self):
-        flows = self.dump_flows_all_tables()
-        for flow, cookie, table in self._filter_flows(flows):
-            # deleting a stale flow should be rare.
-            # it might deserve some attention
-            LOG.warning(_LW("Deleting flow %s"), flow)
-            self.delete_flows(cookie=cookie + '/-1', table=table)
+    def delete_flows_by_cookies(self, cookies, table_ids=None,
+                                **match_kwargs):
+        tables = [{}] if table_ids is None else [
+            {'table': table_id} for table_id in table_ids]
+        kwargs_list = [dict(table, cookie='%#x/-1' % cookie, **match_kwargs)
+                       for cookie in cookies for table in tables]
+        if kwargs_list:
+            self.do_action_flows('del', kwargs_list)
+
+    def _dump_flows_of_tables(self, table_ids):
+        if table_ids is None:
+            return self.dump_flows_all_tables()
+        flows = []
+        for table_id in table_ids:
+            table_flows = self.dump_flows(table_id)
+            if table_flows:
+                flows.extend(table_flows.splitlines())
+        return flows
+
+    def cleanup_flows(self, table_ids=None):
+        """Delete the flows whose cookie is not reserved by the agent.
+
+        The flows of the cookies recorded by a previous run of the agent are
+        deleted by cookie inside Open vSwitch. The flows are only dumped
+        when no cookie was ever recorded on the bridge.
+
+        :param table_ids: the tables to clean, all of them by default.
+        """
+        stale_cookies = self.get_stale_cookies()
+        if stale_cookies is not None:
+            for cookie in stale_cookies:
+                LOG.info(_LI("Deleting flows with cookie %#x"), cookie)
+            self.delete_flows_by_cookies(stale_cookies, table_ids)
+        else:
+            flows = self._dump_flows_of_tables(table_ids)
+            for flow, cookie, table in self._filter_flows(flows):
+                # deleting a stale flow should be rare.
+                # it might deserve some attention
+                LOG.warning(_LW("Deleting flow %s"), flow)
+                self.delete_flows(cookie=cookie + '/-1', table=table)
+        if table_ids is None:
+            self.forget_stale_cookies()
@@ -19,8 +19,10 @@ import functools
 import hashlib
 import signal
 import sys
+import threading
 import time
 
+import eventlet
 import netaddr
 from neutron_lib import constants as n_const
 from neutron_lib.utils import helpers
@@ -175,6 +177,15 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         self.network_ports = collections.defaultdict(set)
         # keeps association between ports and ofports to detect ofport change
         self.vifname_to_ofport_map = {}
+        # Set when a notification or an ovsdb change needs the rpc_loop to
+        # run without waiting for the end of the polling interval
+        self._loop_wakeup = threading.Event()
+        self._ovsdb_event_time = None
+        # Time at which the added ports were seen, to measure their latency
+        # until they are reported ACTIVE
+        self._port_plug_times = {}
+        self.port_plug_latencies = collections.deque(
+            maxlen=constants.PORT_PLUG_LATENCY_SAMPLES)
         self.setup_rpc()
         self.bridge_mappings = self._parse_bridge_mappings(
             ovs_conf.bridge_mappings)
@@ -184,6 +195,13 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         self._reset_tunnel_ofports()
 
         self.polling_interval = agent_conf.polling_interval
+        self.min_polling_interval = agent_conf.min_polling_interval
+        self.port_processing_workers = agent_conf.port_processing_workers
+        # Serializes the firewall updates of the networks processed
+        # concurrently
+        self._port_filters_lock = threading.Lock()
+        # The steps left of an incremental cleanup of the stale flows
+        self._stale_flows_cleanup = None
         self.minimize_polling = agent_conf.minimize_polling
         self.ovsdb_monitor_respawn_interval = (
             agent_conf.ovsdb_monitor_respawn_interval or
@@ -303,6 +321,8 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             self.int_br_device_count)
         self.agent_state.get('configurations')['in_distributed_mode'] = (
             self.dvr_agent.in_distributed_mode())
+        self.agent_state.get('configurations')['port_plug_latency'] = (
+            self.get_port_plug_latency_stats())
 
         try:
             agent_status = self.state_rpc.report_state(self.context,
@@ -398,12 +418,14 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         # they are not used since there is no guarantee the notifications
         # are processed in the same order as the relevant API requests
         self.updated_ports.add(port['id'])
+        self._wake_up_loop()
         LOG.debug("port_update message processed for port %s", port['id'])
 
     def port_delete(self, context, **kwargs):
         port_id = kwargs.get('port_id')
         self.deleted_ports.add(port_id)
         self.updated_ports.discard(port_id)
+        self._wake_up_loop()
         LOG.debug("port_delete message processed for port %s", port_id)
 
     def network_update(self, context, **kwargs):
@@ -413,11 +435,68 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             # we don't want to update it anymore
             if port_id not in self.deleted_ports:
                 self.updated_ports.add(port_id)
+        self._wake_up_loop()
         LOG.debug("network_update message processed for network "
                   "%(network_id)s, with ports: %(ports)s",
                   {'network_id': network_id,
                    'ports': self.network_ports[network_id]})
 
+    def security_groups_rule_updated(self, context, **kwargs):
+        super(OVSNeutronAgent, self).security_groups_rule_updated(context,
+                                                                  **kwargs)
+        self._wake_up_loop()
+
+    def security_groups_member_updated(self, context, **kwargs):
+        super(OVSNeutronAgent, self).security_groups_member_updated(context,
+                                                                    **kwargs)
+        self._wake_up_loop()
+
+    def security_groups_provider_updated(self, context, **kwargs):
+        super(OVSNeutronAgent, self).security_groups_provider_updated(
+            context, **kwargs)
+        self._wake_up_loop()
+
+    def _wake_up_loop(self):
+        self._loop_wakeup.set()
+
+    def _handle_ovsdb_event(self):
+        if self._ovsdb_event_time is None:
+            self._ovsdb_event_time = time.time()
+        self._wake_up_loop()
+
+    def _wait_for_loop_wakeup(self, timeout):
+        self._loop_wakeup.wait(timeout)
+
+    def _record_plugged_ports(self, port_info, plug_time):
+        for port_id in port_info.get('added', ()):
+            self._port_plug_times.setdefault(port_id, plug_time)
+        for port_id in port_info.get('removed', ()):
+            self._port_plug_times.pop(port_id, None)
+
+    def _record_port_plug_latencies(self, devices_up, devices_down):
+        now = time.time()
+        for device in devices_up:
+            plug_time = self._port_plug_times.pop(device, None)
+            if plug_time is None:
+                continue
+            latency = now - plug_time
+            self.port_plug_latencies.append(latency)
+            LOG.debug("Port %(device)s became ACTIVE %(latency).3f seconds "
+                      "after being plugged",
+                      {'device': device, 'latency': latency})
+        for device in devices_down:
+            self._port_plug_times.pop(device, None)
+
+    def get_port_plug_latency_stats(self):
+        """Return statistics of the latest plug to ACTIVE latencies."""
+        latencies = list(self.port_plug_latencies)
+        if not latencies:
+            return {}
+        return {'samples': len(latencies),
+                'last': round(latencies[-1], 3),
+                'average': round(sum(latencies) / len(latencies), 3),
+                'max': round(max(latencies), 3)}
+
     def _clean_network_ports(self, port_id):
         for port_set in self.network_ports.values():
             if port_id in port_set:
@@ -492,32 +571,51 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
     def _tunnel_port_lookup(self, network_type, remote_ip):
         return self.tun_br_ofports[network_type].get(remote_ip)
 
-    def fdb_add(self, context, fdb_entries):
-        LOG.debug("fdb_add received")
+    def _get_remote_agent_ports(self, fdb_entries):
+        entries = []
         for lvm, agent_ports in self.get_agent_ports(fdb_entries):
             agent_ports.pop(self.local_ip, None)
             if len(agent_ports):
-                if not self.enable_distributed_routing:
-                    with self.tun_br.deferred() as deferred_br:
-                        self.fdb_add_tun(context, deferred_br, lvm,
-                                         agent_ports, self._tunnel_port_lookup)
-                else:
-                    self.fdb_add_tun(context, self.tun_br, lvm,
-                                     agent_ports, self._tunnel_port_lookup)
+                entries.append((lvm, agent_ports))
+        return entries
+
+    def fdb_add(self, context, fdb_entries):
+        LOG.debug("fdb_add received")
+        start = time.time()
+        entries = self._get_remote_agent_ports(fdb_entries)
+        if not entries:
+            return
+        # The flows of all the networks are applied at once
+        if not self.enable_distributed_routing:
+            with self.tun_br.deferred() as deferred_br:
+                self.fdb_add_tun_entries(context, deferred_br, entries,
+                                         self._tunnel_port_lookup)
+        else:
+            self.fdb_add_tun_entries(context, self.tun_br, entries,
+                                     self._tunnel_port_lookup)
+        LOG.debug("fdb_add of %(count)d networks applied in %(elapsed).3f "
+                  "seconds", {'count': len(entries),
+                              'elapsed': time.time() - start})
 
     def fdb_remove(self, context, fdb_entries):
         LOG.debug("fdb_remove received")
-        for lvm, agent_ports in self.get_agent_ports(fdb_entries):
-            agent_ports.pop(self.local_ip, None)
-            if len(agent_ports):
-                if not self.enable_distributed_routing:
-                    with self.tun_br.deferred() as deferred_br:
-                        self.fdb_remove_tun(context, deferred_br, lvm,
-                                            agent_ports,
-                                            self._tunnel_port_lookup)
-                else:
-                    self.fdb_remove_tun(context, self.tun_br, lvm,
-                                        agent_ports, self._tunnel_port_lookup)
+        start = time.time()
+        entries = self._get_remote_agent_ports(fdb_entries)
+        if not entries:
+            return
+        if not self.enable_distributed_routing:
+            with self.tun_br.deferred() as deferred_br:
+                for lvm, agent_ports in entries:
+                    self.fdb_remove_tun(context, deferred_br, lvm,
+                                        agent_ports,
+                                        self._tunnel_port_lookup)
+        else:
+            for lvm, agent_ports in entries:
+                self.fdb_remove_tun(context, self.tun_br, lvm,
+                                    agent_ports, self._tunnel_port_lookup)
+        LOG.debug("fdb_remove of %(count)d networks applied in "
+                  "%(elapsed).3f seconds", {'count': len(entries),
+                                            'elapsed': time.time() - start})
 
     def add_fdb_flow(self, br, port_info, remote_ip, lvm, ofport):
         if port_info == n_const.FLOODING_ENTRY:
@@ -825,6 +923,9 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         port_info = self.int_br.get_ports_attributes(
             "Port", columns=["name", "tag"], ports=port_names, if_exists=True)
         tags_by_name = {x['name']: x['tag'] for x in port_info}
+        if self.prevent_arp_spoofing:
+            self.int_br.reserve_owner_cookies(
+                [p['vif_port'].ofport for p in need_binding_ports])
         for port_detail in need_binding_ports:
             try:
                 lvm = self.vlan_manager.get(port_detail['network_id'])
@@ -844,8 +945,9 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             if cur_tag and cur_tag != lvm.vlan:
                 self.int_br.delete_flows(in_port=port.ofport)
             if self.prevent_arp_spoofing:
-                self.setup_arp_spoofing_protection(self.int_br,
-                                                   port, port_detail)
+                self.setup_arp_spoofing_protection(
+                    self.int_br.get_owner_bridge(port.ofport),
+                    port, port_detail)
             if cur_tag != lvm.vlan:
                 self.int_br.set_db_attribute(
                     "Port", port.port_name, "tag", lvm.vlan)
@@ -870,6 +972,8 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             if failed_devices:
                 LOG.error(_LE("Configuration for devices %s failed!"),
                           failed_devices)
+            self._record_port_plug_latencies(
+                set(devices_up) - set(failed_devices), devices_down)
         LOG.info(_LI("Configuration for devices up %(up)s and devices "
                      "down %(down)s completed."),
                  {'up': devices_up, 'down': devices_down})
@@ -966,7 +1070,13 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             self.int_br.set_db_attribute("Port", port.port_name, "tag",
                                          constants.DEAD_VLAN_TAG,
                                          log_errors=log_errors)
-            self.int_br.drop_port(in_port=port.ofport)
+            port_br = self.int_br
+            if (self.prevent_arp_spoofing and
+                    self.int_br.has_flow_owner(port.ofport)):
+                # Give the drop flow the cookie reserved for the port flows
+                # when the port was bound
+                port_br = self.int_br.get_owner_bridge(port.ofport)
+            port_br.drop_port(in_port=port.ofport)
 
     def setup_integration_br(self):
         '''Setup the integration bridge.
@@ -979,6 +1089,7 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         self.int_br.create()
         self.int_br.set_secure_mode()
         self.int_br.setup_controllers(self.conf)
+        self.int_br.record_cookies()
 
         if self.conf.AGENT.drop_flows_on_start:
             # Delete the patch port between br-int and br-tun if we're deleting
@@ -1029,6 +1140,7 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         # cases where something like datapath_type has changed
         self.tun_br.create(secure_mode=True)
         self.tun_br.setup_controllers(self.conf)
+        self.tun_br.record_cookies()
         if (not self.int_br.port_exists(self.conf.OVS.int_peer_patch_port) or
                 self.patch_tun_ofport == ovs_lib.INVALID_OFPORT):
             self.patch_tun_ofport = self.int_br.add_patch_port(
@@ -1090,6 +1202,7 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             br.create()
             br.set_secure_mode()
             br.setup_controllers(self.conf)
+            br.record_cookies()
             if cfg.CONF.AGENT.drop_flows_on_start:
                 br.delete_flows()
             br.setup_default_table()
@@ -1179,9 +1292,10 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         # delete any stale rules based on removed ofports
         ofports_deleted = set(previous.values()) - set(current.values())
         for ofport in ofports_deleted:
-            if self.prevent_arp_spoofing:
-                self.int_br.delete_arp_spoofing_protection(port=ofport)
-            self.int_br.delete_flows(in_port=ofport)
+            # The ARP spoofing and drop flows of the port carry its cookie,
+            # the other flows of the port, e.g. the QoS DSCP marking ones of
+            # the agent extensions, are deleted cookie by cookie
+            self.int_br.delete_owner_flows(ofport, in_port=ofport)
         # store map for next iteration
         self.vifname_to_ofport_map = current
         return moved_ports
@@ -1401,18 +1515,23 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             LOG.debug("No VIF port for port %s defined on agent.", port_id)
         return port_needs_binding
 
-    def _setup_tunnel_port(self, br, port_name, remote_ip, tunnel_type):
+    def _validate_tunnel_remote_ip(self, remote_ip):
         try:
             if (netaddr.IPAddress(self.local_ip).version !=
                 netaddr.IPAddress(remote_ip).version):
                 LOG.error(_LE("IP version mismatch, cannot create tunnel: "
                               "local_ip=%(lip)s remote_ip=%(rip)s"),
                           {'lip': self.local_ip, 'rip': remote_ip})
-                return 0
+                return False
         except Exception:
             LOG.error(_LE("Invalid local or remote IP, cannot create tunnel: "
                           "local_ip=%(lip)s remote_ip=%(rip)s"),
                       {'lip': self.local_ip, 'rip': remote_ip})
+            return False
+        return True
+
+    def _setup_tunnel_port(self, br, port_name, remote_ip, tunnel_type):
+        if not self._validate_tunnel_remote_ip(remote_ip):
             return 0
         ofport = br.add_tunnel_port(port_name,
                                     remote_ip,
@@ -1421,6 +1540,10 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                                     self.vxlan_udp_port,
                                     self.dont_fragment,
                                     self.tunnel_csum)
+        return self._setup_tunnel_port_flows(br, remote_ip, tunnel_type,
+                                             ofport)
+
+    def _setup_tunnel_port_flows(self, br, remote_ip, tunnel_type, ofport):
         if ofport == ovs_lib.INVALID_OFPORT:
             LOG.error(_LE("Failed to set-up %(type)s tunnel port to %(ip)s"),
                       {'type': tunnel_type, 'ip': remote_ip})
@@ -1452,6 +1575,33 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                                          network_type)
         return ofport
 
+    def setup_tunnel_ports(self, br, tunnels):
+        ofports = {}
+        tunnels_by_port_name = {}
+        for remote_ip, network_type in tunnels:
+            port_name = self.get_tunnel_name(
+                network_type, self.local_ip, remote_ip)
+            if (port_name is None or
+                    not self._validate_tunnel_remote_ip(remote_ip)):
+                ofports[(remote_ip, network_type)] = 0
+                continue
+            tunnels_by_port_name[port_name] = (remote_ip, network_type)
+        if not tunnels_by_port_name:
+            return ofports
+        # All the ports are added in a single OVSDB transaction, their flows
+        # are applied with the other ones of br when it is deferred.
+        added_ofports = br.add_tunnel_ports(tunnels_by_port_name,
+                                            self.local_ip,
+                                            self.vxlan_udp_port,
+                                            self.dont_fragment,
+                                            self.tunnel_csum)
+        for port_name, tunnel in tunnels_by_port_name.items():
+            remote_ip, network_type = tunnel
+            ofports[tunnel] = self._setup_tunnel_port_flows(
+                br, remote_ip, network_type,
+                added_ofports.get(port_name, ovs_lib.INVALID_OFPORT))
+        return ofports
+
     def cleanup_tunnel_port(self, br, tun_ofport, tunnel_type):
         # Check if this tunnel port is still used
         for lvm in self.vlan_manager:
@@ -1483,6 +1633,17 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         devices = devices_details_list.get('devices')
         vif_by_id = self.int_br.get_vifs_by_ids(
             [vif['device'] for vif in devices])
+        (skipped_devices, need_binding_devices,
+         security_disabled_devices) = self._treat_devices_details(
+            devices, vif_by_id, ovs_restarted)
+        return (skipped_devices, need_binding_devices,
+                security_disabled_devices, failed_devices)
+
+    def _treat_devices_details(self, devices, vif_by_id, ovs_restarted):
+        skipped_devices = []
+        need_binding_devices = []
+        security_disabled_devices = []
+        self.ext_manager.prepare_ports(self.context, devices)
         for details in devices:
             device = details['device']
             LOG.debug("Processing port: %s", device)
@@ -1524,7 +1685,7 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                 if (port and port.ofport != -1):
                     self.port_dead(port)
         return (skipped_devices, need_binding_devices,
-                security_disabled_devices, failed_devices)
+                security_disabled_devices)
 
     def _update_port_network(self, port_id, network_id):
         self._clean_network_ports(port_id)
@@ -1603,6 +1764,11 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         # list at the same time; avoid processing it twice.
         devices_added_updated = (port_info.get('added', set()) |
                                  port_info.get('updated', set()))
+        if devices_added_updated and self.port_processing_workers > 1:
+            failed_devices['added'] = (
+                self._process_added_updated_ports_pipelined(port_info,
+                                                            ovs_restarted))
+            devices_added_updated = set()
         need_binding_devices = []
         security_disabled_ports = []
         skipped_devices = set()
@@ -1626,15 +1792,20 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             skipped_devices = set(skipped_devices)
             port_info['current'] = (port_info['current'] - skipped_devices)
 
-        # TODO(salv-orlando): Optimize avoiding applying filters
-        # unnecessarily, (eg: when there are no IP address changes)
-        added_ports = port_info.get('added', set()) - skipped_devices
-        self._add_port_tag_info(need_binding_devices)
-        if security_disabled_ports:
-            added_ports -= set(security_disabled_ports)
-        self.sg_agent.setup_port_filters(added_ports,
-                                         port_info.get('updated', set()))
-        failed_devices['added'] |= self._bind_devices(need_binding_devices)
+        if self.port_processing_workers <= 1:
+            # TODO(salv-orlando): Optimize avoiding applying filters
+            # unnecessarily, (eg: when there are no IP address changes)
+            added_ports = port_info.get('added', set()) - skipped_devices
+            self._add_port_tag_info(need_binding_devices)
+            if security_disabled_ports:
+                added_ports -= set(security_disabled_ports)
+            self.sg_agent.setup_port_filters(added_ports,
+                                             port_info.get('updated', set()))
+            failed_devices['added'] |= self._bind_devices(
+                need_binding_devices)
+        elif not (port_info.get('added') or port_info.get('updated')):
+            # Apply the pending firewall refreshes
+            self.sg_agent.setup_port_filters(set(), set())
 
         if 'removed' in port_info and port_info['removed']:
             start = time.time()
@@ -1646,6 +1817,85 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                        'elapsed': time.time() - start})
         return failed_devices
 
+    def _get_devices_details(self, devices):
+        return self.plugin_rpc.get_devices_details_list_and_failed_devices(
+            self.context, devices, self.agent_id, self.conf.host)
+
+    def _process_added_updated_ports_pipelined(self, port_info,
+                                               ovs_restarted):
+        """Process the added and updated ports network by network.
+
+        The details of the devices are fetched in concurrent batches. The
+        ports of each network are wired, filtered and bound as soon as their
+        details are received, concurrently with the ports of the other
+        networks. The batches of a network are processed in order.
+        """
+        start = time.time()
+        added = port_info.get('added', set())
+        updated = port_info.get('updated', set())
+        devices = sorted(added | updated)
+        batch_size = constants.PORT_DETAILS_BATCH_SIZE
+        batches = [devices[i:i + batch_size]
+                   for i in moves.range(0, len(devices), batch_size)]
+        details_pool = eventlet.GreenPool(self.port_processing_workers)
+        network_pool = eventlet.GreenPool(self.port_processing_workers)
+        # The last thread processing the ports of each network, the next
+        # batch of ports of the network waits for it.
+        network_threads = {}
+        failed_devices = set()
+        for devices_details_list in details_pool.imap(
+                self._get_devices_details, batches):
+            failed_devices |= set(devices_details_list.get('failed_devices'))
+            devices_details = devices_details_list.get('devices')
+            vif_by_id = self.int_br.get_vifs_by_ids(
+                [details['device'] for details in devices_details])
+            details_by_network = collections.OrderedDict()
+            for details in devices_details:
+                details_by_network.setdefault(
+                    details.get('network_id'), []).append(details)
+            for network_id, network_details in details_by_network.items():
+                network_threads[network_id] = network_pool.spawn(
+                    self._process_network_devices,
+                    network_threads.get(network_id), network_details,
+                    vif_by_id, added, updated, ovs_restarted)
+        skipped_devices = set()
+        for thread in network_threads.values():
+            network_skipped, network_failed = thread.wait()
+            skipped_devices |= network_skipped
+            failed_devices |= network_failed
+        if not network_threads:
+            self.sg_agent.setup_port_filters(set(), set())
+        port_info['current'] = port_info['current'] - skipped_devices
+        LOG.debug("process_network_ports - iteration:%(iter_num)d - "
+                  "%(num_devices)d devices of %(num_networks)d networks "
+                  "processed by %(workers)d workers. Skipped %(num_skipped)d "
+                  "devices. Time elapsed: %(elapsed).3f",
+                  {'iter_num': self.iter_num,
+                   'num_devices': len(devices),
+                   'num_networks': len(network_threads),
+                   'workers': self.port_processing_workers,
+                   'num_skipped': len(skipped_devices),
+                   'elapsed': time.time() - start})
+        return failed_devices
+
+    def _process_network_devices(self, previous_thread, devices_details,
+                                 vif_by_id, added, updated, ovs_restarted):
+        skipped_devices, failed_devices = (
+            previous_thread.wait() if previous_thread else (set(), set()))
+        (skipped, need_binding_devices,
+         security_disabled_devices) = self._treat_devices_details(
+            devices_details, vif_by_id, ovs_restarted)
+        processed = ({details['device'] for details in devices_details} -
+                     set(skipped))
+        self._add_port_tag_info(need_binding_devices)
+        with self._port_filters_lock:
+            self.sg_agent.setup_port_filters(
+                (added & processed) - set(security_disabled_devices),
+                updated & processed)
+        failed_devices = failed_devices | self._bind_devices(
+            need_binding_devices)
+        return skipped_devices | set(skipped), failed_devices
+
     def process_ancillary_network_ports(self, port_info):
         failed_devices = {'added': set(), 'removed': set()}
         if 'added' in port_info and port_info['added']:
@@ -1755,7 +2005,7 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
         return status
 
     def loop_count_and_wait(self, start_time, port_stats):
-        # sleep till end of polling interval
+        # sleep till end of polling interval, or until some work is queued
         elapsed = time.time() - start_time
         LOG.debug("Agent rpc_loop - iteration:%(iter_num)d "
                   "completed. Processed ports statistics: "
@@ -1764,12 +2014,16 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                    'port_stats': port_stats,
                    'elapsed': elapsed})
         if elapsed < self.polling_interval:
-            time.sleep(self.polling_interval - elapsed)
+            if elapsed < self.min_polling_interval:
+                time.sleep(self.min_polling_interval - elapsed)
+                elapsed = self.min_polling_interval
+            self._wait_for_loop_wakeup(self.polling_interval - elapsed)
         else:
             LOG.debug("Loop iteration exceeded interval "
                       "(%(polling_interval)s vs. %(elapsed)s)!",
                       {'polling_interval': self.polling_interval,
                        'elapsed': elapsed})
+        self._loop_wakeup.clear()
         self.iter_num = self.iter_num + 1
 
     def get_port_stats(self, port_info, ancillary_port_info):
@@ -1784,15 +2038,51 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                 'removed': len(ancillary_port_info.get('removed', []))}
         return port_stats
 
-    def cleanup_stale_flows(self):
+    def _get_flow_bridges(self):
         bridges = [self.int_br]
         bridges.extend(self.phys_brs.values())
         if self.enable_tunneling:
             bridges.append(self.tun_br)
-        for bridge in bridges:
+        return bridges
+
+    def flush_flow_cookies(self):
+        for bridge in self._get_flow_bridges():
+            bridge.flush_cookies()
+
+    def cleanup_stale_flows(self):
+        if self.conf.AGENT.flow_cleanup_tables_per_iteration:
+            self._stale_flows_cleanup = self.iter_cleanup_stale_flows()
+            self.continue_stale_flows_cleanup()
+            return
+        for bridge in self._get_flow_bridges():
             LOG.info(_LI("Cleaning stale %s flows"), bridge.br_name)
             bridge.cleanup_flows()
 
+    def continue_stale_flows_cleanup(self):
+        """Run the next step of an incremental cleanup of stale flows."""
+        if self._stale_flows_cleanup is None:
+            return
+        try:
+            next(self._stale_flows_cleanup)
+        except StopIteration:
+            self._stale_flows_cleanup = None
+
+    def iter_cleanup_stale_flows(self):
+        """Clean the stale flows of the bridges a few tables at a time.
+
+        Each step of the iteration cleans flow_cleanup_tables_per_iteration
+        tables of a bridge, so that the agent loop can run between them.
+        """
+        step = self.conf.AGENT.flow_cleanup_tables_per_iteration
+        for bridge in self._get_flow_bridges():
+            LOG.info(_LI("Cleaning stale %s flows incrementally"),
+                     bridge.br_name)
+            for first in moves.range(0, constants.NUM_OPENFLOW_TABLES, step):
+                bridge.cleanup_flows(table_ids=list(moves.range(
+                    first, min(first + step, constants.NUM_OPENFLOW_TABLES))))
+                yield
+            bridge.forget_stale_cookies()
+
     def process_port_info(self, start, polling_manager, sync, ovs_restarted,
                        ports, ancillary_ports, updated_ports_copy,
                        consecutive_resyncs, ports_not_ready_yet,
@@ -2000,12 +2290,17 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                     # between these two statements, this will be thread-safe
                     updated_ports_copy = self.updated_ports
                     self.updated_ports = set()
+                    plug_time = self._ovsdb_event_time or start
+                    self._ovsdb_event_time = None
                     (port_info, ancillary_port_info, consecutive_resyncs,
                      ports_not_ready_yet) = (self.process_port_info(
                             start, polling_manager, sync, ovs_restarted,
                             ports, ancillary_ports, updated_ports_copy,
                             consecutive_resyncs, ports_not_ready_yet,
                             failed_devices, failed_ancillary_devices))
+                    if not sync:
+                        # All the ports are added again on a resync
+                        self._record_plugged_ports(port_info, plug_time)
                     sync = False
                     self.process_deleted_ports(port_info)
                     ofport_changed_ports = self.update_stale_ofport_rules()
@@ -2017,6 +2312,7 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                               "Elapsed:%(elapsed).3f",
                               {'iter_num': self.iter_num,
                                'elapsed': time.time() - start})
+                    self.continue_stale_flows_cleanup()
                     # Secure and wire/unwire VIFs and update their status
                     # on Neutron server
                     if (self._port_info_has_changes(port_info) or
@@ -2061,6 +2357,8 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
                     # Put the ports back in self.updated_port
                     self.updated_ports |= updated_ports_copy
                     sync = True
+            # Record the cookies released by the iteration at once
+            self.flush_flow_cookies()
             port_stats = self.get_port_stats(port_info, ancillary_port_info)
             self.loop_count_and_wait(start, port_stats)
 
@@ -2072,7 +2370,8 @@ class OVSNeutronAgent(sg_rpc.SecurityGroupAgentRpcCallbackMixin,
             signal.signal(signal.SIGHUP, self._handle_sighup)
         with polling.get_polling_manager(
             self.minimize_polling,
-            self.ovsdb_monitor_respawn_interval) as pm:
+            self.ovsdb_monitor_respawn_interval,
+            event_callback=self._handle_ovsdb_event) as pm:
 
             self.rpc_loop(polling_manager=pm)
 
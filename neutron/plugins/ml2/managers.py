@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
+import eventlet
 from neutron_lib.api import validators
 from neutron_lib import constants
 from neutron_lib import exceptions as exc
@@ -23,6 +26,7 @@ import six
 import stevedore
 
 from neutron._i18n import _, _LE, _LI, _LW
+from neutron.common import request_stats
 from neutron.db import api as db_api
 from neutron.db import segments_db
 from neutron.extensions import external_net
@@ -428,9 +432,18 @@ class MechanismManager(stevedore.named.NamedExtensionManager):
         what db exception is retriable
         """
         errors = []
+        stats = request_stats.get_request_stats()
+        pool = None
+        if (cfg.CONF.ml2.concurrent_postcommit and
+                '_postcommit' in method_name):
+            pool = eventlet.GreenPool()
         for driver in self.ordered_mech_drivers:
+            if pool is not None and driver.obj.is_postcommit_thread_safe:
+                pool.spawn_n(self._call_on_driver_concurrently, driver,
+                             method_name, context, stats, errors)
+                continue
             try:
-                getattr(driver.obj, method_name)(context)
+                self._call_on_driver(driver, method_name, context, stats)
             except Exception as e:
                 if raise_db_retriable and db_api.is_retriable(e):
                     with excutils.save_and_reraise_exception():
@@ -445,12 +458,67 @@ class MechanismManager(stevedore.named.NamedExtensionManager):
                 errors.append(e)
                 if not continue_on_failure:
                     break
+        if pool is not None:
+            pool.waitall()
         if errors:
             raise ml2_exc.MechanismDriverError(
                 method=method_name,
                 errors=errors
             )
 
+    def _call_on_driver(self, driver, method_name, context, stats):
+        start = time.time()
+        try:
+            getattr(driver.obj, method_name)(context)
+        finally:
+            try:
+                self._record_driver_call(driver, method_name, context, stats,
+                                         time.time() - start)
+            except Exception:
+                # Recording must never change the outcome of the call
+                LOG.exception(_LE("Failed to record the call of mechanism "
+                                  "driver '%(name)s' in %(method)s"),
+                              {'name': driver.name, 'method': method_name})
+
+    def _call_on_driver_concurrently(self, driver, method_name, context,
+                                     stats, errors):
+        try:
+            self._call_on_driver(driver, method_name, context, stats)
+        except Exception as e:
+            LOG.exception(
+                _LE("Mechanism driver '%(name)s' failed in %(method)s"),
+                {'name': driver.name, 'method': method_name}
+            )
+            errors.append(e)
+
+    @staticmethod
+    def _describe_context(context):
+        # Bulk methods are called with the list of the contexts of the
+        # resources of the request
+        if isinstance(context, (list, tuple)):
+            ids = [ctx.current.get('id') for ctx in context]
+            kind = context[0].__class__.__name__ if context else 'context'
+            return '%d %s %s' % (len(ids), kind, ids)
+        return '%s %s' % (context.__class__.__name__,
+                          context.current.get('id'))
+
+    def _record_driver_call(self, driver, method_name, context, stats,
+                            elapsed):
+        name = '%s.%s' % (driver.name, method_name)
+        # NOTE: the stats of the request are passed explicitly, as the
+        # concurrent calls run in other green threads.
+        if stats is not None:
+            stats.add_timing('driver', name, elapsed)
+        if cfg.CONF.enable_request_stats:
+            request_stats.add_to_histogram('driver_call', name, elapsed)
+        threshold = cfg.CONF.ml2.slow_driver_call_threshold
+        if threshold and elapsed > threshold:
+            LOG.warning(_LW("Mechanism driver '%(name)s' took %(elapsed).3f "
+                            "seconds in %(method)s for %(resources)s"),
+                        {'name': driver.name, 'elapsed': elapsed,
+                         'method': method_name,
+                         'resources': self._describe_context(context)})
+
     def create_network_precommit(self, context):
         """Notify all mechanism drivers during network creation.
 
@@ -670,6 +738,20 @@ class MechanismManager(stevedore.named.NamedExtensionManager):
         """
         self._call_on_drivers("create_port_postcommit", context)
 
+    def create_port_postcommit_bulk(self, contexts):
+        """Notify all mechanism drivers of the creation of bulk ports.
+
+        :raises: neutron.plugins.ml2.common.MechanismDriverError
+        if any mechanism driver create_port_postcommit_bulk call fails.
+
+        Called after the database transaction, with the PortContext of
+        each port of the request. Errors raised by mechanism drivers are
+        left to propagate to the caller, where the ports will be deleted,
+        triggering any required cleanup. There is no guarantee that all
+        mechanism drivers are called in this case.
+        """
+        self._call_on_drivers("create_port_postcommit_bulk", contexts)
+
     def update_port_precommit(self, context):
         """Notify all mechanism drivers during port update.
 
@@ -0,0 +1,164 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+from oslo_concurrency import lockutils
+from oslo_log import log as logging
+
+from neutron._i18n import _LE
+from neutron.api.rpc.callbacks import events as rpc_events
+from neutron.api.rpc.callbacks.producer import registry as prod_registry
+from neutron.api.rpc.callbacks import resources as rpc_resources
+from neutron.api.rpc.handlers import resources_rpc
+from neutron.callbacks import events
+from neutron.callbacks import registry
+from neutron.callbacks import resources
+from neutron import context as n_ctx
+from neutron.objects import network
+from neutron.objects import ports
+from neutron.objects import securitygroup
+
+LOG = logging.getLogger(__name__)
+
+# Callback resources whose changes are pushed to the agents, with the
+# versioned object class used to push them.
+_RESOURCE_OBJECT_CLASSES = {
+    resources.PORT: ports.Port,
+    resources.NETWORK: network.Network,
+    resources.SECURITY_GROUP: securitygroup.SecurityGroup,
+    resources.SECURITY_GROUP_RULE: securitygroup.SecurityGroupRule,
+}
+
+# Changes of the resources in the values also change the objects of the
+# resources in the keys, which embed them.
+_RELATED_RESOURCES = {
+    resources.SECURITY_GROUP: [resources.SECURITY_GROUP_RULE],
+}
+
+
+class _ObjectChangeHandler(object):
+    """Push the latest state of the objects of a resource on each change.
+
+    The objects are loaded and pushed by a green thread, so that the API
+    request triggering the change is not delayed. Changes of the same
+    object made while a push is pending are coalesced into a single push.
+    """
+
+    def __init__(self, resource, obj_class, resource_push_api):
+        self._resource = resource
+        self._obj_class = obj_class
+        self._resource_push_api = resource_push_api
+        self._resources_to_push = set()
+        self._worker_pool = eventlet.GreenPool()
+        for changed_resource in ([resource] +
+                                 _RELATED_RESOURCES.get(resource, [])):
+            for event in (events.AFTER_CREATE, events.AFTER_UPDATE,
+                          events.AFTER_DELETE):
+                registry.subscribe(self.handle_event, changed_resource, event)
+
+    def wait(self):
+        """Wait for all the pending pushes to be sent."""
+        self._worker_pool.waitall()
+
+    def handle_event(self, resource, event, trigger, **kwargs):
+        resource_id = self._extract_resource_id(resource, kwargs)
+        if resource_id is None:
+            LOG.error(_LE("Unable to find the %(resource)s ID in the "
+                          "%(event)s event of %(changed)s, agents will not "
+                          "be notified of the change."),
+                      {'resource': self._resource, 'event': event,
+                       'changed': resource})
+            return
+        self._resources_to_push.add(resource_id)
+        self._worker_pool.spawn_n(self.dispatch_events)
+
+    def _extract_resource_id(self, resource, callback_kwargs):
+        id_kwarg = '%s_id' % self._resource
+        if id_kwarg in callback_kwargs:
+            return callback_kwargs[id_kwarg]
+        changed = callback_kwargs.get(resource) or {}
+        if resource == self._resource:
+            return changed.get('id')
+        # The change of a related resource, which references the object
+        return changed.get(id_kwarg)
+
+    @lockutils.synchronized('ml2-ovo-rpc-dispatch')
+    def dispatch_events(self):
+        # NOTE: the lock bounds the number of dispatchers querying the
+        # database at the same time, the ones waiting on it usually find
+        # nothing left to push.
+        to_dispatch, self._resources_to_push = self._resources_to_push, set()
+        if not to_dispatch:
+            return
+        context = n_ctx.get_admin_context()
+        for resource_id in to_dispatch:
+            try:
+                obj = self._obj_class.get_object(context, id=resource_id)
+                # Creations are sent as updates, so that agents handle the
+                # messages received out of order the same way.
+                if obj is None:
+                    rpc_event = rpc_events.DELETED
+                    obj = self._obj_class(context, id=resource_id)
+                else:
+                    rpc_event = rpc_events.UPDATED
+                LOG.debug("Pushing %(event)s event for %(resource)s "
+                          "%(id)s", {'event': rpc_event,
+                                     'resource': self._resource,
+                                     'id': resource_id})
+                self._resource_push_api.push(context, [obj], rpc_event)
+            except Exception:
+                LOG.exception(_LE("Failed to push %(resource)s %(id)s to "
+                                  "the agents."),
+                              {'resource': self._resource,
+                               'id': resource_id})
+
+
+def _get_object_provider(obj_class):
+    def provider(resource_type, resource_id, context, **kwargs):
+        return obj_class.get_object(context, id=resource_id)
+    return provider
+
+
+def _get_objects_provider(obj_class):
+    def provider(resource_type, filters, context, **kwargs):
+        return obj_class.get_objects(context, **filters)
+    return provider
+
+
+class OVOServerRpcInterface(object):
+    """Server side of the versioned object cache of the agents.
+
+    Every change of a port, network, security group or security group rule
+    is pushed to the agents as a versioned object, and the same objects can
+    be pulled by the agents through the resources RPC API.
+    """
+
+    def __init__(self):
+        self._rpc_pusher = resources_rpc.ResourcesPushRpcApi()
+        self._resource_handlers = {
+            resource: _ObjectChangeHandler(resource, obj_class,
+                                           self._rpc_pusher)
+            for resource, obj_class in _RESOURCE_OBJECT_CLASSES.items()
+        }
+        for obj_class in _RESOURCE_OBJECT_CLASSES.values():
+            resource_type = rpc_resources.get_resource_type(obj_class)
+            prod_registry.provide(_get_object_provider(obj_class),
+                                  resource_type)
+            prod_registry.provide_bulk(_get_objects_provider(obj_class),
+                                       resource_type)
+        LOG.debug("ML2 versioned object RPC backend initialized.")
+
+    def wait(self):
+        """Wait for all the pending pushes of all the resources."""
+        for handler in self._resource_handlers.values():
+            handler.wait()
+        self._rpc_pusher.flush_pending_updates()
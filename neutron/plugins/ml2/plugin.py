@@ -81,6 +81,7 @@ from neutron.plugins.ml2 import driver_context
 from neutron.plugins.ml2.extensions import qos as qos_ext
 from neutron.plugins.ml2 import managers
 from neutron.plugins.ml2 import models
+from neutron.plugins.ml2 import ovo_rpc
 from neutron.plugins.ml2 import rpc
 from neutron.quota import resource_registry
 from neutron.services.qos import qos_consts
@@ -247,6 +248,9 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         self.agent_notifiers[const.AGENT_TYPE_DHCP] = (
             dhcp_rpc_agent_api.DhcpAgentNotifyAPI()
         )
+        self.ovo_notifier = None
+        if cfg.CONF.ml2.push_resource_objects:
+            self.ovo_notifier = ovo_rpc.OVOServerRpcInterface()
 
     @log_helpers.log_method_call
     def start_rpc_listeners(self):
@@ -1240,6 +1244,24 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                 provisioning_blocks.DHCP_ENTITY)
 
     def _create_port_db(self, context, port):
+        with context.session.begin(subtransactions=True):
+            result, mech_context, port_db = self._create_port_records(
+                context, port)
+            self.mechanism_manager.create_port_precommit(mech_context)
+            self._setup_dhcp_agent_provisioning_component(context, result)
+
+        self._apply_dict_extend_functions('ports', result, port_db)
+        return result, mech_context
+
+    def _create_port_records(self, context, port, networks=None,
+                             sg_bindings=None):
+        """Create the records of a port, up to the precommit of drivers.
+
+        :param networks: a dict of the networks already fetched, by id,
+        shared by the ports of a bulk request.
+        :param sg_bindings: a list collecting the security group bindings
+        of the ports of a bulk request, which are created by the caller.
+        """
         attrs = port[attributes.PORT]
         if not attrs.get('status'):
             attrs['status'] = const.PORT_STATUS_DOWN
@@ -1254,8 +1276,14 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
 
             # sgids must be got after portsec checked with security group
             sgids = self._get_security_groups_on_port(context, port)
-            self._process_port_create_security_group(context, result, sgids)
-            network = self.get_network(context, result['network_id'])
+            self._process_port_create_security_group(context, result, sgids,
+                                                     bindings=sg_bindings)
+            if networks is None:
+                networks = {}
+            network = networks.get(result['network_id'])
+            if network is None:
+                network = self.get_network(context, result['network_id'])
+                networks[result['network_id']] = network
             binding = db.add_port_binding(session, result['id'])
             mech_context = driver_context.PortContext(self, context, result,
                                                       network, binding, None)
@@ -1267,11 +1295,46 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
                     attrs.get(addr_pair.ADDRESS_PAIRS)))
             self._process_port_create_extra_dhcp_opts(context, result,
                                                       dhcp_opts)
-            self.mechanism_manager.create_port_precommit(mech_context)
-            self._setup_dhcp_agent_provisioning_component(context, result)
+        return result, mech_context, port_db
 
-        self._apply_dict_extend_functions('ports', result, port_db)
-        return result, mech_context
+    def _create_port_bulk_db(self, context, items):
+        """Create the ports of a bulk request in a single transaction.
+
+        The networks of the ports are fetched once, the security group
+        bindings of all the ports are inserted together, and the drivers
+        are called once all the records exist.
+        """
+        objects = []
+        networks = {}
+        sg_bindings = []
+        with context.session.begin(subtransactions=True):
+            for item in items:
+                try:
+                    result, mech_context, port_db = (
+                        self._create_port_records(
+                            context, item, networks=networks,
+                            sg_bindings=sg_bindings))
+                except Exception as e:
+                    with excutils.save_and_reraise_exception():
+                        utils.attach_exc_details(
+                            e, _LE("An exception occurred while creating "
+                                   "the %(resource)s:%(item)s"),
+                            {'resource': attributes.PORT, 'item': item})
+                objects.append({'mech_context': mech_context,
+                                'result': result,
+                                'attributes': item[attributes.PORT],
+                                'port_db': port_db})
+            self._create_port_security_group_bindings(context, sg_bindings)
+            for obj in objects:
+                self.mechanism_manager.create_port_precommit(
+                    obj['mech_context'])
+                self._setup_dhcp_agent_provisioning_component(
+                    context, obj['result'])
+
+        for obj in objects:
+            self._apply_dict_extend_functions('ports', obj['result'],
+                                              obj.pop('port_db'))
+        return objects
 
     @utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1313,7 +1376,18 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
     @utils.transaction_guard
     @db_api.retry_if_session_inactive()
     def create_port_bulk(self, context, ports):
-        objects = self._create_bulk_ml2(attributes.PORT, context, ports)
+        objects = self._create_port_bulk_db(
+            context, ports[attributes.PORTS])
+        try:
+            self.mechanism_manager.create_port_postcommit_bulk(
+                [obj['mech_context'] for obj in objects])
+        except ml2_exc.MechanismDriverError:
+            with excutils.save_and_reraise_exception():
+                resource_ids = [res['result']['id'] for res in objects]
+                LOG.exception(_LE("mechanism_manager.create_port_postcommit"
+                                  "_bulk failed, deleting ports %s"),
+                              ', '.join(resource_ids))
+                self._delete_objects(context, attributes.PORT, objects)
 
         # REVISIT(rkukura): Is there any point in calling this before
         # a binding has been successfully established?
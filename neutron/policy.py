@@ -21,6 +21,7 @@ from neutron_lib import exceptions
 from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_log import log as logging
+from oslo_policy import _checks as policy_checks
 from oslo_policy import policy
 from oslo_utils import excutils
 from oslo_utils import importutils
@@ -406,6 +407,119 @@ def enforce(context, action, target, plugin=None, pluralized=None):
     return result
 
 
+# Placeholders of the target values in the match of a check
+_TARGET_PLACEHOLDER_RE = re.compile(r'%\(([^)]+)\)s')
+
+
+def _add_target_fields(fields, rule, rules_seen):
+    """Add the target fields a rule depends on to fields.
+
+    Return False if the rule contains checks whose dependencies on the
+    target are not known, e.g. HTTP checks.
+    """
+    if isinstance(rule, (policy.AndCheck, policy.OrCheck)):
+        return all(_add_target_fields(fields, sub_rule, rules_seen)
+                   for sub_rule in rule.rules)
+    if isinstance(rule, policy.NotCheck):
+        return _add_target_fields(fields, rule.rule, rules_seen)
+    if isinstance(rule, policy.RuleCheck):
+        if rule.match in rules_seen:
+            return True
+        rules_seen.add(rule.match)
+        try:
+            return _add_target_fields(fields, _ENFORCER.rules[rule.match],
+                                      rules_seen)
+        except KeyError:
+            return True
+    if isinstance(rule, (policy_checks.TrueCheck, policy_checks.FalseCheck)):
+        return True
+    if isinstance(rule, OwnerCheck):
+        # The owner of a parent resource is loaded by its foreign key
+        fields.add(rule.target_field)
+        for separator in (':', '_'):
+            parent_res = rule.target_field.split(separator, 1)[0]
+            foreign_key = attributes.RESOURCE_FOREIGN_KEYS.get(
+                "%ss" % parent_res)
+            if foreign_key:
+                fields.add(foreign_key)
+        return True
+    if isinstance(rule, FieldCheck):
+        fields.add(rule.field)
+        return True
+    if isinstance(rule, (policy_checks.RoleCheck,
+                         policy_checks.GenericCheck)):
+        fields.update(_TARGET_PLACEHOLDER_RE.findall(rule.match))
+        return True
+    return False
+
+
+class CollectionPolicyChecker(object):
+    """Check the policies of the items of a collection.
+
+    The rule of an action only depends on a few fields of its target, e.g.
+    tenant_id, shared or the owner of the parent network. Items which share
+    the values of these fields share the result of the check, which is
+    evaluated once and then looked up. Actions whose rules contain checks of
+    unknown dependencies, and actions whose rules depend on the attributes
+    set in the target, are checked for every item.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, context, pluralized=None):
+        self.context = context
+        self.pluralized = pluralized
+        self._fields_by_action = {}
+        self._results = {}
+        init()
+
+    def _get_target_fields(self, action):
+        try:
+            return self._fields_by_action[action]
+        except KeyError:
+            pass
+        fields = set()
+        _resource, enforce_attr_based_check = get_resource_and_action(
+            action, self.pluralized)
+        if (enforce_attr_based_check or not _add_target_fields(
+                fields, policy.RuleCheck('rule', action), set())):
+            fields = None
+        else:
+            fields = tuple(sorted(fields))
+        self._fields_by_action[action] = fields
+        return fields
+
+    def _get_cache_key(self, action, target, might_not_exist):
+        fields = self._get_target_fields(action)
+        if fields is None:
+            return None
+        key = (action, might_not_exist) + tuple(
+            target.get(field, self._MISSING) for field in fields)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def check(self, action, target, might_not_exist=False):
+        """Same as neutron.policy.check, for an item of the collection."""
+        if self.context.is_admin:
+            return True
+        key = self._get_cache_key(action, target, might_not_exist)
+        if key is not None and key in self._results:
+            return self._results[key]
+        result = check(self.context, action, target,
+                       might_not_exist=might_not_exist,
+                       pluralized=self.pluralized)
+        if key is not None:
+            self._results[key] = result
+        return result
+
+    def filter(self, action, targets):
+        """Return the targets on which the action is allowed."""
+        return [target for target in targets if self.check(action, target)]
+
+
 def check_is_admin(context):
     """Verify context has admin rights according to policy settings."""
     init()
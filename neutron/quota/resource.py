@@ -169,11 +169,16 @@ class TrackedResource(BaseResource):
         self._model_class = model_class
         self._dirty_tenants = set()
         self._out_of_sync_tenants = set()
+        # Number of usage resyncs performed by this process
+        self.resync_count = 0
 
     @property
     def dirty(self):
         return self._dirty_tenants
 
+    def is_out_of_sync(self, tenant_id):
+        return tenant_id in self._out_of_sync_tenants
+
     def mark_dirty(self, context):
         if not self._dirty_tenants:
             return
@@ -218,6 +223,7 @@ class TrackedResource(BaseResource):
 
         self._dirty_tenants.discard(tenant_id)
         self._out_of_sync_tenants.discard(tenant_id)
+        self.resync_count += 1
         LOG.debug(("Unset dirty status for tenant:%(tenant_id)s on "
                    "resource:%(resource)s"),
                   {'tenant_id': tenant_id, 'resource': self.name})
@@ -10,11 +10,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import itertools
+
+import eventlet
 from oslo_config import cfg
 from oslo_log import log
 import six
 
-from neutron._i18n import _, _LI, _LW
+from neutron._i18n import _, _LE, _LI, _LW
+from neutron import context as n_context
 from neutron.quota import resource
 
 LOG = log.getLogger(__name__)
@@ -77,13 +82,26 @@ def set_resources_dirty(context):
 
 
 def resync_resource(context, resource_name, tenant_id):
+    """Schedule the resync of the usage of a resource for a tenant.
+
+    The resync is run later by the UsageResyncer of the registry, so that
+    the read requests calling this routine do not write to the database.
+    """
     if not cfg.CONF.QUOTAS.track_quota_usage:
         return
 
     if is_tracked(resource_name):
         res = get_resource(resource_name)
-        # If the resource is tracked count supports the resync_usage parameter
-        res.resync(context, tenant_id)
+        if res.is_out_of_sync(tenant_id):
+            ResourceRegistry.get_instance().resyncer.schedule(
+                resource_name, tenant_id)
+
+
+def get_resync_counts():
+    """Return the number of usage resyncs performed, by resource name."""
+    return {name: res.resync_count
+            for name, res in get_all_resources().items()
+            if is_tracked(name)}
 
 
 def mark_resources_dirty(f):
@@ -129,6 +147,64 @@ class tracked_resources(object):
         return wrapper
 
 
+class UsageResyncer(object):
+    """Resynchronize the usage of tracked resources in the background.
+
+    Resyncs are scheduled by resource and tenant, and run by a green thread
+    in batches of at most QUOTAS.usage_resync_batch_size resyncs, one batch
+    every QUOTAS.usage_resync_interval seconds. Quota enforcement does not
+    depend on them, as it counts the resources whose usage is dirty.
+    """
+
+    def __init__(self):
+        self._pending = collections.OrderedDict()
+        self._flush_thread = None
+
+    def schedule(self, resource_name, tenant_id):
+        self._pending[(resource_name, tenant_id)] = None
+        if self._flush_thread is None:
+            self._flush_thread = eventlet.spawn_after(
+                cfg.CONF.QUOTAS.usage_resync_interval, self.flush)
+
+    def cancel(self):
+        """Drop the scheduled resyncs."""
+        if self._flush_thread is not None:
+            self._flush_thread.cancel()
+            self._flush_thread = None
+        self._pending.clear()
+
+    def flush(self):
+        """Run the next batch of scheduled resyncs now."""
+        if self._flush_thread is not None:
+            self._flush_thread.cancel()
+            self._flush_thread = None
+        batch = list(itertools.islice(
+            self._pending, cfg.CONF.QUOTAS.usage_resync_batch_size))
+        for key in batch:
+            del self._pending[key]
+        context = n_context.get_admin_context()
+        for resource_name, tenant_id in batch:
+            res = get_resource(resource_name)
+            if res is None:
+                continue
+            try:
+                res.resync(context, tenant_id)
+            except Exception:
+                LOG.exception(_LE("Failed to resync the usage of "
+                                  "%(resource)s for tenant %(tenant_id)s"),
+                              {'resource': resource_name,
+                               'tenant_id': tenant_id})
+        if batch:
+            LOG.debug("Resynced the usage of %(batch)d resources, "
+                      "%(pending)d pending, resyncs by resource: "
+                      "%(counts)s",
+                      {'batch': len(batch), 'pending': len(self._pending),
+                       'counts': get_resync_counts()})
+        if self._pending:
+            self._flush_thread = eventlet.spawn_after(
+                cfg.CONF.QUOTAS.usage_resync_interval, self.flush)
+
+
 class ResourceRegistry(object):
     """Registry for resource subject to quota limits.
 
@@ -154,6 +230,7 @@ class ResourceRegistry(object):
         self._resources = {}
         # Map usage tracked resources to the correspondent db model class
         self._tracked_resource_mappings = {}
+        self.resyncer = UsageResyncer()
 
     def __contains__(self, resource):
         return resource in self._resources
@@ -243,6 +320,7 @@ class ResourceRegistry(object):
         for (res_name, res) in self._resources.items():
             if res_name in self._tracked_resource_mappings:
                 res.unregister_events()
+        self.resyncer.cancel()
         self._resources.clear()
         self._tracked_resource_mappings.clear()
 
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import gc
 import inspect
 import os
 import random
@@ -37,6 +38,7 @@ from neutron.conf import service
 from neutron import context
 from neutron.db import api as session
 from neutron import manager
+from neutron import policy
 from neutron import worker as neutron_worker
 from neutron import wsgi
 
@@ -97,6 +99,7 @@ def serve_wsgi(cls):
 class RpcWorker(neutron_worker.NeutronWorker):
     """Wraps a worker to be handled by ProcessLauncher"""
     start_listeners_method = 'start_rpc_listeners'
+    worker_type = 'rpc'
 
     def __init__(self, plugins, worker_process_count=1):
         super(RpcWorker, self).__init__(
@@ -246,6 +249,7 @@ def _start_workers(workers):
             # be shared DB connections in child processes which may cause
             # DB errors.
             session.context_manager.dispose_pool()
+            _preload_workers_state()
 
             for worker in process_workers:
                 worker_launcher.launch_service(worker,
@@ -293,10 +297,29 @@ def _run_wsgi(app_name):
     return run_wsgi_app(app)
 
 
+def _preload_workers_state():
+    """Build the state of the workers before forking them.
+
+    The forked workers share this state copy-on-write, instead of each of
+    them building it on its first request.
+    """
+    if not cfg.CONF.preload_workers_state:
+        return
+    policy.init()
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        # The collections of the workers would otherwise write to the
+        # objects of the parent, unsharing the pages holding them.
+        gc.freeze()
+
+
 def run_wsgi_app(app):
+    workers = _get_api_workers()
+    if workers > 0:
+        _preload_workers_state()
     server = wsgi.Server("Neutron")
     server.start(app, cfg.CONF.bind_port, cfg.CONF.bind_host,
-                 workers=_get_api_workers())
+                 workers=workers)
     LOG.info(_LI("Neutron service started, listening on %(host)s:%(port)s"),
              {'host': cfg.CONF.bind_host, 'port': cfg.CONF.bind_port})
     return server
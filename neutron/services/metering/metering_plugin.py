@@ -25,6 +25,9 @@ class MeteringPlugin(metering_db.MeteringDbMixin):
     supported_extension_aliases = ["metering"]
     path_prefix = "/metering"
 
+    __native_pagination_support = True
+    __native_sorting_support = True
+
     def __init__(self):
         super(MeteringPlugin, self).__init__()
 
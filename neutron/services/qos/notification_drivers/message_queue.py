@@ -37,6 +37,10 @@ def _get_qos_policy_cb(resource, policy_id, **kwargs):
     return policy
 
 
+def _get_qos_policies_cb(resource, filters, context, **kwargs):
+    return policy_object.QosPolicy.get_objects(context, **filters)
+
+
 class RpcQosServiceNotificationDriver(
     qos_base.QosServiceNotificationDriverBase):
     """RPC message queue service notification driver for QoS."""
@@ -44,6 +48,7 @@ class RpcQosServiceNotificationDriver(
     def __init__(self):
         self.notification_api = resources_rpc.ResourcesPushRpcApi()
         registry.provide(_get_qos_policy_cb, resources.QOS_POLICY)
+        registry.provide_bulk(_get_qos_policies_cb, resources.QOS_POLICY)
 
     def get_description(self):
         return "Message queue updates"
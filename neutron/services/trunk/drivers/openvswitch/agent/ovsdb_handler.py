@@ -22,7 +22,7 @@ from oslo_log import log as logging
 import oslo_messaging
 from oslo_serialization import jsonutils
 
-from neutron._i18n import _, _LE
+from neutron._i18n import _, _LE, _LW
 from neutron.agent.common import ovs_lib
 from neutron.api.rpc.handlers import resources_rpc
 from neutron.callbacks import events
@@ -119,6 +119,9 @@ class OVSDBHandler(object):
         self._context = n_context.get_admin_context_without_session()
         self.trunk_manager = trunk_manager
         self.trunk_rpc = agent.TrunkStub()
+        # Trunks fetched in bulk for a batch of added trunk bridges, by
+        # parent port ID. Each one is used once, by the wiring of its bridge.
+        self._prefetched_trunks = {}
 
         registry.subscribe(self.process_trunk_port_events,
                            ovs_agent_constants.OVSDB_RESOURCE,
@@ -132,14 +135,20 @@ class OVSDBHandler(object):
     def process_trunk_port_events(
             self, resource, event, trigger, ovsdb_events):
         """Process added and removed port events coming from OVSDB monitor."""
-        for port_event in ovsdb_events['added']:
-            port_name = port_event['name']
-            if is_trunk_bridge(port_name):
-                LOG.debug("Processing trunk bridge %s", port_name)
+        # NOTE: port_name is equal to bridge_name at this point.
+        added_bridges = [port_event['name']
+                         for port_event in ovsdb_events['added']
+                         if is_trunk_bridge(port_event['name'])]
+        if len(added_bridges) > 1:
+            # Typically at agent startup, fetch all the trunks at once
+            # before handling each bridge.
+            eventlet.spawn_n(self._prefetch_and_handle_trunks, added_bridges)
+        else:
+            for bridge_name in added_bridges:
+                LOG.debug("Processing trunk bridge %s", bridge_name)
                 # As there is active waiting for port to appear, it's handled
                 # in a separate greenthread.
-                # NOTE: port_name is equal to bridge_name at this point.
-                eventlet.spawn_n(self.handle_trunk_add, port_name)
+                eventlet.spawn_n(self.handle_trunk_add, bridge_name)
 
         for port_event in ovsdb_events['removed']:
             bridge_name = port_event['external_ids'].get('bridge_name')
@@ -147,6 +156,39 @@ class OVSDBHandler(object):
                 eventlet.spawn_n(
                     self.handle_trunk_remove, bridge_name, port_event)
 
+    def _prefetch_trunks(self, bridge_names):
+        parent_port_ids = []
+        for bridge_name in bridge_names:
+            bridge = ovs_lib.OVSBridge(bridge_name)
+            try:
+                parent_port_ids.append(
+                    self.trunk_manager.get_port_uuid_from_external_ids(
+                        self._get_parent_port(bridge)))
+            except (RuntimeError, exceptions.ParentPortNotFound,
+                    tman.TrunkManagerError):
+                # The bridge is handled later without prefetched trunk
+                continue
+        if not parent_port_ids:
+            return
+        try:
+            self._prefetched_trunks.update(
+                self.trunk_rpc.get_trunks_details(self.context,
+                                                  parent_port_ids))
+        except resources_rpc.BulkPullNotSupported:
+            LOG.debug("The trunks of the trunk bridges will be fetched one "
+                      "by one")
+        except oslo_messaging.MessagingException as e:
+            LOG.warning(_LW("Unable to fetch the trunks of %(count)d trunk "
+                            "bridges at once, they will be fetched one by "
+                            "one: %(err)s"),
+                        {'count': len(parent_port_ids), 'err': e})
+
+    def _prefetch_and_handle_trunks(self, bridge_names):
+        LOG.debug("Processing trunk bridges %s", bridge_names)
+        self._prefetch_trunks(bridge_names)
+        for bridge_name in bridge_names:
+            eventlet.spawn_n(self.handle_trunk_add, bridge_name)
+
     @lock_on_bridge_name(required_parameter='bridge_name')
     def handle_trunk_add(self, bridge_name):
         """Create trunk bridge based on parent port ID.
@@ -356,7 +398,8 @@ class OVSDBHandler(object):
         try:
             parent_port_id = (
                 self.trunk_manager.get_port_uuid_from_external_ids(port))
-            trunk = self.trunk_rpc.get_trunk_details(ctx, parent_port_id)
+            trunk = (self._prefetched_trunks.pop(parent_port_id, None) or
+                     self.trunk_rpc.get_trunk_details(ctx, parent_port_id))
         except tman.TrunkManagerError as te:
             LOG.error(_LE("Can't obtain parent port ID from port %s"),
                       port['name'])
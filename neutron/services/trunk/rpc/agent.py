@@ -91,6 +91,14 @@ class TrunkStub(object):
         """Get information about the trunk for the given parent port."""
         return self.stub.pull(context, resources.TRUNK, parent_port_id)
 
+    @log_helpers.log_method_call
+    def get_trunks_details(self, context, parent_port_ids):
+        """Get the trunks of the given parent ports, by parent port ID."""
+        trunks = self.stub.bulk_pull(
+            context, resources.TRUNK,
+            filter_kwargs={'port_id': list(parent_port_ids)})
+        return {trunk.port_id: trunk for trunk in trunks}
+
     @log_helpers.log_method_call
     def update_trunk_status(self, context, trunk_id, status):
         """Update the trunk status to reflect outcome of data plane wiring."""
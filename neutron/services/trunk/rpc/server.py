@@ -55,6 +55,11 @@ def trunk_by_port_provider(resource, port_id, context, **kwargs):
     return trunk_objects.Trunk.get_object(context, port_id=port_id)
 
 
+def trunks_provider(resource, filters, context, **kwargs):
+    """Provider callback to supply the trunks matching filters."""
+    return trunk_objects.Trunk.get_objects(context, **filters)
+
+
 class TrunkSkeleton(object):
     """Skeleton proxy code for agent->server communication."""
 
@@ -68,6 +73,7 @@ class TrunkSkeleton(object):
     def __init__(self):
         # Used to provide trunk lookups for the agent.
         registry.provide(trunk_by_port_provider, resources.TRUNK)
+        registry.provide_bulk(trunks_provider, resources.TRUNK)
         self._connection = n_rpc.create_connection()
         self._connection.create_consumer(
             constants.TRUNK_BASE_TOPIC, [self], fanout=False)
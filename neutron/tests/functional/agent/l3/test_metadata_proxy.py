@@ -15,20 +15,28 @@
 import os.path
 import time
 
+from oslo_log import log as logging
 import webob
 import webob.dec
 import webob.exc
 
 from neutron.agent.linux import dhcp
 from neutron.agent.linux import utils
+from neutron.agent.metadata import config as metadata_config
+from neutron.agent.metadata import driver as metadata_driver
+from neutron.common import utils as common_utils
 from neutron.tests.common import machine_fixtures
 from neutron.tests.common import net_helpers
 from neutron.tests.functional.agent.l3 import framework
 from neutron.tests.functional.agent.linux import helpers
 
 
+LOG = logging.getLogger(__name__)
+
 METADATA_REQUEST_TIMEOUT = 60
 METADATA_REQUEST_SLEEP = 5
+FOOTPRINT_ROUTERS = 5
+FOOTPRINT_REQUESTS = 20
 
 
 class MetadataFakeProxyHandler(object):
@@ -59,9 +67,38 @@ class MetadataL3AgentTestCase(framework.L3AgentTestFramework):
                      self.agent.conf.metadata_proxy_socket,
                      workers=0, backlog=4096, mode=self.SOCKET_MODE)
 
+    def _metadata_url(self):
+        return 'http://%(host)s:%(port)s' % {'host': dhcp.METADATA_DEFAULT_IP,
+                                             'port': dhcp.METADATA_PORT}
+
+    def _create_client_machine(self, router):
+        router_ip_cidr = self._port_first_ip_cidr(router.internal_ports[0])
+        br_int = framework.get_ovs_bridge(
+            self.agent.conf.ovs_integration_bridge)
+
+        return self.useFixture(
+            machine_fixtures.FakeMachine(
+                br_int,
+                net_helpers.increment_ip_cidr(router_ip_cidr),
+                router_ip_cidr.partition('/')[0]))
+
+    def _get_metadata_proxy_processes(self):
+        pms = [pm for service_id, pm in
+               self.agent.process_monitor._monitored_processes.items()
+               if service_id.service == metadata_driver.METADATA_SERVICE_NAME]
+        common_utils.wait_until_true(lambda: all(pm.pid for pm in pms))
+        return set(pm.pid for pm in pms)
+
+    @staticmethod
+    def _get_rss_kb(pid):
+        with open('/proc/%s/status' % pid) as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+        return 0
+
     def _query_metadata_proxy(self, machine):
-        url = 'http://%(host)s:%(port)s' % {'host': dhcp.METADATA_DEFAULT_IP,
-                                            'port': dhcp.METADATA_PORT}
+        url = self._metadata_url()
         cmd = 'curl', '--max-time', METADATA_REQUEST_TIMEOUT, '-D-', url
         i = 0
         CONNECTION_REFUSED_TIMEOUT = METADATA_REQUEST_TIMEOUT // 2
@@ -102,15 +139,7 @@ class MetadataL3AgentTestCase(framework.L3AgentTestFramework):
         self._create_metadata_fake_server(webob.exc.HTTPOk.code)
 
         # Create and configure client namespace
-        router_ip_cidr = self._port_first_ip_cidr(router.internal_ports[0])
-        br_int = framework.get_ovs_bridge(
-            self.agent.conf.ovs_integration_bridge)
-
-        machine = self.useFixture(
-            machine_fixtures.FakeMachine(
-                br_int,
-                net_helpers.increment_ip_cidr(router_ip_cidr),
-                router_ip_cidr.partition('/')[0]))
+        machine = self._create_client_machine(router)
 
         # Query metadata proxy
         firstline = self._query_metadata_proxy(machine)
@@ -118,6 +147,42 @@ class MetadataL3AgentTestCase(framework.L3AgentTestFramework):
         # Check status code
         self.assertIn(str(webob.exc.HTTPOk.code), firstline.split())
 
+    def test_metadata_proxy_footprint(self):
+        """Report memory usage and request latency of metadata proxies.
+
+        FOOTPRINT_ROUTERS routers are created and the resident memory of all
+        their metadata proxy processes is summed, then the average latency of
+        FOOTPRINT_REQUESTS metadata requests is measured from a client
+        namespace. Results are logged so that the proxy modes can be compared.
+        """
+        routers = [self.manage_router(self.agent,
+                                      self.generate_router_info(
+                                          enable_ha=False))
+                   for i in range(FOOTPRINT_ROUTERS)]
+        self._create_metadata_fake_server(webob.exc.HTTPOk.code)
+        machine = self._create_client_machine(routers[0])
+        self._query_metadata_proxy(machine)
+
+        cmd = ('curl', '--max-time', METADATA_REQUEST_TIMEOUT, '-s',
+               '-o', '/dev/null', '-w', '%{time_total}', self._metadata_url())
+        latencies = [float(machine.execute(cmd))
+                     for i in range(FOOTPRINT_REQUESTS)]
+        pids = self._get_metadata_proxy_processes()
+        rss_kb = sum(self._get_rss_kb(pid) for pid in pids)
+
+        LOG.info("Metadata proxy mode %(mode)s: %(routers)d routers, "
+                 "%(processes)d processes, %(rss)d kB RSS, "
+                 "%(latency).2f ms average request latency",
+                 {'mode': self.agent.conf.metadata_proxy_mode,
+                  'routers': FOOTPRINT_ROUTERS,
+                  'processes': len(pids),
+                  'rss': rss_kb,
+                  'latency': 1000 * sum(latencies) / len(latencies)})
+        expected_processes = (
+            1 if self.agent.conf.metadata_proxy_mode ==
+            metadata_config.SHARED_PROXY_MODE else FOOTPRINT_ROUTERS)
+        self.assertEqual(expected_processes, len(pids))
+
 
 class UnprivilegedUserMetadataL3AgentTestCase(MetadataL3AgentTestCase):
     """Test metadata proxy with least privileged user.
@@ -150,3 +215,12 @@ class UnprivilegedUserGroupMetadataL3AgentTestCase(MetadataL3AgentTestCase):
         self.agent.conf.set_override('metadata_proxy_user', '65534')
         self.agent.conf.set_override('metadata_proxy_group', '65534')
         self.agent.conf.set_override('metadata_proxy_watch_log', False)
+
+
+class SharedMetadataL3AgentTestCase(MetadataL3AgentTestCase):
+    """Test the metadata proxy shared by all the routers of the agent."""
+
+    def setUp(self):
+        super(SharedMetadataL3AgentTestCase, self).setUp()
+        self.agent.conf.set_override('metadata_proxy_mode',
+                                     metadata_config.SHARED_PROXY_MODE)
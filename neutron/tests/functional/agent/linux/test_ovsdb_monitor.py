@@ -84,10 +84,13 @@ class TestSimpleInterfaceMonitor(BaseMonitorTest):
     def setUp(self):
         super(TestSimpleInterfaceMonitor, self).setUp()
 
-        self.monitor = ovsdb_monitor.SimpleInterfaceMonitor()
+        self.monitor = self._create_monitor()
         self.addCleanup(self.monitor.stop)
         self.monitor.start(block=True, timeout=60)
 
+    def _create_monitor(self):
+        return ovsdb_monitor.SimpleInterfaceMonitor()
+
     def test_has_updates(self):
         utils.wait_until_true(lambda: self.monitor.has_updates)
         # clear the event list
@@ -152,3 +155,9 @@ class TestSimpleInterfaceMonitor(BaseMonitorTest):
                         e['ofport'] != ovs_lib.UNASSIGNED_OFPORT):
                     return True
         utils.wait_until_true(p1_event_has_ofport)
+
+
+class TestNativeInterfaceMonitor(TestSimpleInterfaceMonitor):
+
+    def _create_monitor(self):
+        return ovsdb_monitor.NativeInterfaceMonitor()
@@ -17,12 +17,15 @@
 import time
 
 from eventlet.timeout import Timeout
+from oslo_log import log as logging
 
 from neutron.common import utils
 from neutron.plugins.ml2.drivers.openvswitch.agent.common import constants
 from neutron.tests.common import net_helpers
 from neutron.tests.functional.agent.l2 import base
 
+LOG = logging.getLogger(__name__)
+
 
 class TestOVSAgent(base.OVSAgentTestFramework):
     def test_port_creation_and_deletion(self):
@@ -333,3 +336,70 @@ class TestOVSAgentExtensionConfig(base.OVSAgentTestFramework):
         self.agent._report_state()
         agent_state = self.agent.state_rpc.report_state.call_args[0][1]
         self.assertEqual(['qos'], agent_state['configurations']['extensions'])
+
+
+class TestOVSAgentPortProcessingBenchmark(base.OVSAgentTestFramework):
+    """Measure the rate at which the agent wires added ports.
+
+    Fake ports of several networks are plugged into the integration bridge
+    and processed by a single agent iteration, sequentially and then by
+    concurrent workers.
+    """
+
+    NETWORKS = 5
+    PORTS_PER_NETWORK = 10
+
+    def setUp(self):
+        super(TestOVSAgentPortProcessingBenchmark, self).setUp()
+        self.agent = self.create_agent(create_tunnels=False)
+        self.ports = []
+        self.network_by_port = {}
+        self.agent.plugin_rpc.update_device_list.side_effect = (
+            self._mock_update_device)
+        (self.agent.plugin_rpc.get_devices_details_list_and_failed_devices.
+            side_effect) = self._mock_device_details
+
+    def _mock_device_details(self, context, devices, agent_id, host=None):
+        details = [self._get_device_details(port,
+                                            self.network_by_port[port['id']])
+                   for port in self.ports if port['id'] in devices]
+        return {'devices': details, 'failed_devices': []}
+
+    def _plug_networks_ports(self):
+        ports = []
+        for i in range(self.NETWORKS):
+            network = self._create_test_network_dict()
+            network['segmentation_id'] = 100 + len(self.network_by_port) + i
+            network_ports = self.create_test_ports(
+                amount=self.PORTS_PER_NETWORK)
+            for port in network_ports:
+                self.network_by_port[port['id']] = network
+            self._plug_ports(network, network_ports, self.agent)
+            ports.extend(network_ports)
+        self.ports.extend(ports)
+        return {port['id'] for port in ports}
+
+    def _measure_ports_wired_per_second(self, workers):
+        self.agent.port_processing_workers = workers
+        added = self._plug_networks_ports()
+        port_info = {'current': set(added), 'added': set(added)}
+        start = time.time()
+        failed_devices = self.agent.process_network_ports(port_info, False)
+        elapsed = time.time() - start
+        self.assertEqual(set(), failed_devices['added'])
+        self.assert_vlan_tags(
+            [port for port in self.ports if port['id'] in added], self.agent)
+        rate = len(added) / elapsed
+        LOG.info("%(workers)d port processing workers wired %(ports)d "
+                 "ports of %(networks)d networks in %(elapsed).3f seconds, "
+                 "%(rate).1f ports per second",
+                 {'workers': workers, 'ports': len(added),
+                  'networks': self.NETWORKS, 'elapsed': elapsed,
+                  'rate': rate})
+        return rate
+
+    def test_ports_wired_per_second(self):
+        sequential = self._measure_ports_wired_per_second(workers=1)
+        pipelined = self._measure_ports_wired_per_second(workers=8)
+        self.assertGreater(sequential, 0)
+        self.assertGreater(pipelined, 0)
@@ -10,19 +10,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import resource as rusage
+import time
 import uuid
 
 import mock
 from neutron_lib import constants as n_const
 from oslo_config import cfg
 from oslo_db import exception as db_exc
+from oslo_log import log as logging
 from oslo_policy import policy as oslo_policy
 from oslo_serialization import jsonutils
+from oslo_utils import uuidutils
 import pecan
 from pecan import request
+import webob
 
 from neutron.api import extensions
 from neutron import context
+from neutron.db import models_v2
 from neutron import manager
 from neutron.pecan_wsgi.controllers import root as controllers
 from neutron.pecan_wsgi.controllers import utils as controller_utils
@@ -32,6 +38,8 @@ from neutron.tests.common import helpers
 from neutron.tests.functional.pecan_wsgi import test_functional
 from neutron.tests.functional.pecan_wsgi import utils as pecan_utils
 
+LOG = logging.getLogger(__name__)
+
 _SERVICE_PLUGIN_RESOURCE = 'serviceplugin'
 _SERVICE_PLUGIN_COLLECTION = _SERVICE_PLUGIN_RESOURCE + 's'
 _SERVICE_PLUGIN_INDEX_BODY = {_SERVICE_PLUGIN_COLLECTION: []}
@@ -970,3 +978,128 @@ class TestParentSubresourceController(test_functional.PecanFunctionalTest):
         self.assertEqual(200, resp.status_int)
         self.assertEqual({'fake_duplicates': [{'fake': 'something'}]},
                          resp.json)
+
+
+class TestCollectionStreamingBenchmark(test_functional.PecanFunctionalTest):
+    """Compare the listing of a large collection with and without streaming.
+
+    The time to the first byte of the response and the growth of the peak
+    resident memory of the process are logged for both modes. The streamed
+    listing runs first, as the peak memory never decreases.
+    """
+
+    NETWORKS = 20000
+
+    def setUp(self):
+        super(TestCollectionStreamingBenchmark, self).setUp()
+        networks = [{'id': uuidutils.generate_uuid(),
+                     'name': 'net-%d' % i,
+                     'tenant_id': 'tenid',
+                     'admin_state_up': True,
+                     'status': n_const.NET_STATUS_ACTIVE,
+                     'shared': False,
+                     'subnets': [],
+                     'mtu': 1450}
+                    for i in range(self.NETWORKS)]
+        plugin = manager.NeutronManager.get_plugin()
+        mock.patch.object(plugin, 'get_networks',
+                          return_value=networks).start()
+
+    def _measure_listing(self, streamed):
+        cfg.CONF.set_override('stream_collection_responses', streamed)
+        req = webob.Request.blank(
+            '/v2.0/networks',
+            headers={'X-Project-Id': 'tenid', 'X-Roles': 'admin'})
+        rss_before = rusage.getrusage(rusage.RUSAGE_SELF).ru_maxrss
+        start = time.time()
+        status, headers, app_iter = req.call_application(self.app.app)
+        chunks = iter(app_iter)
+        body = [next(chunks)]
+        first_byte = time.time() - start
+        body.extend(chunks)
+        elapsed = time.time() - start
+        rss_growth = (rusage.getrusage(rusage.RUSAGE_SELF).ru_maxrss -
+                      rss_before)
+        self.assertTrue(status.startswith('200'))
+        networks = jsonutils.loads(b''.join(body))['networks']
+        self.assertEqual(self.NETWORKS, len(networks))
+        LOG.info("Listed %(count)d networks %(mode)s: first byte after "
+                 "%(first_byte).3f seconds, body after %(elapsed).3f "
+                 "seconds, peak RSS grew by %(rss)d KiB",
+                 {'count': self.NETWORKS,
+                  'mode': 'streamed' if streamed else 'buffered',
+                  'first_byte': first_byte, 'elapsed': elapsed,
+                  'rss': rss_growth})
+        return first_byte
+
+    def test_streamed_listing_first_byte(self):
+        streamed = self._measure_listing(streamed=True)
+        buffered = self._measure_listing(streamed=False)
+        self.assertGreater(streamed, 0)
+        self.assertGreater(buffered, 0)
+
+
+class TestKeysetPaginationBenchmark(test_functional.PecanFunctionalTest):
+    """Measure the latency of the pages of a collection against their depth.
+
+    The pages are walked by following the next links, whose markers carry
+    the sort key values of the last item, and then again with the ID of
+    the last item as marker, which makes the plugin load it first.
+    """
+
+    NETWORKS = 2000
+    LIMIT = 50
+
+    def setUp(self):
+        super(TestKeysetPaginationBenchmark, self).setUp()
+        cfg.CONF.set_override('allow_pagination', True)
+        cfg.CONF.set_override('allow_sorting', True)
+        self.setup_app()
+        ctx = context.get_admin_context()
+        with ctx.session.begin():
+            for i in range(self.NETWORKS):
+                ctx.session.add(models_v2.Network(
+                    id=uuidutils.generate_uuid(), name='net-%05d' % i,
+                    tenant_id='tenid', status=n_const.NET_STATUS_ACTIVE,
+                    admin_state_up=True))
+
+    def _get_page(self, url):
+        start = time.time()
+        response = self.app.get(url, headers={'X-Project-Id': 'tenid',
+                                              'X-Roles': 'admin'})
+        return time.time() - start, response.json
+
+    def _walk_pages(self, use_links):
+        url = ('/v2.0/networks?limit=%d&sort_key=name&sort_dir=asc' %
+               self.LIMIT)
+        latencies = []
+        while url:
+            latency, page = self._get_page(url)
+            latencies.append(latency)
+            next_links = [link['href']
+                          for link in page.get('networks_links', [])
+                          if link['rel'] == 'next']
+            if not next_links or not page['networks']:
+                break
+            if use_links:
+                url = next_links[0]
+            else:
+                url = ('/v2.0/networks?limit=%d&sort_key=name&sort_dir=asc'
+                       '&marker=%s' % (self.LIMIT, page['networks'][-1]['id']))
+        LOG.info("Walked %(pages)d pages of %(limit)d networks with "
+                 "%(markers)s markers: first page %(first).3f seconds, "
+                 "middle page %(middle).3f seconds, last page %(last).3f "
+                 "seconds",
+                 {'pages': len(latencies), 'limit': self.LIMIT,
+                  'markers': 'keyset' if use_links else 'ID',
+                  'first': latencies[0],
+                  'middle': latencies[len(latencies) // 2],
+                  'last': latencies[-1]})
+        return latencies
+
+    def test_page_latency_against_depth(self):
+        keyset_latencies = self._walk_pages(use_links=True)
+        id_latencies = self._walk_pages(use_links=False)
+        expected_pages = self.NETWORKS // self.LIMIT + 1
+        self.assertEqual(expected_pages, len(keyset_latencies))
+        self.assertEqual(expected_pages, len(id_latencies))
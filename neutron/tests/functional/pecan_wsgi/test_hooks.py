@@ -13,7 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 import mock
+from oslo_config import cfg
+from oslo_log import log as logging
 from oslo_policy import policy as oslo_policy
 from oslo_serialization import jsonutils
 
@@ -26,6 +30,8 @@ from neutron.pecan_wsgi.controllers import resource
 from neutron import policy
 from neutron.tests.functional.pecan_wsgi import test_functional
 
+LOG = logging.getLogger(__name__)
+
 
 class TestOwnershipHook(test_functional.PecanFunctionalTest):
 
@@ -219,6 +225,90 @@ class TestPolicyEnforcementHook(test_functional.PecanFunctionalTest):
         json_response = jsonutils.loads(response.body)
         self.assertNotIn('restricted_attr', json_response['mehs'][0])
 
+    def test_after_on_streamed_list_filters_items_and_attributes(self):
+        cfg.CONF.set_override('stream_collection_responses', True)
+        self.mock_plugin.get_mehs.return_value = [
+            {'id': 'xxx', 'attr': 'meh', 'restricted_attr': '',
+             'tenant_id': 'tenid'},
+            {'id': 'yyy', 'attr': 'meh', 'restricted_attr': '',
+             'tenant_id': 'tenid'}]
+        response = self.app.get('/v2.0/mehs',
+                                headers={'X-Project-Id': 'tenid'})
+        self.assertEqual(200, response.status_int)
+        self.assertIsNone(response.content_length)
+        json_response = jsonutils.loads(response.body)
+        self.assertEqual(['xxx'],
+                         [meh['id'] for meh in json_response['mehs']])
+        self.assertNotIn('restricted_attr', json_response['mehs'][0])
+
+    def test_after_on_paginated_list_is_not_streamed(self):
+        cfg.CONF.set_override('stream_collection_responses', True)
+        manager.NeutronManager.set_controller_for_resource(
+            'mehs', resource.CollectionsController(
+                'mehs', 'meh', allow_pagination=True))
+        self.mock_plugin.get_mehs.return_value = [{
+            'id': 'xxx',
+            'attr': 'meh',
+            'restricted_attr': '',
+            'tenant_id': 'tenid'}]
+        response = self.app.get('/v2.0/mehs?limit=1',
+                                headers={'X-Project-Id': 'tenid'})
+        self.assertEqual(200, response.status_int)
+        self.assertIsNotNone(response.content_length)
+        json_response = jsonutils.loads(response.body)
+        self.assertEqual('xxx', json_response['mehs'][0]['id'])
+
+    def _set_owner_rules(self):
+        policy._ENFORCER.set_rules(
+            oslo_policy.Rules.from_dict(
+                {'get_meh': 'rule:admin_only or tenant_id:%(tenant_id)s'}),
+            overwrite=False)
+
+    def _get_owned_mehs(self, count, tenants):
+        return [{'id': 'meh-%d' % i, 'attr': 'meh', 'restricted_attr': '',
+                 'tenant_id': 'tenid-%d' % (i % tenants)}
+                for i in range(count)]
+
+    def test_after_on_list_checks_policy_once_per_owner(self):
+        self._set_owner_rules()
+        self.mock_plugin.get_mehs.return_value = self._get_owned_mehs(10, 2)
+        with mock.patch.object(policy, 'check',
+                               wraps=policy.check) as check:
+            response = self.app.get('/v2.0/mehs',
+                                    headers={'X-Project-Id': 'tenid-0'})
+        self.assertEqual(200, response.status_int)
+        json_response = jsonutils.loads(response.body)
+        self.assertEqual(['meh-%d' % i for i in range(0, 10, 2)],
+                         [meh['id'] for meh in json_response['mehs']])
+        self.assertNotIn('restricted_attr', json_response['mehs'][0])
+        get_meh_calls = [call for call in check.call_args_list
+                         if call[0][1] == 'get_meh']
+        self.assertEqual(2, len(get_meh_calls))
+
+    def test_after_on_list_policy_filtering_benchmark(self):
+        self._set_owner_rules()
+        mehs = self._get_owned_mehs(10000, 10)
+
+        def list_mehs():
+            self.mock_plugin.get_mehs.return_value = [
+                dict(meh) for meh in mehs]
+            start = time.time()
+            response = self.app.get('/v2.0/mehs',
+                                    headers={'X-Project-Id': 'tenid-0'})
+            elapsed = time.time() - start
+            self.assertEqual(1000,
+                             len(jsonutils.loads(response.body)['mehs']))
+            return elapsed
+
+        grouped = list_mehs()
+        with mock.patch.object(policy.CollectionPolicyChecker,
+                               '_get_cache_key', return_value=None):
+            per_item = list_mehs()
+        LOG.info("Policy filtering of %(count)d items: %(per_item).3fs "
+                 "checking every item, %(grouped).3fs checking once per "
+                 "owner", {'count': len(mehs), 'per_item': per_item,
+                           'grouped': grouped})
+
 
 class TestMetricsNotifierHook(test_functional.PecanFunctionalTest):
 
@@ -0,0 +1,170 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import os
+
+import mock
+from neutron_lib import constants
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+from neutron.agent import resource_cache
+from neutron.api.rpc.callbacks import events as rpc_events
+from neutron.api.rpc.callbacks import resources as rpc_resources
+from neutron.api.rpc.handlers import resources_rpc
+from neutron import context
+from neutron.extensions import portbindings
+from neutron.objects import ports
+from neutron.plugins.ml2 import config
+from neutron.plugins.ml2 import rpc
+from neutron.tests.common import helpers
+from neutron.tests.unit.plugins.ml2 import base as ml2_test_base
+
+LOG = logging.getLogger(__name__)
+
+DEVICE_OWNER_COMPUTE = constants.DEVICE_OWNER_COMPUTE_PREFIX + 'fake'
+# Number of ports of the fake agent, and number of times the agent asks
+# about all of them before converging
+NUM_PORTS = 500
+NUM_LOOPS = 3
+
+
+class _FanoutConnection(object):
+    """Deliver the fanout casts of the push RPC API to their consumers.
+
+    The RPC servers are not started by the tests, so the casts made by
+    ResourcesPushRpcApi are delivered directly to the endpoints of the
+    consumers created on their topic.
+    """
+
+    def __init__(self):
+        self._endpoints_by_topic = collections.defaultdict(list)
+
+    def create_consumer(self, topic, endpoints, fanout=False):
+        self._endpoints_by_topic[topic].extend(endpoints)
+
+    def prepare_object_fanout_context(self, obj, resource_version,
+                                      rpc_version):
+        topic = resources_rpc.resource_type_versioned_topic(
+            obj.obj_name(), resource_version)
+        return _FanoutCallContext(self._endpoints_by_topic[topic])
+
+
+class _FanoutCallContext(object):
+
+    def __init__(self, endpoints):
+        self._endpoints = endpoints
+
+    def cast(self, ctxt, method, **kwargs):
+        for endpoint in self._endpoints:
+            getattr(endpoint, method)(ctxt, **kwargs)
+
+
+def _measure(func):
+    """Return the result of func, its wall clock time and its CPU time."""
+    cpu_start = sum(os.times()[:2])
+    with timeutils.StopWatch() as watch:
+        result = func()
+    return result, watch.elapsed(), sum(os.times()[:2]) - cpu_start
+
+
+class ResourceCacheConvergenceTestCase(ml2_test_base.ML2TestFramework):
+    """Compare the convergence of a fake agent with and without the cache.
+
+    Without the cache, the agent asks the server about all its ports with
+    get_devices_details_list in each loop. With the cache, the ports are
+    pushed once by the server and each loop is answered locally.
+    """
+
+    def setUp(self):
+        config.cfg.CONF.set_override('push_resource_objects', True,
+                                     group='ml2')
+        self.connection = _FanoutConnection()
+        mock.patch.object(
+            resources_rpc.ResourcesPushRpcApi,
+            '_prepare_object_fanout_context',
+            side_effect=self.connection.prepare_object_fanout_context).start()
+        super(ResourceCacheConvergenceTestCase, self).setUp()
+        self.admin_context = context.get_admin_context()
+        # The cache is filled by the pushes of the plugin, through the
+        # serialization of the push RPC API and the consumer registry
+        self.cache = resource_cache.RemoteResourceCache(
+            [rpc_resources.PORT],
+            indexes={rpc_resources.PORT: ['network_id']})
+        self.cache.start_watcher(self.connection)
+        helpers.register_ovs_agent(host=helpers.HOST)
+        self.rpc_callbacks = rpc.RpcCallbacks(mock.Mock(),
+                                              self.core_plugin.type_manager)
+        with self.network() as network:
+            self.network_id = network['network']['id']
+        self.port_ids = [
+            self.core_plugin.create_port(self.admin_context, {'port': {
+                'network_id': self.network_id,
+                'tenant_id': self._tenant_id,
+                'name': 'port%d' % i,
+                'admin_state_up': True,
+                'device_id': 'device%d' % i,
+                'device_owner': DEVICE_OWNER_COMPUTE,
+                'mac_address': constants.ATTR_NOT_SPECIFIED,
+                'fixed_ips': constants.ATTR_NOT_SPECIFIED,
+                portbindings.HOST_ID: helpers.HOST}})['id']
+            for i in range(NUM_PORTS)]
+        self.core_plugin.ovo_notifier.wait()
+
+    def _converge_without_cache(self):
+        for _loop in range(NUM_LOOPS):
+            details = self.rpc_callbacks.get_devices_details_list(
+                self.admin_context, devices=self.port_ids,
+                agent_id='fake-agent', host=helpers.HOST)
+        return details
+
+    def _push_ports(self):
+        port_objs = ports.Port.get_objects(self.admin_context,
+                                           network_id=self.network_id)
+        resources_rpc.ResourcesPushRpcApi().push(
+            self.admin_context, port_objs, rpc_events.UPDATED)
+
+    def _converge_with_cache(self, cache):
+        for _loop in range(NUM_LOOPS):
+            found = [cache.get_resource_by_id(rpc_resources.PORT, port_id)
+                     for port_id in self.port_ids]
+            network_ports = cache.get_resources(
+                rpc_resources.PORT, {'network_id': [self.network_id]})
+        return found, network_ports
+
+    def test_convergence_with_and_without_cache(self):
+        details, wall, server_cpu = _measure(self._converge_without_cache)
+        self.assertEqual(NUM_PORTS, len(details))
+        LOG.info("Without cache: %(loops)d loops over %(ports)d ports took "
+                 "%(wall).3f s, %(cpu).3f s of server RPC CPU time",
+                 {'loops': NUM_LOOPS, 'ports': NUM_PORTS, 'wall': wall,
+                  'cpu': server_cpu})
+
+        # The ports created by setUp were pushed one by one by the plugin
+        cache = self.cache
+        self.assertEqual(
+            NUM_PORTS, len(cache.get_resources(
+                rpc_resources.PORT, {'network_id': [self.network_id]})))
+        # Measure a full resync, all the ports pushed in one message
+        _result, push_wall, push_cpu = _measure(self._push_ports)
+        (found, network_ports), wall, agent_cpu = _measure(
+            lambda: self._converge_with_cache(cache))
+        self.assertEqual(NUM_PORTS, len([p for p in found if p]))
+        self.assertEqual(NUM_PORTS, len(network_ports))
+        self.assertEqual(0, cache.stats['misses'])
+        LOG.info("With cache: loading %(ports)d ports took %(push_wall).3f "
+                 "s, %(push_cpu).3f s of server CPU time, %(loops)d loops "
+                 "took %(wall).3f s, %(cpu).3f s of agent CPU time",
+                 {'ports': NUM_PORTS, 'push_wall': push_wall,
+                  'push_cpu': push_cpu, 'loops': NUM_LOOPS, 'wall': wall,
+                  'cpu': agent_cpu})
@@ -13,14 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
+import mock
 from neutron_lib import constants
+from oslo_config import cfg
+from oslo_log import log as logging
 
+from neutron.api.v2 import attributes
 from neutron import context
 from neutron.db import agents_db
 from neutron.extensions import portbindings
 from neutron.tests.common import helpers
 from neutron.tests.unit.plugins.ml2 import base as ml2_test_base
 
+LOG = logging.getLogger(__name__)
 
 DEVICE_OWNER_COMPUTE = constants.DEVICE_OWNER_COMPUTE_PREFIX + 'fake'
 
@@ -70,3 +77,48 @@ class TestMl2PortBinding(ml2_test_base.ML2TestFramework,
                                      portbindings.VIF_TYPE_OVS)
                     self.assertEqual(bound_context.current['binding:vif_type'],
                                      portbindings.VIF_TYPE_OVS)
+
+
+class TestMl2PortBulkCreateBenchmark(ml2_test_base.ML2TestFramework):
+    """Compare the bulk creation of ports with the per port creation.
+
+    The per port creation runs the generic _create_bulk_ml2 path, which
+    fetches the network, binds the security groups and calls the
+    postcommit of the drivers port by port.
+    """
+
+    PORTS = 500
+
+    def setUp(self):
+        super(TestMl2PortBulkCreateBenchmark, self).setUp()
+        cfg.CONF.set_override('quota_port', -1, group='QUOTAS')
+
+    def _measure_bulk_create(self, network_id):
+        start = time.time()
+        res = self._create_port_bulk(self.fmt, self.PORTS, network_id,
+                                     'bench', True)
+        elapsed = time.time() - start
+        self.assertEqual(201, res.status_int)
+        self.assertEqual(self.PORTS,
+                         len(self.deserialize(self.fmt, res)['ports']))
+        return elapsed
+
+    def _create_bulk_per_port(self, context, items):
+        return self.plugin._create_bulk_ml2(
+            attributes.PORT, context, {attributes.PORTS: items})
+
+    def test_create_ports_bulk(self):
+        with self.network() as network:
+            network_id = network['network']['id']
+            with self.subnet(network=network, cidr='10.0.0.0/20'):
+                batched = self._measure_bulk_create(network_id)
+                with mock.patch.object(
+                        self.plugin, '_create_port_bulk_db',
+                        side_effect=self._create_bulk_per_port),\
+                        mock.patch.object(self.plugin.mechanism_manager,
+                                          'create_port_postcommit_bulk'):
+                    per_port = self._measure_bulk_create(network_id)
+        LOG.info("Created %(count)d ports in bulk: %(per_port).3f seconds "
+                 "port by port, %(batched).3f seconds batched",
+                 {'count': self.PORTS, 'per_port': per_port,
+                  'batched': batched})
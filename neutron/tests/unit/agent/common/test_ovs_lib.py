@@ -463,6 +463,53 @@ class OVS_Lib_Test(base.BaseTestCase):
 
         tools.verify_mock_calls(self.execute, expected_calls_and_values)
 
+    def test_add_tunnel_ports(self):
+        pname = "tap99"
+        local_ip = "1.1.1.1"
+        remote_ip = "9.9.9.9"
+        command = ["--may-exist", "add-port", self.BR_NAME, pname]
+        command.extend(["--", "set", "Interface", pname])
+        command.extend(["type=" + constants.TYPE_VXLAN,
+                        "options:df_default=true",
+                        "options:remote_ip=" + remote_ip,
+                        "options:local_ip=" + local_ip,
+                        "options:in_key=flow",
+                        "options:out_key=flow"])
+        expected_calls_and_values = [(self._vsctl_mock(*command), None)]
+        tools.setup_mock_calls(self.execute, expected_calls_and_values)
+
+        with mock.patch.object(self.br, 'get_ports_attributes',
+                               return_value=[{'name': pname,
+                                              'ofport': 6}]) as get_attrs:
+            self.assertEqual(
+                {pname: 6},
+                self.br.add_tunnel_ports(
+                    {pname: (remote_ip, constants.TYPE_VXLAN)}, local_ip))
+        tools.verify_mock_calls(self.execute, expected_calls_and_values)
+        get_attrs.assert_called_once_with(
+            'Interface', columns=['name', 'ofport'], ports=[pname],
+            if_exists=True)
+
+    def test_add_tunnel_ports_no_tunnels(self):
+        self.assertEqual({}, self.br.add_tunnel_ports({}, "1.1.1.1"))
+        self.assertFalse(self.execute.called)
+
+    def test_get_ports_ofports_retry(self):
+        with mock.patch.object(
+                self.br, '_get_ports_ofports',
+                side_effect=[{'p1': [], 'p2': 2},
+                             {'p1': 1, 'p2': 2}]) as get_ofports:
+            self.assertEqual({'p1': 1, 'p2': 2},
+                             self.br.get_ports_ofports(['p1', 'p2']))
+        self.assertEqual(2, get_ofports.call_count)
+
+    def test_get_ports_ofports_retry_fails(self):
+        self.br.vsctl_timeout = 0
+        with mock.patch.object(self.br, '_get_ports_ofports',
+                               return_value={'p1': [], 'p2': 2}):
+            self.assertEqual({'p1': ovs_lib.INVALID_OFPORT, 'p2': 2},
+                             self.br.get_ports_ofports(['p1', 'p2']))
+
     def _test_get_vif_ports(self, is_xen=False):
         pname = "tap99"
         ofport = 6
@@ -838,7 +885,8 @@ class TestDeferredOVSBridge(base.BaseTestCase):
         self.del_flow_dict2 = dict(in_port=32)
 
     def test_right_allowed_passthroughs(self):
-        expected_passthroughs = ('add_port', 'add_tunnel_port', 'delete_port')
+        expected_passthroughs = ('add_port', 'add_tunnel_port',
+                                 'add_tunnel_ports', 'delete_port')
         self.assertEqual(expected_passthroughs,
                          ovs_lib.DeferredOVSBridge.ALLOWED_PASSTHROUGHS)
 
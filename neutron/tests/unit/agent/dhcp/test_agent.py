@@ -376,6 +376,60 @@ class TestDhcpAgent(base.BaseTestCase):
     def test_sync_state_disabled_net(self):
         self._test_sync_state_helper(['b'], ['a'])
 
+    def test_sync_state_configures_networks_while_fetching(self):
+        configured = []
+
+        def active_networks():
+            yield mock.Mock(id='a')
+            # The first network was handed to the pool before the next
+            # chunk is fetched
+            eventlet.sleep(0)
+            self.assertEqual(['a'], configured)
+            yield mock.Mock(id='b')
+
+        with mock.patch(DHCP_PLUGIN) as plug:
+            mock_plugin = mock.Mock()
+            mock_plugin.get_active_networks_info.return_value = (
+                active_networks())
+            plug.return_value = mock_plugin
+            dhcp = dhcp_agent.DhcpAgent(HOSTNAME)
+            with mock.patch.object(dhcp, 'safe_configure_dhcp_for_network',
+                                   side_effect=lambda n: configured.append(
+                                       n.id)),\
+                    mock.patch.object(dhcp, 'schedule_resync') as resync:
+                dhcp.sync_state()
+            self.assertEqual(['a', 'b'], configured)
+            self.assertFalse(resync.called)
+            mock_plugin.get_active_networks_info.assert_called_once_with(
+                chunk_size=cfg.CONF.sync_networks_chunk_size)
+
+    def test_sync_state_waits_for_pool_on_chunk_error(self):
+        configured = []
+
+        def active_networks():
+            yield mock.Mock(id='a')
+            raise Exception('chunk failure')
+
+        def configure(network):
+            eventlet.sleep(0.01)
+            configured.append(network.id)
+
+        with mock.patch(DHCP_PLUGIN) as plug:
+            mock_plugin = mock.Mock()
+            mock_plugin.get_active_networks_info.return_value = (
+                active_networks())
+            plug.return_value = mock_plugin
+            dhcp = dhcp_agent.DhcpAgent(HOSTNAME)
+            with mock.patch.object(dhcp, 'safe_configure_dhcp_for_network',
+                                   side_effect=configure),\
+                    mock.patch.object(dhcp, 'disable_dhcp_helper') as disable,\
+                    mock.patch.object(dhcp, 'schedule_resync') as resync:
+                dhcp.sync_state()
+            # The network was configured before sync_state returned
+            self.assertEqual(['a'], configured)
+            self.assertTrue(resync.called)
+            self.assertFalse(disable.called)
+
     def test_sync_state_waitall(self):
         with mock.patch.object(dhcp_agent.eventlet.GreenPool, 'waitall') as w:
             active_net_ids = ['1', '2', '3', '4', '5']
@@ -660,7 +714,7 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
         self.plugin.get_network_info.return_value = network
         self.dhcp.enable_dhcp_helper(network.id)
         self.plugin.assert_has_calls([
-            mock.call.get_network_info(network.id)])
+            mock.call.get_network_info(network.id, cached_network=None)])
         self.call_driver.assert_called_once_with('enable', network)
         self.cache.assert_has_calls([mock.call.put(network)])
         if is_isolated_network and enable_isolated_metadata:
@@ -725,7 +779,8 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
             self.dhcp, 'enable_isolated_metadata_proxy') as enable_metadata:
             self.dhcp.enable_dhcp_helper(fake_network_ipv6_ipv4.id)
             self.plugin.assert_has_calls(
-                [mock.call.get_network_info(fake_network_ipv6_ipv4.id)])
+                [mock.call.get_network_info(fake_network_ipv6_ipv4.id,
+                                            cached_network=None)])
             self.call_driver.assert_called_once_with('enable',
                                                      fake_network_ipv6_ipv4)
             self.assertFalse(self.cache.called)
@@ -742,7 +797,8 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
         self.plugin.get_network_info.return_value = fake_down_network
         self.dhcp.enable_dhcp_helper(fake_down_network.id)
         self.plugin.assert_has_calls(
-            [mock.call.get_network_info(fake_down_network.id)])
+            [mock.call.get_network_info(fake_down_network.id,
+                                        cached_network=None)])
         self.assertFalse(self.call_driver.called)
         self.assertFalse(self.cache.called)
         self.assertFalse(self.external_process.called)
@@ -751,7 +807,7 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
         self.plugin.get_network_info.return_value = None
         self.dhcp.enable_dhcp_helper('fake_id')
         self.plugin.assert_has_calls(
-            [mock.call.get_network_info('fake_id')])
+            [mock.call.get_network_info('fake_id', cached_network=None)])
         self.assertFalse(self.call_driver.called)
         self.assertFalse(self.dhcp.schedule_resync.called)
 
@@ -760,7 +816,8 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
         with mock.patch.object(dhcp_agent.LOG, 'exception') as log:
             self.dhcp.enable_dhcp_helper(fake_network.id)
             self.plugin.assert_has_calls(
-                [mock.call.get_network_info(fake_network.id)])
+                [mock.call.get_network_info(fake_network.id,
+                                            cached_network=None)])
             self.assertFalse(self.call_driver.called)
             self.assertTrue(log.called)
             self.assertTrue(self.schedule_resync.called)
@@ -773,7 +830,7 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
         cfg.CONF.set_override('enable_isolated_metadata', True)
         self.dhcp.enable_dhcp_helper(fake_network.id)
         self.plugin.assert_has_calls(
-            [mock.call.get_network_info(fake_network.id)])
+            [mock.call.get_network_info(fake_network.id, cached_network=None)])
         self.call_driver.assert_called_once_with('enable', fake_network)
         self.assertFalse(self.cache.called)
         self.assertFalse(self.external_process.called)
@@ -1030,6 +1087,54 @@ class TestDhcpAgentEventHandler(base.BaseTestCase):
         self.call_driver.assert_called_once_with('reload_allocations',
                                                  fake_network)
 
+    def _test_port_update_end_concurrency(self, second_network_id):
+        blocked = eventlet.event.Event()
+        calls = []
+
+        def call_driver(action, network):
+            calls.append(network.id)
+            if network.id == fake_port2.network_id:
+                blocked.wait()
+
+        self.call_driver.side_effect = call_driver
+        self.cache.get_network_by_id.side_effect = (
+            lambda network_id: dhcp.NetModel({'id': network_id}))
+        second_port = copy.deepcopy(fake_port2)
+        second_port.network_id = second_network_id
+
+        first = eventlet.spawn(self.dhcp.port_update_end, None,
+                               dict(port=fake_port2))
+        eventlet.sleep(0)
+        second = eventlet.spawn(self.dhcp.port_update_end, None,
+                                dict(port=second_port))
+        eventlet.sleep(0)
+        calls_while_blocked = list(calls)
+        blocked.send()
+        first.wait()
+        second.wait()
+        return calls_while_blocked
+
+    def test_port_update_end_other_network_not_blocked(self):
+        other_network_id = '12345678-1234-5678-1234567890cd'
+        calls = self._test_port_update_end_concurrency(other_network_id)
+        self.assertEqual([fake_port2.network_id, other_network_id], calls)
+
+    def test_port_update_end_same_network_serialized(self):
+        calls = self._test_port_update_end_concurrency(fake_port2.network_id)
+        self.assertEqual([fake_port2.network_id], calls)
+        self.assertEqual(2, self.call_driver.call_count)
+
+    def test_port_update_end_waits_for_sync_state(self):
+        self.cache.get_network_by_id.return_value = fake_network
+        with dhcp_agent._SYNC_STATE_LOCK.write_lock():
+            update = eventlet.spawn(self.dhcp.port_update_end, None,
+                                    dict(port=fake_port2))
+            eventlet.sleep(0)
+            self.assertFalse(self.call_driver.called)
+        update.wait()
+        self.call_driver.assert_called_once_with('reload_allocations',
+                                                 fake_network)
+
     def test_port_update_change_ip_on_port(self):
         payload = dict(port=fake_port1)
         self.cache.get_network_by_id.return_value = fake_network
@@ -1147,10 +1252,175 @@ class TestDhcpPluginApiProxy(base.BaseTestCase):
     def test_get_active_networks_info(self):
         self._test_dhcp_api('get_active_networks_info', version='1.1')
 
+    def test_get_active_networks_info_chunks(self):
+        proxy = dhcp_agent.DhcpPluginApi('foo', host='foo')
+        with mock.patch.object(proxy.client, 'call') as rpc_mock,\
+                mock.patch.object(proxy.client, 'prepare') as prepare_mock:
+            prepare_mock.return_value = proxy.client
+            # The second chunk is short as a network was deleted between
+            # the queries of the server, more networks follow
+            rpc_mock.side_effect = [[{'id': 'a'}, {'id': 'b'}], [{'id': 'c'}],
+                                    [{'id': 'd'}], []]
+            networks = proxy.get_active_networks_info(chunk_size=2)
+            # Nothing is fetched before the networks are consumed
+            self.assertFalse(rpc_mock.called)
+            self.assertEqual(['a', 'b', 'c', 'd'], [n.id for n in networks])
+
+            prepare_mock.assert_called_once_with(version='1.8')
+            self.assertEqual([
+                mock.call(mock.ANY, 'get_active_networks_info', host='foo',
+                          marker=None, limit=2),
+                mock.call(mock.ANY, 'get_active_networks_info', host='foo',
+                          marker='b', limit=2),
+                mock.call(mock.ANY, 'get_active_networks_info', host='foo',
+                          marker='c', limit=2),
+                mock.call(mock.ANY, 'get_active_networks_info', host='foo',
+                          marker='d', limit=2)], rpc_mock.call_args_list)
+
+    def _test_get_active_networks_info_chunks_unsupported(self, exc):
+        proxy = dhcp_agent.DhcpPluginApi('foo', host='foo')
+        with mock.patch.object(proxy.client, 'call') as rpc_mock,\
+                mock.patch.object(proxy.client, 'prepare') as prepare_mock:
+            prepare_mock.return_value = proxy.client
+            rpc_mock.side_effect = [exc, [{'id': 'a'}], [{'id': 'b'}]]
+            networks = proxy.get_active_networks_info(chunk_size=2)
+            self.assertEqual(['a'], [n.id for n in networks])
+            prepare_mock.assert_has_calls([mock.call(version='1.8'),
+                                           mock.call(version='1.1')])
+            rpc_mock.assert_called_with(
+                mock.ANY, 'get_active_networks_info', host='foo')
+
+            # The chunks are not requested again
+            prepare_mock.reset_mock()
+            networks = proxy.get_active_networks_info(chunk_size=2)
+            self.assertEqual(['b'], [n.id for n in networks])
+            prepare_mock.assert_called_once_with(version='1.1')
+
+    def test_get_active_networks_info_chunks_unsupported(self):
+        self._test_get_active_networks_info_chunks_unsupported(
+            oslo_messaging.UnsupportedVersion('1.8'))
+
+    def test_get_active_networks_info_chunks_unsupported_remote(self):
+        self._test_get_active_networks_info_chunks_unsupported(
+            oslo_messaging.RemoteError(exc_type='UnsupportedVersion'))
+
+    def test_get_active_networks_info_chunks_error(self):
+        proxy = dhcp_agent.DhcpPluginApi('foo', host='foo')
+        with mock.patch.object(proxy.client, 'call') as rpc_mock,\
+                mock.patch.object(proxy.client, 'prepare') as prepare_mock:
+            prepare_mock.return_value = proxy.client
+            rpc_mock.side_effect = oslo_messaging.RemoteError(
+                exc_type='NetworkNotFound')
+            networks = proxy.get_active_networks_info(chunk_size=2)
+            self.assertRaises(oslo_messaging.RemoteError, list, networks)
+            self.assertEqual(set(), proxy._unsupported_versions)
+
     def test_get_network_info(self):
         self._test_dhcp_api('get_network_info', network_id='fake_id',
                             return_value=None)
 
+    def _get_network_info_with_cache(self, cached_network, delta):
+        proxy = dhcp_agent.DhcpPluginApi('foo', host='foo')
+        with mock.patch.object(proxy.client, 'call') as rpc_mock,\
+                mock.patch.object(proxy.client, 'prepare') as prepare_mock:
+            prepare_mock.return_value = proxy.client
+            if not isinstance(delta, list):
+                delta = [delta]
+            rpc_mock.side_effect = delta
+            retval = proxy.get_network_info('fake_id',
+                                            cached_network=cached_network)
+        return retval, prepare_mock, rpc_mock
+
+    def test_get_network_info_delta(self):
+        cached_network = dhcp.NetModel(dict(
+            id='fake_id',
+            subnets=[dict(id='s1', revision_number=1),
+                     dict(id='s3', revision_number=1)],
+            ports=[dict(id='p1', revision_number=1),
+                   dict(id='p2', revision_number=4),
+                   dict(id='p3', revision_number=2)]))
+        delta = dict(id='fake_id', admin_state_up=True,
+                     subnets=[dict(id='s2', revision_number=1)],
+                     deleted_subnets=['s3'],
+                     ports=[dict(id='p2', revision_number=5),
+                            dict(id='p4', revision_number=1)],
+                     deleted_ports=['p3'])
+        retval, prepare_mock, rpc_mock = self._get_network_info_with_cache(
+            cached_network, delta)
+
+        prepare_mock.assert_called_once_with(version='1.7')
+        rpc_mock.assert_called_once_with(
+            mock.ANY, 'get_network_info', network_id='fake_id', host='foo',
+            revisions={'subnets': {'s1': 1, 's3': 1},
+                       'ports': {'p1': 1, 'p2': 4, 'p3': 2}})
+        self.assertIsInstance(retval, dhcp.NetModel)
+        self.assertTrue(retval.admin_state_up)
+        self.assertEqual(['s1', 's2'], [s.id for s in retval.subnets])
+        self.assertEqual([('p1', 1), ('p2', 5), ('p4', 1)],
+                         [(p.id, p.revision_number) for p in retval.ports])
+        self.assertNotIn('deleted_ports', retval)
+        self.assertNotIn('deleted_subnets', retval)
+        # The cached network must be left untouched
+        self.assertEqual(3, len(cached_network.ports))
+
+    def test_get_network_info_full_fetch_without_revisions(self):
+        cached_network = dhcp.NetModel(dict(
+            id='fake_id', subnets=[], ports=[dict(id='p1')]))
+        network = dict(id='fake_id', subnets=[], ports=[])
+        retval, prepare_mock, rpc_mock = self._get_network_info_with_cache(
+            cached_network, network)
+
+        prepare_mock.assert_called_once_with()
+        rpc_mock.assert_called_once_with(
+            mock.ANY, 'get_network_info', network_id='fake_id', host='foo')
+        self.assertEqual(network, retval)
+
+    def _test_get_network_info_delta_unsupported(self, exc):
+        cached_network = dhcp.NetModel(dict(
+            id='fake_id', subnets=[], ports=[dict(id='p1',
+                                                  revision_number=1)]))
+        network = dict(id='fake_id', subnets=[], ports=[])
+        retval, prepare_mock, rpc_mock = self._get_network_info_with_cache(
+            cached_network, [exc, network])
+
+        prepare_mock.assert_has_calls([mock.call(version='1.7'),
+                                       mock.call()])
+        rpc_mock.assert_called_with(
+            mock.ANY, 'get_network_info', network_id='fake_id', host='foo')
+        self.assertEqual(network, retval)
+
+    def test_get_network_info_delta_unsupported(self):
+        self._test_get_network_info_delta_unsupported(
+            oslo_messaging.UnsupportedVersion('1.7'))
+
+    def test_get_network_info_delta_unsupported_remote(self):
+        self._test_get_network_info_delta_unsupported(
+            oslo_messaging.RemoteError(exc_type='UnsupportedVersion'))
+
+    def test_get_network_info_delta_not_requested_again(self):
+        proxy = dhcp_agent.DhcpPluginApi('foo', host='foo')
+        proxy._unsupported_versions.add('1.7')
+        cached_network = dhcp.NetModel(dict(
+            id='fake_id', subnets=[], ports=[dict(id='p1',
+                                                  revision_number=1)]))
+        with mock.patch.object(proxy.client, 'call') as rpc_mock,\
+                mock.patch.object(proxy.client, 'prepare') as prepare_mock:
+            prepare_mock.return_value = proxy.client
+            rpc_mock.return_value = None
+            proxy.get_network_info('fake_id', cached_network=cached_network)
+            prepare_mock.assert_called_once_with()
+            rpc_mock.assert_called_once_with(
+                mock.ANY, 'get_network_info', network_id='fake_id',
+                host='foo')
+
+    def test_get_network_info_delta_error(self):
+        cached_network = dhcp.NetModel(dict(
+            id='fake_id', subnets=[], ports=[]))
+        self.assertRaises(
+            oslo_messaging.RemoteError, self._get_network_info_with_cache,
+            cached_network,
+            [oslo_messaging.RemoteError(exc_type='NetworkNotFound')])
+
     def test_create_dhcp_port(self):
         self._test_dhcp_api('create_dhcp_port', port='fake_port',
                             return_value=None, version='1.1')
@@ -166,6 +166,9 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
         self.pull_mock = mock.patch.object(
             self.qos_ext.resource_rpc, 'pull',
             return_value=TEST_POLICY).start()
+        self.bulk_pull_mock = mock.patch.object(
+            self.qos_ext.resource_rpc, 'bulk_pull',
+            return_value=[]).start()
 
     def _create_test_port_dict(self, qos_policy_id=None):
         return {'port_id': uuidutils.generate_uuid(),
@@ -211,6 +214,67 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
              self.context, resources.QOS_POLICY,
              port['qos_policy_id'])
 
+    def test_handle_port_uses_prefetched_policies(self):
+        self.bulk_pull_mock.return_value = [TEST_POLICY, TEST_POLICY2]
+        port1 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        port2 = self._create_test_port_dict(qos_policy_id=TEST_POLICY2.id)
+        port3 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        self.qos_ext.prepare_ports(self.context, [port1, port2, port3])
+        for port in (port1, port2, port3):
+            self.qos_ext.handle_port(self.context, port)
+        self.bulk_pull_mock.assert_called_once_with(
+            self.context, resources.QOS_POLICY, filter_kwargs=mock.ANY)
+        self.assertEqual(
+            {TEST_POLICY.id, TEST_POLICY2.id},
+            set(self.bulk_pull_mock.call_args[1]['filter_kwargs']['id']))
+        self.assertFalse(self.pull_mock.called)
+        self.qos_ext.qos_driver.create.assert_has_calls([
+            mock.call(port1, TEST_POLICY), mock.call(port2, TEST_POLICY2),
+            mock.call(port3, TEST_POLICY)])
+
+    def test_prepare_ports_skips_known_policies(self):
+        port1 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        self.qos_ext.handle_port(self.context, port1)
+        port2 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        port3 = self._create_test_port_dict(qos_policy_id=TEST_POLICY2.id)
+        port4 = {'port_id': uuidutils.generate_uuid()}
+        self.qos_ext.prepare_ports(self.context,
+                                   [port1, port2, port3, port4])
+        # A single unknown policy is left to handle_port
+        self.assertFalse(self.bulk_pull_mock.called)
+
+    def test_prepare_ports_bulk_pull_not_supported(self):
+        self.bulk_pull_mock.side_effect = (
+            resources_rpc.BulkPullNotSupported(
+                resource_type=resources.QOS_POLICY))
+        port1 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        port2 = self._create_test_port_dict(qos_policy_id=TEST_POLICY2.id)
+        self.qos_ext.prepare_ports(self.context, [port1, port2])
+        self.qos_ext.handle_port(self.context, port1)
+        self.pull_mock.assert_called_once_with(
+            self.context, resources.QOS_POLICY, TEST_POLICY.id)
+
+    def test_prepare_ports_failure(self):
+        self.bulk_pull_mock.side_effect = Exception
+        port1 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        port2 = self._create_test_port_dict(qos_policy_id=TEST_POLICY2.id)
+        self.qos_ext.prepare_ports(self.context, [port1, port2])
+        self.qos_ext.handle_port(self.context, port1)
+        self.pull_mock.assert_called_once_with(
+            self.context, resources.QOS_POLICY, TEST_POLICY.id)
+        self.qos_ext.qos_driver.create.assert_called_once_with(port1,
+                                                               TEST_POLICY)
+
+    def test__process_update_policy_updates_prefetched(self):
+        self.bulk_pull_mock.return_value = [TEST_POLICY, TEST_POLICY2]
+        port1 = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
+        port2 = self._create_test_port_dict(qos_policy_id=TEST_POLICY2.id)
+        self.qos_ext.prepare_ports(self.context, [port1, port2])
+        self.qos_ext._process_update_policy(TEST_POLICY_DESCR)
+        self.qos_ext.handle_port(self.context, port1)
+        self.qos_ext.qos_driver.create.assert_called_once_with(
+            port1, TEST_POLICY_DESCR)
+
     def test_delete_known_port(self):
         port = self._create_test_port_dict()
         self.qos_ext.handle_port(self.context, port)
@@ -323,6 +387,9 @@ class QosExtensionReflushRulesTestCase(QosExtensionBaseTestCase):
         self.pull_mock = mock.patch.object(
             self.qos_ext.resource_rpc, 'pull',
             return_value=TEST_POLICY).start()
+        self.bulk_pull_mock = mock.patch.object(
+            self.qos_ext.resource_rpc, 'bulk_pull',
+            return_value=[]).start()
 
         self.policy = policy.QosPolicy(**BASE_TEST_POLICY)
         self.rule = (
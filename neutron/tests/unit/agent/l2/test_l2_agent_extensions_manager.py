@@ -37,6 +37,13 @@ class TestL2AgentExtensionsManager(base.BaseTestCase):
         ext = self._get_extension()
         ext.initialize.assert_called_once_with(connection, 'fake_driver_type')
 
+    def test_prepare_ports(self):
+        context = object()
+        data = [object()]
+        self.manager.prepare_ports(context, data)
+        ext = self._get_extension()
+        ext.prepare_ports.assert_called_once_with(context, data)
+
     def test_handle_port(self):
         context = object()
         data = object()
@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
 
+import eventlet
 import mock
 import netaddr
 from neutron_lib import constants
@@ -888,6 +890,17 @@ class TestBase(TestConfBase):
         self.external_process = mock.patch(
             'neutron.agent.linux.external_process.ProcessManager').start()
 
+        mock.patch.object(dhcp.DhcpLocalProcess, '_config_files',
+                          collections.defaultdict(dict)).start()
+        mock.patch.object(dhcp.DhcpLocalProcess, '_pending_reloads',
+                          {}).start()
+        mock.patch.object(dhcp.DhcpLocalProcess, '_reload_stats',
+                          collections.defaultdict(
+                              collections.Counter)).start()
+        mock.patch.object(dhcp.Dnsmasq, '_host_tables', {}).start()
+        mock.patch.object(dhcp.Dnsmasq, '_unused_leases',
+                          collections.defaultdict(set)).start()
+
         self.mock_mgr.return_value.driver.bridged = True
 
 
@@ -1690,6 +1703,118 @@ class TestDnsmasq(TestBase):
             mock.call(exp_opt_name, exp_opt_data),
         ])
 
+    def _reload_allocations_twice(self, net, change_network=False):
+        self.useFixture(tools.OpenFixture('/dhcp/%s/host' % net.id))
+        self.useFixture(tools.OpenFixture('/dhcp/%s/interface' % net.id,
+                                          'tapdancingmice'))
+        with mock.patch.object(os.path, 'exists', return_value=True):
+            self._get_dnsmasq(net).reload_allocations()
+            if change_network:
+                net.ports[0].mac_address = '00:00:80:aa:bb:dd'
+            dm = self._get_dnsmasq(net)
+            dm.reload_allocations()
+        return dm
+
+    def test_reload_allocations_unchanged_config_skips_reload(self):
+        dm = self._reload_allocations_twice(FakeDualNetwork())
+        self.assertEqual(3, self.safe.call_count)
+        self.external_process().enable.assert_called_once_with(
+            reload_cfg=True)
+        self.assertEqual({'reloads': 1, 'skipped': 1},
+                         dm._reload_stats[dm.network.id])
+
+    def test_reload_allocations_changed_config_reloads(self):
+        dm = self._reload_allocations_twice(FakeDualNetwork(),
+                                            change_network=True)
+        self.assertEqual(2, self.external_process().enable.call_count)
+        self.assertEqual({'reloads': 2}, dm._reload_stats[dm.network.id])
+
+    def test_reload_allocations_delayed_reloads_coalesced(self):
+        self.conf.set_override('dhcp_reload_delay', 0.5)
+        with mock.patch.object(eventlet, 'spawn_after') as spawn_after:
+            dm = self._reload_allocations_twice(FakeDualNetwork(),
+                                                change_network=True)
+        spawn_after.assert_called_once_with(0.5, mock.ANY, mock.ANY)
+        self.assertFalse(self.external_process().enable.called)
+        self.assertEqual({'coalesced': 1}, dm._reload_stats[dm.network.id])
+
+        # the scheduled reload signals dnsmasq once for both changes
+        reload_func, pm = spawn_after.call_args[0][1:]
+        reload_func(pm)
+        pm.enable.assert_called_once_with(reload_cfg=True)
+        self.assertNotIn(dm.network.id, dm._pending_reloads)
+
+    def test_disable_cancels_pending_reload(self):
+        self.conf.set_override('dhcp_reload_delay', 0.5)
+        with mock.patch.object(eventlet, 'spawn_after') as spawn_after:
+            dm = self._reload_allocations_twice(FakeDualNetwork(),
+                                                change_network=True)
+        dm.disable(retain_port=True)
+        spawn_after.return_value.cancel.assert_called_once_with()
+        self.assertNotIn(dm.network.id, dm._pending_reloads)
+        self.assertNotIn(dm.network.id, dm._config_files)
+
+    def _dict_port(self, port_id, mac_address, ip_address):
+        return dhcp.DictModel({
+            'id': port_id,
+            'mac_address': mac_address,
+            'device_owner': 'foo',
+            'extra_dhcp_opts': [],
+            'fixed_ips': [{'ip_address': ip_address,
+                           'subnet_id': FakeV4Subnet().id}]
+        })
+
+    def test_update_host_table_builds_changed_ports_only(self):
+        network = FakeV4Network()
+        port1 = self._dict_port('port1', '00:00:80:aa:bb:01', '192.168.0.2')
+        port2 = self._dict_port('port2', '00:00:80:aa:bb:02', '192.168.0.3')
+        network.ports = [port1, port2]
+        with mock.patch.object(dhcp.Dnsmasq, '_read_hosts_file_leases',
+                               return_value=set()):
+            self._get_dnsmasq(network)._update_host_table()
+        new_port2 = self._dict_port('port2', '00:00:80:aa:bb:02',
+                                    '192.168.0.4')
+        network.ports = [port1, new_port2]
+
+        dm = self._get_dnsmasq(network)
+        with mock.patch.object(dm, '_build_host_entry',
+                               wraps=dm._build_host_entry) as build:
+            entries = dm._update_host_table()
+        build.assert_called_once_with(new_port2, mock.ANY, mock.ANY)
+        self.assertIn('192.168.0.2', entries[0].hosts)
+        self.assertIn('192.168.0.4', entries[1].hosts)
+        self.assertEqual({('192.168.0.3', '00:00:80:aa:bb:02', None)},
+                         dm._unused_leases[network.id])
+
+    def test_reload_allocations_releases_leases_once_per_reload(self):
+        self.conf.set_override('dhcp_reload_delay', 0.5)
+        network = FakeV4Network()
+        port1 = self._dict_port('port1', '00:00:80:aa:bb:01', '192.168.0.2')
+        port2 = self._dict_port('port2', '00:00:80:aa:bb:02', '192.168.0.3')
+        network.ports = [port1, port2]
+        self.useFixture(tools.OpenFixture('/dhcp/%s/interface' % network.id,
+                                          'tapdancingmice'))
+        with mock.patch.object(dhcp.Dnsmasq, '_read_hosts_file_leases',
+                               return_value=set()),\
+                mock.patch.object(dhcp.Dnsmasq,
+                                  '_release_lease') as release_lease,\
+                mock.patch.object(eventlet, 'spawn_after') as spawn_after:
+            self._get_dnsmasq(network).reload_allocations()
+            network.ports = [port1]
+            self._get_dnsmasq(network).reload_allocations()
+            network.ports = []
+            self._get_dnsmasq(network).reload_allocations()
+            self.assertFalse(release_lease.called)
+
+            reload_func, pm = spawn_after.call_args[0][1:]
+            reload_func(pm)
+        release_lease.assert_has_calls(
+            [mock.call('00:00:80:aa:bb:01', '192.168.0.2', None),
+             mock.call('00:00:80:aa:bb:02', '192.168.0.3', None)],
+            any_order=True)
+        self.assertEqual(2, release_lease.call_count)
+        self.assertNotIn(network.id, dhcp.Dnsmasq._unused_leases)
+
     def test_release_unused_leases(self):
         dnsmasq = self._get_dnsmasq(FakeDualNetwork())
 
@@ -1715,6 +1840,7 @@ class TestDnsmasq(TestBase):
         dnsmasq.network.ports = []
         dnsmasq.device_manager.unplug = mock.Mock()
 
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
 
         dnsmasq._release_lease.assert_has_calls([mock.call(mac1, ip1, None),
@@ -1743,6 +1869,7 @@ class TestDnsmasq(TestBase):
                           })
         ipw = mock.patch(
             'neutron.agent.linux.ip_lib.IpNetnsCommand.execute').start()
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
         # Verify that dhcp_release is called  both for ipv4 and ipv6 addresses.
         self.assertEqual(2, ipw.call_count)
@@ -1771,6 +1898,7 @@ class TestDnsmasq(TestBase):
         ipw = mock.patch(
             'neutron.agent.linux.ip_lib.IpNetnsCommand.execute').start()
         dnsmasq._IS_DHCP_RELEASE6_SUPPORTED = False
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
         # Verify that dhcp_release6 is not called when it is not present
         ipw.assert_not_called()
@@ -1794,6 +1922,7 @@ class TestDnsmasq(TestBase):
         dnsmasq._release_lease = mock.Mock()
         dnsmasq.device_manager.get_device_id = mock.Mock(
             return_value='fake_dhcp_port')
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
         self.assertFalse(
             dnsmasq.device_manager.unplug.called)
@@ -1822,6 +1951,7 @@ class TestDnsmasq(TestBase):
         dnsmasq._release_lease = mock.Mock()
         dnsmasq.network.ports = []
 
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
 
         dnsmasq._release_lease.assert_has_calls(
@@ -1849,6 +1979,7 @@ class TestDnsmasq(TestBase):
         dnsmasq._release_lease = mock.Mock()
         dnsmasq.network.ports = [FakePort1()]
 
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
 
         dnsmasq._release_lease.assert_called_once_with(
@@ -1876,6 +2007,7 @@ class TestDnsmasq(TestBase):
         dnsmasq._release_lease = mock.Mock()
         dnsmasq.network.ports = [FakePort5()]
 
+        dnsmasq._update_host_table()
         dnsmasq._release_unused_leases()
 
         dnsmasq._release_lease.assert_called_once_with(
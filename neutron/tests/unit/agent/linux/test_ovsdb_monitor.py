@@ -13,9 +13,11 @@
 #    under the License.
 
 import mock
+from ovs.db import idl
 
 from neutron.agent.common import ovs_lib
 from neutron.agent.linux import ovsdb_monitor
+from neutron.agent.ovsdb import impl_idl
 from neutron.tests import base
 
 
@@ -61,6 +63,17 @@ class TestSimpleInterfaceMonitor(base.BaseTestCase):
             self.assertTrue(process_events.called)
             self.assertFalse(self.monitor.has_updates)
 
+    def test_read_stdout_calls_event_callback(self):
+        callback = mock.Mock()
+        monitor = ovsdb_monitor.SimpleInterfaceMonitor(
+            event_callback=callback)
+        with mock.patch('neutron.agent.linux.async_process.AsyncProcess.'
+                        '_read_stdout', side_effect=['{"data": []}', None]):
+            monitor._read_stdout()
+            callback.assert_called_once_with()
+            monitor._read_stdout()
+            callback.assert_called_once_with()
+
     def process_event_unassigned_of_port(self):
         output = '{"data":[["e040fbec-0579-4990-8324-d338da33ae88","insert",'
         output += '"m50",["set",[]],["map",[]]]],"headings":["row","action",'
@@ -70,3 +83,82 @@ class TestSimpleInterfaceMonitor(base.BaseTestCase):
             self.monitor.process_events()
             self.assertEqual(self.monitor.new_events['added'][0]['ofport'],
                              ovs_lib.UNASSIGNED_OFPORT)
+
+
+def _fake_row(name, ofport=None, table='Interface'):
+    row = mock.Mock(ofport=[ofport] if ofport else [],
+                    external_ids={'iface-id': name})
+    row.name = name
+    row._table.name = table
+    return row
+
+
+class TestNativeInterfaceMonitor(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestNativeInterfaceMonitor, self).setUp()
+        self.ovsdb_connection = mock.patch.object(
+            impl_idl.OvsdbIdl, 'ovsdb_connection').start()
+        self.idl = self.ovsdb_connection.idl
+        self.idl.tables = {
+            'Interface': mock.Mock(rows={'uuid1': _fake_row('tap1', 1)})}
+        self.callback = mock.Mock()
+        self.monitor = ovsdb_monitor.NativeInterfaceMonitor(
+            event_callback=self.callback)
+
+    def test_start_reports_existing_interfaces(self):
+        self.assertFalse(self.monitor.is_active())
+        self.monitor.start(block=True)
+        self.assertTrue(self.monitor.is_active())
+        self.ovsdb_connection.start.assert_called_once_with()
+        self.idl.register_row_event_handler.assert_called_once_with(
+            self.monitor._handle_row_event)
+        self.assertTrue(self.monitor.has_updates)
+        self.assertEqual(
+            {'added': [{'name': 'tap1', 'ofport': 1,
+                        'external_ids': {'iface-id': 'tap1'}}],
+             'removed': []},
+            self.monitor.get_events())
+        self.assertFalse(self.monitor.has_updates)
+
+    def test_stop_unregisters_handler(self):
+        self.monitor.start()
+        self.monitor.stop()
+        self.idl.unregister_row_event_handler.assert_called_once_with(
+            self.monitor._handle_row_event)
+        self.assertFalse(self.monitor.is_active())
+
+    def test_row_events(self):
+        self.monitor.start()
+        self.monitor.get_events()
+        self.monitor._handle_row_event(idl.ROW_CREATE, _fake_row('tap2'))
+        self.monitor._handle_row_event(idl.ROW_UPDATE, _fake_row('tap2', 5),
+                                       mock.Mock())
+        self.monitor._handle_row_event(idl.ROW_DELETE, _fake_row('tap1', 1))
+        self.monitor._handle_row_event(idl.ROW_CREATE,
+                                       _fake_row('br-int', table='Bridge'))
+        self.assertEqual(3, self.callback.call_count)
+        events = self.monitor.get_events()
+        self.assertEqual([('tap2', 5)], [(dev['name'], dev['ofport'])
+                                         for dev in events['added']])
+        self.assertEqual(['tap1'], [dev['name']
+                                    for dev in events['removed']])
+
+    def test_row_updates_without_ofport_change_not_notified(self):
+        self.monitor.start()
+        self.monitor.get_events()
+        # e.g. the periodic statistics updates of the interfaces
+        self.monitor._handle_row_event(idl.ROW_UPDATE, _fake_row('tap1', 1),
+                                       mock.Mock())
+        self.monitor._handle_row_event(idl.ROW_CREATE, _fake_row('tap2', 5))
+        self.callback.reset_mock()
+        self.monitor._handle_row_event(idl.ROW_UPDATE, _fake_row('tap2', 5),
+                                       mock.Mock())
+        self.assertFalse(self.callback.called)
+
+    def test_unassigned_ofport(self):
+        self.monitor.start()
+        self.monitor.get_events()
+        self.monitor._handle_row_event(idl.ROW_CREATE, _fake_row('tap2'))
+        self.assertEqual(ovs_lib.UNASSIGNED_OFPORT,
+                         self.monitor.get_events()['added'][0]['ofport'])
@@ -13,8 +13,10 @@
 #    under the License.
 
 import mock
+from oslo_config import cfg
 
 from neutron.agent.common import base_polling
+from neutron.agent.linux import ovsdb_monitor
 from neutron.agent.linux import polling
 from neutron.tests import base
 
@@ -35,13 +37,30 @@ class TestGetPollingManager(base.BaseTestCase):
                 mock_stop.assert_has_calls([mock.call()])
             mock_start.assert_has_calls([mock.call()])
 
+    def test_polling_minimizer_event_callback(self):
+        callback = mock.Mock()
+        mock_target = 'neutron.agent.linux.polling.InterfacePollingMinimizer'
+        with mock.patch('%s.start' % mock_target),\
+                mock.patch('%s.stop' % mock_target):
+            with polling.get_polling_manager(minimize_polling=True,
+                                             event_callback=callback) as pm:
+                self.assertEqual(callback, pm._monitor._event_callback)
+
 
 class TestInterfacePollingMinimizer(base.BaseTestCase):
 
     def setUp(self):
         super(TestInterfacePollingMinimizer, self).setUp()
+        cfg.CONF.set_override('ovsdb_interface', 'vsctl', 'OVS')
         self.pm = polling.InterfacePollingMinimizer()
 
+    def test_monitor_per_ovsdb_interface(self):
+        self.assertIsInstance(self.pm._monitor,
+                              ovsdb_monitor.SimpleInterfaceMonitor)
+        cfg.CONF.set_override('ovsdb_interface', 'native', 'OVS')
+        self.assertIsInstance(polling.InterfacePollingMinimizer()._monitor,
+                              ovsdb_monitor.NativeInterfaceMonitor)
+
     def test_start_calls_monitor_start(self):
         with mock.patch.object(self.pm._monitor, 'start') as mock_start:
             self.pm.start()
@@ -20,8 +20,10 @@ from oslo_utils import uuidutils
 from neutron.agent.common import config as agent_config
 from neutron.agent.l3 import agent as l3_agent
 from neutron.agent.l3 import router_info
+from neutron.agent.linux import external_process
 from neutron.agent.metadata import config
 from neutron.agent.metadata import driver as metadata_driver
+from neutron.agent.metadata import proxy_registry
 from neutron.common import constants
 from neutron.conf.agent.l3 import config as l3_config
 from neutron.conf.agent.l3 import ha as ha_conf
@@ -164,3 +166,54 @@ class TestMetadataDriverProcess(base.BaseTestCase):
 
     def test_spawn_metadata_proxy(self):
         self._test_spawn_metadata_proxy(str(self.EUID), str(self.EGID))
+
+    def test_spawn_shared_metadata_proxy(self):
+        router_id = _uuid()
+        router_ns = 'qrouter-%s' % router_id
+        cfg.CONF.set_override('metadata_proxy_mode', config.SHARED_PROXY_MODE)
+        registry_dir = proxy_registry.get_registry_dir(cfg.CONF.state_path,
+                                                       'router')
+
+        agent = l3_agent.L3NATAgent('localhost')
+        with mock.patch.object(proxy_registry, 'register') as register,\
+                mock.patch('neutron.agent.linux.ip_lib.IPWrapper') as ip_mock:
+            agent.metadata_driver.spawn_monitored_metadata_proxy(
+                agent.process_monitor,
+                router_ns,
+                8080,
+                agent.conf,
+                router_id=router_id)
+
+        register.assert_called_once_with(registry_dir, router_id, router_ns,
+                                         8080, network_id=None,
+                                         router_id=router_id)
+        ip_mock.assert_called_once_with(namespace=None)
+        execute = ip_mock.return_value.netns.execute
+        self.assertIn('--registry_dir=%s' % registry_dir,
+                      execute.call_args[0][0])
+        self.assertTrue(execute.call_args[1]['run_as_root'])
+        self.assertIn(
+            external_process.ServiceId(
+                metadata_driver.SHARED_PROXY_UUID_PREFIX + 'router',
+                metadata_driver.METADATA_SERVICE_NAME),
+            agent.process_monitor._monitored_processes)
+
+    def test_destroy_shared_metadata_proxy(self):
+        router_id = _uuid()
+        cfg.CONF.set_override('metadata_proxy_mode', config.SHARED_PROXY_MODE)
+        registry_dir = proxy_registry.get_registry_dir(cfg.CONF.state_path,
+                                                       'router')
+
+        agent = l3_agent.L3NATAgent('localhost')
+        with mock.patch.object(proxy_registry, 'unregister') as unregister,\
+                mock.patch.object(external_process.ProcessManager, 'active',
+                                  new_callable=mock.PropertyMock,
+                                  return_value=True),\
+                mock.patch.object(external_process.ProcessManager,
+                                  'disable') as disable:
+            agent.metadata_driver.destroy_monitored_metadata_proxy(
+                agent.process_monitor, router_id, agent.conf)
+
+        unregister.assert_called_once_with(registry_dir, router_id)
+        # The per-namespace proxy is stopped and the shared one reloaded
+        disable.assert_has_calls([mock.call(), mock.call('HUP')])
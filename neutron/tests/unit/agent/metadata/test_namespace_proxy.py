@@ -12,12 +12,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet.wsgi
 import mock
 import testtools
 import webob
 
 from neutron.agent.linux import utils as agent_utils
 from neutron.agent.metadata import namespace_proxy as ns_proxy
+from neutron.agent.metadata import proxy_registry
 from neutron.common import exceptions
 from neutron.common import utils
 from neutron.tests import base
@@ -271,6 +273,7 @@ class TestProxyDaemon(base.BaseTestCase):
                     with mock.patch.object(utils, 'cfg') as utils_cfg:
                         cfg.CONF.router_id = 'router_id'
                         cfg.CONF.network_id = None
+                        cfg.CONF.registry_dir = None
                         cfg.CONF.metadata_port = 9697
                         cfg.CONF.pid_file = 'pidfile'
                         cfg.CONF.daemonize = True
@@ -295,6 +298,7 @@ class TestProxyDaemon(base.BaseTestCase):
                     with mock.patch.object(utils, 'cfg') as utils_cfg:
                         cfg.CONF.router_id = 'router_id'
                         cfg.CONF.network_id = None
+                        cfg.CONF.registry_dir = None
                         cfg.CONF.metadata_port = 9697
                         cfg.CONF.pid_file = 'pidfile'
                         cfg.CONF.daemonize = False
@@ -311,3 +315,133 @@ class TestProxyDaemon(base.BaseTestCase):
                                       watch_log=mock.ANY),
                             mock.call().run()]
                         )
+
+
+class TestSharedProxyDaemon(base.BaseTestCase):
+    def setUp(self):
+        super(TestSharedProxyDaemon, self).setUp()
+        mock.patch('neutron.agent.linux.daemon.Pidfile').start()
+        self.in_namespace = mock.patch.object(ns_proxy,
+                                              '_in_namespace').start()
+        self.listen = mock.patch('eventlet.listen').start()
+        self.load = mock.patch.object(proxy_registry, 'load').start()
+        self.pd = ns_proxy.SharedProxyDaemon('pidfile', '/registry')
+        self.pd._pool = mock.Mock()
+        self.pd._sync_requested = False
+
+    def _registration(self, namespace='qrouter-router_id', port=9697):
+        return {'namespace': namespace,
+                'port': port,
+                'network_id': None,
+                'router_id': 'router_id'}
+
+    def test_sync_starts_new_server(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.pd.sync()
+        self.load.assert_called_once_with('/registry')
+        self.in_namespace.assert_called_once_with('qrouter-router_id')
+        self.listen.assert_called_once_with(('0.0.0.0', 9697),
+                                            backlog=mock.ANY)
+        self.pd._pool.spawn.assert_called_once_with(
+            eventlet.wsgi.server, self.listen.return_value, mock.ANY,
+            log=mock.ANY, keepalive=mock.ANY, socket_timeout=mock.ANY)
+        handler = self.pd._pool.spawn.call_args[0][2]
+        self.assertEqual('router_id', handler.router_id)
+        self.assertIn('router_id', self.pd._servers)
+
+    def test_sync_unchanged_registration(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.pd.sync()
+        self.pd.sync()
+        self.assertEqual(1, self.listen.call_count)
+
+    def test_sync_stops_removed_server(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.pd.sync()
+        server = self.pd._servers['router_id']
+        self.load.return_value = {}
+        self.pd.sync()
+        server.thread.kill.assert_called_once_with()
+        server.socket.close.assert_called_once_with()
+        self.assertNotIn('router_id', self.pd._servers)
+
+    def test_sync_restarts_changed_server(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.pd.sync()
+        server = self.pd._servers['router_id']
+        self.load.return_value = {'router_id': self._registration(port=80)}
+        self.pd.sync()
+        server.thread.kill.assert_called_once_with()
+        self.listen.assert_called_with(('0.0.0.0', 80), backlog=mock.ANY)
+        self.assertEqual(80,
+                         self.pd._servers['router_id'].registration['port'])
+
+    def test_sync_failure_requests_retry(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.in_namespace.side_effect = OSError
+        self.pd.sync()
+        self.assertNotIn('router_id', self.pd._servers)
+        self.assertTrue(self.pd._sync_requested)
+
+    def test_sync_failure_backs_off(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.in_namespace.side_effect = OSError
+        with mock.patch.object(ns_proxy.time, 'time') as now,\
+                mock.patch.object(ns_proxy, 'LOG') as log:
+            now.return_value = 100
+            self.pd.sync()
+            self.pd.sync()
+            self.assertEqual(1, self.in_namespace.call_count)
+            self.assertEqual(1, log.exception.call_count)
+            now.return_value = 101
+            self.pd.sync()
+            self.assertEqual(2, self.in_namespace.call_count)
+            self.assertEqual(1, log.exception.call_count)
+            self.assertEqual(1, log.warning.call_count)
+            self.assertEqual(103, self.pd._failed['router_id'].retry_at)
+            now.return_value = 1000
+            for _i in range(10):
+                self.pd.sync()
+                now.return_value += ns_proxy.SHARED_PROXY_MAX_RETRY_INTERVAL
+        self.assertEqual(1000 + 10 * ns_proxy.SHARED_PROXY_MAX_RETRY_INTERVAL,
+                         self.pd._failed['router_id'].retry_at)
+        self.assertTrue(self.pd._sync_requested)
+
+    def test_sync_retries_changed_failed_registration(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.in_namespace.side_effect = OSError
+        self.pd.sync()
+        self.in_namespace.side_effect = None
+        self.load.return_value = {'router_id': self._registration(port=80)}
+        self.pd.sync()
+        self.assertIn('router_id', self.pd._servers)
+        self.assertNotIn('router_id', self.pd._failed)
+
+    def test_sync_forgets_removed_failed_registration(self):
+        self.load.return_value = {'router_id': self._registration()}
+        self.in_namespace.side_effect = OSError
+        self.pd.sync()
+        self.load.return_value = {}
+        self.pd.sync()
+        self.assertEqual({}, self.pd._failed)
+
+    def test_handle_sighup(self):
+        self.pd.handle_sighup(None, None)
+        self.assertTrue(self.pd._sync_requested)
+
+    def test_main_shared(self):
+        with mock.patch.object(ns_proxy, 'SharedProxyDaemon') as daemon:
+            with mock.patch.object(ns_proxy, 'config'):
+                with mock.patch.object(ns_proxy, 'cfg') as cfg:
+                    with mock.patch.object(utils, 'cfg') as utils_cfg:
+                        cfg.CONF.registry_dir = '/registry'
+                        cfg.CONF.pid_file = 'pidfile'
+                        cfg.CONF.daemonize = True
+                        utils_cfg.CONF.log_opt_values.return_value = None
+                        ns_proxy.main()
+
+                        daemon.assert_has_calls([
+                            mock.call('pidfile', '/registry',
+                                      watch_log=mock.ANY),
+                            mock.call().start()]
+                        )
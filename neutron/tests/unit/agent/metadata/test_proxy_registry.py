@@ -0,0 +1,59 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+from oslo_utils import uuidutils
+
+from neutron.agent.metadata import proxy_registry
+from neutron.tests import base
+
+
+class TestProxyRegistry(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestProxyRegistry, self).setUp()
+        self.registry_dir = proxy_registry.get_registry_dir(
+            self.get_default_temp_dir().path, 'router')
+
+    def test_load_missing_dir(self):
+        self.assertEqual({}, proxy_registry.load(self.registry_dir))
+
+    def test_register_and_load(self):
+        router_id = uuidutils.generate_uuid()
+        proxy_registry.register(self.registry_dir, router_id,
+                                'qrouter-%s' % router_id, 9697,
+                                router_id=router_id)
+        self.assertEqual(
+            {router_id: {'namespace': 'qrouter-%s' % router_id,
+                         'port': 9697,
+                         'network_id': None,
+                         'router_id': router_id}},
+            proxy_registry.load(self.registry_dir))
+
+    def test_unregister(self):
+        router_id = uuidutils.generate_uuid()
+        proxy_registry.register(self.registry_dir, router_id,
+                                'qrouter-%s' % router_id, 9697,
+                                router_id=router_id)
+        proxy_registry.unregister(self.registry_dir, router_id)
+        self.assertEqual({}, proxy_registry.load(self.registry_dir))
+
+    def test_load_ignores_temporary_files(self):
+        router_id = uuidutils.generate_uuid()
+        proxy_registry.register(self.registry_dir, router_id,
+                                'qrouter-%s' % router_id, 9697,
+                                router_id=router_id)
+        with open(os.path.join(self.registry_dir, 'tmpabcdef'), 'w') as f:
+            f.write('{')
+        self.assertEqual([router_id],
+                         list(proxy_registry.load(self.registry_dir)))
@@ -102,3 +102,22 @@ class TestOVSNativeConnection(base.BaseTestCase):
         conn.start()
         self.assertEqual(3, len(mock_get_schema_helper.mock_calls))
         mock_helper.register_all.assert_called_once_with()
+
+
+class TestRowEventIdl(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRowEventIdl, self).setUp()
+        with mock.patch.object(idl.Idl, '__init__', return_value=None):
+            self.idl = connection.RowEventIdl(mock.sentinel.remote,
+                                              mock.sentinel.helper)
+
+    def test_notify_calls_handlers(self):
+        handler = mock.Mock()
+        self.idl.register_row_event_handler(handler)
+        self.idl.notify(idl.ROW_CREATE, mock.sentinel.row)
+        handler.assert_called_once_with(idl.ROW_CREATE, mock.sentinel.row,
+                                        None)
+        self.idl.unregister_row_event_handler(handler)
+        self.idl.notify(idl.ROW_DELETE, mock.sentinel.row)
+        self.assertEqual(1, handler.call_count)
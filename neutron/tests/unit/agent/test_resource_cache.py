@@ -0,0 +1,155 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslo_utils import uuidutils
+
+from neutron.agent import resource_cache
+from neutron.api.rpc.callbacks import events as rpc_events
+from neutron.api.rpc.callbacks import resources
+from neutron.api.rpc.handlers import resources_rpc
+from neutron.callbacks import events
+from neutron.callbacks import registry
+from neutron.objects import ports
+from neutron.tests import base
+
+
+def _port(network_id, revision_number=1, port_id=None, **kwargs):
+    return ports.Port(id=port_id or uuidutils.generate_uuid(),
+                      network_id=network_id,
+                      revision_number=revision_number, **kwargs)
+
+
+class RemoteResourceCacheTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(RemoteResourceCacheTestCase, self).setUp()
+        self.puller = mock.patch.object(
+            resources_rpc, 'ResourcesPullRpcApi').start().return_value
+        self.cache = resource_cache.RemoteResourceCache(
+            [resources.PORT], indexes={resources.PORT: ['network_id']})
+        self.net1 = uuidutils.generate_uuid()
+        self.net2 = uuidutils.generate_uuid()
+
+    def test_get_resource_by_id_cached(self):
+        port = _port(self.net1)
+        self.cache.record_resource_update(None, resources.PORT, port)
+        self.assertEqual(port,
+                         self.cache.get_resource_by_id(resources.PORT,
+                                                       port.id))
+        self.assertFalse(self.puller.pull.called)
+        self.assertEqual(1, self.cache.stats['hits'])
+
+    def test_get_resource_by_id_pulls_on_miss(self):
+        port = _port(self.net1)
+        self.puller.pull.return_value = port
+        self.assertEqual(port,
+                         self.cache.get_resource_by_id(resources.PORT,
+                                                       port.id))
+        self.puller.pull.assert_called_once_with(mock.ANY, resources.PORT,
+                                                 port.id)
+        # The pulled object is cached
+        self.cache.get_resource_by_id(resources.PORT, port.id)
+        self.assertEqual(1, self.puller.pull.call_count)
+
+    def test_get_resource_by_id_not_found(self):
+        self.puller.pull.side_effect = resources_rpc.ResourceNotFound(
+            resource_type=resources.PORT, resource_id='fake')
+        self.assertIsNone(self.cache.get_resource_by_id(resources.PORT,
+                                                        'fake'))
+
+    def test_get_resource_by_id_deleted(self):
+        port = _port(self.net1)
+        self.cache.record_resource_update(None, resources.PORT, port)
+        self.cache.record_resource_delete(None, resources.PORT, port.id)
+        self.assertIsNone(self.cache.get_resource_by_id(resources.PORT,
+                                                        port.id))
+        self.assertFalse(self.puller.pull.called)
+
+    def test_load_resources(self):
+        port1 = _port(self.net1)
+        port2 = _port(self.net1)
+        self.puller.bulk_pull.return_value = [port1, port2]
+        self.cache.load_resources(resources.PORT,
+                                  {'network_id': [self.net1]})
+        self.puller.bulk_pull.assert_called_once_with(
+            mock.ANY, resources.PORT,
+            filter_kwargs={'network_id': [self.net1]})
+        self.assertEqual(
+            {port1.id, port2.id},
+            {p.id for p in self.cache.get_resources(
+                resources.PORT, {'network_id': [self.net1]})})
+        self.cache.get_resource_by_id(resources.PORT, port1.id)
+        self.assertFalse(self.puller.pull.called)
+
+    def test_get_resources_uses_index(self):
+        port1 = _port(self.net1, device_owner='compute:nova')
+        port2 = _port(self.net1, device_owner='network:dhcp')
+        port3 = _port(self.net2, device_owner='compute:nova')
+        for port in (port1, port2, port3):
+            self.cache.record_resource_update(None, resources.PORT, port)
+
+        with mock.patch.object(self.cache, '_matches',
+                               wraps=self.cache._matches) as matches:
+            found = self.cache.get_resources(
+                resources.PORT, {'network_id': [self.net1],
+                                 'device_owner': ['compute:nova']})
+        self.assertEqual([port1], found)
+        # Only the ports of the indexed network were looked at
+        self.assertEqual(2, matches.call_count)
+
+    def test_update_moves_indexed_object(self):
+        port = _port(self.net1)
+        self.cache.record_resource_update(None, resources.PORT, port)
+        moved = _port(self.net2, revision_number=2, port_id=port.id)
+        self.cache.record_resource_update(None, resources.PORT, moved)
+        self.assertEqual([], self.cache.get_resources(
+            resources.PORT, {'network_id': [self.net1]}))
+        self.assertEqual([moved], self.cache.get_resources(
+            resources.PORT, {'network_id': [self.net2]}))
+
+    def test_stale_update_ignored(self):
+        port = _port(self.net1, revision_number=5)
+        self.cache.record_resource_update(None, resources.PORT, port)
+        stale = _port(self.net2, revision_number=4, port_id=port.id)
+        self.cache.record_resource_update(None, resources.PORT, stale)
+        self.assertEqual(port,
+                         self.cache.get_resource_by_id(resources.PORT,
+                                                       port.id))
+
+    def test_handle_push_notifies_changes(self):
+        callback = mock.Mock()
+        registry.subscribe(callback, resources.PORT, events.AFTER_UPDATE)
+        registry.subscribe(callback, resources.PORT, events.AFTER_DELETE)
+        port = _port(self.net1)
+
+        self.cache._handle_push([port], rpc_events.UPDATED)
+        self.cache._handle_push([port], rpc_events.DELETED)
+
+        callback.assert_has_calls([
+            mock.call(resources.PORT, events.AFTER_UPDATE, self.cache,
+                      context=mock.ANY, resource_id=port.id, existing=None,
+                      updated=port),
+            mock.call(resources.PORT, events.AFTER_DELETE, self.cache,
+                      context=mock.ANY, resource_id=port.id, existing=port)])
+        self.assertEqual([], self.cache.get_resources(resources.PORT, {}))
+
+    def test_start_watcher(self):
+        connection = mock.Mock()
+        with mock.patch.object(resource_cache.cons_registry,
+                               'subscribe') as subscribe:
+            self.cache.start_watcher(connection)
+        subscribe.assert_called_once_with(self.cache._handle_push,
+                                          resources.PORT)
+        connection.create_consumer.assert_called_once_with(
+            resources_rpc.resource_type_versioned_topic(resources.PORT),
+            mock.ANY, fanout=True)
@@ -211,6 +211,26 @@ class TestDhcpAgentNotifyAPI(base.BaseTestCase):
                 port={'id': 'foo_port_id', 'network_id': 'foo_network_id'}),
             expected_scheduling=0, expected_casts=1)
 
+    def test_notify_bulk_ports_schedules_once_per_network(self):
+        ports = [{'id': 'port-%d' % i, 'network_id': 'net-%d' % (i % 2)}
+                 for i in range(4)]
+        self._test__notify_agents_with_function(
+            lambda: self.notifier.notify_bulk(
+                mock.Mock(), 'port', ports, 'port.create.end'),
+            expected_scheduling=2, expected_casts=4)
+        self.assertEqual(2, self.notifier.plugin.get_network.call_count)
+        self.assertEqual(
+            [{'port': port} for port in ports[::2] + ports[1::2]],
+            [call[0][2] for call in self.mock_cast.call_args_list])
+
+    def test_notify_bulk_subnets_notifies_each_subnet(self):
+        subnets = [{'id': 'subnet-%d' % i, 'network_id': 'net'}
+                   for i in range(2)]
+        self._test__notify_agents_with_function(
+            lambda: self.notifier.notify_bulk(
+                mock.Mock(), 'subnet', subnets, 'subnet.create.end'),
+            expected_scheduling=2, expected_casts=2)
+
     def test__fanout_message(self):
         self.notifier._fanout_message(mock.ANY, mock.ANY, mock.ANY)
         self.assertEqual(1, self.mock_fanout.call_count)
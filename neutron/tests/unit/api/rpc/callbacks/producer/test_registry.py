@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from neutron.api.rpc.callbacks import exceptions
 from neutron.api.rpc.callbacks.producer import registry
 from neutron.api.rpc.callbacks import resources
@@ -79,3 +81,41 @@ class ProducerRegistryTestCase(base.BaseQosTestCase):
         self.assertRaises(
             exceptions.CallbackNotFound,
             registry.pull, resources.QOS_POLICY, 'fake_id')
+
+    def test_bulk_pull_returns_callback_result(self):
+        policy_obj = policy.QosPolicy(context=None)
+        bulk_cb = mock.Mock(return_value=[policy_obj])
+
+        registry.provide_bulk(bulk_cb, resources.QOS_POLICY)
+
+        self.assertEqual(
+            [policy_obj],
+            registry.bulk_pull(resources.QOS_POLICY, {'id': ['fake_id']},
+                               context='fake_context'))
+        bulk_cb.assert_called_once_with(
+            resources.QOS_POLICY, {'id': ['fake_id']}, context='fake_context')
+
+    def test_bulk_pull_raises_on_wrong_object_type(self):
+        registry.provide_bulk(mock.Mock(return_value=[object()]),
+                              resources.QOS_POLICY)
+
+        self.assertRaises(
+            exceptions.CallbackWrongResourceType,
+            registry.bulk_pull, resources.QOS_POLICY, {})
+
+    def test_bulk_pull_raises_on_callback_not_found(self):
+        # The single object producer does not produce in bulk
+        registry.provide(mock.Mock(), resources.QOS_POLICY)
+
+        self.assertRaises(
+            exceptions.CallbackNotFound,
+            registry.bulk_pull, resources.QOS_POLICY, {})
+
+    def test_unprovide_bulk(self):
+        bulk_cb = mock.Mock(return_value=[])
+        registry.provide_bulk(bulk_cb, resources.QOS_POLICY)
+        registry.unprovide_bulk(bulk_cb, resources.QOS_POLICY)
+
+        self.assertRaises(
+            exceptions.CallbackNotFound,
+            registry.bulk_pull, resources.QOS_POLICY, {})
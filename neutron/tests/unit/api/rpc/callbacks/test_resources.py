@@ -41,6 +41,12 @@ class IsValidResourceTypeTestCase(base.BaseTestCase):
         self.assertFalse(
             resources.is_valid_resource_type('unknown-resource-type'))
 
+    def test_cached_resource_types(self):
+        for resource_type in (resources.PORT, resources.NETWORK,
+                              resources.SECURITYGROUP,
+                              resources.SECURITYGROUPRULE):
+            self.assertTrue(resources.is_valid_resource_type(resource_type))
+
 
 class GetResourceClsTestCase(base.BaseTestCase):
 
@@ -23,6 +23,7 @@ from neutron.callbacks import resources
 from neutron.common import constants as n_const
 from neutron.common import exceptions
 from neutron.common import utils
+from neutron.db import _utils as ndb_utils
 from neutron.db import provisioning_blocks
 from neutron.extensions import portbindings
 from neutron.tests import base
@@ -91,6 +92,40 @@ class TestDhcpRpcCallback(base.BaseTestCase):
                     {'id': 'b', 'subnets': [subnets[0]], 'ports': []}]
         self.assertEqual(expected, networks)
 
+    def test_get_active_networks_info_with_limit(self):
+        self.plugin.get_networks.return_value = [{'id': 'b'}, {'id': 'c'}]
+        self.plugin.get_ports.return_value = []
+        self.plugin.get_subnets.return_value = []
+        networks = self.callbacks.get_active_networks_info(
+            mock.Mock(), host='host', marker='a', limit=2)
+        self.assertEqual(['b', 'c'], [n['id'] for n in networks])
+        self.plugin.get_networks.assert_called_once_with(
+            mock.ANY, filters={'admin_state_up': [True]},
+            sorts=[('id', True)], limit=2,
+            marker=ndb_utils.encode_keyset_marker({'id': 'a'}, ['id']))
+        self.plugin.get_ports.assert_called_once_with(
+            mock.ANY, filters={'network_id': ['b', 'c']})
+
+    def test_get_active_networks_info_with_limit_and_scheduler(self):
+        self.plugin.supported_extension_aliases = [
+            constants.DHCP_AGENT_SCHEDULER_EXT_ALIAS]
+        self.plugin.list_active_networks_on_active_dhcp_agent.return_value = (
+            [{'id': 'b'}])
+        self.plugin.get_ports.return_value = []
+        self.plugin.get_subnets.return_value = []
+        self.callbacks.get_active_networks_info(
+            mock.Mock(), host='host', marker='a', limit=2)
+        (self.plugin.list_active_networks_on_active_dhcp_agent.
+         assert_called_once_with(mock.ANY, 'host', marker='a', limit=2))
+        self.assertFalse(self.plugin.auto_schedule_networks.called)
+
+    def test_get_active_networks_info_after_last_chunk(self):
+        self.plugin.get_networks.return_value = []
+        networks = self.callbacks.get_active_networks_info(
+            mock.Mock(), host='host', marker='a', limit=2)
+        self.assertEqual([], networks)
+        self.assertFalse(self.plugin.get_ports.called)
+
     def _test__port_action_with_failures(self, exc=None, action=None):
         port = {
             'network_id': 'foo_network_id',
@@ -231,6 +266,50 @@ class TestDhcpRpcCallback(base.BaseTestCase):
         }
         self._test_get_network_info()
 
+    def test_get_network_info_with_revisions(self):
+        self.plugin.get_network.return_value = dict(id='a')
+        self.plugin.get_subnets.return_value = [
+            dict(id='s2', revision_number=3),
+            dict(id='s1', revision_number=1)]
+        changed_ports = [dict(id='p2', revision_number=6),
+                         dict(id='p4', revision_number=1)]
+        self.plugin.get_ports.side_effect = [
+            [dict(id='p1', revision_number=2),
+             dict(id='p2', revision_number=6),
+             dict(id='p4', revision_number=1)],
+            changed_ports]
+        revisions = {'subnets': {'s1': 1, 's2': 2, 's3': 1},
+                     'ports': {'p1': 2, 'p2': 5, 'p3': 1}}
+
+        retval = self.callbacks.get_network_info(
+            mock.Mock(), network_id='a', revisions=revisions)
+
+        self.assertEqual([dict(id='s2', revision_number=3)],
+                         retval['subnets'])
+        self.assertEqual(['s3'], retval['deleted_subnets'])
+        self.assertEqual(changed_ports, retval['ports'])
+        self.assertEqual(['p3'], retval['deleted_ports'])
+        self.plugin.get_ports.assert_has_calls([
+            mock.call(mock.ANY, filters=dict(network_id=['a']),
+                      fields=['id', 'revision_number']),
+            mock.call(mock.ANY, filters={'id': ['p2', 'p4']})])
+
+    def test_get_network_info_with_revisions_nothing_changed(self):
+        self.plugin.get_network.return_value = dict(id='a')
+        self.plugin.get_subnets.return_value = [
+            dict(id='s1', revision_number=1)]
+        self.plugin.get_ports.return_value = [
+            dict(id='p1', revision_number=2)]
+        revisions = {'subnets': {'s1': 1}, 'ports': {'p1': 2}}
+
+        retval = self.callbacks.get_network_info(
+            mock.Mock(), network_id='a', revisions=revisions)
+
+        self.assertEqual([], retval['subnets'])
+        self.assertEqual([], retval['ports'])
+        self.assertEqual([], retval['deleted_ports'])
+        self.assertEqual(1, self.plugin.get_ports.call_count)
+
     def test_update_dhcp_port_verify_port_action_port_dict(self):
         port = {'port': {'network_id': 'foo_network_id',
                          'device_owner': constants.DEVICE_OWNER_DHCP,
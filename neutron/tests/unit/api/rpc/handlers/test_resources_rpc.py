@@ -14,11 +14,14 @@
 # limitations under the License.
 
 import mock
+from oslo_config import cfg
+import oslo_messaging
 from oslo_utils import uuidutils
 from oslo_versionedobjects import fields as obj_fields
 from oslo_versionedobjects import fixture
 import testtools
 
+from neutron.api.rpc.callbacks import events
 from neutron.api.rpc.callbacks import resources
 from neutron.api.rpc.callbacks import version_manager
 from neutron.api.rpc.handlers import resources_rpc
@@ -69,6 +72,16 @@ class FakeResource2(BaseFakeResource):
     }
 
 
+class FakeRevisionedResource(BaseFakeResource):
+    VERSION = TEST_VERSION
+
+    fields = {
+        'id': obj_fields.UUIDField(),
+        'field': obj_fields.StringField(),
+        'revision_number': obj_fields.IntegerField()
+    }
+
+
 class ResourcesRpcBaseTestCase(base.BaseTestCase):
 
     def setUp(self):
@@ -92,7 +105,9 @@ class ResourcesRpcBaseTestCase(base.BaseTestCase):
     @staticmethod
     def _get_resource_cls(resource_type):
         return {FakeResource.obj_name(): FakeResource,
-                FakeResource2.obj_name(): FakeResource2}.get(resource_type)
+                FakeResource2.obj_name(): FakeResource2,
+                FakeRevisionedResource.obj_name(): FakeRevisionedResource
+                }.get(resource_type)
 
 
 class _ValidateResourceTypeTestCase(base.BaseTestCase):
@@ -131,6 +146,7 @@ class ResourcesPullRpcApiTestCase(ResourcesRpcBaseTestCase):
         super(ResourcesPullRpcApiTestCase, self).setUp()
         self.rpc = resources_rpc.ResourcesPullRpcApi()
         mock.patch.object(self.rpc, 'client').start()
+        mock.patch.object(self.rpc, '_bulk_pull_unsupported', False).start()
         self.cctxt_mock = self.rpc.client.prepare.return_value
 
     def test_is_singleton(self):
@@ -145,11 +161,22 @@ class ResourcesPullRpcApiTestCase(ResourcesRpcBaseTestCase):
         result = self.rpc.pull(
             self.context, FakeResource.obj_name(), resource_id)
 
+        # pull is sent with the version of the target, see below
+        self.rpc.client.prepare.assert_called_once_with()
         self.cctxt_mock.call.assert_called_once_with(
             self.context, 'pull', resource_type='FakeResource',
             version=TEST_VERSION, resource_id=resource_id)
         self.assertEqual(expected_obj, result)
 
+    def test_client_target_version(self):
+        # The servers which only serve 1.0 must still accept pull
+        cls = resources_rpc.ResourcesPullRpcApi
+        self.addCleanup(setattr, cls, '_instance', cls._instance)
+        del cls._instance
+        with mock.patch('neutron.common.rpc.get_client') as get_client:
+            cls()
+        self.assertEqual('1.0', get_client.call_args[0][0].version)
+
     def test_pull_resource_not_found(self):
         resource_dict = _create_test_dict()
         resource_id = resource_dict['id']
@@ -158,6 +185,50 @@ class ResourcesPullRpcApiTestCase(ResourcesRpcBaseTestCase):
             self.rpc.pull(self.context, FakeResource.obj_name(),
                           resource_id)
 
+    def test_bulk_pull(self):
+        self.obj_registry.register(FakeResource)
+        expected_objs = [_create_test_resource(self.context)
+                         for _ in range(2)]
+        self.cctxt_mock.call.return_value = [
+            obj.obj_to_primitive() for obj in expected_objs]
+
+        result = self.rpc.bulk_pull(
+            self.context, FakeResource.obj_name(),
+            filter_kwargs={'id': [obj.id for obj in expected_objs]})
+
+        self.rpc.client.prepare.assert_called_once_with(version='1.1')
+        self.cctxt_mock.call.assert_called_once_with(
+            self.context, 'bulk_pull', resource_type='FakeResource',
+            version=TEST_VERSION,
+            filter_kwargs={'id': [obj.id for obj in expected_objs]})
+        self.assertEqual(expected_objs, result)
+
+    def _test_bulk_pull_unsupported(self, exc):
+        self.obj_registry.register(FakeResource)
+        self.cctxt_mock.call.side_effect = exc
+        for _attempt in range(2):
+            self.assertRaises(resources_rpc.BulkPullNotSupported,
+                              self.rpc.bulk_pull, self.context,
+                              FakeResource.obj_name())
+        # The server is not asked again
+        self.assertEqual(1, self.cctxt_mock.call.call_count)
+
+    def test_bulk_pull_unsupported(self):
+        self._test_bulk_pull_unsupported(
+            oslo_messaging.UnsupportedVersion('1.1'))
+
+    def test_bulk_pull_unsupported_remote(self):
+        self._test_bulk_pull_unsupported(
+            oslo_messaging.RemoteError(exc_type='UnsupportedVersion'))
+
+    def test_bulk_pull_remote_error(self):
+        self.obj_registry.register(FakeResource)
+        self.cctxt_mock.call.side_effect = oslo_messaging.RemoteError(
+            exc_type='CallbackNotFound')
+        self.assertRaises(oslo_messaging.RemoteError, self.rpc.bulk_pull,
+                          self.context, FakeResource.obj_name())
+        self.assertFalse(self.rpc._bulk_pull_unsupported)
+
 
 class ResourcesPushToServerRpcCallbackTestCase(ResourcesRpcBaseTestCase):
 
@@ -207,6 +278,26 @@ class ResourcesPullRpcCallbackTestCase(ResourcesRpcBaseTestCase):
                 resource_id=self.resource_obj.id)
             to_prim_mock.assert_called_with(target_version='0.9')
 
+    def test_bulk_pull(self):
+        with mock.patch.object(
+                resources_rpc.prod_registry, 'bulk_pull',
+                return_value=[self.resource_obj]) as registry_mock:
+            primitives = self.callbacks.bulk_pull(
+                self.context, resource_type=FakeResource.obj_name(),
+                version=TEST_VERSION, filter_kwargs={'field': ['foo']})
+        registry_mock.assert_called_once_with(
+            'FakeResource', {'field': ['foo']}, context=self.context)
+        self.assertEqual([self.resource_obj.obj_to_primitive()], primitives)
+
+    @mock.patch.object(FakeResource, 'obj_to_primitive')
+    def test_bulk_pull_backports_to_older_version(self, to_prim_mock):
+        with mock.patch.object(resources_rpc.prod_registry, 'bulk_pull',
+                               return_value=[self.resource_obj]):
+            self.callbacks.bulk_pull(
+                self.context, resource_type=FakeResource.obj_name(),
+                version='0.9')
+        to_prim_mock.assert_called_with(target_version='0.9')
+
 
 class ResourcesPushRpcApiTestCase(ResourcesRpcBaseTestCase):
     """Tests the neutron server side of the RPC interface."""
@@ -271,6 +362,106 @@ class ResourcesPushRpcApiTestCase(ResourcesRpcBaseTestCase):
             resource=self.resource_objs[0].obj_to_primitive(),
             event_type=TEST_EVENT)
 
+    def _create_revisioned_resource(self, resource_id=None, revision=1):
+        resource = FakeRevisionedResource(
+            self.context, revision_number=revision,
+            **_create_test_dict(resource_id))
+        resource.obj_reset_changes()
+        return resource
+
+    def _cache_revisioned_resources(self):
+        self.rpc.PRIMITIVE_CACHE_TYPES = frozenset(
+            [FakeRevisionedResource.obj_name()])
+
+    def test_push_dehydrates_revision_once(self):
+        self._cache_revisioned_resources()
+        resource = self._create_revisioned_resource()
+        with mock.patch.object(resource, 'obj_to_primitive',
+                               wraps=resource.obj_to_primitive) as to_prim:
+            self.rpc.push(self.context, [resource], TEST_EVENT)
+            self.rpc.push(self.context, [resource], TEST_EVENT)
+            self.assertEqual(1, to_prim.call_count)
+            resource.revision_number = 2
+            resource.obj_reset_changes()
+            self.rpc.push(self.context, [resource], TEST_EVENT)
+            self.assertEqual(2, to_prim.call_count)
+        self.assertEqual(3, self.cctxt_mock.cast.call_count)
+
+    def test_push_dehydrates_changed_resource(self):
+        self._cache_revisioned_resources()
+        resource = self._create_revisioned_resource()
+        self.rpc.push(self.context, [resource], TEST_EVENT)
+        resource.field = 'bar'
+        self.rpc.push(self.context, [resource], TEST_EVENT)
+        self.cctxt_mock.cast.assert_called_with(
+            self.context, 'push', resource=resource.obj_to_primitive(),
+            event_type=TEST_EVENT)
+
+    def test_push_type_not_cached(self):
+        resource = self._create_revisioned_resource()
+        self.rpc.push(self.context, [resource], TEST_EVENT)
+        self.assertEqual({}, self.rpc._primitive_cache)
+
+    def test_push_without_revision_not_cached(self):
+        self.rpc.PRIMITIVE_CACHE_TYPES = frozenset(
+            [FakeResource.obj_name()])
+        self.rpc.push(self.context, self.resource_objs, TEST_EVENT)
+        self.assertEqual({}, self.rpc._primitive_cache)
+
+    def test_primitive_cache_evicts_least_recently_used(self):
+        self._cache_revisioned_resources()
+        resources_list = [self._create_revisioned_resource()
+                          for _ in range(3)]
+        self.rpc.PRIMITIVE_CACHE_SIZE = 2
+        self.rpc.push(self.context, resources_list[:2], TEST_EVENT)
+        self.rpc.push(self.context, resources_list[:1], TEST_EVENT)
+        self.rpc.push(self.context, resources_list[2:], TEST_EVENT)
+        self.assertEqual(
+            {resources_list[0].id, resources_list[2].id},
+            {key[1] for key in self.rpc._primitive_cache})
+
+    def test_security_groups_cached(self):
+        self.assertEqual(
+            frozenset([resources.SECURITYGROUP, resources.SECURITYGROUPRULE]),
+            self.rpc.PRIMITIVE_CACHE_TYPES)
+
+    @mock.patch.object(resources_rpc.eventlet, 'spawn_after')
+    def test_push_updates_coalesced(self, spawn_after):
+        cfg.CONF.set_override('resource_push_coalesce_interval', 1)
+        resource_id = uuidutils.generate_uuid()
+        resource_v2 = self._create_revisioned_resource(resource_id, 2)
+        self.rpc.push(self.context,
+                      [self._create_revisioned_resource(resource_id, 1)],
+                      events.UPDATED)
+        self.rpc.push(self.context, [resource_v2], events.UPDATED)
+        self.rpc.push(self.context,
+                      [self._create_revisioned_resource(resource_id, 1)],
+                      events.UPDATED)
+        spawn_after.assert_called_once_with(
+            1, self.rpc.flush_pending_updates)
+        self.assertFalse(self.cctxt_mock.cast.called)
+
+        self.rpc.flush_pending_updates()
+        self.cctxt_mock.cast.assert_called_once_with(
+            self.context, 'push', resource=resource_v2.obj_to_primitive(),
+            event_type=events.UPDATED)
+
+    @mock.patch.object(resources_rpc.eventlet, 'spawn_after')
+    def test_push_delete_discards_pending_updates(self, spawn_after):
+        cfg.CONF.set_override('resource_push_coalesce_interval', 1)
+        resource = self._create_revisioned_resource()
+        self.rpc.push(self.context, [resource], events.UPDATED)
+        self.rpc.push(self.context, [resource], events.DELETED)
+        self.rpc.flush_pending_updates()
+        self.cctxt_mock.cast.assert_called_once_with(
+            self.context, 'push', resource=resource.obj_to_primitive(),
+            event_type=events.DELETED)
+
+    def test_push_updates_not_coalesced(self):
+        cfg.CONF.set_override('resource_push_coalesce_interval', 0)
+        self.rpc.push(self.context, self.resource_objs, events.UPDATED)
+        self.assertEqual(1, self.cctxt_mock.cast.call_count)
+
 
 class ResourcesPushRpcCallbackTestCase(ResourcesRpcBaseTestCase):
     """Tests the agent-side of the RPC interface."""
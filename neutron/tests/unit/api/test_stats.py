@@ -0,0 +1,87 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslo_config import cfg
+from oslo_serialization import jsonutils
+import webob
+
+from neutron.api import stats
+from neutron.common import request_stats
+from neutron import context
+from neutron.tests import base
+
+
+class TestGetOperation(base.BaseTestCase):
+
+    def test_collection(self):
+        self.assertEqual('networks', stats.get_operation('/v2.0/networks'))
+
+    def test_member_with_format(self):
+        self.assertEqual(
+            'routers/{id}/add_router_interface',
+            stats.get_operation('/routers/%s/add_router_interface.json' %
+                                'cc1eacb5-6c0a-4fa4-9a3a-1b0d4a0e2a5c'))
+
+    def test_ids_which_are_not_uuids(self):
+        self.assertEqual(
+            'networks/{id}/tags/{id}',
+            stats.get_operation('/v2.0/networks/%s/tags/red' %
+                                'cc1eacb5-6c0a-4fa4-9a3a-1b0d4a0e2a5c'))
+        self.assertEqual('quotas/{id}/default',
+                         stats.get_operation('/v2.0/quotas/abc123/default'))
+
+
+class TestRequestStatsMiddleware(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRequestStatsMiddleware, self).setUp()
+        cfg.CONF.set_override('enable_request_stats', True)
+        self.addCleanup(request_stats.reset_histograms)
+
+        @webob.dec.wsgify
+        def fake_app(req):
+            with request_stats.timed('plugin', 'get_networks'):
+                pass
+            return webob.Response()
+
+        self.middleware = stats.RequestStatsMiddleware(fake_app)
+        self.log = mock.patch.object(stats, 'LOG').start()
+
+    def _get_stats(self, ctx):
+        request = webob.Request.blank('/v2.0/_stats')
+        request.environ['neutron.context'] = ctx
+        return request.get_response(self.middleware)
+
+    def test_request_is_recorded(self):
+        response = webob.Request.blank('/v2.0/networks').get_response(
+            self.middleware)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual(1, self.log.info.call_count)
+        response = self._get_stats(context.get_admin_context())
+        self.assertEqual(200, response.status_int)
+        body = jsonutils.loads(response.body)
+        self.assertIn('checkouts', body['db_pool'])
+        self.assertIn('quota_usage_resyncs', body)
+        histograms = body['stats']
+        self.assertEqual(1, histograms['request']['GET networks']['count'])
+        self.assertEqual(1, histograms['plugin']['get_networks']['count'])
+
+    def test_stats_requires_admin(self):
+        response = self._get_stats(context.Context('user', 'tenant'))
+        self.assertEqual(403, response.status_int)
+
+    def test_disabled(self):
+        cfg.CONF.set_override('enable_request_stats', False)
+        webob.Request.blank('/v2.0/networks').get_response(self.middleware)
+        self.assertFalse(self.log.info.called)
+        self.assertEqual({}, request_stats.get_histograms())
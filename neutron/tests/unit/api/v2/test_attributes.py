@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+
 import mock
 from neutron_lib.api import converters
 from neutron_lib import constants
@@ -173,3 +175,90 @@ class TestHelpers(base.DietTestCase):
             attrs = attributes.get_resource_info('port')
             self._verify_port_attributes(attrs)
         self.assertEqual(0, mock_plurals.items.call_count)
+
+
+class TestRequestBodyPlan(base.DietTestCase):
+
+    def setUp(self):
+        super(TestRequestBodyPlan, self).setUp()
+        self.attr_info = copy.deepcopy(
+            attributes.RESOURCE_ATTRIBUTE_MAP[attributes.PORTS])
+        mock.patch.dict(attributes._REQUEST_BODY_PLANS, clear=True).start()
+
+    def _prepare_legacy(self, res_dict, is_create):
+        attributes.verify_attributes(res_dict, self.attr_info)
+        if is_create:
+            attributes.fill_default_value(self.attr_info, res_dict,
+                                          webob.exc.HTTPBadRequest)
+        else:
+            for attr, attr_vals in self.attr_info.items():
+                if attr in res_dict and not attr_vals['allow_put']:
+                    msg = "Cannot update read-only attribute %s" % attr
+                    raise webob.exc.HTTPBadRequest(msg)
+        attributes.convert_value(self.attr_info, res_dict,
+                                 webob.exc.HTTPBadRequest)
+        return res_dict
+
+    def _assert_same_result(self, res_dict, is_create=True):
+        plan = attributes.RequestBodyPlan(self.attr_info, is_create)
+        legacy_dict = copy.deepcopy(res_dict)
+        try:
+            expected = self._prepare_legacy(legacy_dict, is_create)
+        except webob.exc.HTTPBadRequest as e:
+            error = self.assertRaises(webob.exc.HTTPBadRequest,
+                                      plan.prepare, res_dict,
+                                      webob.exc.HTTPBadRequest)
+            self.assertEqual(str(e), str(error))
+        else:
+            plan.prepare(res_dict, webob.exc.HTTPBadRequest)
+            self.assertEqual(expected, res_dict)
+
+    def test_create(self):
+        self._assert_same_result({'network_id': uuidutils.generate_uuid(),
+                                  'tenant_id': 'tenant',
+                                  'admin_state_up': 'true',
+                                  'fixed_ips': [{'ip_address': '10.0.0.2'}]})
+
+    def test_create_missing_required_attribute(self):
+        self._assert_same_result({'tenant_id': 'tenant'})
+
+    def test_create_not_allowed_attribute(self):
+        self._assert_same_result({'network_id': uuidutils.generate_uuid(),
+                                  'tenant_id': 'tenant',
+                                  'status': 'ACTIVE'})
+
+    def test_create_invalid_value(self):
+        self._assert_same_result({'network_id': 'not-an-uuid',
+                                  'tenant_id': 'tenant'})
+
+    def test_unrecognized_attribute(self):
+        self._assert_same_result({'network_id': uuidutils.generate_uuid(),
+                                  'tenant_id': 'tenant',
+                                  'meh': 'meh'})
+
+    def test_update(self):
+        self._assert_same_result({'name': 'meh', 'admin_state_up': 'false'},
+                                 is_create=False)
+
+    def test_update_read_only_attribute(self):
+        self._assert_same_result({'network_id': uuidutils.generate_uuid()},
+                                 is_create=False)
+
+    def test_get_request_body_plan(self):
+        attr_map = {attributes.PORTS: self.attr_info}
+        self.assertIsNone(
+            attributes.get_request_body_plan(self.attr_info, True))
+        attributes.build_request_body_plans(attr_map)
+        plan = attributes.get_request_body_plan(self.attr_info, True)
+        self.assertTrue(plan.is_create)
+        self.assertIs(self.attr_info, plan.attr_info)
+        self.assertFalse(
+            attributes.get_request_body_plan(self.attr_info, False).is_create)
+
+    def test_get_request_body_plan_changed_attributes(self):
+        attributes.build_request_body_plans(
+            {attributes.PORTS: self.attr_info})
+        self.attr_info['meh'] = {'allow_post': True, 'allow_put': True,
+                                 'is_visible': True, 'default': None}
+        self.assertIsNone(
+            attributes.get_request_body_plan(self.attr_info, True))
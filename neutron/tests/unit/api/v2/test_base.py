@@ -36,6 +36,7 @@ from neutron.api.v2 import base as v2_base
 from neutron.api.v2 import router
 from neutron.callbacks import registry
 from neutron import context
+from neutron.db import _utils as ndb_utils
 from neutron import manager
 from neutron import policy
 from neutron import quota
@@ -578,6 +579,34 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
         tenant_id = _uuid()
         self._test_list(tenant_id + "bad", tenant_id)
 
+    def test_list_streamed(self):
+        cfg.CONF.set_override('stream_collection_responses', True)
+        tenant_id = _uuid()
+        self._test_list(tenant_id, tenant_id)
+        self._test_list(tenant_id + "bad", tenant_id)
+
+    def test_list_streamed_without_content_length(self):
+        cfg.CONF.set_override('stream_collection_responses', True)
+        instance = self.plugin.return_value
+        instance.get_networks.return_value = [
+            {'id': _uuid(), 'name': 'net%d' % i, 'tenant_id': ''}
+            for i in range(3)]
+        res = self.api.get(_get_path('networks', fmt=self.fmt))
+        self.assertNotIn('Content-Length', res.headers)
+        self.assertEqual(['net0', 'net1', 'net2'],
+                         [net['name'] for net in
+                          self.deserialize(res)['networks']])
+
+    def test_list_paginated_not_streamed(self):
+        cfg.CONF.set_override('stream_collection_responses', True)
+        instance = self.plugin.return_value
+        instance.get_networks.return_value = [
+            {'id': _uuid(), 'name': 'net1', 'tenant_id': ''}]
+        res = self.api.get(_get_path('networks', fmt=self.fmt),
+                           params={'limit': '2'})
+        self.assertIn('Content-Length', res.headers)
+        self.assertIn('networks_links', self.deserialize(res))
+
     def test_list_pagination(self):
         id1 = str(_uuid())
         id2 = str(_uuid())
@@ -623,12 +652,14 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
 
         url = urlparse.urlparse(next_links[0]['href'])
         self.assertEqual(url.path, _get_path('networks'))
-        params['marker'] = [id2]
+        params['marker'] = [ndb_utils.encode_keyset_marker(
+            input_dict2, ['name', 'id'])]
         self.assertEqual(params, urlparse.parse_qs(url.query))
 
         url = urlparse.urlparse(previous_links[0]['href'])
         self.assertEqual(url.path, _get_path('networks'))
-        params['marker'] = [id1]
+        params['marker'] = [ndb_utils.encode_keyset_marker(
+            input_dict1, ['name', 'id'])]
         params['page_reverse'] = ['True']
         self.assertEqual(params, urlparse.parse_qs(url.query))
 
@@ -663,7 +694,8 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
         url = urlparse.urlparse(previous_links[0]['href'])
         self.assertEqual(url.path, _get_path('networks'))
         expect_params = params.copy()
-        expect_params['marker'] = [id]
+        expect_params['marker'] = [ndb_utils.encode_keyset_marker(
+            input_dict, ['id'])]
         expect_params['page_reverse'] = ['True']
         self.assertEqual(expect_params, urlparse.parse_qs(url.query))
 
@@ -726,7 +758,8 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
         self.assertEqual(url.path, _get_path('networks'))
         expected_params = params.copy()
         del expected_params['page_reverse']
-        expected_params['marker'] = [id]
+        expected_params['marker'] = [ndb_utils.encode_keyset_marker(
+            input_dict, ['id'])]
         self.assertEqual(expected_params,
                          urlparse.parse_qs(url.query))
 
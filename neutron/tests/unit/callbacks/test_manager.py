@@ -14,11 +14,13 @@
 
 import mock
 from oslo_db import exception as db_exc
+from oslo_utils import reflection
 
 from neutron.callbacks import events
 from neutron.callbacks import exceptions
 from neutron.callbacks import manager
 from neutron.callbacks import resources
+from neutron.common import request_stats
 from neutron.tests import base
 
 
@@ -228,6 +230,20 @@ class CallBacksManagerTestCase(base.BaseTestCase):
         self.assertEqual(2, callback_1.counter)
         self.assertEqual(1, callback_2.counter)
 
+    def test__notify_loop_times_callbacks_by_name(self):
+        self.addCleanup(request_stats.reset_histograms)
+        self.manager.subscribe(
+            callback_1, resources.PORT, events.BEFORE_CREATE)
+        request_stats.start_request('POST', 'ports')
+        try:
+            self.manager._notify_loop(
+                resources.PORT, events.BEFORE_CREATE, mock.ANY)
+            timings = request_stats.get_request_stats().timings['callback']
+        finally:
+            request_stats.finish_request()
+        self.assertEqual([reflection.get_callable_name(callback_1)],
+                         list(timings))
+
     @mock.patch("neutron.callbacks.manager.LOG")
     def test__notify_loop_skip_log_errors(self, _logger):
         self.manager.subscribe(
@@ -0,0 +1,28 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from neutron.cmd import startup_benchmark
+from neutron.tests import base
+
+
+class TestStartupBenchmark(base.BaseTestCase):
+
+    def test_run_phases(self):
+        phases = [('first', mock.Mock()), ('second', mock.Mock())]
+        with mock.patch.object(startup_benchmark, 'PHASES', phases):
+            timings = startup_benchmark.run_phases()
+        self.assertEqual(['first', 'second'],
+                         [name for name, _elapsed in timings])
+        for _name, phase in phases:
+            phase.assert_called_once_with()
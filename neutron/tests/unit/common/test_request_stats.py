@@ -0,0 +1,99 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import sqlalchemy
+
+from neutron.common import request_stats
+from neutron.tests import base
+
+
+class TestHistogram(base.BaseTestCase):
+
+    def test_add(self):
+        histogram = request_stats.Histogram(bounds=(1, 10))
+        for value in (0.5, 1, 5, 20):
+            histogram.add(value)
+        self.assertEqual([2, 1, 1], histogram.buckets)
+        self.assertEqual(4, histogram.count)
+        self.assertEqual(26.5, histogram.total)
+        self.assertEqual(20, histogram.max)
+        self.assertEqual({'le_1': 2, 'le_10': 1, 'inf': 1},
+                         dict(histogram.to_dict()['buckets']))
+
+
+class TestAddToHistogram(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestAddToHistogram, self).setUp()
+        self.addCleanup(request_stats.reset_histograms)
+
+    def test_names_are_capped(self):
+        with mock.patch.object(request_stats,
+                               'MAX_HISTOGRAMS_PER_CATEGORY', 2):
+            for name in ('a', 'b', 'c', 'd', 'a'):
+                request_stats.add_to_histogram('request', name, 1)
+        histograms = request_stats.get_histograms()['request']
+        self.assertEqual({'a', 'b', request_stats.OTHER_NAME},
+                         set(histograms))
+        self.assertEqual(2, histograms['a']['count'])
+        self.assertEqual(2, histograms[request_stats.OTHER_NAME]['count'])
+
+
+class TestRequestStats(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRequestStats, self).setUp()
+        self.addCleanup(request_stats.reset_histograms)
+        self.addCleanup(request_stats.finish_request)
+
+    def test_timed_without_request(self):
+        func = mock.Mock()
+        self.assertIs(func, request_stats.timed_callable('plugin', 'f', func))
+        with request_stats.timed('driver', 'meh'):
+            pass
+        self.assertIsNone(request_stats.finish_request())
+        self.assertEqual({}, request_stats.get_histograms())
+
+    def test_request(self):
+        request_stats.start_request('POST', 'ports')
+        func = mock.Mock(return_value='result')
+        timed_func = request_stats.timed_callable('plugin', 'create_port',
+                                                  func)
+        self.assertEqual('result', timed_func('ctx', port='port'))
+        func.assert_called_once_with('ctx', port='port')
+        with request_stats.timed('driver', 'test.create_port_precommit'):
+            pass
+        with request_stats.timed('driver', 'test.create_port_precommit'):
+            pass
+        stats = request_stats.finish_request()
+        self.assertEqual(1, stats.timings['plugin']['create_port'][0])
+        self.assertEqual(
+            2, stats.timings['driver']['test.create_port_precommit'][0])
+        histograms = request_stats.get_histograms()
+        self.assertEqual(1, histograms['request']['POST ports']['count'])
+        self.assertEqual(
+            1, histograms['driver']['test.create_port_precommit']['count'])
+        self.assertEqual(1, histograms['plugin']['create_port']['count'])
+
+    def test_sql_statements(self):
+        engine = sqlalchemy.create_engine('sqlite://')
+        request_stats.add_engine_hooks(engine)
+        engine.execute('SELECT 1')
+        request_stats.start_request('GET', 'networks')
+        engine.execute('SELECT 1')
+        engine.execute('SELECT 2')
+        stats = request_stats.finish_request()
+        engine.execute('SELECT 1')
+        self.assertEqual(2, stats.sql_count)
+        histogram = request_stats.get_histograms()['request_sql_count']
+        self.assertEqual(2, histogram['GET networks']['total'])
@@ -624,6 +624,25 @@ class OvsAgentSchedulerTestCase(OvsAgentSchedulerTestCaseBase):
             self.adminContext, host=DHCP_HOSTA)
         self.assertEqual([], nets)
 
+    def test_list_active_networks_on_active_dhcp_agent_with_limit(self):
+        plugin = manager.NeutronManager.get_plugin()
+        with self.network() as net1, self.network() as net2, \
+                self.network() as net3, \
+                self.network(admin_state_up=False) as net4:
+            self._register_agent_states()
+            hosta_id = self._get_agent_id(constants.AGENT_TYPE_DHCP,
+                                          DHCP_HOSTA)
+            net_ids = [net['network']['id'] for net in (net1, net2, net3)]
+            for net_id in net_ids + [net4['network']['id']]:
+                self._add_network_to_dhcp_agent(hosta_id, net_id)
+            net_ids.sort()
+            nets = plugin.list_active_networks_on_active_dhcp_agent(
+                self.adminContext, DHCP_HOSTA, limit=2)
+            self.assertEqual(net_ids[:2], [net['id'] for net in nets])
+            nets = plugin.list_active_networks_on_active_dhcp_agent(
+                self.adminContext, DHCP_HOSTA, marker=net_ids[1], limit=2)
+            self.assertEqual(net_ids[2:], [net['id'] for net in nets])
+
     def test_reserved_port_after_network_remove_from_dhcp_agent(self):
         helpers.register_dhcp_agent(DHCP_HOSTA)
         hosta_id = self._get_agent_id(constants.AGENT_TYPE_DHCP,
@@ -173,3 +173,103 @@ class TestCommonDBfunctions(base.BaseTestCase):
                 db_api.set_hook(engine_mock)
                 add_tracing.assert_called_with(sqlalchemy, engine_mock,
                                                'neutron.db')
+
+
+class TestConfigureWorkerPool(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestConfigureWorkerPool, self).setUp()
+        self.engine = sqlalchemy.create_engine(
+            'sqlite://', poolclass=sqlalchemy.pool.QueuePool)
+        mock.patch.object(db_api, '_get_engines',
+                          return_value={self.engine}).start()
+        mock.patch.dict(db_api._worker, {'type': None, 'pools': [],
+                                         'stats_logger': None}).start()
+        self.looping_call = mock.patch.object(
+            db_api.loopingcall, 'FixedIntervalLoopingCall').start()
+
+    def test_worker_type_pool_size(self):
+        self.config(rpc_workers_db_pool_size=3, rpc_workers_db_max_overflow=2)
+        db_api.configure_worker_pool('rpc')
+        pool = self.engine.pool
+        self.assertIsInstance(pool, db_api._WorkerQueuePool)
+        self.assertEqual(3, pool.size())
+        self.assertEqual(2, pool._max_overflow)
+        self.assertEqual('rpc', db_api.get_pool_stats()['worker_type'])
+
+    def test_queue_on_exhaustion(self):
+        self.config(api_workers_db_max_overflow=10,
+                    db_pool_queue_on_exhaustion=True)
+        db_api.configure_worker_pool('api')
+        self.assertEqual(0, self.engine.pool._max_overflow)
+
+    def test_pools_kept_without_worker_options(self):
+        pool = self.engine.pool
+        db_api.configure_worker_pool('api')
+        self.assertIs(pool, self.engine.pool)
+        self.assertEqual([pool], db_api._worker['pools'])
+
+    def test_pool_replaced_on_queue_on_exhaustion(self):
+        self.config(db_pool_queue_on_exhaustion=True)
+        db_api.configure_worker_pool('periodic')
+        self.assertIsInstance(self.engine.pool, db_api._WorkerQueuePool)
+
+    def test_replaced_pool_keeps_private_attributes(self):
+        # The pool is rebuilt from private attributes of the SQLAlchemy
+        # QueuePool, this fails if SQLAlchemy renames or drops them.
+        pool = self.engine.pool
+        attributes = ('_creator', '_recycle', '_orig_logging_name',
+                      '_use_threadlocal', '_reset_on_return', '_dialect',
+                      'dispatch')
+        for attribute in attributes:
+            self.assertTrue(hasattr(pool, attribute), attribute)
+        self.config(api_workers_db_pool_size=3)
+        db_api.configure_worker_pool('api')
+        new_pool = self.engine.pool
+        self.assertIsNot(pool, new_pool)
+        for attribute in attributes[:-1]:
+            self.assertEqual(getattr(pool, attribute),
+                             getattr(new_pool, attribute), attribute)
+        self.engine.execute('SELECT 1')
+
+    def test_checkouts_are_counted(self):
+        self.config(api_workers_db_pool_size=5)
+        db_api.configure_worker_pool('api')
+        checkouts = db_api.get_pool_stats()['checkouts']
+        self.engine.execute('SELECT 1')
+        stats = db_api.get_pool_stats()
+        self.assertEqual(checkouts + 1, stats['checkouts'])
+        self.assertEqual([{'size': self.engine.pool.size(),
+                           'checked_out': 0, 'overflow': mock.ANY}],
+                         stats['pools'])
+
+    def test_checkout_histogram_requires_request_stats(self):
+        self.config(api_workers_db_pool_size=5)
+        db_api.configure_worker_pool('api')
+        with mock.patch.object(db_api.request_stats,
+                               'add_to_histogram') as add_to_histogram:
+            self.engine.execute('SELECT 1')
+            self.assertFalse(add_to_histogram.called)
+            self.config(enable_request_stats=True)
+            self.engine.execute('SELECT 1')
+            add_to_histogram.assert_called_once_with('db_pool', 'checkout',
+                                                     mock.ANY)
+
+    def test_rpc_worker_logs_pool_stats(self):
+        self.config(db_pool_stats_log_interval=60)
+        db_api.configure_worker_pool('rpc')
+        self.looping_call.assert_called_once_with(db_api._log_pool_stats)
+        self.looping_call.return_value.start.assert_called_once_with(
+            interval=60, initial_delay=60)
+        with mock.patch.object(db_api.LOG, 'info') as log_info:
+            db_api._log_pool_stats()
+            self.assertEqual('rpc', log_info.call_args[0][1]['type'])
+
+    def test_api_worker_does_not_log_pool_stats(self):
+        db_api.configure_worker_pool('api')
+        self.assertFalse(self.looping_call.called)
+
+    def test_pool_stats_logging_disabled(self):
+        self.config(db_pool_stats_log_interval=0)
+        db_api.configure_worker_pool('periodic')
+        self.assertFalse(self.looping_call.called)
@@ -14,9 +14,12 @@
 #    under the License.
 
 import mock
+from neutron_lib import exceptions as n_exc
 
 from neutron import context
 from neutron.db import _utils as db_utils
+from neutron.db import common_db_mixin
+from neutron.db import models_v2
 from neutron.tests.unit import testlib_api
 
 
@@ -46,3 +49,93 @@ class TestCommonHelpFunctions(testlib_api.SqlTestCase):
                           self.admin_ctx, create_fn, delete_fn,
                           create_bindings)
         delete_fn.assert_called_once_with(1234)
+
+
+class TestKeysetMarker(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(TestKeysetMarker, self).setUp()
+        self.ctx = context.get_admin_context()
+        self.mixin = common_db_mixin.CommonDbMixin()
+
+    def test_encode_decode(self):
+        item = {'id': 'id1', 'name': u'net\u7f51', 'mtu': 1500,
+                'status': 'ACTIVE'}
+        marker = db_utils.encode_keyset_marker(item, ['name', 'mtu', 'id'])
+        self.assertTrue(marker.startswith(db_utils.KEYSET_MARKER_PREFIX))
+        keyset_marker = db_utils.decode_keyset_marker(marker)
+        self.assertEqual({'id': 'id1', 'name': u'net\u7f51', 'mtu': 1500},
+                         keyset_marker.values)
+        self.assertEqual(1500, keyset_marker.mtu)
+        self.assertRaises(AttributeError, getattr, keyset_marker, 'status')
+
+    def test_encode_missing_sort_key(self):
+        self.assertIsNone(
+            db_utils.encode_keyset_marker({'id': 'id1'}, ['name', 'id']))
+
+    def test_decode_id_marker(self):
+        self.assertIsNone(db_utils.decode_keyset_marker('id1'))
+
+    def test_decode_invalid_marker(self):
+        for marker in (db_utils.KEYSET_MARKER_PREFIX + '!!!',
+                       db_utils.KEYSET_MARKER_PREFIX + 'W10='):
+            self.assertRaises(n_exc.BadRequest,
+                              db_utils.decode_keyset_marker, marker)
+
+    def test_covers(self):
+        marker = db_utils.KeysetMarker({'id': 'id1', 'name': 'net'})
+        self.assertTrue(marker.covers(models_v2.Network, ['name', 'id']))
+        self.assertFalse(marker.covers(models_v2.Network, ['mtu', 'id']))
+        marker.values['created_at'] = '2016-01-01T00:00:00Z'
+        self.assertFalse(
+            marker.covers(models_v2.Network, ['created_at', 'id']))
+
+    def _create_networks(self, names):
+        with self.ctx.session.begin():
+            for i, name in enumerate(names):
+                self.ctx.session.add(models_v2.Network(
+                    id='id%d' % i, name=name, tenant_id='tenant'))
+
+    def _get_page(self, marker, sorts):
+        marker_obj = self.mixin._get_marker_obj(self.ctx, 'network', 2,
+                                                marker)
+        query = self.mixin._get_collection_query(
+            self.ctx, models_v2.Network, sorts=sorts, limit=2,
+            marker_obj=marker_obj)
+        return [net.id for net in query]
+
+    def test_get_collection_query_keyset_marker(self):
+        self._create_networks(['b', 'a', 'b', 'c'])
+        sorts = [('name', True), ('id', True)]
+        marker = db_utils.encode_keyset_marker({'id': 'id0', 'name': 'b'},
+                                               ['name', 'id'])
+        with mock.patch.object(self.mixin, '_model_query',
+                               wraps=self.mixin._model_query) as query:
+            self.assertEqual(['id2', 'id3'], self._get_page(marker, sorts))
+        # The marker network is not loaded
+        self.assertEqual(1, query.call_count)
+
+    def test_get_collection_query_keyset_marker_of_deleted_item(self):
+        self._create_networks(['a', 'c'])
+        marker = db_utils.encode_keyset_marker({'id': 'id9', 'name': 'b'},
+                                               ['name', 'id'])
+        self.assertEqual(['id1'],
+                         self._get_page(marker, [('name', True),
+                                                 ('id', True)]))
+
+    def test_get_collection_query_keyset_marker_other_sort_keys(self):
+        self._create_networks(['b', 'a', 'c'])
+        marker = db_utils.encode_keyset_marker({'id': 'id1'}, ['id'])
+        self.assertEqual(['id0', 'id2'],
+                         self._get_page(marker, [('name', True),
+                                                 ('id', True)]))
+
+    def test_get_collection_query_keyset_marker_not_found(self):
+        marker = db_utils.encode_keyset_marker({'id': 'id1'}, ['id'])
+        self.assertRaises(n_exc.BadRequest, self._get_page, marker,
+                          [('name', True), ('id', True)])
+
+    def test_get_marker_obj_without_getter(self):
+        marker_obj = self.mixin._get_marker_obj(self.ctx, 'meh', 2, 'id1')
+        self.assertIsInstance(marker_obj, db_utils.KeysetMarker)
+        self.assertEqual({'id': 'id1'}, marker_obj.values)
@@ -126,6 +126,57 @@ class TestL2populationRpcCallBackTunnelMixin(
         self.assertEqual(sorted(expected),
                          sorted(mock_add_fdb_flow.call_args_list))
 
+    def test_fdb_add_tun_entries_sets_up_missing_ports_once(self):
+        del self.ofports[self.type_gre][self.ports[1].ip]
+        entries = [(self.lvm0, self.agent_ports),
+                   (self.lvm1, self.agent_ports)]
+
+        def setup_tunnel_ports(br, tunnels):
+            for remote_ip, network_type in tunnels:
+                self.ofports[network_type][remote_ip] = 'ofport4'
+            return dict.fromkeys(tunnels, 'ofport4')
+
+        with mock.patch.object(self.fakeagent, 'setup_tunnel_ports',
+                               side_effect=setup_tunnel_ports
+                               ) as mock_setup_tunnel_ports,\
+                mock.patch.object(self.fakeagent, 'setup_tunnel_port'
+                                  ) as mock_setup_tunnel_port,\
+                mock.patch.object(self.fakeagent, 'fdb_add_tun'
+                                  ) as mock_fdb_add_tun:
+            self.fakeagent.fdb_add_tun_entries('context', self.fakebr,
+                                               entries,
+                                               self._tunnel_port_lookup)
+        mock_setup_tunnel_ports.assert_called_once_with(
+            self.fakebr, set([(self.ports[1].ip, self.type_gre)]))
+        self.assertFalse(mock_setup_tunnel_port.called)
+        mock_fdb_add_tun.assert_has_calls([
+            mock.call('context', self.fakebr, self.lvm0, self.agent_ports,
+                      self._tunnel_port_lookup),
+            mock.call('context', self.fakebr, self.lvm1, self.agent_ports,
+                      self._tunnel_port_lookup)])
+
+    def test_fdb_add_tun_entries_skips_unavailable_ofport(self):
+        del self.ofports[self.type_gre][self.ports[1].ip]
+        with mock.patch.object(self.fakeagent, 'setup_tunnel_port',
+                               return_value=0
+                               ) as mock_setup_tunnel_port,\
+                mock.patch.object(self.fakeagent, 'add_fdb_flow'
+                                  ) as mock_add_fdb_flow:
+            self.fakeagent.fdb_add_tun_entries('context', self.fakebr,
+                                               [(self.lvm0,
+                                                 self.agent_ports)],
+                                               self._tunnel_port_lookup)
+        mock_setup_tunnel_port.assert_called_once_with(
+            self.fakebr, self.ports[1].ip, self.lvm0.network_type)
+        expected = [
+            mock.call(self.fakebr, (self.lvms[0].mac, self.lvms[0].ip),
+                      self.ports[0].ip, self.lvm0, self.ports[0].ofport),
+            mock.call(self.fakebr, (self.lvms[2].mac, self.lvms[2].ip),
+                      self.ports[2].ip, self.lvm0, self.ports[2].ofport),
+        ]
+        self.assertEqual(sorted(expected),
+                         sorted(mock_add_fdb_flow.call_args_list))
+
     def test_fdb_remove_tun(self):
         with mock.patch.object(
             self.fakeagent, 'del_fdb_flow') as mock_del_fdb_flow:
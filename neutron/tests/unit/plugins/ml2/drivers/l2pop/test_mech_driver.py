@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 import mock
 from neutron_lib import constants
 from neutron_lib import exceptions
@@ -1142,28 +1144,6 @@ class TestL2PopulationRpcTestCase(test_plugin.Ml2PluginV2TestCase):
 
 class TestL2PopulationMechDriver(base.BaseTestCase):
 
-    def _test_get_tunnels(self, agent_ip, exclude_host=True):
-        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
-        agent = mock.Mock()
-        agent.host = HOST
-        network_ports = ((None, agent),)
-        with mock.patch.object(l2pop_db, 'get_agent_ip',
-                               return_value=agent_ip):
-            excluded_host = HOST + '-EXCLUDE' if exclude_host else HOST
-            return mech_driver._get_tunnels(network_ports, excluded_host)
-
-    def test_get_tunnels(self):
-        tunnels = self._test_get_tunnels('20.0.0.1')
-        self.assertIn('20.0.0.1', tunnels)
-
-    def test_get_tunnels_no_ip(self):
-        tunnels = self._test_get_tunnels(None)
-        self.assertEqual(0, len(tunnels))
-
-    def test_get_tunnels_dont_exclude_host(self):
-        tunnels = self._test_get_tunnels(None, exclude_host=False)
-        self.assertEqual(0, len(tunnels))
-
     def _test_create_agent_fdb(self, fdb_network_ports, agent_ips):
         mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
         tunnel_network_ports, tunnel_agent = (
@@ -1184,6 +1164,7 @@ class TestL2PopulationMechDriver(base.BaseTestCase):
             session = mock.Mock()
             agent = mock.Mock()
             agent.host = HOST
+            agent_ips[agent] = '30.0.0.1'
             segment = {'segmentation_id': 1, 'network_type': 'vxlan'}
             return mech_driver._create_agent_fdb(session,
                                                  agent,
@@ -1257,6 +1238,70 @@ class TestL2PopulationMechDriver(base.BaseTestCase):
                                  ip_address='1.1.1.1')]}}
         self.assertEqual(expected_result, result)
 
+    def test_create_agent_fdb_agent_without_ip(self):
+        binding = mock.Mock()
+        binding.port = None
+        fdb_network_ports, fdb_agent = (
+            self._mock_network_ports(HOST + '2', [binding]))
+        agent_fdb = self._test_create_agent_fdb(fdb_network_ports,
+                                                {fdb_agent: None})
+        self.assertEqual({'10.0.0.1': [constants.FLOODING_ENTRY]},
+                         agent_fdb['network_id']['ports'])
+
+    def test_create_agent_fdb_served_from_endpoint_index(self):
+        self.config(fdb_cache_timeout=60, group='l2pop')
+        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
+        mech_driver.endpoint_index.enabled = True
+        port_info = l2pop_rpc.PortInfo(mac_address='00:00:DE:AD:BE:EF',
+                                       ip_address='1.1.1.1')
+        mech_driver.endpoint_index.set(
+            'network_id', {'10.0.0.1': [], '20.0.0.1': [port_info]})
+        agent = mock.Mock()
+        segment = {'segmentation_id': 1, 'network_type': 'vxlan'}
+        with mock.patch.object(l2pop_db, 'get_agent_ip',
+                               return_value='10.0.0.1'),\
+                mock.patch.object(
+                    l2pop_db,
+                    'get_nondistributed_active_network_ports') as get_ports:
+            agent_fdb = mech_driver._create_agent_fdb(
+                mock.Mock(), agent, segment, 'network_id')
+        self.assertFalse(get_ports.called)
+        self.assertEqual(
+            {'20.0.0.1': [constants.FLOODING_ENTRY, port_info]},
+            agent_fdb['network_id']['ports'])
+
+    def _test_start_endpoint_index(self, worker_type):
+        self.config(fdb_cache_timeout=60, group='l2pop')
+        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
+
+        class FakeWorker(object):
+            def start(self):
+                pass
+
+        worker = FakeWorker()
+        worker.worker_type = worker_type
+        with mock.patch.object(l2pop_mech_driver.n_rpc,
+                               'create_connection') as create_conn:
+            mech_driver._start_endpoint_index(
+                'process', 'after_init', worker.start)
+        return mech_driver, create_conn.return_value
+
+    def test_start_endpoint_index_rpc_worker(self):
+        mech_driver, conn = self._test_start_endpoint_index('rpc')
+        self.assertTrue(mech_driver.endpoint_index.enabled)
+        conn.create_consumer.assert_called_once_with(
+            topics.get_topic_name(topics.AGENT, topics.L2POPULATION,
+                                  topics.UPDATE),
+            mock.ANY, fanout=True)
+        callback = conn.create_consumer.call_args[0][1][0]
+        self.assertIs(mech_driver.endpoint_index, callback.index)
+        conn.consume_in_threads.assert_called_once_with()
+
+    def test_start_endpoint_index_api_worker(self):
+        mech_driver, conn = self._test_start_endpoint_index('api')
+        self.assertFalse(mech_driver.endpoint_index.enabled)
+        self.assertFalse(conn.create_consumer.called)
+
     def test_update_port_precommit_mac_address_changed_raises(self):
         port = {'status': u'ACTIVE',
                 'device_owner': DEVICE_OWNER_COMPUTE,
@@ -1279,3 +1324,83 @@ class TestL2PopulationMechDriver(base.BaseTestCase):
         mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
         with testtools.ExpectedException(exceptions.InvalidInput):
             mech_driver.update_port_precommit(ctx)
+
+
+class TestNetworkEndpointIndex(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestNetworkEndpointIndex, self).setUp()
+        self.index = l2pop_mech_driver.NetworkEndpointIndex(60)
+        self.index.enabled = True
+        self.port_info1 = l2pop_rpc.PortInfo(mac_address='00:00:00:00:00:01',
+                                             ip_address='1.1.1.1')
+        self.port_info2 = l2pop_rpc.PortInfo(mac_address='00:00:00:00:00:02',
+                                             ip_address='1.1.1.2')
+        self.index.set('net1', {'10.0.0.1': [self.port_info1]})
+
+    def _fdb_entries(self, network_id, ports):
+        # The entries are received as lists over RPC
+        return {network_id: {'segment_id': 1,
+                             'network_type': 'vxlan',
+                             'ports': {ip: [list(entry) for entry in entries]
+                                       for ip, entries in ports.items()}}}
+
+    def test_get_unknown_network(self):
+        self.assertIsNone(self.index.get('net2'))
+
+    def test_get_expired(self):
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(self.index.get('net1'))
+
+    def test_set_no_timeout(self):
+        index = l2pop_mech_driver.NetworkEndpointIndex(0)
+        index.enabled = True
+        index.set('net1', {'10.0.0.1': []})
+        self.assertIsNone(index.get('net1'))
+
+    def test_set_not_enabled(self):
+        index = l2pop_mech_driver.NetworkEndpointIndex(60)
+        index.set('net1', {'10.0.0.1': []})
+        self.assertIsNone(index.get('net1'))
+
+    def test_add_fdb_entries(self):
+        self.index.add_fdb_entries(self._fdb_entries(
+            'net1', {'10.0.0.1': [self.port_info1, self.port_info2],
+                     '20.0.0.1': [constants.FLOODING_ENTRY]}))
+        self.assertEqual(
+            {'10.0.0.1': [self.port_info1, self.port_info2],
+             '20.0.0.1': []},
+            self.index.get('net1'))
+
+    def test_add_fdb_entries_unknown_network(self):
+        self.index.add_fdb_entries(self._fdb_entries(
+            'net2', {'10.0.0.1': [self.port_info2]}))
+        self.assertIsNone(self.index.get('net2'))
+
+    def test_remove_fdb_entries(self):
+        self.index.add_fdb_entries(self._fdb_entries(
+            'net1', {'10.0.0.1': [self.port_info2]}))
+        self.index.remove_fdb_entries(self._fdb_entries(
+            'net1', {'10.0.0.1': [self.port_info1]}))
+        self.assertEqual({'10.0.0.1': [self.port_info2]},
+                         self.index.get('net1'))
+
+    def test_remove_fdb_entries_last_port(self):
+        self.index.remove_fdb_entries(self._fdb_entries(
+            'net1', {'10.0.0.1': [constants.FLOODING_ENTRY,
+                                  self.port_info1]}))
+        self.assertEqual({}, self.index.get('net1'))
+
+    def test_update_fdb_entries_chg_ip(self):
+        self.index.set('net2', {'20.0.0.1': []})
+        self.index.update_fdb_entries({'chg_ip': {'net1': {}}})
+        self.assertIsNone(self.index.get('net1'))
+        self.assertEqual({'20.0.0.1': []}, self.index.get('net2'))
+
+    def test_update_fdb_entries_other(self):
+        self.index.update_fdb_entries({'set_db': {}})
+        self.assertIsNone(self.index.get('net1'))
+
+    def test_invalidate(self):
+        self.index.invalidate('net1')
+        self.assertIsNone(self.index.get('net1'))
@@ -0,0 +1,104 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from neutron_lib import constants
+
+from neutron.plugins.ml2.drivers.l2pop import rpc as l2pop_rpc
+from neutron.tests import base
+
+
+PORT_INFO1 = l2pop_rpc.PortInfo(mac_address='00:00:00:00:00:01',
+                                ip_address='1.1.1.1')
+PORT_INFO2 = l2pop_rpc.PortInfo(mac_address='00:00:00:00:00:02',
+                                ip_address='1.1.1.2')
+
+
+def _fdb_entries(network_id, agent_ip, entries):
+    return {network_id: {'segment_id': 1,
+                         'network_type': 'vxlan',
+                         'ports': {agent_ip: entries}}}
+
+
+class TestL2populationAgentNotifyAPI(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestL2populationAgentNotifyAPI, self).setUp()
+        mock.patch('neutron.common.rpc.get_client').start()
+        self.spawn_after = mock.patch('eventlet.spawn_after').start()
+        self.notifier = l2pop_rpc.L2populationAgentNotifyAPI()
+        self.cast = mock.patch.object(self.notifier, '_cast_fanout').start()
+
+    def test_fanout_not_aggregated_by_default(self):
+        fdb_entries = _fdb_entries('net1', '10.0.0.1', [PORT_INFO1])
+        self.notifier.add_fdb_entries('ctx', fdb_entries)
+        self.cast.assert_called_once_with('ctx', 'add_fdb_entries',
+                                          fdb_entries)
+        self.assertFalse(self.spawn_after.called)
+
+    def test_fanouts_aggregated(self):
+        self.config(fdb_aggregation_interval=0.5, group='l2pop')
+        self.notifier.add_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1',
+                                [constants.FLOODING_ENTRY, PORT_INFO1]))
+        self.notifier.add_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO2]))
+        self.notifier.add_fdb_entries(
+            'ctx', _fdb_entries('net2', '10.0.0.2', [PORT_INFO1]))
+        self.assertFalse(self.cast.called)
+        self.spawn_after.assert_called_once_with(
+            0.5, self.notifier.flush_pending_fanouts)
+
+        self.notifier.flush_pending_fanouts()
+        expected = _fdb_entries('net1', '10.0.0.1',
+                                [constants.FLOODING_ENTRY, PORT_INFO1,
+                                 PORT_INFO2])
+        expected.update(_fdb_entries('net2', '10.0.0.2', [PORT_INFO1]))
+        self.cast.assert_called_once_with('ctx', 'add_fdb_entries', expected)
+
+    def test_fanouts_aggregated_in_order(self):
+        self.config(fdb_aggregation_interval=0.5, group='l2pop')
+        self.notifier.add_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO1]))
+        self.notifier.remove_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO1]))
+        self.notifier.add_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO1]))
+        self.notifier.update_fdb_entries('ctx', {'chg_ip': {}})
+        self.notifier.flush_pending_fanouts()
+        fdb_entries = _fdb_entries('net1', '10.0.0.1', [PORT_INFO1])
+        self.assertEqual(
+            [mock.call('ctx', 'add_fdb_entries', fdb_entries),
+             mock.call('ctx', 'remove_fdb_entries', fdb_entries),
+             mock.call('ctx', 'add_fdb_entries', fdb_entries),
+             mock.call('ctx', 'update_fdb_entries', {'chg_ip': {}})],
+            self.cast.call_args_list)
+
+    def test_host_notifications_not_aggregated(self):
+        self.config(fdb_aggregation_interval=0.5, group='l2pop')
+        with mock.patch.object(self.notifier,
+                               '_notification_host') as notify_host:
+            self.notifier.add_fdb_entries(
+                'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO1]),
+                host='host1')
+        self.assertTrue(notify_host.called)
+        self.assertFalse(self.spawn_after.called)
+
+    def test_flush_failure_sends_next_fanouts(self):
+        self.config(fdb_aggregation_interval=0.5, group='l2pop')
+        self.cast.side_effect = [Exception(), None]
+        self.notifier.add_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO1]))
+        self.notifier.remove_fdb_entries(
+            'ctx', _fdb_entries('net1', '10.0.0.1', [PORT_INFO2]))
+        self.notifier.flush_pending_fanouts()
+        self.assertEqual(2, self.cast.call_count)
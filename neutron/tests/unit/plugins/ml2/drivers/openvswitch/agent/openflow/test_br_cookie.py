@@ -16,6 +16,8 @@
 import mock
 
 from neutron.agent.common import ovs_lib
+from neutron.plugins.ml2.drivers.openvswitch.agent.openflow \
+    import br_cookie
 from neutron.plugins.ml2.drivers.openvswitch.agent.openflow.ovs_ofctl \
     import ovs_bridge
 from neutron.tests import base
@@ -64,3 +66,112 @@ class TestBRCookieOpenflow(base.BaseTestCase):
         self.assertIn(new_cookie, self.br.reserved_cookies)
         self.assertNotIn(def_cookie, self.br.reserved_cookies)
         self.assertEqual(set([new_cookie]), self.br.reserved_cookies)
+
+    def _record(self, cookies):
+        return {br_cookie.COOKIES_EXTERNAL_ID: cookies}
+
+    def test_record_cookies(self):
+        with mock.patch.object(self.br, 'db_get_val',
+                               return_value=self._record('0x1,0x2')),\
+                mock.patch.object(self.br, 'set_db_attribute') as set_attr:
+            self.br.set_agent_uuid_stamp(3)
+            self.br.record_cookies()
+        set_attr.assert_called_once_with(
+            'Bridge', 'br-int', 'external_ids',
+            self._record('0x1,0x2,0x3'))
+
+    def test_request_cookie_once_recorded(self):
+        with mock.patch.object(self.br, 'db_get_val', return_value={}),\
+                mock.patch.object(self.br, 'set_db_attribute') as set_attr:
+            self.br.request_cookie()
+            self.assertFalse(set_attr.called)
+            self.br.record_cookies()
+            new_cookie = self.br.request_cookie()
+        self.assertEqual(2, set_attr.call_count)
+        self.assertIn('%#x' % new_cookie, set_attr.call_args[0][3][
+            br_cookie.COOKIES_EXTERNAL_ID])
+
+    def test_record_cookies_reads_previous_cookies_once(self):
+        with mock.patch.object(self.br, 'db_get_val',
+                               return_value=self._record('0x1')) as get_val,\
+                mock.patch.object(self.br, 'set_db_attribute') as set_attr:
+            self.br.set_agent_uuid_stamp(3)
+            self.br.record_cookies()
+            self.br.reserve_owner_cookies([1])
+            self.br.record_cookies()
+        get_val.assert_called_once_with('Bridge', 'br-int', 'external_ids')
+        self.assertEqual(3, set_attr.call_count)
+        recorded = set_attr.call_args[0][3][br_cookie.COOKIES_EXTERNAL_ID]
+        self.assertIn('0x1', recorded.split(','))
+
+    def test_release_cookie_is_recorded_by_flush(self):
+        with mock.patch.object(self.br, 'db_get_val', return_value={}),\
+                mock.patch.object(self.br, 'set_db_attribute') as set_attr:
+            self.br.set_agent_uuid_stamp(3)
+            self.br.record_cookies()
+            cookie = self.br.request_cookie()
+            set_attr.reset_mock()
+            self.br.release_cookie(cookie)
+            self.assertFalse(set_attr.called)
+            self.br.flush_cookies()
+            self.br.flush_cookies()
+        set_attr.assert_called_once_with('Bridge', 'br-int', 'external_ids',
+                                         self._record('0x3'))
+
+    def test_get_stale_cookies(self):
+        self.br.set_agent_uuid_stamp(2)
+        with mock.patch.object(self.br, 'db_get_val',
+                               return_value=self._record('0x1,0x2')):
+            self.assertEqual(set([1]), self.br.get_stale_cookies())
+
+    def test_get_stale_cookies_not_recorded(self):
+        with mock.patch.object(self.br, 'db_get_val', return_value={}):
+            self.assertIsNone(self.br.get_stale_cookies())
+
+    def test_forget_stale_cookies(self):
+        self.br.set_agent_uuid_stamp(2)
+        with mock.patch.object(self.br, 'set_db_attribute') as set_attr:
+            self.br.forget_stale_cookies()
+        set_attr.assert_called_once_with('Bridge', 'br-int', 'external_ids',
+                                         self._record('0x2'))
+
+    def test_get_owner_bridge(self):
+        port_br = self.br.get_owner_bridge(5)
+        cookie = port_br.default_cookie
+        self.assertNotEqual(self.br.default_cookie, cookie)
+        self.assertIn(cookie, self.br.reserved_cookies)
+        self.assertEqual(cookie, self.br.get_owner_bridge(5).default_cookie)
+        self.assertTrue(self.br.has_flow_owner(5))
+        self.assertFalse(self.br.has_flow_owner(6))
+
+    def test_reserve_owner_cookies_records_once(self):
+        with mock.patch.object(self.br, 'db_get_val', return_value={}),\
+                mock.patch.object(self.br, 'set_db_attribute') as set_attr:
+            self.br.record_cookies()
+            self.br.reserve_owner_cookies([1, 2, 3])
+            self.br.reserve_owner_cookies([1, 2])
+        self.assertEqual(2, set_attr.call_count)
+
+    def test_delete_owner_flows(self):
+        cookie = self.br.get_owner_bridge(5).default_cookie
+        with mock.patch.object(self.br,
+                               'delete_flows_by_cookies') as delete_flows:
+            self.br.delete_owner_flows(5)
+            self.br.delete_owner_flows(5)
+        delete_flows.assert_called_once_with([cookie])
+        self.assertNotIn(cookie, self.br.reserved_cookies)
+        self.assertFalse(self.br.has_flow_owner(5))
+
+    def test_delete_owner_flows_with_match(self):
+        self.br.set_agent_uuid_stamp(1)
+        ext_cookie = self.br.request_cookie()
+        cookie = self.br.get_owner_bridge(5).default_cookie
+        other_cookie = self.br.get_owner_bridge(6).default_cookie
+        with mock.patch.object(self.br,
+                               'delete_flows_by_cookies') as delete_flows:
+            self.br.delete_owner_flows(5, in_port=5)
+        self.assertEqual(
+            [mock.call([cookie]),
+             mock.call(set([1, ext_cookie]), in_port=5)],
+            delete_flows.mock_calls)
+        self.assertIn(other_cookie, self.br.reserved_cookies)
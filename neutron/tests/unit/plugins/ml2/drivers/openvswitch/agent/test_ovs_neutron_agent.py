@@ -339,10 +339,23 @@ class TestOvsNeutronAgent(object):
                                            log_errors=True),
                 mock.call.drop_port(in_port=port.ofport),
             ])
+        self.assertFalse(int_br.get_owner_bridge.called)
 
     def test_port_dead(self):
         self._test_port_dead()
 
+    def test_port_dead_with_port_flow_cookie(self):
+        self.agent.prevent_arp_spoofing = True
+        port = mock.Mock(ofport=1)
+        with mock.patch.object(self.agent, 'int_br') as int_br:
+            int_br.db_get_val.return_value = 1
+            int_br.has_flow_owner.return_value = True
+            self.agent.port_dead(port)
+        int_br.get_owner_bridge.assert_called_once_with(port.ofport)
+        int_br.get_owner_bridge().drop_port.assert_called_once_with(
+            in_port=port.ofport)
+        self.assertFalse(int_br.reserve_owner_cookies.called)
+
     def test_port_dead_with_port_already_dead(self):
         self._test_port_dead(constants.DEAD_VLAN_TAG)
 
@@ -824,6 +837,31 @@ class TestOvsNeutronAgent(object):
 
             self.agent.treat_devices_added_or_updated([], False)
 
+    def test_treat_devices_added_updated_prepares_extension_ports(self):
+        details = mock.MagicMock()
+        details.__contains__.side_effect = lambda x: True
+        port = mock.MagicMock()
+        manager = mock.Mock()
+        with mock.patch.object(self.agent.plugin_rpc,
+                               'get_devices_details_list_and_failed_devices',
+                               return_value={'devices': [details],
+                                             'failed_devices': []}),\
+            mock.patch.object(self.agent.ext_manager, 'prepare_ports',
+                              new=manager.prepare_ports),\
+            mock.patch.object(self.agent.ext_manager, 'handle_port',
+                              new=manager.handle_port),\
+            mock.patch.object(self.agent.int_br,
+                              'get_vifs_by_ids',
+                              return_value={details['device']: port}),\
+            mock.patch.object(self.agent, 'treat_vif_port',
+                              return_value=False):
+
+            self.agent.treat_devices_added_or_updated([], False)
+        self.assertEqual([mock.call.prepare_ports(self.agent.context,
+                                                  [details]),
+                          mock.call.handle_port(self.agent.context, details)],
+                         manager.mock_calls)
+
     def test_treat_devices_added_updated_skips_if_port_not_found(self):
         dev_mock = mock.MagicMock()
         dev_mock.__getitem__.return_value = 'the_skipped_one'
@@ -1023,6 +1061,113 @@ class TestOvsNeutronAgent(object):
             setup_port_filters.assert_called_once_with(
                 set(), port_info.get('updated', set()))
 
+    def _test_process_network_ports_pipelined(self, port_info, details,
+                                              failed=None):
+        self.agent.port_processing_workers = 4
+        rpc_result = {'devices': details, 'failed_devices': failed or []}
+        calls = []
+
+        def treat_devices_details(devices, vif_by_id, ovs_restarted):
+            calls.append([d['device'] for d in devices])
+            skipped = [d['device'] for d in devices if d.get('skip')]
+            return skipped, [], []
+
+        with mock.patch.object(self.agent.sg_agent,
+                               "setup_port_filters") as setup_port_filters,\
+                mock.patch.object(
+                    self.agent.plugin_rpc,
+                    'get_devices_details_list_and_failed_devices',
+                    return_value=rpc_result),\
+                mock.patch.object(self.agent.int_br, 'get_vifs_by_ids',
+                                  return_value={}),\
+                mock.patch.object(self.agent, '_treat_devices_details',
+                                  side_effect=treat_devices_details),\
+                mock.patch.object(self.agent, '_bind_devices',
+                                  return_value=set()),\
+                mock.patch.object(self.agent, 'treat_devices_added_or_updated'
+                                  ) as treat_devices_added_or_updated:
+            failed_devices = self.agent.process_network_ports(port_info,
+                                                              False)
+        self.assertFalse(treat_devices_added_or_updated.called)
+        return failed_devices, calls, setup_port_filters
+
+    def test_process_network_ports_pipelined_groups_by_network(self):
+        port_info = {'current': {'p1', 'p2', 'p3'},
+                     'added': {'p1', 'p2'},
+                     'updated': {'p3'}}
+        details = [{'device': 'p1', 'network_id': 'net1'},
+                   {'device': 'p2', 'network_id': 'net2'},
+                   {'device': 'p3', 'network_id': 'net1'}]
+        failed_devices, calls, setup_port_filters = (
+            self._test_process_network_ports_pipelined(port_info, details))
+        self.assertEqual({'added': set(), 'removed': set()}, failed_devices)
+        self.assertItemsEqual([['p1', 'p3'], ['p2']], calls)
+        setup_port_filters.assert_has_calls(
+            [mock.call({'p1'}, {'p3'}), mock.call({'p2'}, set())],
+            any_order=True)
+        self.assertEqual(2, setup_port_filters.call_count)
+
+    def test_process_network_ports_pipelined_keeps_network_order(self):
+        port_info = {'current': set(), 'added': set(), 'updated': set()}
+        details = []
+        for i in range(constants.PORT_DETAILS_BATCH_SIZE + 1):
+            device = 'p%03d' % i
+            port_info['added'].add(device)
+            details.append({'device': device, 'network_id': 'net1'})
+        port_info['current'] = set(port_info['added'])
+        with mock.patch.object(
+                self.agent, '_get_devices_details',
+                side_effect=lambda devices: {
+                    'devices': [d for d in details if d['device'] in devices],
+                    'failed_devices': []}):
+            _, calls, _ = self._test_process_network_ports_pipelined(
+                port_info, details)
+        self.assertEqual(
+            [[d['device'] for d in details[:-1]], [details[-1]['device']]],
+            calls)
+
+    def test_process_network_ports_pipelined_skipped_and_failed(self):
+        port_info = {'current': {'p1', 'p2', 'p3'},
+                     'added': {'p1', 'p2', 'p3'}}
+        details = [{'device': 'p1', 'network_id': 'net1', 'skip': True},
+                   {'device': 'p2', 'network_id': 'net1'}]
+        failed_devices, _, setup_port_filters = (
+            self._test_process_network_ports_pipelined(
+                port_info, details, failed=['p3']))
+        self.assertEqual({'p3'}, failed_devices['added'])
+        self.assertEqual({'p2', 'p3'}, port_info['current'])
+        setup_port_filters.assert_called_once_with({'p2'}, set())
+
+    def test_process_network_ports_pipelined_no_added_ports(self):
+        self.agent.port_processing_workers = 4
+        with mock.patch.object(self.agent.sg_agent,
+                               "setup_port_filters") as setup_port_filters:
+            self.agent.process_network_ports({'current': set()}, False)
+        setup_port_filters.assert_called_once_with(set(), set())
+
+    def test_cleanup_stale_flows_incrementally(self):
+        cfg.CONF.set_override('flow_cleanup_tables_per_iteration', 100,
+                              'AGENT')
+        with mock.patch.object(self.agent, 'int_br') as int_br:
+            self.agent.cleanup_stale_flows()
+            int_br.cleanup_flows.assert_called_once_with(
+                table_ids=list(range(100)))
+            self.agent.continue_stale_flows_cleanup()
+            self.agent.continue_stale_flows_cleanup()
+            int_br.cleanup_flows.assert_called_with(
+                table_ids=list(range(200, constants.NUM_OPENFLOW_TABLES)))
+            self.assertFalse(int_br.forget_stale_cookies.called)
+            self.agent.continue_stale_flows_cleanup()
+            int_br.forget_stale_cookies.assert_called_once_with()
+            self.assertIsNone(self.agent._stale_flows_cleanup)
+            self.agent.continue_stale_flows_cleanup()
+            self.assertEqual(3, int_br.cleanup_flows.call_count)
+
+    def test_flush_flow_cookies(self):
+        with mock.patch.object(self.agent, 'int_br') as int_br:
+            self.agent.flush_flow_cookies()
+        int_br.flush_cookies.assert_called_once_with()
+
     def test_hybrid_plug_flag_based_on_firewall(self):
         cfg.CONF.set_default(
             'firewall_driver',
@@ -1124,6 +1269,58 @@ class TestOvsNeutronAgent(object):
         self.agent.network_update(context=None, network=network)
         self.assertEqual(set([port['id']]), self.agent.updated_ports)
 
+    def test_port_update_wakes_up_loop(self):
+        self.agent.port_update("unused_context", port={'id': TEST_PORT_ID1})
+        self.assertTrue(self.agent._loop_wakeup.is_set())
+
+    def test_security_groups_member_updated_wakes_up_loop(self):
+        with mock.patch.object(self.agent, 'sg_agent'):
+            self.agent.security_groups_member_updated(
+                None, security_groups=['sg1'])
+            self.agent.sg_agent.security_groups_member_updated.\
+                assert_called_once_with(['sg1'])
+        self.assertTrue(self.agent._loop_wakeup.is_set())
+
+    def test_loop_count_and_wait_waits_for_wakeup(self):
+        self.agent.polling_interval = 2
+        self.agent.min_polling_interval = 0.5
+        self.agent._wake_up_loop()
+        with mock.patch.object(time, 'time', return_value=10.1),\
+                mock.patch.object(time, 'sleep') as sleep,\
+                mock.patch.object(self.agent,
+                                  '_wait_for_loop_wakeup') as wait:
+            self.agent.loop_count_and_wait(10.0, {})
+        self.assertAlmostEqual(0.4, sleep.call_args[0][0])
+        self.assertAlmostEqual(1.5, wait.call_args[0][0])
+        self.assertFalse(self.agent._loop_wakeup.is_set())
+
+    def test_loop_count_and_wait_returns_when_woken_up(self):
+        self.agent.polling_interval = 60
+        self.agent.min_polling_interval = 0
+        self.agent._handle_ovsdb_event()
+        start = time.time()
+        self.agent.loop_count_and_wait(start, {})
+        self.assertLess(time.time() - start, 60)
+        self.assertIsNotNone(self.agent._ovsdb_event_time)
+
+    def test_port_plug_latency(self):
+        self.agent._record_plugged_ports(
+            {'added': {'p1', 'p2', 'p3'}, 'removed': {'p3'}}, 10.0)
+        with mock.patch.object(time, 'time', return_value=12.5):
+            self.agent._record_port_plug_latencies({'p1', 'p4'}, ['p2'])
+        self.assertEqual({'samples': 1, 'last': 2.5, 'average': 2.5,
+                          'max': 2.5},
+                         self.agent.get_port_plug_latency_stats())
+        self.assertEqual({}, self.agent._port_plug_times)
+
+    def test_report_state_port_plug_latency(self):
+        self.agent.port_plug_latencies.extend([1.0, 3.0])
+        with mock.patch.object(self.agent.state_rpc, "report_state"):
+            self.agent._report_state()
+        self.assertEqual(
+            {'samples': 2, 'last': 3.0, 'average': 2.0, 'max': 3.0},
+            self.agent.agent_state['configurations']['port_plug_latency'])
+
     def test_network_update_outoforder(self):
         """Network update arrives later than port_delete.
 
@@ -1200,6 +1397,7 @@ class TestOvsNeutronAgent(object):
                 mock.call.phys_br.create(),
                 mock.call.phys_br.set_secure_mode(),
                 mock.call.phys_br.setup_controllers(mock.ANY),
+                mock.call.phys_br.record_cookies(),
                 mock.call.phys_br.setup_default_table(),
                 mock.call.int_br.db_get_val('Interface', 'int-br-eth',
                                             'type', log_errors=False),
@@ -1317,6 +1515,7 @@ class TestOvsNeutronAgent(object):
                 mock.call.phys_br.create(),
                 mock.call.phys_br.set_secure_mode(),
                 mock.call.phys_br.setup_controllers(mock.ANY),
+                mock.call.phys_br.record_cookies(),
                 mock.call.phys_br.setup_default_table(),
                 mock.call.int_br.delete_port('int-br-eth'),
                 mock.call.phys_br.delete_port('phy-br-eth'),
@@ -1380,6 +1579,7 @@ class TestOvsNeutronAgent(object):
                 mock.patch.object(self.agent.tun_br, 'create') as create_tun,\
                 mock.patch.object(self.agent.tun_br,
                                   'setup_controllers') as setup_controllers,\
+                mock.patch.object(self.agent.tun_br, 'record_cookies'),\
                 mock.patch.object(self.agent.tun_br, 'port_exists',
                                   return_value=False),\
                 mock.patch.object(self.agent.int_br, 'port_exists',
@@ -1564,10 +1764,80 @@ class TestOvsNeutronAgent(object):
             self.assertFalse(add_tun_fn.called)
             fdb_entry['net1']['ports']['10.10.10.10'] = [
                 l2pop_rpc.PortInfo(FAKE_MAC, FAKE_IP1)]
+            deferred_br = tun_br.deferred().__enter__()
+            deferred_br.add_tunnel_ports.return_value = {'gre-0a0a0a0a': '3'}
+            self.agent.fdb_add(None, fdb_entry)
+            self.assertFalse(add_tun_fn.called)
+            deferred_br.add_tunnel_ports.assert_called_once_with(
+                {'gre-0a0a0a0a': ('10.10.10.10', 'gre')}, self.agent.local_ip,
+                self.agent.vxlan_udp_port, self.agent.dont_fragment,
+                self.agent.tunnel_csum)
+            deferred_br.setup_tunnel_port.assert_called_once_with('gre', '3')
+            deferred_br.install_unicast_to_tun.assert_called_with(
+                'vlan1', 'seg1', '3', FAKE_MAC)
+            self.assertEqual('3',
+                             self.agent.tun_br_ofports['gre']['10.10.10.10'])
+
+    def test_fdb_add_ports_of_networks_batched(self):
+        self._prepare_l2_pop_ofports()
+        fdb_entry = {'net1':
+                     {'network_type': 'gre',
+                      'segment_id': 'tun1',
+                      'ports': {'10.10.10.10': [n_const.FLOODING_ENTRY]}},
+                     'net2':
+                     {'network_type': 'gre',
+                      'segment_id': 'tun2',
+                      'ports': {'10.10.10.10': [n_const.FLOODING_ENTRY],
+                                '11.11.11.11': [n_const.FLOODING_ENTRY]}}}
+        with mock.patch.object(self.agent, 'tun_br', autospec=True) as tun_br:
+            deferred_br = tun_br.deferred().__enter__()
+            tun_br.deferred.reset_mock()
+            deferred_br.add_tunnel_ports.return_value = {
+                'gre-0a0a0a0a': '3', 'gre-0b0b0b0b': '4'}
             self.agent.fdb_add(None, fdb_entry)
+        # The flows of both networks are applied at once, after the
+        # creation of all the missing ports
+        tun_br.deferred.assert_called_once_with()
+        deferred_br.add_tunnel_ports.assert_called_once_with(
+            {'gre-0a0a0a0a': ('10.10.10.10', 'gre'),
+             'gre-0b0b0b0b': ('11.11.11.11', 'gre')}, self.agent.local_ip,
+            self.agent.vxlan_udp_port, self.agent.dont_fragment,
+            self.agent.tunnel_csum)
+        deferred_br.install_flood_to_tun.assert_has_calls(
+            [mock.call('vlan1', 'seg1', set(['1', '3'])),
+             mock.call('vlan2', 'seg2', set(['1', '2', '3', '4']))],
+            any_order=True)
+
+    def test_fdb_add_skips_failed_tunnel_ports(self):
+        self._prepare_l2_pop_ofports()
+        fdb_entry = {'net1':
+                     {'network_type': 'gre',
+                      'segment_id': 'tun1',
+                      'ports': {'10.10.10.10': [n_const.FLOODING_ENTRY]}}}
+        with mock.patch.object(self.agent, 'tun_br', autospec=True) as tun_br,\
+                mock.patch.object(self.agent,
+                                  '_setup_tunnel_port') as add_tun_fn:
             deferred_br = tun_br.deferred().__enter__()
-            add_tun_fn.assert_called_with(
-                deferred_br, 'gre-0a0a0a0a', '10.10.10.10', 'gre')
+            deferred_br.add_tunnel_ports.return_value = {
+                'gre-0a0a0a0a': ovs_lib.INVALID_OFPORT}
+            self.agent.fdb_add(None, fdb_entry)
+        self.assertFalse(add_tun_fn.called)
+        self.assertFalse(deferred_br.setup_tunnel_port.called)
+        self.assertFalse(deferred_br.install_flood_to_tun.called)
+        self.assertNotIn('10.10.10.10', self.agent.tun_br_ofports['gre'])
+
+    def test_setup_tunnel_ports_skips_invalid_remote_ip(self):
+        self.agent.local_ip = '1.1.1.1'
+        br = mock.Mock()
+        br.add_tunnel_ports.return_value = {'gre-02020202': '2'}
+        ofports = self.agent.setup_tunnel_ports(
+            br, set([('2.2.2.2', 'gre'), ('2001:db8::1', 'gre')]))
+        self.assertEqual({('2.2.2.2', 'gre'): '2', ('2001:db8::1', 'gre'): 0},
+                         ofports)
+        br.add_tunnel_ports.assert_called_once_with(
+            {'gre-02020202': ('2.2.2.2', 'gre')}, '1.1.1.1',
+            self.agent.vxlan_udp_port, self.agent.dont_fragment,
+            self.agent.tunnel_csum)
 
     def test_fdb_del_port(self):
         self._prepare_l2_pop_ofports()
@@ -1633,8 +1903,9 @@ class TestOvsNeutronAgent(object):
             'neutron.agent.common.polling.get_polling_manager') as mock_get_pm:
             with mock.patch.object(self.agent, 'rpc_loop') as mock_loop:
                 self.agent.daemon_loop()
-        mock_get_pm.assert_called_with(True,
-                                       constants.DEFAULT_OVSDBMON_RESPAWN)
+        mock_get_pm.assert_called_with(
+            True, constants.DEFAULT_OVSDBMON_RESPAWN,
+            event_callback=self.agent._handle_ovsdb_event)
         mock_loop.assert_called_once_with(polling_manager=mock.ANY)
 
     def test_setup_tunnel_port_invalid_ofport(self):
@@ -1822,6 +2093,8 @@ class TestOvsNeutronAgent(object):
                 mock.patch.object(self.mod_agent.OVSNeutronAgent,
                                   'setup_physical_bridges') as setup_phys_br,\
                 mock.patch.object(time, 'sleep'),\
+                mock.patch.object(self.mod_agent.OVSNeutronAgent,
+                                  '_wait_for_loop_wakeup'),\
                 mock.patch.object(
                     self.mod_agent.OVSNeutronAgent,
                     'update_stale_ofport_rules') as update_stale, \
@@ -1898,6 +2171,8 @@ class TestOvsNeutronAgent(object):
                 mock.patch.object(self.mod_agent.OVSNeutronAgent,
                                   'check_ovs_status') as check_ovs_status,\
                 mock.patch.object(time, 'sleep'),\
+                mock.patch.object(self.mod_agent.OVSNeutronAgent,
+                                  '_wait_for_loop_wakeup'),\
                 mock.patch.object(
                     self.mod_agent.OVSNeutronAgent,
                     'update_stale_ofport_rules') as update_stale, \
@@ -2021,10 +2296,11 @@ class TestOvsNeutronAgent(object):
         newmap = {'port2': 2}
         self.agent.int_br.get_vif_port_to_ofport_map.return_value = newmap
         self.agent.update_stale_ofport_rules()
-        # rules matching port 1 should have been deleted
+        # flows of port 1 should have been deleted by cookie
         self.assertEqual(
-            [mock.call(port=1)],
-            self.agent.int_br.delete_arp_spoofing_protection.mock_calls)
+            [mock.call(1, in_port=1)],
+            self.agent.int_br.delete_owner_flows.mock_calls)
+        self.assertFalse(self.agent.int_br.delete_flows.called)
         # make sure the state was updated with the new map
         self.assertEqual(newmap, self.agent.vifname_to_ofport_map)
 
@@ -2039,24 +2315,29 @@ class TestOvsNeutronAgent(object):
         ofport_changed_ports = self.agent.update_stale_ofport_rules()
         self.assertEqual(['port1'], ofport_changed_ports)
 
-    def test_update_stale_ofport_rules_removes_drop_flow(self):
-        self.agent.prevent_arp_spoofing = False
-        self.agent.vifname_to_ofport_map = {'port1': 1, 'port2': 2}
-        self.agent.int_br = mock.Mock()
-        # simulate port1 was removed
-        newmap = {'port2': 2}
-        self.agent.int_br.get_vif_port_to_ofport_map.return_value = newmap
-        self.agent.update_stale_ofport_rules()
-        # drop flow rule matching port 1 should have been deleted
-        ofport_changed_ports = self.agent.update_stale_ofport_rules()
-        expected = [
-            mock.call(in_port=1)
-        ]
-        self.assertEqual(expected, self.agent.int_br.delete_flows.mock_calls)
-        self.assertEqual(newmap, self.agent.vifname_to_ofport_map)
-        self.assertFalse(
-            self.agent.int_br.delete_arp_spoofing_protection.called)
-        self.assertEqual([], ofport_changed_ports)
+    def test_bind_devices_installs_arp_flows_with_port_cookie(self):
+        self.agent.prevent_arp_spoofing = True
+        port = FakeVif()
+        details = {'network_id': 'net', 'vif_port': port, 'device': 'dev',
+                   'admin_state_up': True}
+        self.agent.vlan_manager.add('net', 1, None, None, None)
+        with mock.patch.object(self.agent, 'int_br') as int_br,\
+                mock.patch.object(
+                    self.agent.plugin_rpc, 'update_device_list',
+                    return_value={'devices_up': ['dev'],
+                                  'devices_down': [],
+                                  'failed_devices_up': [],
+                                  'failed_devices_down': []}),\
+                mock.patch.object(
+                    self.agent,
+                    'setup_arp_spoofing_protection') as setup_arp:
+            int_br.get_ports_attributes.return_value = [
+                {'name': port.port_name, 'tag': 1}]
+            self.agent._bind_devices([details])
+        int_br.reserve_owner_cookies.assert_called_once_with([port.ofport])
+        int_br.get_owner_bridge.assert_called_once_with(port.ofport)
+        setup_arp.assert_called_once_with(int_br.get_owner_bridge(), port,
+                                          details)
 
     def test__setup_tunnel_port_while_new_mapping_is_added(self):
         """
@@ -2092,6 +2373,10 @@ class TestOvsNeutronAgentOFCtl(TestOvsNeutronAgent,
     def test_cleanup_stale_flows(self):
         with mock.patch.object(self.agent.int_br,
                               'dump_flows_all_tables') as dump_flows,\
+                mock.patch.object(self.agent.int_br, 'get_stale_cookies',
+                                  return_value=None),\
+                mock.patch.object(self.agent.int_br,
+                                  'forget_stale_cookies') as forget,\
                 mock.patch.object(self.agent.int_br,
                                   'delete_flows') as del_flow:
             self.agent.int_br.set_agent_uuid_stamp(1234)
@@ -2108,6 +2393,35 @@ class TestOvsNeutronAgentOFCtl(TestOvsNeutronAgent,
                 mock.call(cookie='0x2345/-1', table='2'),
             ]
             self.assertEqual(expected, del_flow.mock_calls)
+            forget.assert_called_once_with()
+
+    def test_cleanup_stale_flows_by_recorded_cookies(self):
+        with mock.patch.object(self.agent.int_br,
+                               'dump_flows_all_tables') as dump_flows,\
+                mock.patch.object(self.agent.int_br, 'get_stale_cookies',
+                                  return_value={0x4321}),\
+                mock.patch.object(self.agent.int_br,
+                                  'forget_stale_cookies') as forget,\
+                mock.patch.object(self.agent.int_br,
+                                  'do_action_flows') as do_action_flows:
+            self.agent.cleanup_stale_flows()
+            self.assertFalse(dump_flows.called)
+            do_action_flows.assert_called_once_with(
+                'del', [{'cookie': '0x4321/-1'}])
+            forget.assert_called_once_with()
+
+    def test_cleanup_stale_flows_of_tables(self):
+        with mock.patch.object(self.agent.int_br, 'get_stale_cookies',
+                               return_value={0x4321}),\
+                mock.patch.object(self.agent.int_br,
+                                  'forget_stale_cookies') as forget,\
+                mock.patch.object(self.agent.int_br,
+                                  'do_action_flows') as do_action_flows:
+            self.agent.int_br.cleanup_flows(table_ids=[0, 1])
+            do_action_flows.assert_called_once_with(
+                'del', [{'cookie': '0x4321/-1', 'table': 0},
+                        {'cookie': '0x4321/-1', 'table': 1}])
+            self.assertFalse(forget.called)
 
 
 class TestOvsNeutronAgentRyu(TestOvsNeutronAgent,
@@ -2116,6 +2430,9 @@ class TestOvsNeutronAgentRyu(TestOvsNeutronAgent,
         uint64_max = (1 << 64) - 1
         with mock.patch.object(self.agent.int_br,
                               'dump_flows') as dump_flows,\
+                mock.patch.object(self.agent.int_br, 'get_stale_cookies',
+                                  return_value=None),\
+                mock.patch.object(self.agent.int_br, 'forget_stale_cookies'),\
                 mock.patch.object(self.agent.int_br,
                                   'delete_flows') as del_flow:
             self.agent.int_br.set_agent_uuid_stamp(1234)
@@ -2128,13 +2445,29 @@ class TestOvsNeutronAgentRyu(TestOvsNeutronAgent,
             ]
             self.agent.iter_num = 3
             self.agent.cleanup_stale_flows()
-            expected = [mock.call(cookie=17185,
+            expected = [mock.call(table_id=None, cookie=17185,
                                   cookie_mask=uint64_max),
-                        mock.call(cookie=9029,
+                        mock.call(table_id=None, cookie=9029,
                                   cookie_mask=uint64_max)]
             del_flow.assert_has_calls(expected, any_order=True)
             self.assertEqual(len(expected), len(del_flow.mock_calls))
 
+    def test_cleanup_stale_flows_by_recorded_cookies(self):
+        uint64_max = (1 << 64) - 1
+        with mock.patch.object(self.agent.int_br,
+                               'dump_flows') as dump_flows,\
+                mock.patch.object(self.agent.int_br, 'get_stale_cookies',
+                                  return_value={17185}),\
+                mock.patch.object(self.agent.int_br,
+                                  'forget_stale_cookies') as forget,\
+                mock.patch.object(self.agent.int_br,
+                                  'delete_flows') as del_flow:
+            self.agent.cleanup_stale_flows()
+            self.assertFalse(dump_flows.called)
+            del_flow.assert_called_once_with(table_id=None, cookie=17185,
+                                             cookie_mask=uint64_max)
+            forget.assert_called_once_with()
+
 
 class AncillaryBridgesTest(object):
 
@@ -204,6 +204,7 @@ class TunnelTest(object):
             mock.call.create(),
             mock.call.set_secure_mode(),
             mock.call.setup_controllers(mock.ANY),
+            mock.call.record_cookies(),
             mock.call.setup_default_table(),
         ]
 
@@ -211,6 +212,7 @@ class TunnelTest(object):
             mock.call.create(),
             mock.call.set_secure_mode(),
             mock.call.setup_controllers(mock.ANY),
+            mock.call.record_cookies(),
             mock.call.setup_default_table(),
             mock.call.port_exists('phy-%s' % self.MAP_TUN_BRIDGE),
             mock.call.add_patch_port('phy-%s' % self.MAP_TUN_BRIDGE,
@@ -244,6 +246,7 @@ class TunnelTest(object):
         self.mock_tun_bridge_expected = [
             mock.call.create(secure_mode=True),
             mock.call.setup_controllers(mock.ANY),
+            mock.call.record_cookies(),
             mock.call.port_exists('patch-int'),
             nonzero(mock.call.port_exists()),
             mock.call.add_patch_port('patch-int', 'patch-tun'),
@@ -506,7 +509,9 @@ class TunnelTest(object):
                 'Port', VIF_PORT.port_name,
                 'tag', constants.DEAD_VLAN_TAG,
                 log_errors=True),
-            mock.call.drop_port(in_port=VIF_PORT.ofport),
+            mock.call.has_flow_owner(VIF_PORT.ofport),
+            mock.call.get_owner_bridge(VIF_PORT.ofport),
+            mock.call.get_owner_bridge().drop_port(in_port=VIF_PORT.ofport),
         ]
 
         a = self._build_agent()
@@ -563,13 +568,16 @@ class TunnelTest(object):
         self.mock_int_bridge_expected += [
             mock.call.check_canary_table(),
             mock.call.cleanup_flows(),
+            mock.call.flush_cookies(),
             mock.call.check_canary_table()
         ]
         self.mock_tun_bridge_expected += [
-            mock.call.cleanup_flows()
+            mock.call.cleanup_flows(),
+            mock.call.flush_cookies()
         ]
         self.mock_map_tun_bridge_expected += [
-            mock.call.cleanup_flows()
+            mock.call.cleanup_flows(),
+            mock.call.flush_cookies()
         ]
         # No cleanup is expected on ancillary bridge
 
@@ -585,6 +593,8 @@ class TunnelTest(object):
                 mock.patch.object(self.mod_agent.OVSNeutronAgent,
                                   'tunnel_sync'),\
                 mock.patch.object(time, 'sleep'),\
+                mock.patch.object(self.mod_agent.OVSNeutronAgent,
+                                  '_wait_for_loop_wakeup'),\
                 mock.patch.object(
                     self.mod_agent.OVSNeutronAgent,
                     'update_stale_ofport_rules') as update_stale:
@@ -663,6 +673,7 @@ class TunnelTestUseVethInterco(TunnelTest):
             mock.call.create(),
             mock.call.set_secure_mode(),
             mock.call.setup_controllers(mock.ANY),
+            mock.call.record_cookies(),
             mock.call.setup_default_table(),
         ]
 
@@ -670,6 +681,7 @@ class TunnelTestUseVethInterco(TunnelTest):
             mock.call.create(),
             mock.call.set_secure_mode(),
             mock.call.setup_controllers(mock.ANY),
+            mock.call.record_cookies(),
             mock.call.setup_default_table(),
             mock.call.add_port('phy-%s' % self.MAP_TUN_BRIDGE),
         ]
@@ -693,6 +705,7 @@ class TunnelTestUseVethInterco(TunnelTest):
         self.mock_tun_bridge_expected = [
             mock.call.create(secure_mode=True),
             mock.call.setup_controllers(mock.ANY),
+            mock.call.record_cookies(),
             mock.call.port_exists('patch-int'),
             nonzero(mock.call.port_exists()),
             mock.call.add_patch_port('patch-int', 'patch-tun'),
@@ -18,6 +18,7 @@ import mock
 
 from oslo_db import exception as db_exc
 
+from neutron.common import request_stats
 from neutron.plugins.ml2.common import exceptions as ml2_exc
 from neutron.plugins.ml2 import config
 from neutron.plugins.ml2 import driver_api as api
@@ -77,3 +78,86 @@ class TestMechManager(base.BaseTestCase):
 
     def test_port_precommit(self):
         self._check_resource('port')
+
+    def test_create_port_postcommit_bulk_default_calls_each_port(self):
+        fake_ctxts = [mock.Mock(), mock.Mock()]
+        with mock.patch.object(mechanism_test.TestMechanismDriver,
+                               'create_port_postcommit') as cpp:
+            self._manager.create_port_postcommit_bulk(fake_ctxts)
+        cpp.assert_has_calls([mock.call(ctxt) for ctxt in fake_ctxts])
+
+    def test_create_port_postcommit_bulk_failure(self):
+        with mock.patch.object(mechanism_test.TestMechanismDriver,
+                               'create_port_postcommit_bulk',
+                               side_effect=RuntimeError()):
+            self.assertRaises(ml2_exc.MechanismDriverError,
+                              self._manager.create_port_postcommit_bulk,
+                              [mock.Mock()])
+
+    def test_slow_driver_call_is_logged(self):
+        config.cfg.CONF.set_override('slow_driver_call_threshold', 1,
+                                     group='ml2')
+        fake_ctxt = mock.Mock(current={'id': 'fake_id'})
+        with mock.patch.object(managers.time, 'time', side_effect=[0, 5]),\
+                mock.patch.object(managers.LOG, 'warning') as log_warning:
+            self._manager.update_port_postcommit(fake_ctxt)
+        self.assertIn('fake_id', log_warning.call_args[0][1]['resources'])
+        self.assertEqual('test', log_warning.call_args[0][1]['name'])
+
+    def test_slow_bulk_driver_call_is_logged(self):
+        config.cfg.CONF.set_override('slow_driver_call_threshold', 1,
+                                     group='ml2')
+        fake_ctxts = [mock.Mock(current={'id': 'id1'}),
+                      mock.Mock(current={'id': 'id2'})]
+        with mock.patch.object(managers.time, 'time', side_effect=[0, 5]),\
+                mock.patch.object(managers.LOG, 'warning') as log_warning:
+            self._manager.create_port_postcommit_bulk(fake_ctxts)
+        resources = log_warning.call_args[0][1]['resources']
+        self.assertIn('id1', resources)
+        self.assertIn('id2', resources)
+
+    def test_driver_call_recording_failure_is_ignored(self):
+        with mock.patch.object(self._manager, '_record_driver_call',
+                               side_effect=AttributeError()):
+            self._manager.update_port_postcommit(mock.Mock(current={}))
+
+    def test_driver_calls_are_recorded(self):
+        config.cfg.CONF.set_override('enable_request_stats', True)
+        self.addCleanup(request_stats.reset_histograms)
+        request_stats.start_request('PUT', 'ports/{id}')
+        self._manager.update_port_postcommit(mock.Mock(current={}))
+        stats = request_stats.finish_request()
+        name = 'test.update_port_postcommit'
+        self.assertEqual(1, stats.timings['driver'][name][0])
+        self.assertEqual(
+            1, request_stats.get_histograms()['driver_call'][name]['count'])
+
+    def _call_concurrently(self, method_name='update_port_postcommit',
+                           fake_ctxt=None, **kwargs):
+        config.cfg.CONF.set_override('concurrent_postcommit', True,
+                                     group='ml2')
+        fake_ctxt = fake_ctxt or mock.Mock(current={})
+        with mock.patch.object(mechanism_test.TestMechanismDriver,
+                               'is_postcommit_thread_safe',
+                               new_callable=mock.PropertyMock,
+                               return_value=True),\
+                mock.patch.object(mechanism_test.TestMechanismDriver,
+                                  method_name, **kwargs) as method,\
+                mock.patch.object(managers.eventlet, 'GreenPool',
+                                  wraps=managers.eventlet.GreenPool) as pool:
+            try:
+                getattr(self._manager, method_name)(fake_ctxt)
+            finally:
+                method.assert_called_once_with(fake_ctxt)
+                self.assertTrue(pool.called)
+
+    def test_concurrent_postcommit(self):
+        self._call_concurrently()
+
+    def test_concurrent_postcommit_bulk(self):
+        self._call_concurrently('create_port_postcommit_bulk',
+                                [mock.Mock(current={}), mock.Mock(current={})])
+
+    def test_concurrent_postcommit_failure(self):
+        self.assertRaises(ml2_exc.MechanismDriverError,
+                          self._call_concurrently, side_effect=RuntimeError())
@@ -0,0 +1,95 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from oslo_utils import uuidutils
+
+from neutron.api.rpc.callbacks import events as rpc_events
+from neutron.api.rpc.callbacks.producer import registry as prod_registry
+from neutron.api.rpc.callbacks import resources as rpc_resources
+from neutron.callbacks import events
+from neutron.callbacks import registry
+from neutron.callbacks import resources
+from neutron.objects import securitygroup
+from neutron.plugins.ml2 import ovo_rpc
+from neutron.tests import base
+
+
+class ObjectChangeHandlerTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(ObjectChangeHandlerTestCase, self).setUp()
+        self.push_api = mock.Mock()
+        self.get_object = mock.patch.object(
+            securitygroup.SecurityGroup, 'get_object').start()
+        self.handler = ovo_rpc._ObjectChangeHandler(
+            resources.SECURITY_GROUP, securitygroup.SecurityGroup,
+            self.push_api)
+
+    def _notify(self, resource, event, **kwargs):
+        registry.notify(resource, event, self, context=mock.Mock(), **kwargs)
+
+    def test_update_pushes_latest_object(self):
+        self._notify(resources.SECURITY_GROUP, events.AFTER_UPDATE,
+                     security_group_id='sg1',
+                     security_group={'id': 'sg1'})
+        self.handler.wait()
+        self.get_object.assert_called_once_with(mock.ANY, id='sg1')
+        self.push_api.push.assert_called_once_with(
+            mock.ANY, [self.get_object.return_value], rpc_events.UPDATED)
+
+    def test_deleted_object_pushed_as_deleted(self):
+        self.get_object.return_value = None
+        self._notify(resources.SECURITY_GROUP, events.AFTER_DELETE,
+                     security_group_id='sg1')
+        self.handler.wait()
+        (_ctx, objs, event), _kwargs = self.push_api.push.call_args
+        self.assertEqual(rpc_events.DELETED, event)
+        self.assertEqual('sg1', objs[0].id)
+
+    def test_related_resource_change_pushes_object(self):
+        self._notify(resources.SECURITY_GROUP_RULE, events.AFTER_CREATE,
+                     security_group_rule={'id': 'rule1',
+                                          'security_group_id': 'sg1'})
+        self.handler.wait()
+        self.get_object.assert_called_once_with(mock.ANY, id='sg1')
+
+    def test_changes_coalesced(self):
+        with mock.patch.object(self.handler._worker_pool, 'spawn_n'):
+            for _i in range(3):
+                self._notify(resources.SECURITY_GROUP, events.AFTER_UPDATE,
+                             security_group={'id': 'sg1'})
+        self.handler.dispatch_events()
+        self.handler.dispatch_events()
+        self.assertEqual(1, self.push_api.push.call_count)
+
+
+class OVOServerRpcInterfaceTestCase(base.BaseTestCase):
+
+    def test_providers_registered(self):
+        with mock.patch('neutron.api.rpc.handlers.resources_rpc.'
+                        'ResourcesPushRpcApi'):
+            ovo_rpc.OVOServerRpcInterface()
+        port_cls = rpc_resources.get_resource_cls(rpc_resources.PORT)
+        port = port_cls(id=uuidutils.generate_uuid())
+        with mock.patch.object(port_cls, 'get_object',
+                               return_value=port) as get_object:
+            self.assertEqual(port, prod_registry.pull(
+                rpc_resources.PORT, port.id, context=mock.sentinel.context))
+        get_object.assert_called_once_with(mock.sentinel.context, id=port.id)
+        with mock.patch.object(port_cls, 'get_objects',
+                               return_value=[port]) as get_objects:
+            self.assertEqual([port], prod_registry.bulk_pull(
+                rpc_resources.PORT, {'network_id': ['net1']},
+                context=mock.sentinel.context))
+        get_objects.assert_called_once_with(mock.sentinel.context,
+                                            network_id=['net1'])
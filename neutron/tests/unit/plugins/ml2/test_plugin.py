@@ -909,6 +909,77 @@ class TestMl2PortsV2(test_plugin.TestPortsV2, Ml2PluginV2TestCase):
             m_upd.assert_called_once_with(ctx, used_sg)
             self.assertFalse(p_upd.called)
 
+    def test_create_ports_bulk_calls_postcommit_bulk_once(self):
+        ctx = context.get_admin_context()
+        with self.network() as net,\
+                mock.patch.object(managers.MechanismManager,
+                                  'create_port_postcommit_bulk') as cppb:
+            res = self._create_port_bulk(self.fmt, 3, net['network']['id'],
+                                         'test', True, context=ctx)
+            ports = self.deserialize(self.fmt, res)['ports']
+        cppb.assert_called_once_with(mock.ANY)
+        self.assertEqual(sorted(port['id'] for port in ports),
+                         sorted(mech_context.current['id'] for mech_context
+                                in cppb.call_args[0][0]))
+
+    def test_create_ports_bulk_with_slow_driver_call_threshold(self):
+        config.cfg.CONF.set_override('slow_driver_call_threshold', 0.000001,
+                                     group='ml2')
+        ctx = context.get_admin_context()
+        with self.network() as net,\
+                mock.patch.object(managers.LOG, 'warning') as log_warning:
+            res = self._create_port_bulk(self.fmt, 2, net['network']['id'],
+                                         'test', True, context=ctx)
+            self.assertEqual(webob.exc.HTTPCreated.code, res.status_int)
+            ports = self.deserialize(self.fmt, res)['ports']
+        self.assertEqual(2, len(ports))
+        bulk_warnings = [
+            call for call in log_warning.call_args_list
+            if len(call[0]) > 1 and isinstance(call[0][1], dict) and
+            call[0][1].get('method') == 'create_port_postcommit_bulk']
+        self.assertTrue(bulk_warnings)
+        for port in ports:
+            self.assertIn(port['id'], bulk_warnings[0][0][1]['resources'])
+
+    def test_create_ports_bulk_postcommit_failure(self):
+        ctx = context.get_admin_context()
+        with self.network() as net,\
+                mock.patch.object(managers.MechanismManager,
+                                  'create_port_postcommit_bulk',
+                                  side_effect=ml2_exc.MechanismDriverError(
+                                      method='create_port_postcommit_bulk')):
+            res = self._create_port_bulk(self.fmt, 2, net['network']['id'],
+                                         'test', True, context=ctx)
+            self._validate_behavior_on_bulk_failure(
+                res, 'ports', webob.exc.HTTPServerError.code)
+
+    def test_create_ports_bulk_fetches_network_once(self):
+        ctx = context.get_admin_context()
+        plugin = manager.NeutronManager.get_plugin()
+        create_port_bulk_db = plugin._create_port_bulk_db
+        get_network_counts = []
+
+        def _create_port_bulk_db(*args, **kwargs):
+            with mock.patch.object(plugin, 'get_network',
+                                   wraps=plugin.get_network) as get_network:
+                objects = create_port_bulk_db(*args, **kwargs)
+            get_network_counts.append(get_network.call_count)
+            return objects
+
+        with self.network() as net,\
+                mock.patch.object(plugin, '_create_port_bulk_db',
+                                  side_effect=_create_port_bulk_db):
+            res = self._create_port_bulk(self.fmt, 3, net['network']['id'],
+                                         'test', True, context=ctx)
+            ports = self.deserialize(self.fmt, res)['ports']
+        self.assertEqual([1], get_network_counts)
+        for port in ports:
+            bindings = plugin._get_port_security_group_bindings(
+                ctx, filters={'port_id': [port['id']]})
+            self.assertEqual(port['security_groups'],
+                             [binding['security_group_id']
+                              for binding in bindings])
+
     def _check_security_groups_provider_updated_args(self, p_upd_mock, net_id):
         query_params = "network_id=%s" % net_id
         network_ports = self._list('ports', query_params=query_params)
@@ -1210,6 +1281,17 @@ class TestMl2PluginOnly(Ml2PluginV2TestCase):
                 plugin._verify_service_plugins_requirements
             )
 
+    def test_resource_objects_not_pushed_by_default(self):
+        self.assertIsNone(self.driver.ovo_notifier)
+
+    def test_resource_objects_pushed(self):
+        config.cfg.CONF.set_override('push_resource_objects', True,
+                                     group='ml2')
+        with mock.patch.object(ml2_plugin.ovo_rpc,
+                               'OVOServerRpcInterface') as ovo_rpc_cls:
+            self.driver._start_rpc_notifiers()
+        self.assertEqual(ovo_rpc_cls.return_value, self.driver.ovo_notifier)
+
     def _test_check_mac_update_allowed(self, vif_type, expect_change=True):
         plugin = manager.NeutronManager.get_plugin()
         port = {'mac_address': "fake_mac", 'id': "fake_id"}
@@ -249,3 +249,4 @@ class TestTrackedResource(testlib_api.SqlTestCaseLight):
             self.assertNotIn(self.tenant_id, res._out_of_sync_tenants)
             mock_set_quota_usage.assert_called_once_with(
                 self.context, self.resource, self.tenant_id, in_use=2)
+            self.assertEqual(1, res.resync_count)
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
 import mock
 from oslo_config import cfg
 import testtools
@@ -105,12 +106,28 @@ class TestAuxiliaryFunctions(base.DietTestCase):
 
     def test_resync_tracked_resource(self):
         with mock.patch('neutron.quota.resource.'
-                        'TrackedResource.resync') as mock_resync:
+                        'TrackedResource.resync') as mock_resync,\
+                mock.patch.object(eventlet, 'spawn_after') as spawn_after:
             self.registry.set_tracked_resource('meh', test_quota.MehModel)
             self.registry.register_resource_by_name('meh')
+            self.registry.get_resource('meh')._out_of_sync_tenants.add(
+                'tenant_id')
             resource_registry.resync_resource(mock.ANY, 'meh', 'tenant_id')
+            # The resync is not run by the request
+            self.assertEqual(0, mock_resync.call_count)
+            spawn_after.assert_called_once_with(
+                cfg.CONF.QUOTAS.usage_resync_interval,
+                self.registry.resyncer.flush)
+            self.registry.resyncer.flush()
             mock_resync.assert_called_once_with(mock.ANY, 'tenant_id')
 
+    def test_resync_tracked_resource_in_sync(self):
+        with mock.patch.object(eventlet, 'spawn_after') as spawn_after:
+            self.registry.set_tracked_resource('meh', test_quota.MehModel)
+            self.registry.register_resource_by_name('meh')
+            resource_registry.resync_resource(mock.ANY, 'meh', 'tenant_id')
+            self.assertEqual(0, spawn_after.call_count)
+
     def test_resync_non_tracked_resource(self):
         with mock.patch('neutron.quota.resource.'
                         'TrackedResource.resync') as mock_resync:
@@ -164,3 +181,67 @@ class TestAuxiliaryFunctions(base.DietTestCase):
             res._dirty_tenants.add('tenant_id')
             resource_registry.set_resources_dirty(ctx)
             mock_mark_dirty.assert_called_once_with(ctx)
+
+
+class TestUsageResyncer(base.DietTestCase):
+
+    def setUp(self):
+        super(TestUsageResyncer, self).setUp()
+        self.registry = resource_registry.ResourceRegistry.get_instance()
+        self.registry.unregister_resources()
+        self.addCleanup(self.registry.unregister_resources)
+        self.registry.set_tracked_resource('meh', test_quota.MehModel)
+        self.registry.register_resource_by_name('meh')
+        self.resync = mock.patch('neutron.quota.resource.'
+                                 'TrackedResource.resync').start()
+        self.spawn_after = mock.patch.object(eventlet, 'spawn_after').start()
+        self.resyncer = self.registry.resyncer
+
+    def test_schedule_coalesces_resyncs(self):
+        self.resyncer.schedule('meh', 'tenant_id')
+        self.resyncer.schedule('meh', 'tenant_id')
+        self.assertEqual(1, self.spawn_after.call_count)
+        self.resyncer.flush()
+        self.resync.assert_called_once_with(mock.ANY, 'tenant_id')
+
+    def test_flush_is_rate_limited(self):
+        cfg.CONF.set_override('usage_resync_batch_size', 2, group='QUOTAS')
+        self.addCleanup(cfg.CONF.reset)
+        for tenant_id in ('t1', 't2', 't3'):
+            self.resyncer.schedule('meh', tenant_id)
+        self.resyncer.flush()
+        self.assertEqual([mock.call(mock.ANY, 't1'),
+                          mock.call(mock.ANY, 't2')],
+                         self.resync.call_args_list)
+        # The remaining resync is left to the next batch
+        self.assertEqual(2, self.spawn_after.call_count)
+        self.resyncer.flush()
+        self.resync.assert_called_with(mock.ANY, 't3')
+        self.assertEqual(2, self.spawn_after.call_count)
+
+    def test_flush_resyncs_after_failure(self):
+        self.resync.side_effect = [Exception, None]
+        self.resyncer.schedule('meh', 't1')
+        self.resyncer.schedule('meh', 't2')
+        self.resyncer.flush()
+        self.assertEqual(2, self.resync.call_count)
+
+    def test_flush_logs_resync_counts(self):
+        self.registry.get_resource('meh').resync_count = 1
+        self.resyncer.schedule('meh', 'tenant_id')
+        with mock.patch.object(resource_registry, 'LOG') as log:
+            self.resyncer.flush()
+        log.debug.assert_called_once_with(
+            mock.ANY, {'batch': 1, 'pending': 0, 'counts': {'meh': 1}})
+
+    def test_cancel(self):
+        self.resyncer.schedule('meh', 'tenant_id')
+        self.resyncer.cancel()
+        self.spawn_after.return_value.cancel.assert_called_once_with()
+        self.resyncer.flush()
+        self.assertEqual(0, self.resync.call_count)
+
+    def test_get_resync_counts(self):
+        self.registry.register_resource_by_name('countable')
+        self.registry.get_resource('meh').resync_count = 3
+        self.assertEqual({'meh': 3}, resource_registry.get_resync_counts())
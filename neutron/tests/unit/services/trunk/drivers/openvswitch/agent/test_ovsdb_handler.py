@@ -236,6 +236,67 @@ class TestOVSDBHandler(base.BaseTestCase):
             self.assertTrue(f.call_count)
             self.assertEqual(constants.DEGRADED_STATUS, status)
 
+    def test_process_trunk_port_events_single_bridge(self):
+        with mock.patch.object(ovsdb_handler.eventlet, 'spawn_n') as spawn:
+            self.ovsdb_handler.process_trunk_port_events(
+                mock.ANY, mock.ANY, mock.ANY,
+                {'added': [{'name': 'tbr-foo'}, {'name': 'tap-bar'}],
+                 'removed': []})
+        spawn.assert_called_once_with(self.ovsdb_handler.handle_trunk_add,
+                                      'tbr-foo')
+
+    def test_process_trunk_port_events_prefetches_trunks(self):
+        with mock.patch.object(ovsdb_handler.eventlet, 'spawn_n') as spawn:
+            self.ovsdb_handler.process_trunk_port_events(
+                mock.ANY, mock.ANY, mock.ANY,
+                {'added': [{'name': 'tbr-foo'}, {'name': 'tbr-bar'}],
+                 'removed': []})
+        spawn.assert_called_once_with(
+            self.ovsdb_handler._prefetch_and_handle_trunks,
+            ['tbr-foo', 'tbr-bar'])
+
+    @mock.patch('neutron.agent.common.ovs_lib.OVSBridge')
+    def test__prefetch_trunks(self, br):
+        trunk = mock.Mock(id=self.trunk_id, port_id='parent1',
+                          sub_ports=[])
+        self.trunk_manager.get_port_uuid_from_external_ids.return_value = (
+            'parent1')
+        trunk_rpc = self.ovsdb_handler.trunk_rpc
+        trunk_rpc.get_trunks_details.return_value = {'parent1': trunk}
+        with mock.patch.object(
+                self.ovsdb_handler, '_get_parent_port',
+                side_effect=[self.fake_port,
+                             exceptions.ParentPortNotFound(bridge='b')]):
+            self.ovsdb_handler._prefetch_trunks(['tbr-foo', 'tbr-bar'])
+        trunk_rpc.get_trunks_details.assert_called_once_with(
+            mock.ANY, ['parent1'])
+
+        with mock.patch.object(self.ovsdb_handler,
+                               'wire_subports_for_trunk'):
+            self.ovsdb_handler._wire_trunk(mock.Mock(), self.fake_port)
+        self.assertFalse(trunk_rpc.get_trunk_details.called)
+        self.trunk_manager.create_trunk.assert_called_once_with(
+            self.trunk_id, 'parent1', mock.ANY)
+        # A prefetched trunk is only used once
+        self.assertEqual({}, self.ovsdb_handler._prefetched_trunks)
+
+    @mock.patch('neutron.agent.common.ovs_lib.OVSBridge')
+    def _test__prefetch_trunks_rpc_failure(self, exc, br):
+        trunk_rpc = self.ovsdb_handler.trunk_rpc
+        trunk_rpc.get_trunks_details.side_effect = exc
+        with mock.patch.object(self.ovsdb_handler, '_get_parent_port',
+                               return_value=self.fake_port):
+            self.ovsdb_handler._prefetch_trunks(['tbr-foo'])
+        self.assertEqual({}, self.ovsdb_handler._prefetched_trunks)
+
+    def test__prefetch_trunks_rpc_failure(self):
+        self._test__prefetch_trunks_rpc_failure(
+            oslo_messaging.MessagingException)
+
+    def test__prefetch_trunks_bulk_pull_not_supported(self):
+        self._test__prefetch_trunks_rpc_failure(
+            resources_rpc.BulkPullNotSupported(resource_type='Trunk'))
+
     def test__wire_trunk_get_trunk_details_failure(self):
         self.trunk_manager.get_port_uuid_from_external_ids.side_effect = (
             trunk_manager.TrunkManagerError(error='error'))
@@ -46,3 +46,19 @@ class TrunkSkeletonTest(base.BaseTestCase):
         mocked_get_server.assert_has_calls(calls, any_order=True)
         self.assertIn("ResourcesPushRpcCallback",
                       str(mocked_get_server.call_args_list))
+
+
+class TrunkStubTest(base.BaseTestCase):
+
+    def test_get_trunks_details(self):
+        stub = agent.TrunkStub()
+        trunk1 = mock.Mock(port_id='parent1')
+        trunk2 = mock.Mock(port_id='parent2')
+        with mock.patch.object(stub.stub, 'bulk_pull',
+                               return_value=[trunk1, trunk2]) as bulk_pull:
+            trunks = stub.get_trunks_details(mock.sentinel.context,
+                                             ['parent1', 'parent2'])
+        bulk_pull.assert_called_once_with(
+            mock.sentinel.context, resources.TRUNK,
+            filter_kwargs={'port_id': ['parent1', 'parent2']})
+        self.assertEqual({'parent1': trunk1, 'parent2': trunk2}, trunks)
@@ -37,6 +37,8 @@ class TrunkSkeletonTest(test_plugin.Ml2PluginV2TestCase):
         super(TrunkSkeletonTest, self).setUp()
         self.mock_registry_provide = mock.patch(
             'neutron.api.rpc.callbacks.producer.registry.provide').start()
+        self.mock_registry_provide_bulk = mock.patch(
+            'neutron.api.rpc.callbacks.producer.registry.provide_bulk').start()
         self.drivers_patch = mock.patch.object(drivers, 'register').start()
         self.mock_update_port = mock.patch.object(ml2_plugin.Ml2Plugin,
                                                   'update_port').start()
@@ -64,6 +66,8 @@ class TrunkSkeletonTest(test_plugin.Ml2PluginV2TestCase):
         self.mock_registry_provide.assert_called_with(
             server.trunk_by_port_provider,
             resources.TRUNK)
+        self.mock_registry_provide_bulk.assert_called_with(
+            server.trunks_provider, resources.TRUNK)
         trunk_target = oslo_messaging.Target(topic=rpc_consts.TRUNK_BASE_TOPIC,
                                              server=cfg.CONF.host,
                                              fanout=False)
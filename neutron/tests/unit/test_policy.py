@@ -656,3 +656,55 @@ class NeutronPolicyTestCase(base.BaseTestCase):
         result = policy._is_attribute_explicitly_set(
             attr, resource, target, action)
         self.assertFalse(result)
+
+    def _test_collection_checker(self, targets, action='get_network'):
+        checker = policy.CollectionPolicyChecker(self.context,
+                                                 pluralized='networks')
+        with mock.patch.object(policy, 'check',
+                               wraps=policy.check) as check:
+            results = [checker.check(action, target) for target in targets]
+        expected = [policy.check(self.context, action, target,
+                                 pluralized='networks')
+                    for target in targets]
+        self.assertEqual(expected, results)
+        return check.call_count
+
+    def test_collection_checker_caches_result_by_target_fields(self):
+        targets = [{'id': str(i), 'name': 'net-%s' % i,
+                    'tenant_id': 'fake' if i % 2 else 'other',
+                    'shared': False, 'router:external': False}
+                   for i in range(10)]
+        self.assertEqual(2, self._test_collection_checker(targets))
+
+    def test_collection_checker_evaluates_distinct_fields(self):
+        targets = [{'id': '1', 'tenant_id': 'other', 'shared': False},
+                   {'id': '2', 'tenant_id': 'other', 'shared': True},
+                   {'id': '3', 'tenant_id': 'other'}]
+        self.assertEqual(3, self._test_collection_checker(targets))
+
+    def test_collection_checker_unknown_checks_not_cached(self):
+        self._set_rules(get_network='http:http://www.example.com')
+        self.useFixture(op_fixture.HttpCheckFixture())
+        targets = [{'id': str(i), 'tenant_id': 'fake'} for i in range(3)]
+        self.assertEqual(3, self._test_collection_checker(targets))
+
+    def test_collection_checker_unhashable_values_not_cached(self):
+        targets = [{'id': str(i), 'tenant_id': 'other', 'shared': [i]}
+                   for i in range(3)]
+        self.assertEqual(3, self._test_collection_checker(targets))
+
+    def test_collection_checker_admin(self):
+        checker = policy.CollectionPolicyChecker(context.get_admin_context())
+        with mock.patch.object(policy, 'check') as check:
+            self.assertTrue(checker.check('get_network',
+                                          {'tenant_id': 'other'}))
+        self.assertFalse(check.called)
+
+    def test_collection_checker_filter(self):
+        checker = policy.CollectionPolicyChecker(self.context,
+                                                 pluralized='networks')
+        targets = [{'id': '1', 'tenant_id': 'fake'},
+                   {'id': '2', 'tenant_id': 'other'},
+                   {'id': '3', 'tenant_id': 'other', 'shared': True}]
+        self.assertEqual([targets[0], targets[2]],
+                         checker.filter('get_network', targets))
@@ -55,3 +55,18 @@ class TestRunWsgiApp(base.BaseTestCase):
 
     def test_api_workers_defined(self):
         self._test_api_workers(42, 42)
+
+    def test_workers_state_preloaded(self):
+        cfg.CONF.set_override('preload_workers_state', True)
+        cfg.CONF.set_override('api_workers', 2)
+        with mock.patch('neutron.wsgi.Server'),\
+                mock.patch.object(service.policy, 'init') as policy_init:
+            service.run_wsgi_app(mock.sentinel.app)
+        policy_init.assert_called_once_with()
+
+    def test_workers_state_not_preloaded(self):
+        cfg.CONF.set_override('api_workers', 2)
+        with mock.patch('neutron.wsgi.Server'),\
+                mock.patch.object(service.policy, 'init') as policy_init:
+            service.run_wsgi_app(mock.sentinel.app)
+        self.assertFalse(policy_init.called)
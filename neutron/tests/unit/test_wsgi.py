@@ -20,6 +20,7 @@ import ssl
 import mock
 from neutron_lib import exceptions as exception
 from oslo_config import cfg
+from oslo_serialization import jsonutils
 import six.moves.urllib.request as urlrequest
 import testtools
 import webob
@@ -535,6 +536,51 @@ class JSONDictSerializerTest(base.BaseTestCase):
 
         self.assertEqual(expected_json, result)
 
+    def test_serialize_collection(self):
+        items = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': u'\u7f51'}]
+        serializer = wsgi.JSONDictSerializer()
+        chunks = list(serializer.serialize_collection('servers',
+                                                      iter(items)))
+        self.assertEqual({'servers': items},
+                         jsonutils.loads(b''.join(chunks)))
+
+    def test_serialize_collection_empty(self):
+        serializer = wsgi.JSONDictSerializer()
+        chunks = list(serializer.serialize_collection('servers', []))
+        self.assertEqual({'servers': []}, jsonutils.loads(b''.join(chunks)))
+
+    def test_serialize_collection_in_chunks(self):
+        items = [{'id': i} for i in range(10)]
+        serializer = wsgi.JSONDictSerializer()
+        serializer.CHUNK_SIZE = 20
+        chunks = list(serializer.serialize_collection('servers', items))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual({'servers': items},
+                         jsonutils.loads(b''.join(chunks)))
+
+    def test_serialize_collection_items_encoded_lazily(self):
+        encoded = []
+
+        def items():
+            for i in range(2):
+                encoded.append(i)
+                yield {'id': i}
+
+        serializer = wsgi.JSONDictSerializer()
+        serializer.CHUNK_SIZE = 1
+        chunks = serializer.serialize_collection('servers', items())
+        next(chunks)
+        self.assertEqual([0], encoded)
+
+    def test_serialize_collection_item_failure(self):
+        def items():
+            yield {'id': 1}
+            raise RuntimeError()
+
+        serializer = wsgi.JSONDictSerializer()
+        self.assertRaises(RuntimeError, list,
+                          serializer.serialize_collection('servers', items()))
+
 
 class TextDeserializerTest(base.BaseTestCase):
 
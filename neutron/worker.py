@@ -16,6 +16,7 @@ from oslo_service import service
 from neutron.callbacks import events
 from neutron.callbacks import registry
 from neutron.callbacks import resources
+from neutron.db import api as db_api
 
 
 class WorkerSupportServiceMixin(object):
@@ -72,6 +73,8 @@ class NeutronWorker(service.ServiceBase):
 
     # default class value for case when super().__init__ is not called
     _worker_process_count = 1
+    # type of the worker, which sets the size of its database pool
+    worker_type = 'periodic'
 
     def __init__(self, worker_process_count=_worker_process_count):
         """
@@ -90,6 +93,7 @@ class NeutronWorker(service.ServiceBase):
 
     def start(self):
         if self.worker_process_count > 0:
+            db_api.configure_worker_pool(self.worker_type)
             registry.notify(resources.PROCESS, events.AFTER_INIT, self.start)
 
 
@@ -61,6 +61,8 @@ def encode_body(body):
 
 class WorkerService(neutron_worker.NeutronWorker):
     """Wraps a worker to be handled by ProcessLauncher"""
+    worker_type = 'api'
+
     def __init__(self, service, application, disable_ssl=False,
                  worker_process_count=0):
         super(WorkerService, self).__init__(worker_process_count)
@@ -305,10 +307,40 @@ class DictSerializer(ActionDispatcher):
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
+    # The minimum size of the chunks of the streamed collections
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def _sanitizer(obj):
+        return six.text_type(obj)
+
     def default(self, data):
-        def sanitizer(obj):
-            return six.text_type(obj)
-        return encode_body(jsonutils.dumps(data, default=sanitizer))
+        return encode_body(jsonutils.dumps(data, default=self._sanitizer))
+
+    def serialize_collection(self, collection, items):
+        """Yield the JSON body of a collection chunk by chunk.
+
+        Each item is encoded when it is reached, so that neither all the
+        items nor the whole body are held in memory.
+        """
+        chunk = ['{%s: [' % jsonutils.dumps(collection)]
+        chunk_size = 0
+        separator = ''
+        try:
+            for item in items:
+                encoded = jsonutils.dumps(item, default=self._sanitizer)
+                chunk.extend((separator, encoded))
+                chunk_size += len(encoded)
+                separator = ', '
+                if chunk_size >= self.CHUNK_SIZE:
+                    yield encode_body(''.join(chunk))
+                    chunk, chunk_size = [], 0
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                LOG.exception(_LE("Failed to serialize the %s collection, "
+                                  "aborting the response."), collection)
+        chunk.append(']}')
+        yield encode_body(''.join(chunk))
 
 
 class ResponseHeaderSerializer(ActionDispatcher):